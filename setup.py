@@ -72,6 +72,7 @@ setup(
     # Not configured ...
     extras_require={
         "buster": ["wwpdb.apps.validation ~= 2.3"],
+        "contacts": ["gemmi"],
         "dev": ["check-manifest"],
         "test": ["coverage"],
     },
@@ -9,6 +9,7 @@
 #  19-Feb-2105  jdw add edit support for _struct_biol.details.
 #  02-Feb-2017  ep  add support for display author provided assembly and evidence
 #  04-Oct-2017  zf  add __getPdbxStructAssemblyGenDepositorInfo(), makeEntityInfoTable(), makeSymopInfoTable() & __getSymmetryCellValue()
+#  18-Oct-2026  ep  read only the categories used by each table from the model file
 ##
 """
 Calculation, selection and depiction of coordinate assemblies.
@@ -39,6 +40,24 @@ class AssemblyInput(object):
 
     """
 
+    # Model file categories used by each of the tables -
+    _entityCategoryList = ["entity", "entity_poly", "pdbx_branch_scheme"]
+    _symopCategoryList = ["cell", "symmetry"]
+    _assemblyCategoryList = ["pdbx_struct_assembly", "pdbx_struct_assembly_gen", "pdbx_struct_oper_list"]
+    _depositorAssemblyCategoryList = [
+        "pdbx_struct_assembly_depositor_info",
+        "struct_biol",
+        "pdbx_struct_assembly_gen_depositor_info",
+        "pdbx_struct_oper_list_depositor_info",
+        "pdbx_struct_assembly_auth_evidence",
+        "pdbx_struct_assembly_auth_classification",
+        "entity",
+        "entity_poly",
+        "pdbx_branch_scheme",
+        "pdbx_poly_seq_scheme",
+        "pdbx_nonpoly_scheme",
+    ]
+
     def __init__(self, reqObj=None, verbose=False, log=sys.stderr):
         self.__verbose = verbose
         self.__lfh = log
@@ -97,7 +116,7 @@ class AssemblyInput(object):
         if fN is not None and not os.access(fN, os.R_OK):
             return assemL, assemRcsbL, ed, assemGen, assemOper, assemEvidence, assemClassification, branchInstList
         #
-        c0 = PdbxFileIo(ioObj=IoAdapterCore(), verbose=self.__verbose, log=self.__lfh).getContainer(fN)
+        c0 = PdbxFileIo(ioObj=IoAdapterCore(), verbose=self.__verbose, log=self.__lfh).getContainer(fN, selectList=self._depositorAssemblyCategoryList)
         sdf = ModelFileIo(dataContainer=c0, verbose=self.__verbose, log=self.__lfh)
 
         assemL = sdf.getDepositorAssemblyDetails()
@@ -228,7 +247,7 @@ class AssemblyInput(object):
 
     def __fetchAssemblyDetails(self, entryFilePath=None):
         """Return a list of dictionaries containing the current assembly details."""
-        c0 = PdbxFileIo(ioObj=IoAdapterCore(), verbose=self.__verbose, log=self.__lfh).getContainer(entryFilePath)
+        c0 = PdbxFileIo(ioObj=IoAdapterCore(), verbose=self.__verbose, log=self.__lfh).getContainer(entryFilePath, selectList=self._assemblyCategoryList)
         sdf = ModelFileIo(dataContainer=c0, verbose=self.__verbose, log=self.__lfh)
 
         assemL, assemGenL, assemOpL = sdf.getAssemblyDetails()
@@ -253,7 +272,7 @@ class AssemblyInput(object):
         if not os.access(fN, os.R_OK):
             return not_found_msg
         #
-        c0 = PdbxFileIo(ioObj=IoAdapterCore(), verbose=self.__verbose, log=self.__lfh).getContainer(fN)
+        c0 = PdbxFileIo(ioObj=IoAdapterCore(), verbose=self.__verbose, log=self.__lfh).getContainer(fN, selectList=self._entityCategoryList)
         sdf = ModelFileIo(dataContainer=c0, verbose=self.__verbose, log=self.__lfh)
         polyEntityList = sdf.getPolymerEntityList()
         if len(polyEntityList) > 0:
@@ -304,7 +323,7 @@ class AssemblyInput(object):
         if not os.access(fN, os.R_OK):
             return not_found_msg
         #
-        c0 = PdbxFileIo(ioObj=IoAdapterCore(), verbose=self.__verbose, log=self.__lfh).getContainer(fN)
+        c0 = PdbxFileIo(ioObj=IoAdapterCore(), verbose=self.__verbose, log=self.__lfh).getContainer(fN, selectList=self._symopCategoryList)
         if (not c0.exists("cell")) or (not c0.exists("symmetry")):
             return not_found_msg
         #
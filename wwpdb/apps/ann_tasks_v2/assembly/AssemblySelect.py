@@ -20,6 +20,11 @@
 #                         def makeAssemblyDetailsTable(self, entryId, modelFilePath)
 #                     switch to core python IO adapter -
 #  14-Jun-2019   zf   add autoAssignDefaultAssembly()
+#  18-Oct-2026        generate assembly coordinate files concurrently with optional lazy generation
+#  18-Oct-2026        reuse the parsed assembly report between requests
+#  18-Oct-2026        copy deferred assembly model files from the workflow import before use
+#  18-Oct-2026        assembly view links request the coordinate file from the assemblymodel service
+#  18-Oct-2026        copy a deferred assembly model file from the workflow import only when it is requested
 ##
 """
 Calculation, selection and depiction of coordinate assemblies.
@@ -41,10 +46,13 @@ import os.path
 import os
 import traceback
 import shutil
+import threading
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.utils.dp.DataFileAdapter import DataFileAdapter
 from wwpdb.apps.ann_tasks_v2.io.PisaReader import PisaAssemblyReader
 from wwpdb.apps.ann_tasks_v2.io.PdbxIoUtils import PdbxFileIo, ModelFileIo
+from wwpdb.apps.ann_tasks_v2.utils.SessionImport import SessionImport
+from wwpdb.apps.ann_tasks_v2.utils.TaskPool import TaskPool
 from mmcif.api.PdbxContainers import DataContainer
 from mmcif.api.DataCategory import DataCategory
 from mmcif.io.IoAdapterCore import IoAdapterCore
@@ -59,6 +67,9 @@ class AssemblySelect(object):
 
     """
 
+    # Serializes on-demand generation of the same assembly model within a process
+    _modelLock = threading.Lock()
+
     def __init__(self, reqObj=None, verbose=False, log=sys.stderr):
         self.__verbose = verbose
         self.__debug = False
@@ -90,13 +101,19 @@ class AssemblySelect(object):
     def setArguments(self, assemblyArgs):
         self.__assemblyArgs = assemblyArgs
 
-    def run(self, entryId, inpFile, sessionName, maxAssems=50):
-        """Run the assembly calculation and create coordinate files for each candidate assembly"""
+    def run(self, entryId, inpFile, sessionName, maxAssems=50, lazy=False, maxWorkers=None):
+        """Run the assembly calculation and create coordinate files for each candidate assembly
+
+        Coordinate files are generated concurrently (at most maxWorkers at a time).  If lazy is set
+        the coordinate files are not created here, but on first request in getLaunchJmolHtml()
+        (or for all outstanding assemblies by materializeAssemblyModels()).
+        """
         try:
             inpPath = os.path.join(self.__sessionPath, inpFile)
             reportPath = os.path.join(self.__sessionPath, entryId + "_assembly-report_P1.xml")
             logPath = os.path.join(self.__sessionPath, entryId + "-assembly-report.log")
-            for filePath in (reportPath, logPath):
+            cachePath = PisaAssemblyReader().getCachePath(reportPath)
+            for filePath in (reportPath, logPath, cachePath):
                 if os.access(filePath, os.R_OK):
                     os.remove(filePath)
                 #
@@ -117,6 +134,7 @@ class AssemblySelect(object):
             shutil.copyfile(inpPath, inpPathDep)
             #
             assemD, _assemSetD = self.__readAssemblyReport(reportPath)
+            uidList = []
             if len(assemD) > 0:
                 if self.__debug:
                     self.__lfh.write("+AssemblySelect.run - assembly uid list %r\n" % assemD.keys())
@@ -126,15 +144,16 @@ class AssemblySelect(object):
                         break
                     if assemblyUid == 0:
                         continue
-                    assemModelFileName = os.path.join(self.__sessionPath, entryId + "_assembly-model-xyz_P" + str(assemblyUid) + ".cif")
-                    dp.addInput(name="pisa_assembly_id", value=str(assemblyUid))
-                    dp.op("pisa-assembly-coordinates-cif")
-                    dp.exp(assemModelFileName)
-                    if self.__verbose:
-                        self.__lfh.write("+AssemblySelect.run - creating assembly model %r file %s\n" % (assemblyUid, assemModelFileName))
-                    #
+                    # Remove models from any previous calculation -
+                    assemModelPath = self.__getAssemblyModelPath(entryId, assemblyUid)
+                    if os.access(assemModelPath, os.F_OK):
+                        os.remove(assemModelPath)
+                    uidList.append(assemblyUid)
                 #
             #
+            self.__writePendingModels(entryId, sessionName, uidList)
+            if not lazy:
+                self.materializeAssemblyModels(entryId, maxWorkers=maxWorkers)
             # dp.cleanup()
             return True
         except:  # noqa: E722 pylint: disable=bare-except
@@ -142,6 +161,73 @@ class AssemblySelect(object):
                 traceback.print_exc(file=self.__lfh)
             return False
 
+    def __getAssemblyModelPath(self, entryId, assemblyUid):
+        return os.path.join(self.__sessionPath, entryId + "_assembly-model-xyz_P" + str(assemblyUid) + ".cif")
+
+    def __getPendingModelsPath(self, entryId):
+        return os.path.join(self.__sessionPath, entryId + "_assembly-model-pending.pic")
+
+    def __writePendingModels(self, entryId, sessionName, uidList):
+        """Save the PISA session name and the list of assemblies for which coordinate files are to be made."""
+        with open(self.__getPendingModelsPath(entryId), "wb") as fb:
+            pickle.dump(sessionName, fb)
+            pickle.dump([int(uid) for uid in uidList], fb)
+
+    def __readPendingModels(self, entryId):
+        """Return the PISA session name and the list of assemblies without coordinate files (None, []) if none are pending."""
+        pendingPath = self.__getPendingModelsPath(entryId)
+        if not os.access(pendingPath, os.R_OK):
+            return None, []
+        try:
+            with open(pendingPath, "rb") as fb:
+                sessionName = pickle.load(fb)
+                uidList = pickle.load(fb)
+            return sessionName, [uid for uid in uidList if not os.access(self.__getAssemblyModelPath(entryId, uid), os.R_OK)]
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                traceback.print_exc(file=self.__lfh)
+        return None, []
+
+    def __makeAssemblyModel(self, entryId, sessionName, assemblyUid):
+        """Create the coordinate file for a single assembly from the PISA session.
+
+        Each call uses its own RcsbDpUtility working directory so calls may run concurrently.
+        """
+        assemModelPath = self.__getAssemblyModelPath(entryId, assemblyUid)
+        dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+        try:
+            dp.addInput(name="pisa_session_name", value=sessionName)
+            dp.addInput(name="pisa_assembly_id", value=str(assemblyUid))
+            dp.op("pisa-assembly-coordinates-cif")
+            dp.exp(assemModelPath)
+        finally:
+            dp.cleanup()
+        if self.__verbose:
+            self.__lfh.write("+AssemblySelect.__makeAssemblyModel - creating assembly model %r file %s\n" % (assemblyUid, assemModelPath))
+        return os.access(assemModelPath, os.R_OK)
+
+    def materializeAssemblyModels(self, entryId, uidList=None, maxWorkers=None):
+        """Create any outstanding assembly coordinate files (optionally only those in uidList).
+
+        Returns True if all requested coordinate files are available.
+        """
+        sessionName, pendingList = self.__readPendingModels(entryId)
+        if uidList is not None:
+            uidL = [int(uid) for uid in uidList if str(uid).isdigit()]
+            pendingList = [uid for uid in pendingList if uid in uidL]
+        if not pendingList:
+            return True
+        #
+        tP = TaskPool(maxWorkers=maxWorkers, verbose=self.__verbose, log=self.__lfh)
+        for assemblyUid in pendingList:
+            tP.add(assemblyUid, self.__makeAssemblyModel, entryId, sessionName, assemblyUid)
+        ok = True
+        for assemblyUid, tOk, result in tP.run():
+            if not (tOk and result):
+                self.__lfh.write("+AssemblySelect.materializeAssemblyModels - failed for assembly %r\n" % assemblyUid)
+                ok = False
+        return ok
+
     def setReportContext(self, entryId):
         """Set the analysis report context for subsequent operations."""
         try:
@@ -499,11 +585,35 @@ class AssemblySelect(object):
 
         return modelPathRel
 
+    def getAssemblyModelUrl(self, entryId, assemblyUid):
+        """Return the URL of the service returning the coordinate file of the input assembly (see getAssemblyModelPath())."""
+        return "/service/ann_tasks_v2/assemblymodel?sessionid=%s&entryid=%s&assemblyid=%s&filename=%s" % (
+            self.__sObj.getId(),
+            entryId,
+            assemblyUid,
+            os.path.basename(self.__getAssemblyModelPath(entryId, assemblyUid)),
+        )
+
+    def getAssemblyModelPath(self, entryId, assemblyUid):
+        """Return the path of the coordinate file of the input assembly - the file is created first if its
+        generation was deferred (lazy calculation) or it is still pending from the workflow import.
+        Returns None if there is no coordinate file.
+        """
+        if str(assemblyUid) != "0":
+            SessionImport(self.__reqObj, entryId, verbose=self.__verbose, log=self.__lfh).materialize(["assembly-models"], pathList=[self.__getAssemblyModelPath(entryId, assemblyUid)])
+            # Coordinates for lazily computed assemblies are made on first request -
+            with AssemblySelect._modelLock:
+                self.materializeAssemblyModels(entryId, uidList=[assemblyUid], maxWorkers=1)
+        assemModelPath = self.__getAssemblyModelPath(entryId, assemblyUid) if str(assemblyUid) != "0" else os.path.join(self.__sessionPath, entryId + "_model_P1.cif")
+        return assemModelPath if os.access(assemModelPath, os.R_OK) else None
+
     def getLaunchJmolHtml(self, assemblyUid, entryId, generated=False):
         """Return the HTML to launch a 3D viewer for the pre-calculated coordinate file containing the
         input assembly (assemblyUid).
         """
         modelPathRel = self.__setAssemblyModelRelativePath(assemblyUid, entryId, generated=generated)
+        if not generated:
+            self.getAssemblyModelPath(entryId, assemblyUid)
 
         # setupCmds="background black; wireframe only; wireframe 0.05; labels off; slab 100; depth 40; slab on;"
         # setupCmds="background black; wireframe off; spacefill 0.75; labels off; slab 100; depth 40; slab on;"
@@ -587,7 +697,7 @@ class AssemblySelect(object):
 
     def __readAssemblyReport(self, reportPath):
         """Read assembly calculation report and return a dictionary of assembly details."""
-        pA = PisaAssemblyReader(verbose=self.__verbose, log=self.__lfh)
+        pA = PisaAssemblyReader(verbose=self.__verbose, log=self.__lfh, useCache=True)
         ok = pA.read(reportPath)
         if not ok:
             return {}, {}
@@ -871,17 +981,13 @@ class AssemblySelect(object):
             viewopt = ""
             if uid != 0:
                 #
-                #  <entryId>_assembly-model-xyz_P<assemId>.cif
-                # <a href='javascript:loadFileJsmol("myApp1","#jmol-dialog-1","/files/1cbs.cif","cpk")'> Load 1cbs cpk </a>
+                # The coordinate file may not have been made yet (lazy generation) - the link requests it from
+                # the assemblymodel service which creates the file on first access.  The URL ends with the file
+                # name so the viewer recognizes the format.
                 #
-                # Add a test for file existence here --
-                #
-                fullPath = os.path.join(self.__sessionPath, self.__entryId + "_assembly-model-xyz_P" + str(uid) + ".cif")
-                if os.access(fullPath, os.R_OK):
-                    assemblyFilePath = os.path.join(self.__rltvSessionPath, self.__entryId + "_assembly-model-xyz_P" + str(uid) + ".cif")
-                    jsurl = 'javascript:loadFileJsmol("myApp1","#jsmol-dialog-1","%s","cpk")' % assemblyFilePath
-                    htjs = "<a href='%s'>Jsmol</a>" % (jsurl)
-                    viewopt = htjs
+                jsurl = 'javascript:loadFileJsmol("myApp1","#jsmol-dialog-1","%s","cpk")' % self.getAssemblyModelUrl(self.__entryId, uid)
+                htjs = "<a href='%s'>Jsmol</a>" % (jsurl)
+                viewopt = htjs
             else:
                 #
                 fullPath = os.path.join(self.__sessionPath, self.__entryFileName)
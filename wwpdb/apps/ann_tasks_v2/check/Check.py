@@ -9,6 +9,7 @@
 #  1-Feb -2015  include pre-dictionary dialect conversion before V4 dicitonary check
 # 29-Nov -2016  Include support for new naming and extended checks (still using old rcsbDpUtilities for now (ep)
 # 25-May -2023  Using PublicPdbxFile class for generating PDBx/mmCIF file (zf)
+# 18-Oct -2026  Reuse stored results for unchanged input/dictionary/arguments via FileResultCache
 ##
 """
 Dictionary-level PDBx/mmCIF checking
@@ -26,7 +27,9 @@ import os
 import traceback
 import inspect
 
+from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCommon
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
+from wwpdb.apps.ann_tasks_v2.utils.FileResultCache import FileResultCache
 from wwpdb.apps.ann_tasks_v2.utils.PublicPdbxFile import PublicPdbxFile
 
 
@@ -37,15 +40,22 @@ class Check(PublicPdbxFile):
     Operations are performed in the current session context defined in the input
     reqObj().
 
+    Results are cached across sessions keyed on the content of the input file, the
+    dictionary version and files, the first block flag and the check arguments.
+
     """
 
     def __init__(self, reqObj=None, verbose=False, log=sys.stderr):
         super(Check, self).__init__(reqObj=reqObj, verbose=verbose, log=log)
+        self.__reqObj = reqObj
         self.__reportPath = None
         self.__dictionaryVersion = "V5"
         self.__reportFileSize = 0
         self.__checkArgs = None
         self.__firstBlock = False
+        self.__useCache = True
+        self.__cacheMaxSize = 2 * 1024 * 1024 * 1024
+        self.__cacheHit = False
 
     def setDictionaryVersion(self, version):
         if version.upper() in ["V6", "V5", "V4", "DEPOSIT", "ARCHIVE_NEXT", "ARCHIVE_CURRENT"]:
@@ -60,14 +70,103 @@ class Check(PublicPdbxFile):
     def setArguments(self, checkArgs):
         self.__checkArgs = checkArgs
 
+    def setUseCache(self, flag, maxSize=None):
+        """Enable/disable reuse of stored check results (optionally setting the cache size bound in bytes)."""
+        self.__useCache = flag
+        if maxSize is not None:
+            self.__cacheMaxSize = maxSize
+
+    def getCacheHit(self):
+        """Return True if the last run() was satisfied from the result cache."""
+        return self.__cacheHit
+
+    def getCacheStats(self):
+        return self.__getCache().getStats()
+
+    def __getCache(self):
+        cachePath = os.path.join(self.__reqObj.getSessionPath(), "cache", "dict-check")
+        return FileResultCache(cachePath, maxSize=self.__cacheMaxSize, verbose=self._verbose, log=self._lfh)
+
+    def __getConversionOp(self):
+        if self.__dictionaryVersion in ["V4", "ARCHIVE_CURRENT"]:
+            return "cif2pdbx-public"
+        elif self.__dictionaryVersion in ["ARCHIVE_NEXT"]:
+            return "cif2pdbx-ext"
+        return None
+
+    def __getDictionaryIdentity(self):
+        """Return a list of (file name, size, mtime) for the installed dictionary files or None if unavailable."""
+        try:
+            dictPath = ConfigInfoAppCommon(self._siteId).get_mmcif_dict_path()
+            rL = []
+            for fn in sorted(os.listdir(dictPath)):
+                st = os.stat(os.path.join(dictPath, fn))
+                rL.append((fn, st.st_size, int(st.st_mtime)))
+            return rL
+        except Exception as e:  # pylint: disable=broad-except
+            if self._verbose:
+                self._lfh.write("+%s.%s dictionary identity unavailable %s\n" % (self.__class__.__name__, inspect.currentframe().f_code.co_name, str(e)))
+        return None
+
+    def __getCachePathD(self, entryId, logPath):
+        pathD = {"report": self.__reportPath, "log": logPath}
+        cnvOp = self.__getConversionOp()
+        if cnvOp is not None:
+            pathD["cnv-pdbx"], pathD["cnv-log"] = self.get_conversion_paths(cnvOp, entryId)
+        return pathD
+
+    def __getCacheKey(self, entryId, inpPath):
+        dictId = self.__getDictionaryIdentity()
+        if dictId is None:
+            return None
+        paramD = {
+            "entryId": entryId,
+            "dictionaryVersion": self.__dictionaryVersion,
+            "firstBlock": self.__firstBlock,
+            "checkArgs": self.__checkArgs,
+            "dictionary": dictId,
+        }
+        return self.__getCache().makeKey([inpPath], paramD)
+
+    def __fetchCachedResult(self, cacheKey, entryId, logPath):
+        """Restore a stored result for the cache key - returns True on a hit."""
+        pathD = self.__getCachePathD(entryId, logPath)
+        metaD = self.__getCache().fetch(cacheKey, pathD)
+        if metaD is None:
+            return False
+        self.__reportFileSize = metaD.get("reportSize", 0)
+        for role in ["cnv-pdbx", "cnv-log", "report", "log"]:
+            if role in pathD:
+                self.addDownloadPath(pathD[role])
+        return True
+
+    def __getRunPaths(self, entryId):
+        """Return the log and report paths for the current dictionary version."""
+        if self.__dictionaryVersion in ["V4", "ARCHIVE_CURRENT"]:
+            return (os.path.join(self._exportPath, entryId + "_dict-check-report-r4.log"), os.path.join(self._exportPath, entryId + "_dict-check-report-r4_P1.txt.V1"))
+        elif self.__dictionaryVersion in ["ARCHIVE_NEXT"]:
+            return (os.path.join(self._exportPath, entryId + "_dict-check-report-next.log"), os.path.join(self._exportPath, entryId + "_dict-check-report-next_P1.txt.V1"))
+        return (os.path.join(self._exportPath, entryId + "_dict-check-report.log"), os.path.join(self._exportPath, entryId + "_dict-check-report_P1.txt.V1"))
+
     def run(self, entryId, inpPath):  # pylint: disable=unused-argument
         """Run the dictionary-level check on the input PDBx/mmCIF data file -"""
         try:
             self.clearFileList()
+            self.__cacheHit = False
 
-            logPath = os.path.join(self._exportPath, entryId + "_dict-check-report.log")
-            self.__reportPath = os.path.join(self._exportPath, entryId + "_dict-check-report_P1.txt.V1")
+            logPath, self.__reportPath = self.__getRunPaths(entryId)
             #
+            cacheKey = self.__getCacheKey(entryId, inpPath) if self.__useCache else None
+            if cacheKey is not None and self.__fetchCachedResult(cacheKey, entryId, logPath):
+                self.__cacheHit = True
+                if self._verbose:
+                    self._lfh.write(
+                        "+%s.%s dictionary check version %s restored from cache for entryId %s file %s report %s size %d\n"
+                        % (self.__class__.__name__, inspect.currentframe().f_code.co_name, self.__dictionaryVersion, entryId, inpPath, self.__reportPath, self.__reportFileSize)
+                    )
+                return True
+            #
+            cnvOk = True
             dp = RcsbDpUtility(tmpPath=self._sessionPath, siteId=self._siteId, verbose=self._verbose, log=self._lfh)
             if self._debug:
                 dp.setDebugMode(flag=True)
@@ -86,22 +185,20 @@ class Check(PublicPdbxFile):
                 if cnvInpPath is not None:
                     dp.imp(cnvInpPath)
                 else:
+                    cnvOk = False
                     dp.imp(inpPath)
                 #
                 dp.op("check-cif-v4")
-                logPath = os.path.join(self._exportPath, entryId + "_dict-check-report-r4.log")
-                self.__reportPath = os.path.join(self._exportPath, entryId + "_dict-check-report-r4_P1.txt.V1")
             elif self.__dictionaryVersion in ["ARCHIVE_NEXT"]:
                 cnvInpPath = self.run_conversion("cif2pdbx-ext", entryId, inpPath)
                 if cnvInpPath is not None:
                     dp.imp(cnvInpPath)
                 else:
+                    cnvOk = False
                     dp.imp(inpPath)
                 #
                 dp.op("check-cif-ext")
                 dp.addInput(name="dictionary", value="archive_next")
-                logPath = os.path.join(self._exportPath, entryId + "_dict-check-report-next.log")
-                self.__reportPath = os.path.join(self._exportPath, entryId + "_dict-check-report-next_P1.txt.V1")
             elif self.__dictionaryVersion in ["V6"]:
                 dp.imp(inpPath)
                 dp.op("check-cif-v6")
@@ -124,6 +221,10 @@ class Check(PublicPdbxFile):
             #
             self.addDownloadPath(logPath)
             #
+            # Do not store the fallback result of a failed conversion -
+            if cacheKey is not None and cnvOk:
+                self.__getCache().store(cacheKey, self.__getCachePathD(entryId, logPath), metaD={"reportSize": self.__reportFileSize})
+            #
             if self._verbose:
                 self._lfh.write(
                     "+%s.%s dictionary check version %s completed for entryId %s file %s report %s size %d\n"
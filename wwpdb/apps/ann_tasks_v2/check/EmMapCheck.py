@@ -3,7 +3,9 @@
 # Date:  1-Jun-2023  Zukang Feng
 #
 # Update:
-#
+#  18-Oct-2026  Ezra Peisach - enumerate archive map partitions from a single directory listing
+#  18-Oct-2026  Ezra Peisach - read the model file through the request model context
+#  18-Oct-2026  Ezra Peisach - declare the model categories read before the first read (EmMapCheckTask.modelCategoryList)
 ##
 """
 Check consistencies between em_map category vs. map files in archival directory
@@ -22,6 +24,8 @@ import inspect
 import logging
 
 from mmcif.io.IoAdapterCore import IoAdapterCore
+from wwpdb.apps.ann_tasks_v2.io.ModelContext import ModelContext
+from wwpdb.apps.ann_tasks_v2.utils.ArchiveFileIndex import ArchiveFileIndex
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
 from wwpdb.io.locator.PathInfo import PathInfo
 
@@ -72,7 +76,9 @@ class EmMapCheck(SessionWebDownloadUtils):
             if os.access(self.__reportPath, os.R_OK):
                 os.remove(self.__reportPath)
             #
-            checkTask = EmMapCheckTask(siteId=self.__siteId, sessionPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
+            modelContext = ModelContext.fromRequest(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+            modelContext.require(modelInputFile, EmMapCheckTask.modelCategoryList)
+            checkTask = EmMapCheckTask(siteId=self.__siteId, sessionPath=self.__sessionPath, modelContext=modelContext, verbose=self.__verbose, log=self.__lfh)
             checkTask.run(entryId, modelInputFile, self.__reportPath)
             #
             if not os.access(self.__reportPath, os.R_OK):
@@ -113,18 +119,25 @@ class EmMapCheck(SessionWebDownloadUtils):
 class EmMapCheckTask(object):
     """ """
 
-    def __init__(self, siteId=None, sessionPath=None, verbose=False, log=sys.stderr):
+    # Categories read from the model file
+    modelCategoryList = ["em_admin", "em_map"]
+
+    def __init__(self, siteId=None, sessionPath=None, modelContext=None, verbose=False, log=sys.stderr):
         """ """
         self.__siteId = siteId
         self.__sessionPath = sessionPath
+        self.__modelContext = modelContext
         self.__verbose = verbose
         self.__lfh = log
 
     def run(self, entryId, modelInputFile, reportPath):
         """ """
         # Test if em_admin present in model
-        ioObj = IoAdapterCore(verbose=self.__verbose, log=self.__lfh)
-        dIn = ioObj.readFile(inputFilePath=modelInputFile, selectList=["em_admin", "em_map"])
+        if self.__modelContext is not None:
+            dIn = self.__modelContext.getContainerList(modelInputFile, EmMapCheckTask.modelCategoryList)
+        else:
+            ioObj = IoAdapterCore(verbose=self.__verbose, log=self.__lfh)
+            dIn = ioObj.readFile(inputFilePath=modelInputFile, selectList=EmMapCheckTask.modelCategoryList)
         if not dIn or len(dIn) == 0:
             return
         #
@@ -155,6 +168,7 @@ class EmMapCheckTask(object):
             #
         #
         pI = PathInfo(siteId=self.__siteId, sessionPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
+        fileIndex = ArchiveFileIndex(pI, verbose=self.__verbose, log=self.__lfh)
         #
         archivalMapList = []
         for mapType in (
@@ -171,17 +185,9 @@ class EmMapCheckTask(object):
             "em-segmentation-volume",
             "em-volume",
         ):
-            partNum = 1
-            while True:
-                archiveFilePath = pI.getFilePath(
-                    dataSetId=entryId, wfInstanceId=None, contentType=mapType, formatType="map", fileSource="archive", versionId="latest", partNumber=str(partNum)
-                )
-                if (not archiveFilePath) or (not os.access(archiveFilePath, os.F_OK)):
-                    break
-                #
+            for archiveFilePath in fileIndex.getLatestPartitionFilePathList(entryId, contentType=mapType, formatType="map", fileSource="archive"):
                 (_dir, fileName) = os.path.split(archiveFilePath)
                 archivalMapList.append(fileName)
-                partNum += 1
             #
         #
         (_dir, modelFileName) = os.path.split(modelInputFile)
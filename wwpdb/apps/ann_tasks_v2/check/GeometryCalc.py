@@ -4,6 +4,7 @@
 #
 # Update:
 # 28-Feb -2014  Add base class
+# 18-Oct -2026  Run in a private task workspace and commit the model update with a version history
 #
 ##
 """
@@ -24,6 +25,7 @@ import traceback
 
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
 
 
 class GeometryCalc(SessionWebDownloadUtils):
@@ -58,38 +60,31 @@ class GeometryCalc(SessionWebDownloadUtils):
         """Run the geometry-level check on the input PDBx/mmCIF data file -"""
         try:
             inpPath = os.path.join(self.__sessionPath, inpFile)
-            logPath = os.path.join(self.__sessionPath, entryId + "_geometry-calc-report.log")
-            if os.access(logPath, os.R_OK):
-                os.remove(logPath)
-            #
-            retPath = os.path.join(self.__sessionPath, entryId + "_model-updated_P1.cif")
-            if os.access(retPath, os.R_OK):
-                os.remove(retPath)
-            #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            dp.imp(inpPath)
-            if self.__checkArgs is not None:
-                dp.addInput(name="check_arguments", value=self.__checkArgs)
+            with TaskWorkspace(self.__sessionPath, entryId, "geometry", verbose=self.__verbose, log=self.__lfh) as ws:
+                logPath = ws.getPath(entryId + "_geometry-calc-report.log")
+                retPath = ws.getPath(entryId + "_model-updated_P1.cif")
+                #
+                dp = RcsbDpUtility(tmpPath=ws.getPath(), siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                dp.imp(ws.snapshot(inpPath))
+                if self.__checkArgs is not None:
+                    dp.addInput(name="check_arguments", value=self.__checkArgs)
 
-            dp.op("annot-validate-geometry")
-            dp.expLog(logPath)
-            dp.exp(retPath)
-            self.addDownloadPath(retPath)
-            self.addDownloadPath(logPath)
-            if updateInput and os.access(retPath, os.R_OK):
-                dp.exp(inpPath)
-            #
+                dp.op("annot-validate-geometry")
+                dp.expLog(logPath)
+                dp.exp(retPath)
+                if self.__cleanup:
+                    dp.cleanup()
+                #
+                for filePath in ws.publish([retPath, logPath]):
+                    self.addDownloadPath(filePath)
+                ok = os.access(retPath, os.R_OK)
+                if updateInput and ok:
+                    ok = ws.commit(retPath, inpPath)
+                #
             if self.__verbose:
                 self.__lfh.write("+%s.%s geometry calc completed for entryId %s file %s\n" % (self.__class__.__name__, inspect.currentframe().f_code.co_name, entryId, inpFile))
-
-            if self.__cleanup:
-                dp.cleanup()
-            #
-            if os.access(retPath, os.R_OK):
-                return True
-            else:
-                return False
             #
+            return ok
         except:  # noqa: E722 pylint: disable=bare-except
             if self.__verbose:
                 self.__lfh.write("+%s.%s geometry calc failed for entryId %s file %s\n" % (self.__class__.__name__, inspect.currentframe().f_code.co_name, entryId, inpFile))
@@ -2,6 +2,9 @@
 # File:  CorresPNDTemplate.py
 # Date:  07-Oct-2013
 # Update:
+#   18-Oct-2026      reuse the parsed validation XML summary between requests
+#   18-Oct-2026      process cache of the parsed template files and session cache of the entry summary
+#   18-Oct-2026      the summary cache key includes the identity of the annot-get-corres-info program
 ##
 """
 Generating correspondence to depositor template.
@@ -13,12 +16,18 @@ __email__ = "zfeng@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
+import hashlib
+import json
 import sys
 import os.path
 import os
+import threading
 import traceback
 
 from wwpdb.apps.ann_tasks_v2.correspnd.ValidateXml import ValidateXml
+from wwpdb.apps.ann_tasks_v2.utils.FileResultCache import hashFile
+from wwpdb.apps.ann_tasks_v2.utils.StageManifest import StageManifest
+from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppCommon
 from wwpdb.io.file.mmCIFUtil import mmCIFUtil
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 
@@ -27,8 +36,19 @@ class CorresPNDTemplate(object):
     """
     The CorresPNDTemplate class generates correspondence to depositor template.
 
+    The parsed letter template and HTML include files are kept in a process wide cache while
+    their modification time and size are unchanged.  The entry summary (correspondence
+    information and validation report values) is saved in the session directory and reused
+    while the content of the model file, the validation reports and the letter template is
+    unchanged.
+
     """
 
+    # Process wide cache of template files - file path -> ((mtime, size), content)
+    _templateCacheD = {}
+    _templateCacheLock = threading.Lock()
+    _summaryCacheVersion = 1
+
     def __init__(self, reqObj=None, verbose=False, log=sys.stderr):
         """ """
         self.__verbose = verbose
@@ -48,6 +68,7 @@ class CorresPNDTemplate(object):
         self.__token_question_mapping = {}
         self.__additional_text_mapping = {}
         self.__javascript_text_mapping = ""
+        self.__summaryKey = None
         #
         self.__setup()
 
@@ -65,15 +86,18 @@ class CorresPNDTemplate(object):
     def get(self):
         """Get correspondence template"""
         try:
-            error, resultfile = self.__runGetCorresInfo()
-            if error:
-                return error
-            #
             self.__getCorrespondenceTempltInfo()
-            self.__getCorresInfo(resultfile)
-            self.__getValidateInfo()
-            if self.__EmMapwithModel or self.__EmFsc143CutOff:
-                self.__getValidateInfoCif()
+            if not self.__readSummaryCache():
+                error, resultfile = self.__runGetCorresInfo()
+                if error:
+                    return error
+                #
+                self.__getCorresInfo(resultfile)
+                self.__getValidateInfo()
+                if self.__EmMapwithModel or self.__EmFsc143CutOff:
+                    self.__getValidateInfoCif()
+                #
+                self.__writeSummaryCache()
             #
             return self.__doRender()
         except:  # noqa: E722 pylint: disable=bare-except
@@ -112,21 +136,145 @@ class CorresPNDTemplate(object):
             error = "error:" + traceback.format_exc()
             return error, ""
 
+    def __getSummaryCachePath(self):
+        """The name does not start with the entry id so the cache file is not taken for an entry output file."""
+        return os.path.join(self.__sessionPath, "corres-info-summary_" + os.path.splitext(os.path.basename(self.__entryFile))[0] + ".json")
+
+    def __getSummaryKey(self):
+        """Hash of the content of the files the entry summary is derived from -"""
+        depid = self.__reqObj.getValue("entryid")
+        h = hashlib.sha256()
+        h.update(str(self.__siteId).encode("utf-8"))
+        for filePath in (
+            os.path.join(self.__sessionPath, self.__entryFile),
+            os.path.join(self.__sessionPath, depid + "_val-data_P1.xml"),
+            os.path.join(self.__sessionPath, depid + "_val-data_P1.cif"),
+        ):
+            h.update((hashFile(filePath) if os.access(filePath, os.R_OK) else "none").encode("ascii"))
+        # The text of missing and inconsistent values is taken from the letter template -
+        h.update(repr(self.__getFileStamp(self.__TemplateFile)).encode("utf-8"))
+        # A summary made by an earlier version of the program is not used -
+        h.update(json.dumps(self.__getCorresInfoToolIdentity(), sort_keys=True).encode("utf-8"))
+        return h.hexdigest()
+
+    def __getCorresInfoToolIdentity(self):
+        """Version of the package which runs annot-get-corres-info and the state of the GetCorresInfo program."""
+        try:
+            toolPath = os.path.join(ConfigInfoAppCommon(self.__siteId).get_site_annot_tools_path(), "bin", "GetCorresInfo")
+        except Exception:  # pylint: disable=broad-except
+            toolPath = None
+        return StageManifest.getToolIdentity(packageNameList=["wwpdb.utils.dp"], pathList=[toolPath] if toolPath else [])
+
+    def __readSummaryCache(self):
+        """Load the entry summary saved by an earlier request for the same file contents"""
+        try:
+            self.__summaryKey = self.__getSummaryKey()
+            cachePath = self.__getSummaryCachePath()
+            if not os.access(cachePath, os.R_OK):
+                return False
+            #
+            with open(cachePath, "r") as ifh:
+                cD = json.load(ifh)
+            #
+            if cD.get("version") != self._summaryCacheVersion or cD.get("key") != self.__summaryKey:
+                return False
+            #
+            sD = cD["summary"]
+            self.__corresInfo = sD["corres_info"]
+            self.__ligandInfo = sD["ligand_info"]
+            self.__EmMapwithModel = sD["em_map_with_model"]
+            self.__EmFsc143CutOff = sD["em_fsc_143_cut_off"]
+            if self.__verbose:
+                self.__lfh.write("+CorresPNDTemplate() using summary cache %s\n" % cachePath)
+            #
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            self.__summaryKey = None
+            if self.__verbose:
+                self.__lfh.write("+CorresPNDTemplate() ignoring unreadable summary cache\n")
+                traceback.print_exc(file=self.__lfh)
+            #
+        #
+        return False
+
+    def __writeSummaryCache(self):
+        """Save the entry summary with the key of the file contents it was derived from"""
+        if self.__summaryKey is None:
+            return False
+        #
+        cachePath = self.__getSummaryCachePath()
+        tmpPath = cachePath + ".tmp-%d-%d" % (os.getpid(), threading.get_ident())
+        try:
+            sD = {
+                "corres_info": self.__corresInfo,
+                "ligand_info": self.__ligandInfo,
+                "em_map_with_model": self.__EmMapwithModel,
+                "em_fsc_143_cut_off": self.__EmFsc143CutOff,
+            }
+            with open(tmpPath, "w") as ofh:
+                json.dump({"version": self._summaryCacheVersion, "key": self.__summaryKey, "summary": sD}, ofh)
+            #
+            os.rename(tmpPath, cachePath)
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+CorresPNDTemplate() summary cache write failed for %s\n" % cachePath)
+                traceback.print_exc(file=self.__lfh)
+            #
+            if os.access(tmpPath, os.F_OK):
+                os.remove(tmpPath)
+            #
+        #
+        return False
+
+    def __getFileStamp(self, filePath):
+        st = os.stat(filePath)
+        return (st.st_mtime, st.st_size)
+
+    def __getCachedFile(self, filePath, readFunc):
+        """Return readFunc(filePath) from the process cache while the file modification time and size are unchanged -
+        cached content is shared between requests and must not be modified.
+        """
+        stamp = self.__getFileStamp(filePath)
+        with CorresPNDTemplate._templateCacheLock:
+            entry = CorresPNDTemplate._templateCacheD.get(filePath)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        #
+        content = readFunc(filePath)
+        with CorresPNDTemplate._templateCacheLock:
+            CorresPNDTemplate._templateCacheD[filePath] = (stamp, content)
+        #
+        return content
+
+    @classmethod
+    def clearCache(cls):
+        with cls._templateCacheLock:
+            cls._templateCacheD.clear()
+
+    def __readTemplateCif(self, filePath):
+        cifObj = mmCIFUtil(filePath=filePath)
+        return {catName: cifObj.GetValue(catName) for catName in ("letter_template", "value_mapping", "rcsb_question_category", "token_question_mapping")}
+
+    def __readTextFile(self, filePath):
+        with open(filePath, "r") as ifh:
+            return ifh.read()
+
     def __getCorrespondenceTempltInfo(self):
         """ """
-        cifObj = mmCIFUtil(filePath=self.__TemplateFile)
+        templtD = self.__getCachedFile(self.__TemplateFile, self.__readTemplateCif)
         #
-        tlist = cifObj.GetValue("letter_template")
+        tlist = templtD["letter_template"]
         for tdir in tlist:
             self.__letterTemplateMap[tdir["type"]] = tdir["text"]
         #
-        vlist = cifObj.GetValue("value_mapping")
+        vlist = templtD["value_mapping"]
         for vdir in vlist:
             self.__valueMap[vdir["token"]] = vdir["text"]
         #
-        self.__questionList = cifObj.GetValue("rcsb_question_category")
+        self.__questionList = templtD["rcsb_question_category"]
         #
-        vlist = cifObj.GetValue("token_question_mapping")
+        vlist = templtD["token_question_mapping"]
         for vdir in vlist:
             self.__all_items.append(vdir["token"])
             self.__corresInfo[vdir["token"]] = ""
@@ -211,7 +359,7 @@ class CorresPNDTemplate(object):
             return
         #
         try:
-            vobj = ValidateXml(FileName=xmlPath, verbose=self.__verbose, log=self.__lfh)
+            vobj = ValidateXml(FileName=xmlPath, verbose=self.__verbose, log=self.__lfh, useCache=True)
             self.__corresInfo["calculated_completeness"] = vobj.getCalculatedCompleteness()
             if self.__corresInfo["reported_completeness"] and self.__corresInfo["calculated_completeness"]:
                 c1 = float(self.__corresInfo["reported_completeness"])
@@ -864,7 +1012,5 @@ class CorresPNDTemplate(object):
         """ """
         if parameterDict is None:
             parameterDict = {}
-        ifh = open(fn, "r")
-        sIn = ifh.read()
-        ifh.close()
+        sIn = self.__getCachedFile(fn, self.__readTextFile)
         return sIn % parameterDict
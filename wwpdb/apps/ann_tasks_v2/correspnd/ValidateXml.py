@@ -3,10 +3,15 @@
 # Date:  14-Aug-2014
 # Updates:
 #  07-Dec-2024:  zf  added getChemicalShiftStatistics() method.
+#  18-Oct-2026:      added incremental (iterparse) reader mode and optional cache of the parsed summary
 ##
 """
 Parse validation XML report
 
+The default streaming mode reads the report incrementally with ElementTree iterparse()
+and discards each ModelledSubgroup element once its outliers have been collected.  The
+original DOM parser is retained (streaming=False) and both produce identical results.
+
 This software was developed as part of the World Wide Protein Data Bank
 Common Deposition and Annotation System Project
 
@@ -20,21 +25,37 @@ __docformat__ = "restructuredtext en"
 __author__ = "Zukang Feng"
 __email__ = "zfeng@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
-__version__ = "V0.07"
+__version__ = "V0.08"
 
 from xml.dom import minidom
+import xml.etree.ElementTree as ET
+import json
+import os
 import sys
 import traceback
 
+from wwpdb.apps.ann_tasks_v2.utils.FileResultCache import hashFile
+
 
 class ValidateXml(object):
     """Class responsible for parsing validation XML report"""
 
-    def __init__(self, FileName=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
-        # self.__verbose = verbose
-        # self.__lfh = log
+    # Version of the summary cache file content
+    _cacheVersion = 1
+    # Chemical shift details collected from each chemical_shift_list element
+    _csDetailTagList = ["unmapped_chemical_shift", "chemical_shift_outlier", "referencing_offset"]
+
+    def __init__(self, FileName=None, verbose=False, log=sys.stderr, streaming=True, useCache=False):
+        """Validation XML report parser.
+
+        :param `streaming`:  read incrementally with iterparse() rather than building a DOM
+        :param `useCache`:   save the parsed outlier summary in a JSON file next to the report and reuse it
+                             while the content hash of the report is unchanged
+        """
+        self.__verbose = verbose
+        self.__lfh = log
         self.__xmlFile = FileName
-        self.__doc = minidom.parse(self.__xmlFile)
+        self.__fileHash = None
         #
         self.clashMap = {}
         self.clashOutliers = []
@@ -60,7 +81,18 @@ class ValidateXml(object):
         self.__has_cs_referencing_offset_flag = False
         #
         self.__getOutlierDefinition()
-        self.__parse()
+        if useCache and self.__readCache():
+            return
+        #
+        if streaming:
+            self.__parseStreaming()
+        else:
+            self.__parse()
+        #
+        self.__processClashMap()
+        if useCache:
+            self.__writeCache()
+        #
 
     def getOutlier(self, Type):
         """
@@ -116,6 +148,17 @@ class ValidateXml(object):
         """
         return self.__has_cs_referencing_offset_flag
 
+    def getCachePath(self, filePath=None):
+        """Return the path of the summary cache file for the input report.
+
+        The name does not start with the report name so the cache file is not taken for a validation output file.
+        """
+        if filePath is None:
+            filePath = self.__xmlFile
+        #
+        (dirPath, fileName) = os.path.split(filePath)
+        return os.path.join(dirPath, "val-xml-summary_" + os.path.splitext(fileName)[0] + ".json")
+
     def __getOutlierDefinition(self):
         """
         """
@@ -131,126 +174,151 @@ class ValidateXml(object):
         self.__outlierMap["clash"] = ["atom", "cid", "clashmag", "dist"]
 
     def __parse(self):
+        """ Read the report with the DOM parser
         """
-        """
-        self.__processGlobalValues()
+        doc = minidom.parse(self.__xmlFile)
         #
-        self.__processChemcalShiftList()
+        self.__processGlobalValues(self.__getAttributes(doc.getElementsByTagName("Entry")[0]))
         #
-        items = ["model", "ent", "chain", "resname", "resnum", "icode"]  # , 'ligand_geometry_outlier', 'ligand_density_outlier' ]
-        #
-        for node in self.__doc.getElementsByTagName("ModelledSubgroup"):
-            if node.nodeType != node.ELEMENT_NODE:
-                continue
+        for csNode in doc.getElementsByTagName("chemical_shift_list"):
+            detailD = {}
+            for tag in self._csDetailTagList:
+                detailD[tag] = [self.__getAttributes(node) for node in csNode.getElementsByTagName(tag)]
             #
-            residueInfo = {}
-            if node.hasAttribute("rama"):
-                val = node.getAttribute("rama").strip()
-                if val == "OUTLIER":
-                    if not residueInfo:
-                        residueInfo = self.__getMapInfo(node, items)
-                    #
-                    tdir = self.__getMapInfo(node, self.__outlierMap["torsion-outlier"])
-                    outlier = residueInfo.copy()
-                    outlier.update(tdir)
-                    if "torsion-outlier" in self.__outlierResult:
-                        self.__outlierResult["torsion-outlier"].append(outlier)
-                    else:
-                        tlist = []
-                        tlist.append(outlier)
-                        self.__outlierResult["torsion-outlier"] = tlist
-                    #
+            self.__processChemcalShiftList(self.__getAttributes(csNode), detailD)
+        #
+        for node in doc.getElementsByTagName("ModelledSubgroup"):
+            childList = []
+            for childnode in node.childNodes:
+                if childnode.nodeType == node.ELEMENT_NODE:
+                    childList.append((childnode.tagName, self.__getAttributes(childnode)))
                 #
             #
-            if node.hasAttribute("rsrz"):
-                val = node.getAttribute("rsrz").strip()
-                if float(val) > 5:
-                    if not residueInfo:
-                        residueInfo = self.__getMapInfo(node, items)
-                    #
-                    outlier = residueInfo.copy()
-                    outlier["rsrz"] = val
-                    if "polymer-rsrz-outlier" in self.__outlierResult:
-                        self.__outlierResult["polymer-rsrz-outlier"].append(outlier)
-                    else:
-                        tlist = []
-                        tlist.append(outlier)
-                        self.__outlierResult["polymer-rsrz-outlier"] = tlist
-                    #
-                #
+            self.__processModelledSubgroup(self.__getAttributes(node), childList)
+        #
+        doc.unlink()
+
+    def __parseStreaming(self):
+        """ Read the report incrementally - ModelledSubgroup and chemical_shift_list elements are processed as their
+            end tags are seen and then removed from the tree together with all other children of the root element.
+        """
+        elStack = []
+        hasEntry = False
+        for event, el in ET.iterparse(self.__xmlFile, events=("start", "end")):
+            if event == "start":
+                elStack.append(el)
+                continue
             #
-            if node.hasAttribute("ligRSRZ"):
-                val = node.getAttribute("ligRSRZ").strip()
-                if float(val) > 5:
-                    if not residueInfo:
-                        residueInfo = self.__getMapInfo(node, items)
-                    #
-                    outlier = residueInfo.copy()
-                    outlier["ligRSRZ"] = val
-                    if "ligand-rsrz-outlier" in self.__outlierResult:
-                        self.__outlierResult["ligand-rsrz-outlier"].append(outlier)
-                    else:
-                        tlist = []
-                        tlist.append(outlier)
-                        self.__outlierResult["ligand-rsrz-outlier"] = tlist
-                    #
+            elStack.pop()
+            if el.tag == "Entry" and not hasEntry:
+                self.__processGlobalValues(el.attrib)
+                hasEntry = True
+            elif el.tag == "ModelledSubgroup":
+                self.__processModelledSubgroup(el.attrib, [(childEl.tag, childEl.attrib) for childEl in el])
+            elif el.tag == "chemical_shift_list":
+                detailD = {}
+                for tag in self._csDetailTagList:
+                    detailD[tag] = [detailEl.attrib for detailEl in el.iter(tag)]
                 #
+                self.__processChemcalShiftList(el.attrib, detailD)
+            #
+            if (len(elStack) == 1) or (el.tag == "ModelledSubgroup" and elStack):
+                elStack[-1].remove(el)
             #
+        #
+        if not hasEntry:
+            raise ValueError("No Entry element in %s" % self.__xmlFile)
+        #
 
-            for childnode in node.childNodes:
-                if childnode.nodeType != node.ELEMENT_NODE:
-                    continue
-                #
-                if childnode.tagName not in self.__outlierMap:
-                    continue
-                #
+    def __processModelledSubgroup(self, attribD, childList):
+        """ Collect the outliers of a residue from the attributes of the ModelledSubgroup element and the
+            (tag, attributes) list of its child elements
+        """
+        items = ["model", "ent", "chain", "resname", "resnum", "icode"]  # , 'ligand_geometry_outlier', 'ligand_density_outlier' ]
+        #
+        residueInfo = {}
+        if "rama" in attribD:
+            val = attribD["rama"].strip()
+            if val == "OUTLIER":
                 if not residueInfo:
-                    residueInfo = self.__getMapInfo(node, items)
+                    residueInfo = self.__getMapInfo(attribD, items)
                 #
-                tdir = self.__getMapInfo(childnode, self.__outlierMap[childnode.tagName])
-                # jmb - removed cut off in reporting outliers in standard bond lengths and bond angles. Uses validation XML cut off instead.
-                # if childnode.tagName == 'bond-outlier' or childnode.tagName == 'angle-outlier':
-                #    if abs(float(tdir['z'])) <= 10:
-                #        continue
+                tdir = self.__getMapInfo(attribD, self.__outlierMap["torsion-outlier"])
+                outlier = residueInfo.copy()
+                outlier.update(tdir)
+                self.__outlierResult.setdefault("torsion-outlier", []).append(outlier)
+            #
+        #
+        if "rsrz" in attribD:
+            val = attribD["rsrz"].strip()
+            if float(val) > 5:
+                if not residueInfo:
+                    residueInfo = self.__getMapInfo(attribD, items)
                 #
-                # skip bonds between standard residues in reporting, these are better captured
-                #   in pdbx_validate_polymer_linkage - the validation is limited to a maxiumum distance of 1.999 Angstroms
-                # in the validation report for unusual bonds
-                if childnode.tagName == "bond-outlier":
-                    if tdir["atom0"] in ("C", "O3'") and tdir["atom1"] in ("N", "P"):
-                        continue
-
-                if childnode.tagName == "mog-angle-outlier" or childnode.tagName == "mog-bond-outlier":
-                    if abs(float(tdir["Zscore"])) <= 10:
-                        continue
-                    #
+                outlier = residueInfo.copy()
+                outlier["rsrz"] = val
+                self.__outlierResult.setdefault("polymer-rsrz-outlier", []).append(outlier)
+            #
+        #
+        if "ligRSRZ" in attribD:
+            val = attribD["ligRSRZ"].strip()
+            if float(val) > 5:
+                if not residueInfo:
+                    residueInfo = self.__getMapInfo(attribD, items)
                 #
-                if childnode.tagName == "clash":
-                    atom_dict = {
-                        "dist": tdir["dist"],
-                        "atom": tdir["atom"],
-                        "clashmag": tdir["clashmag"],
-                        "chain": node.getAttribute("chain").strip(),
-                        "model": node.getAttribute("model").strip(),
-                        "altcode": node.getAttribute("altcode").strip(),
-                        "resnum": node.getAttribute("resnum").strip(),
-                        "resname": node.getAttribute("resname").strip(),
-                    }
-                    if float(tdir["dist"]) < 2.2:
-                        self.clashMap.setdefault(tdir["cid"], []).append(atom_dict)
-
                 outlier = residueInfo.copy()
-                outlier.update(tdir)
-                if childnode.tagName in self.__outlierResult:
-                    self.__outlierResult[childnode.tagName].append(outlier)
-                else:
-                    tlist = []
-                    tlist.append(outlier)
-                    self.__outlierResult[childnode.tagName] = tlist
+                outlier["ligRSRZ"] = val
+                self.__outlierResult.setdefault("ligand-rsrz-outlier", []).append(outlier)
+            #
+        #
+
+        for tagName, childAttribD in childList:
+            if tagName not in self.__outlierMap:
+                continue
+            #
+            if not residueInfo:
+                residueInfo = self.__getMapInfo(attribD, items)
+            #
+            tdir = self.__getMapInfo(childAttribD, self.__outlierMap[tagName])
+            # jmb - removed cut off in reporting outliers in standard bond lengths and bond angles. Uses validation XML cut off instead.
+            # if tagName == 'bond-outlier' or tagName == 'angle-outlier':
+            #    if abs(float(tdir['z'])) <= 10:
+            #        continue
+            #
+            # skip bonds between standard residues in reporting, these are better captured
+            #   in pdbx_validate_polymer_linkage - the validation is limited to a maxiumum distance of 1.999 Angstroms
+            # in the validation report for unusual bonds
+            if tagName == "bond-outlier":
+                if tdir["atom0"] in ("C", "O3'") and tdir["atom1"] in ("N", "P"):
+                    continue
+
+            if tagName == "mog-angle-outlier" or tagName == "mog-bond-outlier":
+                if abs(float(tdir["Zscore"])) <= 10:
+                    continue
                 #
             #
+            if tagName == "clash":
+                atom_dict = {
+                    "dist": tdir["dist"],
+                    "atom": tdir["atom"],
+                    "clashmag": tdir["clashmag"],
+                    "chain": attribD.get("chain", "").strip(),
+                    "model": attribD.get("model", "").strip(),
+                    "altcode": attribD.get("altcode", "").strip(),
+                    "resnum": attribD.get("resnum", "").strip(),
+                    "resname": attribD.get("resname", "").strip(),
+                }
+                if float(tdir["dist"]) < 2.2:
+                    self.clashMap.setdefault(tdir["cid"], []).append(atom_dict)
+
+            outlier = residueInfo.copy()
+            outlier.update(tdir)
+            self.__outlierResult.setdefault(tagName, []).append(outlier)
         #
 
+    def __processClashMap(self):
+        """ Pair the atoms of each close clash
+        """
         if self.clashMap:
             for o in self.clashMap:
                 # check that there are two clashes
@@ -279,18 +347,17 @@ class ValidateXml(object):
             #
         #
 
-    def __processGlobalValues(self):
-        """
+    def __processGlobalValues(self, attribD):
+        """ Process the attributes of the Entry element
         """
         global_values = {}
-        Entry = self.__doc.getElementsByTagName("Entry")[0]
         for item in ("DCC_Rfree", "PDB-Rfree", "DCC_R", "PDB-R"):
-            if Entry.getAttribute(item) and Entry.getAttribute(item) != "NotAvailable":
-                global_values[item] = Entry.getAttribute(item)
+            if attribD.get(item) and attribD.get(item) != "NotAvailable":
+                global_values[item] = attribD.get(item)
             #
         #
-        if Entry.getAttribute("DataCompleteness") and Entry.getAttribute("DataCompleteness") != "NotAvailable":
-            self.__calculated_completeness = Entry.getAttribute("DataCompleteness")
+        if attribD.get("DataCompleteness") and attribD.get("DataCompleteness") != "NotAvailable":
+            self.__calculated_completeness = attribD.get("DataCompleteness")
         #
         for global_list in (("r_free_diff", "DCC_Rfree", "PDB-Rfree"), ("r_work_diff", "DCC_R", "PDB-R")):
             if (global_list[1] in global_values) and (global_list[2] in global_values):
@@ -304,7 +371,7 @@ class ValidateXml(object):
             #
         #
 
-    def __processChemcalShiftList(self):
+    def __processChemcalShiftList(self, attribD, detailD):
         """ chemical_shift_list.attributes = ( 'block_name', 'file_id', 'file_name', 'list_id', 'number_of_errors_while_mapping', 'number_of_mapped_shifts' \
                         'number_of_parsed_shifts', 'number_of_unparsed_shifts', 'number_of_warnings_while_mapping', 'total_number_of_shifts' )
 
@@ -313,99 +380,149 @@ class ValidateXml(object):
             chemical_shift_outlier.attributes = ( 'atom', 'chain', 'method', 'prediction', 'rescode', 'resnum', 'value', 'zscore' )
 
             referencing_offset.attributes = ( 'atom', 'number_of_measurements', 'precision', 'uncertainty', 'value' )
+
+            detailD holds the attribute dictionaries of the unmapped_chemical_shift, chemical_shift_outlier and
+            referencing_offset elements of the list.
         """
-        csList = self.__doc.getElementsByTagName("chemical_shift_list")
-        if len(csList) < 1:
-            return
+        if attribD.get("total_number_of_shifts"):
+            self.__total_number_of_shifts += int(attribD["total_number_of_shifts"])
+        #
+        if attribD.get("number_of_mapped_shifts"):
+            self.__number_of_mapped_shifts += int(attribD["number_of_mapped_shifts"])
+        #
+        if attribD.get("number_of_unparsed_shifts"):
+            self.__number_of_unparsed_shifts += int(attribD["number_of_unparsed_shifts"])
         #
-        for csNode in csList:
-            if csNode.getAttribute("total_number_of_shifts"):
-                self.__total_number_of_shifts += int(csNode.getAttribute("total_number_of_shifts"))
+        if attribD.get("number_of_errors_while_mapping"):
+            self.__number_of_errors_while_mapping += int(attribD["number_of_errors_while_mapping"])
+        #
+        if attribD.get("number_of_warnings_while_mapping"):
+            self.__number_of_warnings_while_mapping += int(attribD["number_of_warnings_while_mapping"])
+        #
+        for unmappedD in detailD["unmapped_chemical_shift"]:
+            notMappedCsResidueFlag = False
+            if unmappedD.get("diagnostic", "").startswith("Residue not found in structure."):
+                notMappedCsResidueFlag = True
             #
-            if csNode.getAttribute("number_of_mapped_shifts"):
-                self.__number_of_mapped_shifts += int(csNode.getAttribute("number_of_mapped_shifts"))
+            csData = [unmappedD.get(attribute, "") for attribute in ("chain", "resnum", "rescode", "atom", "value", "error", "ambiguity")]
+            self.__not_found_in_structure_cs_list.append(csData)
+            if notMappedCsResidueFlag:
+                self.__not_found_residue_in_structure_cs_list.append(csData)
             #
-            if csNode.getAttribute("number_of_unparsed_shifts"):
-                self.__number_of_unparsed_shifts += int(csNode.getAttribute("number_of_unparsed_shifts"))
+        #
+        for outlierD in detailD["chemical_shift_outlier"]:
+            csData = [outlierD.get(attribute, "") for attribute in ("chain", "resnum", "rescode", "atom", "value", "prediction", "zscore")]
+            self.__cs_outlier_list.append(csData)
+        #
+        for offsetD in detailD["referencing_offset"]:
+            csData = [offsetD.get(attribute, "") for attribute in ("atom", "number_of_measurements", "precision", "uncertainty", "value")]
+            if csData[2] and csData[3] and csData[4]:
+                precision = float(csData[2])
+                uncertainty = float(csData[3])
+                value = float(csData[4])
+                if (abs(value) < uncertainty) or (abs(value) < (2.0 * precision)):
+                    continue
+                #
+                self.__has_cs_referencing_offset_flag = True
             #
-            if csNode.getAttribute("number_of_errors_while_mapping"):
-                self.__number_of_errors_while_mapping += int(csNode.getAttribute("number_of_errors_while_mapping"))
+            self.__cs_referencing_offset_list.append(csData)
+        #
+
+    def __getAttributes(self, node):
+        """ Return the attributes of a DOM element as a dictionary
+        """
+        return dict(node.attributes.items())
+
+    def __getMapInfo(self, attribD, items):
+        """
+        """
+        rmap = {}
+        for item in items:
+            rmap[item] = attribD.get(item, "").strip()
+        #
+        return rmap
+
+    def __getSummary(self):
+        """ Return the parsed results as a JSON serializable dictionary
+        """
+        return {
+            "outlier_result": self.__outlierResult,
+            "clash_map": self.clashMap,
+            "clash_outliers": self.clashOutliers,
+            "calculated_completeness": self.__calculated_completeness,
+            "cs_counts": [self.__total_number_of_shifts, self.__number_of_mapped_shifts, self.__number_of_unparsed_shifts,
+                          self.__number_of_errors_while_mapping, self.__number_of_warnings_while_mapping],
+            "not_found_in_structure_cs_list": self.__not_found_in_structure_cs_list,
+            "not_found_residue_in_structure_cs_list": self.__not_found_residue_in_structure_cs_list,
+            "cs_outlier_list": self.__cs_outlier_list,
+            "cs_referencing_offset_list": self.__cs_referencing_offset_list,
+            "has_cs_referencing_offset_flag": self.__has_cs_referencing_offset_flag,
+        }
+
+    def __setSummary(self, sD):
+        self.__outlierResult = sD["outlier_result"]
+        self.clashMap = sD["clash_map"]
+        self.clashOutliers = sD["clash_outliers"]
+        self.__calculated_completeness = sD["calculated_completeness"]
+        (self.__total_number_of_shifts, self.__number_of_mapped_shifts, self.__number_of_unparsed_shifts,
+         self.__number_of_errors_while_mapping, self.__number_of_warnings_while_mapping) = sD["cs_counts"]
+        self.__not_found_in_structure_cs_list = sD["not_found_in_structure_cs_list"]
+        self.__not_found_residue_in_structure_cs_list = sD["not_found_residue_in_structure_cs_list"]
+        self.__cs_outlier_list = sD["cs_outlier_list"]
+        self.__cs_referencing_offset_list = sD["cs_referencing_offset_list"]
+        self.__has_cs_referencing_offset_flag = sD["has_cs_referencing_offset_flag"]
+
+    def __readCache(self):
+        """ Load the summary from the cache file if it was made from a report with the same content hash
+        """
+        try:
+            self.__fileHash = hashFile(self.__xmlFile)
+            cachePath = self.getCachePath()
+            if not os.access(cachePath, os.R_OK):
+                return False
             #
-            if csNode.getAttribute("number_of_warnings_while_mapping"):
-                self.__number_of_warnings_while_mapping += int(csNode.getAttribute("number_of_warnings_while_mapping"))
+            with open(cachePath, "r") as ifh:
+                cD = json.load(ifh)
             #
-            unmappedCsList = csNode.getElementsByTagName("unmapped_chemical_shift")
-            if len(unmappedCsList) > 0:
-                for unmappedNode in unmappedCsList:
-                    notMappedCsResidueFlag = False
-                    if unmappedNode.getAttribute("diagnostic").startswith("Residue not found in structure."):
-                        notMappedCsResidueFlag = True
-                    #
-                    csData = []
-                    for attribute in ("chain", "resnum", "rescode", "atom", "value", "error", "ambiguity"):
-                        if unmappedNode.getAttribute(attribute):
-                            csData.append(unmappedNode.getAttribute(attribute))
-                        else:
-                            csData.append("")
-                        #
-                    #
-                    self.__not_found_in_structure_cs_list.append(csData)
-                    if notMappedCsResidueFlag:
-                        self.__not_found_residue_in_structure_cs_list.append(csData)
-                    #
-                #
+            if cD.get("version") != self._cacheVersion or cD.get("hash") != self.__fileHash:
+                return False
             #
-            csOutlierList = csNode.getElementsByTagName("chemical_shift_outlier")
-            if len(csOutlierList) > 0:
-                for outlierNode in csOutlierList:
-                    csData = []
-                    for attribute in ("chain", "resnum", "rescode", "atom", "value", "prediction", "zscore"):
-                        if outlierNode.getAttribute(attribute):
-                            csData.append(outlierNode.getAttribute(attribute))
-                        else:
-                            csData.append("")
-                        #
-                    #
-                    self.__cs_outlier_list.append(csData)
-                #
+            self.__setSummary(cD["summary"])
+            if self.__verbose:
+                self.__lfh.write("+ValidateXml() using summary cache %s\n" % cachePath)
             #
-            offsetList = csNode.getElementsByTagName("referencing_offset")
-            if len(offsetList) > 0:
-                for offsetNode in offsetList:
-                    csData = []
-                    for attribute in ("atom", "number_of_measurements", "precision", "uncertainty", "value"):
-                        if offsetNode.getAttribute(attribute):
-                            csData.append(offsetNode.getAttribute(attribute))
-                        else:
-                            csData.append("")
-                        #
-                    #
-                    if csData[2] and csData[3] and csData[4]:
-                        precision = float(csData[2])
-                        uncertainty = float(csData[3])
-                        value = float(csData[4])
-                        if (abs(value) < uncertainty) or (abs(value) < (2.0 * precision)):
-                            continue
-                        #
-                        self.__has_cs_referencing_offset_flag = True
-                    #
-                    self.__cs_referencing_offset_list.append(csData)
-                #
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+ValidateXml() ignoring unreadable summary cache for %s\n" % self.__xmlFile)
             #
         #
+        return False
 
-    def __getMapInfo(self, node, items):
-        """
+    def __writeCache(self):
+        """ Save the summary with the content hash of the report
         """
-        rmap = {}
-        for item in items:
-            val = ""
-            if node.hasAttribute(item):
-                val = node.getAttribute(item).strip()
+        if self.__fileHash is None:
+            return False
+        #
+        cachePath = self.getCachePath()
+        tmpPath = cachePath + ".tmp-%d" % os.getpid()
+        try:
+            with open(tmpPath, "w") as ofh:
+                json.dump({"version": self._cacheVersion, "hash": self.__fileHash, "summary": self.__getSummary()}, ofh)
+            #
+            os.rename(tmpPath, cachePath)
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+ValidateXml() summary cache write failed for %s\n" % cachePath)
+                traceback.print_exc(file=self.__lfh)
+            #
+            if os.access(tmpPath, os.F_OK):
+                os.remove(tmpPath)
             #
-            rmap[item] = val
         #
-        return rmap
+        return False
 
 
 if __name__ == "__main__":
@@ -2,6 +2,9 @@
 # File:  CoordEditorForm.py
 # Date:  12-Jan-2018
 # Update:
+#   18-Oct-2026   index the chain objects of the entry JSON file so a chain request reads only its own chain
+#   18-Oct-2026   report the stage of the detached operation (DetachStatus)
+#   18-Oct-2026   validate the chain index by the size and modification time of entryId.json file
 ##
 """
 Manage the generating coordinate editor form
@@ -25,6 +28,7 @@ import sys
 import traceback
 
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
+from wwpdb.apps.ann_tasks_v2.utils.DetachStatus import DetachStatus
 
 
 class CoordEditorForm(object):
@@ -106,6 +110,12 @@ class CoordEditorForm(object):
         except:  # noqa: E722 pylint: disable=bare-except
             return False
 
+    def __setStage(self, stage):
+        """Report the stage of the operation when it is run detached."""
+        dS = DetachStatus.fromRequest(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        if dS is not None:
+            dS.setStage(stage)
+
     def __generateEntryJson(self):
         """Call C++ DepictMolecule_Json program to generate coordinates data in JSON format"""
         #
@@ -124,12 +134,20 @@ class CoordEditorForm(object):
         #
         os.makedirs(self.__jsonPath)
         #
+        self.__setStage("generating coordinate data")
         self.__runScript()
+        entryJsonPath = os.path.join(self.__jsonPath, self.__entryId + ".json")
         if (
-            os.access(os.path.join(self.__jsonPath, self.__entryId + ".json"), os.F_OK)
+            os.access(entryJsonPath, os.F_OK)
             and os.access(os.path.join(self.__sessionPath, self.__entryId + "_chainids.txt"), os.F_OK)
             and os.access(os.path.join(self.__sessionPath, self.__entryId + "_index.cif"), os.F_OK)
         ):
+            try:
+                self.__setStage("indexing chains")
+                self.__getChainIndex(entryJsonPath)
+            except:  # noqa: E722 pylint: disable=bare-except
+                traceback.print_exc(file=self.__lfh)
+            #
             return True
         #
         return False
@@ -171,15 +189,21 @@ class CoordEditorForm(object):
         #
 
     def __geterateChainJson(self, mol_idx, chainID):
-        """Read entryId.json file and re-write chain.json file"""
+        """Read the chain object from entryId.json file and write chain pickle file"""
+        chainPicklePath = os.path.join(self.__jsonPath, mol_idx + "_" + chainID + ".pickle")
+        if os.access(chainPicklePath, os.F_OK):
+            # The entryId_Json directory is re-created with entryId.json file, so an existing chain file is current
+            return True
+        #
         entryJsonPath = os.path.join(self.__jsonPath, self.__entryId + ".json")
         if not os.access(entryJsonPath, os.F_OK):
             return False
         #
         try:
-            entryJSonObj = self.__readJSonFile(entryJsonPath)
-            if (mol_idx in entryJSonObj) and (("PDBChainID_" + chainID) in entryJSonObj[mol_idx]):
-                self.__proessChainJSonObj(mol_idx, chainID, entryJSonObj[mol_idx]["PDBChainID_" + chainID])
+            self.__setStage("reading chain %s" % chainID)
+            chainJSonObj = self.__readChainJSonObj(entryJsonPath, mol_idx, chainID)
+            if chainJSonObj is not None:
+                self.__proessChainJSonObj(mol_idx, chainID, chainJSonObj)
                 return True
             #
         except:  # noqa: E722 pylint: disable=bare-except
@@ -187,6 +211,118 @@ class CoordEditorForm(object):
         #
         return False
 
+    def __readChainJSonObj(self, entryJsonPath, mol_idx, chainID):
+        """Read only the byte range of the chain object from entryId.json file"""
+        for rebuild in (False, True):
+            chainIndex = self.__getChainIndex(entryJsonPath, rebuild=rebuild)
+            if (mol_idx not in chainIndex) or (chainID not in chainIndex[mol_idx]):
+                return None
+            #
+            start, end = chainIndex[mol_idx][chainID]
+            with open(entryJsonPath, "rb") as fb:
+                fb.seek(start)
+                data = fb.read(end - start)
+            #
+            try:
+                chainJSonObj = json.loads(data.decode("utf-8"))
+                if isinstance(chainJSonObj, dict):
+                    return chainJSonObj
+                #
+            except ValueError:
+                pass
+            #
+            # The byte range does not hold a chain object - the index is out of date
+        #
+        return None
+
+    def __getChainIndex(self, entryJsonPath, rebuild=False):
+        """Return the { mol_idx: { chainID: [start, end] } } byte ranges of the chain objects in entryId.json file.
+
+        The index is written beside entryId.json file when it is first needed and is used while the size and
+        modification time of entryId.json file are unchanged.
+        """
+        indexPath = os.path.join(self.__jsonPath, self.__entryId + "_chain_index.json")
+        st = os.stat(entryJsonPath)
+        fileStamp = [st.st_size, st.st_mtime_ns]
+        if (not rebuild) and os.access(indexPath, os.F_OK):
+            try:
+                indexObj = self.__readJSonFile(indexPath)
+                if indexObj.get("stamp") == fileStamp:
+                    return indexObj["chains"]
+                #
+            except:  # noqa: E722 pylint: disable=bare-except
+                traceback.print_exc(file=self.__lfh)
+            #
+        #
+        # Decoded as latin-1 so that string positions are byte offsets - only one chain object is decoded at a time
+        with open(entryJsonPath, "rb") as fb:
+            text = fb.read().decode("latin-1")
+        #
+        decoder = json.JSONDecoder()
+        chainIndex = {}
+
+        def chainMember(chainIndexD, key, pos):
+            end = decoder.raw_decode(text, pos)[1]
+            if key.startswith("PDBChainID_"):
+                chainIndexD[key[len("PDBChainID_"):]] = [pos, end]
+            #
+            return end
+
+        def molMember(key, pos):
+            if text[pos] != "{":
+                return decoder.raw_decode(text, pos)[1]
+            #
+            chainIndexD = {}
+            end = self.__scanJSonObject(text, pos, decoder, lambda chainKey, chainPos: chainMember(chainIndexD, chainKey, chainPos))
+            if chainIndexD:
+                chainIndex[key] = chainIndexD
+            #
+            return end
+
+        self.__scanJSonObject(text, 0, decoder, molMember)
+        #
+        with open(indexPath, "w") as f:
+            json.dump({"stamp": fileStamp, "chains": chainIndex}, f)
+        #
+        if self.__verbose:
+            self.__lfh.write("+CoordEditorForm.__getChainIndex() indexed %d chains in %s\n" % (sum([len(v) for v in chainIndex.values()]), entryJsonPath))
+        #
+        return chainIndex
+
+    def __scanJSonObject(self, text, pos, decoder, memberFunc):
+        """Scan the members of the JSON object at pos - memberFunc(key, valuePos) returns the end position of the member value.
+        Returns the end position of the object.
+        """
+        pos = self.__skipJSonSpace(text, pos)
+        if text[pos] != "{":
+            raise ValueError("Expecting JSON object at position %d" % pos)
+        #
+        pos = self.__skipJSonSpace(text, pos + 1)
+        if text[pos] == "}":
+            return pos + 1
+        #
+        while True:
+            key, pos = decoder.raw_decode(text, pos)
+            pos = self.__skipJSonSpace(text, pos)
+            if text[pos] != ":":
+                raise ValueError("Expecting ':' at position %d" % pos)
+            #
+            pos = self.__skipJSonSpace(text, memberFunc(key, self.__skipJSonSpace(text, pos + 1)))
+            if text[pos] == "}":
+                return pos + 1
+            elif text[pos] != ",":
+                raise ValueError("Expecting ',' or '}' at position %d" % pos)
+            #
+            pos = self.__skipJSonSpace(text, pos + 1)
+        #
+
+    def __skipJSonSpace(self, text, pos):
+        """Return the position of the next non-whitespace character"""
+        while pos < len(text) and text[pos] in " \t\n\r":
+            pos += 1
+        #
+        return pos
+
     def __readJSonFile(self, filename):
         """Read json file"""
         with open(filename, "r") as f:
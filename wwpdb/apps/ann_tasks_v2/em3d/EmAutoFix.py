@@ -3,6 +3,7 @@
 # Date:  17-Jun-2019  E Peisach
 #
 # Update:
+#  18-Oct-2026  Read only database_2 and em_map, and splice the updated em_map into the output model
 ##
 """
 Auto runs mapfix on maps specified in em_map category
@@ -19,7 +20,7 @@ import os
 import json
 import logging
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
-from mmcif.io.IoAdapterCore import IoAdapterCore
+from wwpdb.apps.ann_tasks_v2.io.PdbxCategoryIo import PdbxCategoryIo
 from wwpdb.io.locator.PathInfo import PathInfo
 
 logger = logging.getLogger()
@@ -88,11 +89,12 @@ class EmAutoFix(object):
 
         logger.info("Checking for map updates to %r", modelin)
 
-        # Parse model file
-        ioobj = IoAdapterCore()
-        c0 = ioobj.readFile(inputFilePath=modelin)
-
-        block0 = c0[0]
+        # Parse the categories used from the model file
+        ioobj = PdbxCategoryIo(verbose=self.__verbose, log=self.__lfh)
+        block0 = ioobj.getContainer(modelin, ["database_2", "em_map"])
+        if block0 is None:
+            logger.error("Could not read %s", modelin)
+            return False
 
         # Is there an em_map category?
 
@@ -147,8 +149,8 @@ class EmAutoFix(object):
         if updated:
             logger.info("Model file updated")
 
-            # Write model
-            ret = ioobj.writeFile(outputFilePath=modelout, containerList=c0)
+            # Write model - remaining categories are copied unchanged from modelin
+            ret = ioobj.spliceCategories(modelin, modelout, block0, ["em_map"])
             logger.info("Writing file returns %s %s", ret, modelout)
             return True
 
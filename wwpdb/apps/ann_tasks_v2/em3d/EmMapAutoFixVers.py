@@ -3,6 +3,7 @@
 # Date:  17-Jun-2019  E Peisach
 #
 # Update:
+#  18-Oct-2026  Read only em_map, and splice the updated category into the output model
 ##
 """
 Updates versions numbers of components in em_map category
@@ -16,7 +17,7 @@ __license__ = "Creative Commons Attribution 3.0 Unported"
 
 import sys
 import logging
-from mmcif.io.IoAdapterCore import IoAdapterCore
+from wwpdb.apps.ann_tasks_v2.io.PdbxCategoryIo import PdbxCategoryIo
 from wwpdb.io.locator.PathInfo import PathInfo
 
 logger = logging.getLogger()
@@ -44,15 +45,13 @@ class EmMapAutoFixVers(object):
 
         logger.info("Starting fixing versions of em_map")
 
-        # Parse model file
-        ioobj = IoAdapterCore()
-        c0 = ioobj.readFile(inputFilePath=modelin)
-        if len(c0) == 0:
+        # Parse the em_map category of the model file
+        ioobj = PdbxCategoryIo(verbose=self.__verbose, log=self.__lfh)
+        block0 = ioobj.getContainer(modelin, ["em_map"])
+        if block0 is None:
             logger.error("Could not read %s", modelin)
             return False
 
-        block0 = c0[0]
-
         # Is there an em_map category?
         tobj = block0.getObj("em_map")
         if not tobj:
@@ -77,8 +76,8 @@ class EmMapAutoFixVers(object):
         if updated:
             logger.info("Model file updated")
 
-            # Write model
-            ret = ioobj.writeFile(outputFilePath=modelout, containerList=c0)
+            # Write model - remaining categories are copied unchanged from modelin
+            ret = ioobj.spliceCategories(modelin, modelout, block0, ["em_map"])
             logger.info("Writing file returns %s %s", ret, modelout)
             return True
 
@@ -3,6 +3,9 @@
 # Date:  26-Feb-2019  Zukang Feng
 #
 # Update:
+#  18-Oct-2026  evaluate candidate free R sets concurrently in per-set scratch directories and report a summary table
+#  18-Oct-2026  work on input snapshots in a private task workspace and commit the accepted set with a version history
+#  18-Oct-2026  summary marks only the set which was used as accepted
 ##
 """
 Utility to reset free R set of sf file in mmCIF format
@@ -21,6 +24,8 @@ import traceback
 from wwpdb.io.file.mmCIFUtil import mmCIFUtil
 from wwpdb.utils.config.ConfigInfo import ConfigInfo
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.TaskPool import TaskPool, getDefaultMaxWorkers
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 
 
@@ -47,27 +52,74 @@ class ReSetFreeRinSFmmCIF(SessionWebDownloadUtils):
         #
         self.__status = False
         self.__message = ""
+        self.__maxSets = 20
+        self.__ws = None
+        self.__expSnapPath = None
+        self.__modelSnapPath = None
 
-    def run(self):
-        """Run the calculation"""
+    def run(self, maxWorkers=None):
+        """Run the calculation
+
+        Candidate sets are generated and validated concurrently, each in its own scratch directory, in
+        groups of maxWorkers sets.  The result is the same as trying the sets in order - the first set
+        which validates is accepted and the search stops at a set which cannot be generated.  The sets
+        are made from snapshots of the input files taken in a private task workspace.
+        """
         try:
-            logPath = os.path.join(self.__sessionPath, self.__entryId + "-reset_freer.log")
-            if os.access(logPath, os.R_OK):
-                os.remove(logPath)
-            #
-            for i in range(20):
-                if (not self.__generate_mmCIFFile(str(i))) or self.__runDccValidation(str(i)):
-                    break
+            with TaskWorkspace(self.__sessionPath, self.__entryId, "reset-freer", verbose=self.__verbose, log=self.__lfh) as ws:
+                self.__ws = ws
+                self.__expSnapPath = ws.snapshot(os.path.join(self.__sessionPath, self.__expFileName))
+                self.__modelSnapPath = ws.snapshot(os.path.join(self.__sessionPath, self.__modelFileName))
+                #
+                if not maxWorkers:
+                    maxWorkers = getDefaultMaxWorkers(limit=4)
+                #
+                triedList = []
+                acceptedSetId = None
+                done = False
+                for start in range(0, self.__maxSets, maxWorkers):
+                    tP = TaskPool(maxWorkers=maxWorkers, verbose=self.__verbose, log=self.__lfh)
+                    for i in range(start, min(start + maxWorkers, self.__maxSets)):
+                        tP.add(str(i), self.__evaluateSet, str(i))
+                    #
+                    for set_id, ok, rD in tP.run():
+                        if not ok:
+                            rD = {"setid": set_id, "generated": False, "accepted": False, "message": "Evaluating set " + set_id + " failed.", "stats": None}
+                        #
+                        triedList.append(rD)
+                        if done:
+                            continue
+                        #
+                        if rD["accepted"]:
+                            self.__acceptSet(rD)
+                            acceptedSetId = rD["setid"]
+                            done = True
+                        elif rD["message"]:
+                            if self.__message:
+                                self.__message += "\n\n" if rD["generated"] else "\n"
+                            #
+                            self.__message += rD["message"]
+                        #
+                        if not rD["generated"]:
+                            done = True
+                        #
+                    #
+                    if done:
+                        break
+                    #
+                #
+                logPath = ws.getPath(self.__entryId + "-reset_freer.log")
+                fh = open(logPath, "w")
+                fh.write("%s\n" % self.__message)
+                fh.write("\n%s" % self.__getSummary(triedList, acceptedSetId))
+                fh.close()
+                #
+                for filePath in ws.publish([logPath]):
+                    self.addDownloadPath(filePath)
+                #
+                if self.__status:
+                    self.addDownloadPath(os.path.join(self.__sessionPath, self.__expFileName))
                 #
-            #
-            fh = open(logPath, "w")
-            fh.write("%s\n" % self.__message)
-            fh.close()
-            #
-            self.addDownloadPath(logPath)
-            if self.__status:
-                self.addDownloadPath(os.path.join(self.__sessionPath, self.__expFileName))
-            #
             return self.__status
         except:  # noqa: E722 pylint: disable=bare-except
             if self.__verbose:
@@ -76,18 +128,66 @@ class ReSetFreeRinSFmmCIF(SessionWebDownloadUtils):
             return False
         #
 
-    def __generate_mmCIFFile(self, set_id):
+    def __evaluateSet(self, set_id):
+        """Generate and validate a single candidate set in its own scratch directory"""
+        workPath = self.__ws.getPath("set_" + set_id)
+        os.makedirs(workPath)
+        rD = {"setid": set_id, "generated": False, "accepted": False, "message": "", "stats": None, "sfPath": os.path.join(workPath, self.__entryId + "_sf.cif")}
+        rD["generated"] = self.__generate_mmCIFFile(set_id, workPath, rD)
+        if rD["generated"]:
+            rD["accepted"] = self.__runDccValidation(set_id, workPath, rD)
+        #
+        return rD
+
+    def __acceptSet(self, rD):
+        """Replace the experimental data file with the accepted set unless it was changed during the calculation"""
+        ifh = open(rD["sfPath"], "r")
+        sfData = ifh.read()
+        ifh.close()
+        #
+        outPath = self.__ws.getPath(self.__entryId + "_sf-accepted.cif")
+        ofh = open(outPath, "w")
+        ofh.write(sfData)
+        ofh.write("#END OF REFLECTIONS\n")
+        ofh.close()
+        #
+        if not self.__ws.commit(outPath, os.path.join(self.__sessionPath, self.__expFileName)):
+            self.__message = rD["message"] + "\n\nFree R set was not relabeled - the structure factor file was changed during the calculation."
+            return
+        #
+        self.__status = True
+        self.__message = rD["message"] + "\n\nFree R set was successfully relabeled."
+
+    def __getSummary(self, triedList, acceptedSetId):
+        """Table of the statistics of every tried set - sets of the same group after the accepted set may also have passed"""
+        text = "Summary of tried free R sets:\n\nset  reso  R_rep  Rf_rep  CC_rep    R_cal  Rf_cal  CC_cal   Rf-R_TLS  status\n"
+        for rD in sorted(triedList, key=lambda rD: int(rD["setid"])):
+            if rD["setid"] == acceptedSetId:
+                status = "accepted"
+            elif rD["accepted"]:
+                status = "passed, not used"
+            elif not rD["generated"]:
+                status = "generation failed"
+            elif rD["stats"] is None:
+                status = "validation failed"
+            else:
+                status = "rejected"
+            #
+            if rD["stats"] is None:
+                text += " %2s  %-64s  %s\n" % (rD["setid"], "", status)
+            else:
+                text += " %2s  %4.2f  %5.3f  %5.3f   %5.3f    %5.3f  %5.3f   %5.3f    %6.3f   %s\n" % tuple([rD["setid"]] + rD["stats"] + [status])
+            #
+        #
+        return text
+
+    def __generate_mmCIFFile(self, set_id, workPath, rD):
         """Manipulate SF file"""
         try:
-            logPath = os.path.join(self.__sessionPath, "logfile")
-            outputPath = os.path.join(self.__sessionPath, self.__entryId + "_sf.cif")
-            for filePath in (logPath, outputPath):
-                if os.access(filePath, os.R_OK):
-                    os.remove(filePath)
-                #
-            #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            dp.imp(os.path.join(self.__sessionPath, self.__expFileName))
+            logPath = os.path.join(workPath, "logfile")
+            outputPath = rD["sfPath"]
+            dp = RcsbDpUtility(tmpPath=workPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+            dp.imp(self.__expSnapPath)
             dp.addInput(name="set_num", value=set_id)
             dp.op("annot-correct-freer-set")
             dp.exp(outputPath)
@@ -96,7 +196,7 @@ class ReSetFreeRinSFmmCIF(SessionWebDownloadUtils):
             #
             hasError = False
             for fileName in ("logfile", "clogfile"):
-                logFile = os.path.join(self.__sessionPath, fileName)
+                logFile = os.path.join(workPath, fileName)
                 if not os.access(logFile, os.R_OK):
                     continue
                 #
@@ -107,42 +207,37 @@ class ReSetFreeRinSFmmCIF(SessionWebDownloadUtils):
                 if (data == "") or (data == "Finished!\n"):
                     continue
                 #
-                if self.__message:
-                    self.__message += "\n"
+                if rD["message"]:
+                    rD["message"] += "\n"
                 #
-                self.__message += data
+                rD["message"] += data
                 hasError = True
             #
             if hasError:
                 return False
             #
             if not os.access(outputPath, os.R_OK):
-                if self.__message:
-                    self.__message += "\n"
+                if rD["message"]:
+                    rD["message"] += "\n"
                 #
-                self.__message += "Generated 'SF-'" + set_id + ".cif' file failed."
+                rD["message"] += "Generated 'SF-'" + set_id + ".cif' file failed."
                 return False
             #
             return True
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
-            self.__message += "Generated 'SF-'" + set_id + ".cif' file failed:\n" + traceback.format_exc()
+            rD["message"] += "Generated 'SF-'" + set_id + ".cif' file failed:\n" + traceback.format_exc()
             return False
         #
 
-    def __runDccValidation(self, set_id):
+    def __runDccValidation(self, set_id, workPath, rD):
         """Run dcc program to verify if the mainpulated sf file is correct."""
         try:
-            logPath = os.path.join(self.__sessionPath, "dcc_logfile")
-            outputPath = os.path.join(self.__sessionPath, self.__entryId + "_dcc.cif")
-            for filePath in (logPath, outputPath):
-                if os.access(filePath, os.R_OK):
-                    os.remove(filePath)
-                #
-            #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            dp.imp(os.path.join(self.__sessionPath, self.__entryId + "_sf.cif"))
-            dp.addInput(name="model_file", value=os.path.join(self.__sessionPath, self.__modelFileName))
+            logPath = os.path.join(workPath, "dcc_logfile")
+            outputPath = os.path.join(workPath, self.__entryId + "_dcc.cif")
+            dp = RcsbDpUtility(tmpPath=workPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+            dp.imp(rD["sfPath"])
+            dp.addInput(name="model_file", value=self.__modelSnapPath)
             dp.op("annot-dcc-validation")
             dp.exp(outputPath)
             dp.expLog(logPath)
@@ -227,25 +322,11 @@ class ReSetFreeRinSFmmCIF(SessionWebDownloadUtils):
                         res_best[3],
                     )
                     #
+                    rD["stats"] = [res_pdb[0], res_pdb[1], res_pdb[2], res_pdb[3], res_best[1], res_best[2], res_best[3], res_tls[2] - res_tls[1]]
+                    rD["message"] = logData
                     if (res_tls[2] - res_tls[1]) > 0.02:
-                        os.path.join(self.__sessionPath, self.__entryId + "_sf.cif")
-                        ifh = open(os.path.join(self.__sessionPath, self.__entryId + "_sf.cif"), "r")
-                        sfData = ifh.read()
-                        ifh.close()
-                        #
-                        ofh = open(os.path.join(self.__sessionPath, self.__expFileName), "w")
-                        ofh.write(sfData)
-                        ofh.write("#END OF REFLECTIONS\n")
-                        ofh.close()
-                        #
-                        self.__status = True
-                        self.__message = logData + "\n\nFree R set was successfully relabeled."
                         return True
                     #
-                    if self.__message:
-                        self.__message += "\n\n"
-                    #
-                    self.__message += logData
                 except:  # noqa: E722 pylint: disable=bare-except
                     if self.__verbose:
                         traceback.print_exc(file=self.__lfh)
@@ -255,7 +336,7 @@ class ReSetFreeRinSFmmCIF(SessionWebDownloadUtils):
             return False
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
-            self.__message += "Calculating R/Rfree for (" + self.__modelFileName + " & SF-" + set_id + ".cif):\n" + traceback.format_exc()
+            rD["message"] = "Calculating R/Rfree for (" + self.__modelFileName + " & SF-" + set_id + ".cif):\n" + traceback.format_exc()
             return False
         #
 
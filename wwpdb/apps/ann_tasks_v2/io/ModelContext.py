@@ -0,0 +1,254 @@
+##
+# File:  ModelContext.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#   18-Oct-2026  report readers share the parsed files through ContextIoAdapter
+##
+"""
+Parsed model files shared by the helpers serving a single web request.
+
+The context is attached to the request object (see ModelContext.fromRequest()).  Each
+file is parsed once with the union of the categories requested (or declared in advance
+with require()) by its readers and the parsed content is handed out as read-only views.
+Readers which take an IoAdapter (e.g. the report readers used by PdbxReport) are given a
+ContextIoAdapter so their reads are served from the same parse.  Callers which know the
+readers serving a request should declare the categories with require() before the first
+read - a later request for a category which has not been parsed reads the file again.
+A file which changes on disk during the request is parsed again.  The number of parses
+is recorded for each file.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import sys
+import threading
+
+try:
+    from mmcif.io.IoAdapterCore import IoAdapterCore as IoAdapter
+except ImportError:
+    from mmcif.io.IoAdapterPy import IoAdapterPy as IoAdapter
+
+
+class CategoryView(object):
+    """Read-only view of a data category -  methods which modify the category are not available."""
+
+    _readMethods = frozenset(
+        [
+            "getName",
+            "getAttributeList",
+            "getAttributeCount",
+            "getAttributeIndex",
+            "getAttributeIndexDict",
+            "getItemNameList",
+            "hasAttribute",
+            "getRowCount",
+            "getValue",
+            "getValueOrDefault",
+            "getFirstValueOrDefault",
+            "getAttributeValueList",
+            "getAttributeUniqueValueList",
+            "getRowAttributeDict",
+            "getRowItemDict",
+            "selectIndices",
+            "selectValuesWhere",
+            "selectValueListWhere",
+            "selectValuesWhereConditions",
+            "countValuesWhereConditions",
+        ]
+    )
+
+    def __init__(self, catObj):
+        self.__catObj = catObj
+
+    def __getattr__(self, name):
+        if name in CategoryView._readMethods:
+            return getattr(self.__catObj, name)
+        raise AttributeError("%s is not available in a read-only category view" % name)
+
+    def __len__(self):
+        return self.__catObj.getRowCount()
+
+    def __iter__(self):
+        for row in self.__catObj.getRowList():
+            yield list(row)
+
+    def getRow(self, index):
+        return list(self.__catObj.getRow(index))
+
+    def getFullRow(self, index):
+        return list(self.__catObj.getFullRow(index))
+
+    def getRowList(self):
+        return [list(row) for row in self.__catObj.getRowList()]
+
+
+class ContainerView(object):
+    """Read-only view of a data container."""
+
+    def __init__(self, container):
+        self.__container = container
+
+    def getName(self):
+        return self.__container.getName()
+
+    def getType(self):
+        return self.__container.getType()
+
+    def getObjNameList(self):
+        return list(self.__container.getObjNameList())
+
+    def exists(self, name):
+        return self.__container.exists(name)
+
+    def getObj(self, name):
+        catObj = self.__container.getObj(name)
+        return CategoryView(catObj) if catObj is not None else None
+
+
+class ModelContext(object):
+    """Request scoped reader of model files.
+
+    Readers name the categories they need -  categoryList=None reads the complete file.
+    """
+
+    _requestKey = "_model_context"
+    _createLock = threading.Lock()
+
+    def __init__(self, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__lock = threading.RLock()
+        # realpath -> (file key, category set or None for the complete file, container list)
+        self.__fileD = {}
+        # realpath -> declared category set or None for the complete file
+        self.__requireD = {}
+        self.__statsD = {"parses": 0, "hits": 0}
+        self.__parseD = {}
+
+    @classmethod
+    def fromRequest(cls, reqObj, verbose=False, log=sys.stderr):
+        """Return the model context attached to reqObj, creating it on first use."""
+        with cls._createLock:
+            mC = reqObj.getRawValue(cls._requestKey)
+            if not isinstance(mC, ModelContext):
+                mC = cls(verbose=verbose, log=log)
+                reqObj.setValue(cls._requestKey, mC)
+            return mC
+
+    def __getKey(self, filePath):
+        try:
+            st = os.stat(filePath)
+            return (st.st_ino, st.st_mtime, st.st_size)
+        except OSError:
+            return None
+
+    def require(self, filePath, categoryList=None):
+        """Declare categories which will be read from filePath so that the first parse includes them."""
+        path = os.path.realpath(filePath)
+        with self.__lock:
+            if path in self.__requireD and self.__requireD[path] is None:
+                return
+            if categoryList is None:
+                self.__requireD[path] = None
+            else:
+                self.__requireD.setdefault(path, set()).update(categoryList)
+
+    def getContainerList(self, filePath, categoryList=None):
+        """Return read-only views of the data containers in filePath with at least the categories in categoryList.
+
+        Returns an empty list if the file cannot be read.
+        """
+        return [ContainerView(container) for container in self.getSharedContainerList(filePath, categoryList)]
+
+    def getSharedContainerList(self, filePath, categoryList=None):
+        """Return the data containers in filePath with at least the categories in categoryList.
+
+        The containers are shared by all readers in this request and must be treated as read-only apart from the
+        addition of empty style attributes performed by PdbxStyleIoUtil.  Returns an empty list if the file cannot be read.
+        """
+        path = os.path.realpath(filePath)
+        key = self.__getKey(path)
+        if key is None:
+            return []
+        with self.__lock:
+            if path in self.__fileD:
+                fKey, catS, cList = self.__fileD[path]
+                if fKey == key and (catS is None or (categoryList is not None and catS.issuperset(categoryList))):
+                    self.__statsD["hits"] += 1
+                    return cList
+                if fKey != key:
+                    del self.__fileD[path]
+            #
+            # Read the union of the categories requested so far from this version of the file
+            if categoryList is None or self.__requireD.get(path, set()) is None:
+                catS = None
+            else:
+                catS = set(categoryList) | self.__requireD.get(path, set())
+                if path in self.__fileD:
+                    if self.__fileD[path][1] is None:
+                        catS = None
+                    else:
+                        catS |= self.__fileD[path][1]
+            #
+            io = IoAdapter(raiseExceptions=False, verbose=self.__verbose, log=self.__lfh)
+            if catS is None:
+                cList = io.readFile(path)
+            else:
+                cList = io.readFile(path, selectList=sorted(catS))
+            self.__statsD["parses"] += 1
+            self.__parseD[path] = self.__parseD.get(path, 0) + 1
+            if self.__verbose:
+                self.__lfh.write("+ModelContext.getContainerList() parse %d of %s categories %s\n" % (self.__parseD[path], path, "all" if catS is None else ",".join(sorted(catS))))
+            if not cList:
+                return []
+            self.__fileD[path] = (key, catS, cList)
+            return cList
+
+    def getContainer(self, filePath, categoryList=None):
+        """Return a read-only view of the first data container in filePath or None."""
+        cList = self.getContainerList(filePath, categoryList)
+        return cList[0] if cList else None
+
+    def getIoAdapter(self):
+        """Return an IoAdapter for readers which read files themselves - their reads are served from this context."""
+        return ContextIoAdapter(self, raiseExceptions=False, verbose=self.__verbose, log=self.__lfh)
+
+    def invalidate(self, filePath=None):
+        """Discard parsed content for filePath or for all files."""
+        with self.__lock:
+            if filePath is None:
+                self.__fileD.clear()
+            else:
+                self.__fileD.pop(os.path.realpath(filePath), None)
+
+    def getStats(self):
+        """Return the number of parses and reuses in this request and the number of parses of each file."""
+        with self.__lock:
+            sD = dict(self.__statsD)
+            sD["files"] = dict(self.__parseD)
+            return sD
+
+
+class ContextIoAdapter(IoAdapter):
+    """IoAdapter which reads files through a ModelContext (see ModelContext.getSharedContainerList()).
+
+    Reads with a category selection are served from the same parse as complete reads.
+    """
+
+    def __init__(self, modelContext, *args, **kwargs):
+        super(ContextIoAdapter, self).__init__(*args, **kwargs)
+        self.__modelContext = modelContext
+
+    def getModelContext(self):
+        return self.__modelContext
+
+    def readFile(self, inputFilePath, *args, **kwargs):  # pylint: disable=arguments-differ
+        if args or kwargs.get("excludeFlag"):
+            return super(ContextIoAdapter, self).readFile(inputFilePath, *args, **kwargs)
+        return self.__modelContext.getSharedContainerList(inputFilePath, kwargs.get("selectList") or None)
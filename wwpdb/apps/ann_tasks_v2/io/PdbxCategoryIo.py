@@ -0,0 +1,308 @@
+##
+# File:  PdbxCategoryIo.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Category selective reads and category level updates of PDBx files.
+
+Consumers which need only a few small categories from a model file declare the
+categories they use.  The file is scanned line by line to locate those categories
+and only their text is parsed, so the coordinate tables are never tokenized.
+Updated categories are written back by splicing their new text into a copy of the
+original file in place of the old text.
+
+Files which cannot be scanned (compressed files, save frames ...) are handled
+by a conventional IoAdapterCore read and write.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import io
+import logging
+import os
+import sys
+import tempfile
+
+from mmcif.api.PdbxContainers import DataContainer
+from mmcif.io.IoAdapterCore import IoAdapterCore
+from mmcif.io.PdbxReader import PdbxReader
+from mmcif.io.PdbxWriter import PdbxWriter
+
+logger = logging.getLogger(__name__)
+
+
+class PdbxCategoryScanError(Exception):
+    """Raised when the file layout is not supported by the line scanner."""
+
+
+class PdbxCategoryIo(object):
+    """Category selective reader and category splice writer for PDBx files."""
+
+    def __init__(self, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+
+    def getContainer(self, filePath, categoryList, index=0):
+        """Return the data container at position index holding only the categories in categoryList (None on failure)."""
+        cList = self.__read(filePath, categoryList, stopBlock=index)
+        if cList is not None and len(cList) > index:
+            return cList[index]
+        return None
+
+    def readCategories(self, filePath, categoryList):
+        """Return the list of data containers in filePath holding only the categories in categoryList."""
+        cList = self.__read(filePath, categoryList)
+        return cList if cList is not None else []
+
+    def spliceCategories(self, inpFilePath, outFilePath, container, categoryList, index=0):
+        """Write a copy of inpFilePath to outFilePath with the categories in categoryList of data block
+        index replaced by those in container.  Categories missing from container are removed and those
+        not in the input file are added at the end of the data block.
+
+        Returns True on success.
+        """
+        catL = [str(catName) for catName in categoryList]
+        try:
+            blockL = self.__indexFile(inpFilePath, catL)
+            if index >= len(blockL):
+                raise PdbxCategoryScanError("missing data block %d" % index)
+            secD = blockL[index]["sections"]
+            for catName in catL:
+                if len(secD.get(catName.lower(), [])) > 1:
+                    raise PdbxCategoryScanError("category %s is not contiguous" % catName)
+            ok = self.__splice(inpFilePath, outFilePath, blockL[index], container, catL)
+            if self.__verbose:
+                self.__lfh.write("+PdbxCategoryIo.spliceCategories() %s -> %s categories %r status %r\n" % (inpFilePath, outFilePath, catL, ok))
+            return ok
+        except PdbxCategoryScanError as e:
+            logger.info("Category splice not possible for %s (%s) - rewriting file", inpFilePath, str(e))
+            return self.__rewrite(inpFilePath, outFilePath, container, catL, index)
+
+    # ---------------------------------------------------------------------------------------------
+    #
+    def __read(self, filePath, categoryList, stopBlock=None):
+        try:
+            return self.__scanRead(filePath, [str(catName).lower() for catName in categoryList], stopBlock=stopBlock)
+        except PdbxCategoryScanError as e:
+            logger.info("Category scan not possible for %s (%s) - using full parser", filePath, str(e))
+        except (IOError, OSError) as e:
+            logger.error("Reading %s failed %s", filePath, str(e))
+            return None
+        try:
+            return IoAdapterCore().readFile(filePath, selectList=categoryList, outDirPath=self.__getOutDir(filePath))
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error("Reading %s failed %s", filePath, str(e))
+        return None
+
+    def __getOutDir(self, fPath):
+        """Attempts to find a writeable place for log file during read"""
+        for dp in [os.path.dirname(fPath), ".", tempfile.gettempdir()]:
+            if os.access(dp, os.W_OK):
+                return dp
+        return None
+
+    def __scanLines(self, ifh):
+        """Generate (lineNo, line, event, value) for each line of an open binary file.
+
+        event is one of -
+          'block'   value = data block name
+          'loop'    start of a loop (the category is given by the following 'item')
+          'item'    value = category name of a data item name
+          'value'   data value or text field content (continues the current category)
+          'sep'     comment or blank line
+        """
+        inText = False
+        for lineNo, line in enumerate(ifh):
+            if inText:
+                if line[:1] == b";":
+                    inText = False
+                yield lineNo, line, "value", None
+                continue
+            if line[:1] == b";":
+                inText = True
+                yield lineNo, line, "value", None
+                continue
+            sLine = line.lstrip()
+            c = sLine[:1]
+            if c == b"_":
+                idx = sLine.find(b".")
+                if idx < 0:
+                    raise PdbxCategoryScanError("non-mmCIF data name at line %d" % (lineNo + 1))
+                yield lineNo, line, "item", sLine[1:idx].decode("ascii", "ignore").lower()
+            elif c == b"#" or not c:
+                yield lineNo, line, "sep", None
+            elif c in b"dDlLsSgG":
+                tok = sLine[:7].lower()
+                if tok.startswith(b"data_"):
+                    yield lineNo, line, "block", sLine.split()[0][5:].decode("utf-8", "ignore")
+                elif tok.startswith(b"loop_"):
+                    yield lineNo, line, "loop", None
+                elif tok.startswith(b"save_") or tok.startswith(b"global_") or tok.startswith(b"stop_"):
+                    raise PdbxCategoryScanError("unsupported reserved word at line %d" % (lineNo + 1))
+                else:
+                    yield lineNo, line, "value", None
+            else:
+                yield lineNo, line, "value", None
+
+    def __scan(self, ifh, catSet, collect=False, stopBlock=None):
+        """Index the data blocks and the line ranges [start, end) of the categories in catSet (lower case names).
+
+        If collect is set the text of these categories is also returned for each block.
+        """
+        blockL = []
+        block = None
+        sec = None  # [catName, startLine, endLine, isLoop, lineList]
+        pendingLoop = None
+        inLoopHeader = False
+
+        def closeSection():
+            if sec is not None and sec[0] in catSet:
+                block["sections"].setdefault(sec[0], []).append((sec[1], sec[2]))
+                if collect:
+                    block["text"].extend(sec[4])
+
+        for lineNo, line, event, value in self.__scanLines(ifh):
+            if event == "sep":
+                continue
+            if event == "block":
+                if block is not None:
+                    closeSection()
+                    block["end"] = lineNo
+                    if stopBlock is not None and len(blockL) > stopBlock:
+                        return blockL
+                sec = None
+                inLoopHeader = False
+                block = {"name": value, "start": lineNo, "end": None, "contentEnd": lineNo + 1, "sections": {}, "text": [line] if collect else []}
+                blockL.append(block)
+                continue
+            if block is None:
+                raise PdbxCategoryScanError("data before first data block at line %d" % (lineNo + 1))
+            block["contentEnd"] = lineNo + 1
+            if event == "loop":
+                closeSection()
+                sec = None
+                pendingLoop = (lineNo, line)
+                inLoopHeader = True
+            elif event == "item":
+                if inLoopHeader and pendingLoop is not None:
+                    sec = [value, pendingLoop[0], lineNo + 1, True, [pendingLoop[1], line] if collect and value in catSet else []]
+                    pendingLoop = None
+                elif inLoopHeader and sec is not None and sec[0] == value:
+                    sec[2] = lineNo + 1
+                    if collect and value in catSet:
+                        sec[4].append(line)
+                elif sec is not None and not sec[3] and sec[0] == value:
+                    sec[2] = lineNo + 1
+                    if collect and value in catSet:
+                        sec[4].append(line)
+                else:
+                    closeSection()
+                    sec = [value, lineNo, lineNo + 1, False, [line] if collect and value in catSet else []]
+                    inLoopHeader = False
+            else:
+                if pendingLoop is not None:
+                    raise PdbxCategoryScanError("loop without data names at line %d" % (lineNo + 1))
+                inLoopHeader = False
+                if sec is None:
+                    raise PdbxCategoryScanError("data value outside of a category at line %d" % (lineNo + 1))
+                sec[2] = lineNo + 1
+                if collect and sec[0] in catSet:
+                    sec[4].append(line)
+            #
+            if stopBlock is not None and len(blockL) == stopBlock + 1 and sec is not None and sec[0] not in catSet and event == "item":
+                # The categories of a data block are unique - stop once all requested categories have been seen
+                if all(catName in block["sections"] for catName in catSet):
+                    return blockL
+        if block is not None:
+            closeSection()
+        return blockL
+
+    def __indexFile(self, filePath, catL):
+        if filePath.endswith(".gz") or filePath.endswith(".bz2") or filePath.endswith(".xz"):
+            raise PdbxCategoryScanError("compressed file")
+        with open(filePath, "rb") as ifh:
+            return self.__scan(ifh, set([catName.lower() for catName in catL]))
+
+    def __scanRead(self, filePath, catL, stopBlock=None):
+        if filePath.endswith(".gz") or filePath.endswith(".bz2") or filePath.endswith(".xz"):
+            raise PdbxCategoryScanError("compressed file")
+        with open(filePath, "rb") as ifh:
+            blockL = self.__scan(ifh, set(catL), collect=True, stopBlock=stopBlock)
+        # Apply the same ascii filtering as the default IoAdapterCore read
+        text = b"".join([b"".join(block["text"]) + b"\n" for block in blockL]).decode("utf-8", "ignore")
+        text = text.encode("ascii", "xmlcharrefreplace").decode("ascii")
+        cList = []
+        PdbxReader(io.StringIO(text)).read(cList)
+        return cList
+
+    def __getCategoryText(self, container, catName):
+        """Return the PDBx text for a single category of the input container (empty if not present)."""
+        if container is None or not container.exists(catName):
+            return b""
+        dc = DataContainer(container.getName())
+        dc.append(container.getObj(catName))
+        ofh = io.StringIO()
+        PdbxWriter(ofh).write([dc])
+        lineL = ofh.getvalue().split("\n")[1:]
+        while lineL and not lineL[0].strip():
+            lineL.pop(0)
+        while lineL and (not lineL[-1].strip() or not lineL[-1].strip().strip("#")):
+            lineL.pop()
+        return ("\n".join(lineL) + "\n").encode("utf-8")
+
+    def __splice(self, inpFilePath, outFilePath, block, container, catL):
+        replaceD = {}
+        for catName in catL:
+            for start, end in block["sections"].get(catName.lower(), []):
+                replaceD[start] = (end, self.__getCategoryText(container, catName))
+        appendText = b"".join([b"#\n" + self.__getCategoryText(container, catName) for catName in catL if catName.lower() not in block["sections"] and container.exists(catName)])
+        appendLine = block["contentEnd"]
+        #
+        outDir = os.path.dirname(os.path.abspath(outFilePath))
+        fd, tmpPath = tempfile.mkstemp(prefix=".splice-", dir=outDir)
+        try:
+            with open(inpFilePath, "rb") as ifh, os.fdopen(fd, "wb") as ofh:
+                skipTo = -1
+                for lineNo, line in enumerate(ifh):
+                    if lineNo == appendLine and appendText:
+                        ofh.write(appendText)
+                        appendText = b""
+                    if lineNo < skipTo:
+                        continue
+                    if lineNo in replaceD:
+                        skipTo, text = replaceD[lineNo]
+                        ofh.write(text)
+                        continue
+                    ofh.write(line)
+                if appendText:
+                    ofh.write(appendText + b"#\n")
+            os.rename(tmpPath, outFilePath)
+            return True
+        except (IOError, OSError) as e:
+            logger.error("Category splice failed for %s: %s", outFilePath, str(e))
+            if os.access(tmpPath, os.F_OK):
+                os.remove(tmpPath)
+        return False
+
+    def __rewrite(self, inpFilePath, outFilePath, container, catL, index):
+        """Full read, category replacement and write of the file."""
+        try:
+            ioObj = IoAdapterCore()
+            cList = ioObj.readFile(inpFilePath, outDirPath=self.__getOutDir(inpFilePath))
+            block = cList[index]
+            for catName in catL:
+                if block.exists(catName):
+                    block.remove(catName)
+                if container is not None and container.exists(catName):
+                    block.append(container.getObj(catName))
+            return ioObj.writeFile(outFilePath, cList)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error("Category update failed for %s: %s", inpFilePath, str(e))
+        return False
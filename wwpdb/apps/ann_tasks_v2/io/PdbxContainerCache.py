@@ -0,0 +1,124 @@
+##
+# File:  PdbxContainerCache.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Cache of parsed PDBx container lists keyed on file path, modification time and size.
+
+Report generators wrap several style specific readers around the same model file.
+CachingIoAdapter may be passed to these readers in place of the default IoAdapter
+so the file is parsed once and the resulting container list shared.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+try:
+    from mmcif.io.IoAdapterCore import IoAdapterCore as IoAdapter
+except ImportError:
+    from mmcif.io.IoAdapterPy import IoAdapterPy as IoAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class PdbxContainerCache(object):
+    """LRU cache of parsed container lists.
+
+    With shared=True the entries are held at process level and are visible to every
+    cache instance (e.g. across requests handled by the same web worker), otherwise
+    entries live only as long as this instance.
+    """
+
+    _sharedD = OrderedDict()
+    _sharedStatsD = {"hits": 0, "misses": 0, "parses": 0}
+    _lock = threading.RLock()
+
+    def __init__(self, shared=False, maxEntries=4, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__maxEntries = maxEntries
+        if shared:
+            self.__cacheD = PdbxContainerCache._sharedD
+            self.__statsD = PdbxContainerCache._sharedStatsD
+        else:
+            self.__cacheD = OrderedDict()
+            self.__statsD = {"hits": 0, "misses": 0, "parses": 0}
+
+    def getKey(self, filePath):
+        """Return the cache key for the current state of the input file or None if it cannot be accessed."""
+        try:
+            st = os.stat(filePath)
+            return (os.path.realpath(filePath), st.st_mtime, st.st_size)
+        except OSError:
+            return None
+
+    def get(self, filePath, readFunc):
+        """Return the container list for filePath - on a miss the list is read with readFunc(filePath) and stored."""
+        key = self.getKey(filePath)
+        if key is None:
+            return readFunc(filePath)
+        with PdbxContainerCache._lock:
+            if key in self.__cacheD:
+                self.__cacheD.move_to_end(key)
+                self.__statsD["hits"] += 1
+                if self.__verbose:
+                    self.__lfh.write("+PdbxContainerCache.get() cache hit for %s\n" % filePath)
+                return self.__cacheD[key]
+            self.__statsD["misses"] += 1
+        #
+        cList = readFunc(filePath)
+        with PdbxContainerCache._lock:
+            self.__statsD["parses"] += 1
+            if cList:
+                # Drop stale versions of the same file -
+                for staleKey in [k for k in self.__cacheD if k[0] == key[0]]:
+                    del self.__cacheD[staleKey]
+                self.__cacheD[key] = cList
+                while len(self.__cacheD) > self.__maxEntries:
+                    self.__cacheD.popitem(last=False)
+        return cList
+
+    def clear(self):
+        with PdbxContainerCache._lock:
+            self.__cacheD.clear()
+
+    def getStats(self):
+        with PdbxContainerCache._lock:
+            return dict(self.__statsD)
+
+
+class CachingIoAdapter(IoAdapter):
+    """IoAdapter which satisfies complete file reads from a PdbxContainerCache.
+
+    Readers sharing a container list must treat it as read-only apart from the addition of
+    empty style attributes performed by PdbxStyleIoUtil.  Category selective reads are not
+    cached.
+    """
+
+    def __init__(self, cache=None, *args, **kwargs):
+        super(CachingIoAdapter, self).__init__(*args, **kwargs)
+        self.__cache = cache if cache is not None else PdbxContainerCache()
+
+    def getCache(self):
+        return self.__cache
+
+    def readFile(self, inputFilePath, *args, **kwargs):  # pylint: disable=arguments-differ
+        if args or kwargs.get("selectList") or kwargs.get("excludeFlag"):
+            return super(CachingIoAdapter, self).readFile(inputFilePath, *args, **kwargs)
+
+        def readFunc(filePath):
+            return super(CachingIoAdapter, self).readFile(filePath, **kwargs)
+
+        return self.__cache.get(inputFilePath, readFunc)
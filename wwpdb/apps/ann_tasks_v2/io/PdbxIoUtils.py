@@ -3,7 +3,7 @@
 # Date:  09-NovFeb-2018 - Taken from sequence module and trimmed down
 #
 # Updates:
-#
+#   18-Oct-2026  Add category selective reads to PdbxFileIo.getContainer()
 ##
 """
 Utility methods for accessing model for assembly info.
@@ -24,6 +24,7 @@ import traceback
 import tempfile
 
 from mmcif.io.IoAdapterPy import IoAdapterPy
+from wwpdb.apps.ann_tasks_v2.io.PdbxCategoryIo import PdbxCategoryIo
 
 # from mmcif.api.PdbxContainers import *
 
@@ -49,7 +50,13 @@ class PdbxFileIo(object):
             if os.access(dp, os.W_OK):
                 return dp
 
-    def getContainer(self, fPath, index=0):
+    def getContainer(self, fPath, index=0, selectList=None):
+        """Return data container index from fPath.
+
+        If selectList is provided only the categories named in the list are read.
+        """
+        if selectList:
+            return PdbxCategoryIo(verbose=self.__verbose, log=self.__lfh).getContainer(fPath, selectList, index=index)
         outDirPath = self.__getOutDir(fPath)
         try:
             cList = self.__ioObj.readFile(fPath, outDirPath=outDirPath)
@@ -7,10 +7,15 @@
 #                          add method to count assembly sets
 #         04-Oct-2017  zf  add __reCalculateCompositions(), __getAsuChainOrder(), __reCalculateComposition()
 #                          add __reCalculateCompositionBasedAsuOrder(), __reCalculateCompositionBasedCurOrder()
+#         18-Oct-2026      add incremental (iterparse) reader mode and optional cache of parsed results
 #
 ##
 """
-DOM parser for PISA assembly data files.
+Parser for PISA assembly data files.
+
+The default streaming mode reads the file incrementally with ElementTree iterparse()
+and discards elements as they are processed.  The original DOM parser is retained
+(streaming=False) and both produce identical dictionaries.
 
 """
 __docformat__ = "restructuredtext en"
@@ -25,14 +30,80 @@ import os.path
 import sys
 import traceback
 from xml.dom import minidom
+import xml.etree.ElementTree as ET
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle as pickle
 
 from wwpdb.io.misc.FormatOut import FormatOut
 
 
 class PisaAssemblyReader(object):
-    def __init__(self, verbose=True, log=sys.stderr):
+    # Tags of scalar data items in each section of the report -
+    _summaryNodeList = ["name", "status", "total_asm", "multimeric_state", "all_chains_at_identity"]
+    _assemblySetNodeList = ["ser_no", "all_chains_at_identity"]
+    _assemblyNodeList = [
+        "serial_no",
+        "id",
+        "size",
+        "mmsize",
+        "score",
+        "diss_energy",
+        "asa",
+        "bsa",
+        "entropy",
+        "diss_area",
+        "int_energy",
+        "n_uc",
+        "n_diss",
+        "symNumber",
+        "formula",
+        "composition",
+    ]
+    _moleculeNodeList = [
+        "chain_id",
+        "visual_id",
+        "rxx",
+        "rxy",
+        "rxz",
+        "tx",
+        "ryx",
+        "ryy",
+        "ryz",
+        "ty",
+        "rzx",
+        "rzy",
+        "rzz",
+        "tz",
+        "rxx-f",
+        "rxy-f",
+        "rxz-f",
+        "tx-f",
+        "ryx-f",
+        "ryy-f",
+        "ryz-f",
+        "ty-f",
+        "rzx-f",
+        "rzy-f",
+        "rzz-f",
+        "tz-f",
+        "symId",
+    ]
+    # Version of the parsed result cache file content
+    _cacheVersion = 1
+
+    def __init__(self, verbose=True, log=sys.stderr, streaming=True, useCache=False):
+        """PISA assembly report reader.
+
+        :param `streaming`:  read incrementally with iterparse() rather than building a DOM
+        :param `useCache`:   save the parsed result in a pickle file next to the report and reuse it while the report is unchanged
+        """
         self.__lfh = log
         self.__verbose = verbose
+        self.__streaming = streaming
+        self.__useCache = useCache
         self.__aD = {}
         self.__gD = {}
         self.__sD = {}
@@ -62,8 +133,17 @@ class PisaAssemblyReader(object):
             #
             if not os.access(filePath, os.F_OK):
                 return False
-            self.__dom = minidom.parse(filePath)
-            return self.__getData()
+            if self.__useCache and self.__readCache(filePath):
+                return True
+            if self.__streaming:
+                ok = self.__getDataStreaming(filePath)
+            else:
+                self.__dom = minidom.parse(filePath)
+                ok = self.__getData()
+                self.__dom = None
+            if ok and self.__useCache:
+                self.__writeCache(filePath)
+            return ok
         except:  # noqa: E722 pylint: disable=bare-except
             self.__lfh.write("+PisaAssemblyReader(read) read failed for file  %s\n" % filePath)
             if self.__verbose:
@@ -71,8 +151,141 @@ class PisaAssemblyReader(object):
             return False
         #
 
+    def getCachePath(self, filePath):
+        """Return the path of the parsed result cache file for the input report."""
+        return os.path.splitext(filePath)[0] + "-parsed.pic"
+
+    def __readCache(self, filePath):
+        cachePath = self.getCachePath(filePath)
+        if not os.access(cachePath, os.R_OK):
+            return False
+        try:
+            st = os.stat(filePath)
+            with open(cachePath, "rb") as fb:
+                cD = pickle.load(fb)
+            if cD["version"] != self._cacheVersion or cD["size"] != st.st_size or cD["mtime"] != st.st_mtime:
+                return False
+            self.__gD = cD["gD"]
+            self.__sD = cD["sD"]
+            self.__aD = cD["aD"]
+            if self.__verbose:
+                self.__lfh.write("+PisaAssemblyReader(read) using parsed result cache %s\n" % cachePath)
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+PisaAssemblyReader(read) ignoring unreadable cache %s\n" % cachePath)
+        return False
+
+    def __writeCache(self, filePath):
+        cachePath = self.getCachePath(filePath)
+        tmpPath = cachePath + ".tmp-%d" % os.getpid()
+        try:
+            st = os.stat(filePath)
+            cD = {"version": self._cacheVersion, "size": st.st_size, "mtime": st.st_mtime, "gD": self.__gD, "sD": self.__sD, "aD": self.__aD}
+            with open(tmpPath, "wb") as fb:
+                pickle.dump(cD, fb, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmpPath, cachePath)
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+PisaAssemblyReader(read) cache write failed for %s\n" % cachePath)
+                traceback.print_exc(file=self.__lfh)
+            if os.access(tmpPath, os.F_OK):
+                os.remove(tmpPath)
+        return False
+
+    @staticmethod
+    def __hasChildNodes(el):
+        """Element equivalent of the DOM test len(node.childNodes) > 0."""
+        return bool(el.text) or len(el) > 0
+
+    def __getElementValues(self, el, nodeList, tD):
+        """Store the values of child elements in nodeList - the value is that of the first child node as in the DOM parser."""
+        for child in el:
+            if child.tag in nodeList and self.__hasChildNodes(child):
+                tD[child.tag] = child.text if child.text else None
+
+    def __getDataStreaming(self, filePath):
+        """Build the summary, assembly set and assembly dictionaries incrementally.
+
+        Assembly sets, assemblies and molecules are collected as their end tags are seen and
+        the processed elements are removed from the tree.
+        """
+        gD = {}
+        sD = {}
+        for node in self._summaryNodeList:
+            gD[node] = None
+        #
+        elStack = []
+        curSet = None
+        curAssem = None
+        for event, el in ET.iterparse(filePath, events=("start", "end")):
+            if event == "start":
+                parentTag = elStack[-1].tag if elStack else None
+                if parentTag == "pisa_results" and el.tag in ["asm_set", "asu_complex"]:
+                    curSet = {"assembly_list": []}
+                    for node in self._assemblySetNodeList:
+                        curSet[node] = None
+                elif curSet is not None and parentTag in ["asm_set", "asu_complex"] and el.tag == "assembly":
+                    curAssem = {"molecule_list": []}
+                    for node in self._assemblyNodeList:
+                        curAssem[node] = None
+                elStack.append(el)
+                continue
+            #
+            elStack.pop()
+            parent = elStack[-1] if elStack else None
+            parentTag = parent.tag if parent is not None else None
+            if parentTag == "assembly" and el.tag == "molecule" and curAssem is not None:
+                if self.__hasChildNodes(el):
+                    mD = {}
+                    for node in self._moleculeNodeList:
+                        mD[node] = None
+                    self.__getElementValues(el, self._moleculeNodeList, mD)
+                    curAssem["molecule_list"].append(mD)
+                parent.remove(el)
+            elif parentTag in ["asm_set", "asu_complex"] and el.tag == "assembly" and curSet is not None:
+                if self.__hasChildNodes(el):
+                    self.__getElementValues(el, self._assemblyNodeList, curAssem)
+                    curSet["assembly_list"].append(curAssem)
+                curAssem = None
+                parent.remove(el)
+            elif parentTag == "pisa_results":
+                if self.__hasChildNodes(el):
+                    if el.tag in self._summaryNodeList:
+                        gD[el.tag] = el.text if el.text else None
+                    if el.tag in ["asm_set", "asu_complex"]:
+                        self.__getElementValues(el, self._assemblySetNodeList, curSet)
+                        if el.tag == "asm_set":
+                            sD[int(str(curSet["ser_no"]))] = curSet
+                        else:
+                            curSet["ser_no"] = 0
+                            sD[0] = curSet
+                if el.tag in ["asm_set", "asu_complex"]:
+                    curSet = None
+                parent.remove(el)
+        #
+        self.__setData(gD, sD)
+        return True
+
+    def __setData(self, gD, sD):
+        # make assembly dictionary
+        aD = {}
+        for _k, v in sD.items():
+            for assem in v["assembly_list"]:
+                uId = str(assem["serial_no"])
+                assem["set_ser_no"] = int(v["ser_no"])
+                assem["all_chains_at_identity"] = v["all_chains_at_identity"]
+                aD[int(uId)] = assem
+
+        self.__gD = gD
+        self.__sD = sD
+        self.__aD = aD
+
+        self.__reCalculateCompositions()
+
     def __getData(self):
-        nodeList = ["name", "status", "total_asm", "multimeric_state", "all_chains_at_identity"]
+        nodeList = self._summaryNodeList
         gD = {}
         sD = {}
         for node in nodeList:
@@ -96,25 +309,11 @@ class PisaAssemblyReader(object):
                     tD["ser_no"] = 0
                     sD[0] = tD
 
-        # make assembly dictionary
-        aD = {}
-        for _k, v in sD.items():
-            for assem in v["assembly_list"]:
-                uId = str(assem["serial_no"])
-                assem["set_ser_no"] = int(v["ser_no"])
-                assem["all_chains_at_identity"] = v["all_chains_at_identity"]
-                aD[int(uId)] = assem
-
-        self.__gD = gD
-        self.__sD = sD
-        self.__aD = aD
-
-        self.__reCalculateCompositions()
-
+        self.__setData(gD, sD)
         return True
 
     def __getAssemblySet(self, el):
-        nodeList = ["ser_no", "all_chains_at_identity"]
+        nodeList = self._assemblySetNodeList
 
         sD = {}
         for node in nodeList:
@@ -135,24 +334,7 @@ class PisaAssemblyReader(object):
         return sD
 
     def __getAssembly(self, el):
-        nodeList = [
-            "serial_no",
-            "id",
-            "size",
-            "mmsize",
-            "score",
-            "diss_energy",
-            "asa",
-            "bsa",
-            "entropy",
-            "diss_area",
-            "int_energy",
-            "n_uc",
-            "n_diss",
-            "symNumber",
-            "formula",
-            "composition",
-        ]
+        nodeList = self._assemblyNodeList
         aD = {}
         for node in nodeList:
             aD[node] = None
@@ -173,35 +355,7 @@ class PisaAssemblyReader(object):
         return aD
 
     def __getMolecule(self, el):
-        nodeList = [
-            "chain_id",
-            "visual_id",
-            "rxx",
-            "rxy",
-            "rxz",
-            "tx",
-            "ryx",
-            "ryy",
-            "ryz",
-            "ty",
-            "rzx",
-            "rzy",
-            "rzz",
-            "tz",
-            "rxx-f",
-            "rxy-f",
-            "rxz-f",
-            "tx-f",
-            "ryx-f",
-            "ryy-f",
-            "ryz-f",
-            "ty-f",
-            "rzx-f",
-            "rzy-f",
-            "rzz-f",
-            "tz-f",
-            "symId",
-        ]
+        nodeList = self._moleculeNodeList
 
         mD = {}
         for node in nodeList:
@@ -6,6 +6,7 @@
 #   2-Aug-2012  jdw   add cis peptide annotation
 #  28-Feb-2014        Add base class
 #  06-Sep-2024   zf   changed "annot-link-ssbond" to "annot-link-ssbond-with-ptm" operator
+#  18-Oct-2026   ep   run in a private task workspace and commit the model update with a version history
 #
 ##
 """
@@ -24,6 +25,7 @@ import os
 import traceback
 
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
 from wwpdb.io.locator.PathInfo import PathInfo
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 
@@ -59,43 +61,41 @@ class Link(SessionWebDownloadUtils):
         try:
             pI = PathInfo(siteId=self.__siteId, sessionPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
             csvFile = pI.getFileName(entryId, contentType="pcm-missing-data", formatType="csv", versionId="none", partNumber="1")
-            csvPath = os.path.join(self.__sessionPath, csvFile)
             #
             inpPath = os.path.join(self.__sessionPath, inpFile)
-            logPath1 = os.path.join(self.__sessionPath, entryId + "-link-anal.log")
-            logPath2 = os.path.join(self.__sessionPath, entryId + "-cispeptide-anal.log")
-            retPath1 = os.path.join(self.__sessionPath, entryId + "_model-updated_P1.cif")
-            retPath2 = os.path.join(self.__sessionPath, entryId + "_model-updated_P2.cif")
-            for filePath in (csvPath, retPath1, retPath2, logPath1, logPath2):
-                if os.access(filePath, os.R_OK):
-                    os.remove(filePath)
+            with TaskWorkspace(self.__sessionPath, entryId, "link", verbose=self.__verbose, log=self.__lfh) as ws:
+                csvPath = ws.getPath(csvFile)
+                logPath1 = ws.getPath(entryId + "-link-anal.log")
+                logPath2 = ws.getPath(entryId + "-cispeptide-anal.log")
+                retPath1 = ws.getPath(entryId + "_model-updated_P1.cif")
+                retPath2 = ws.getPath(entryId + "_model-updated_P2.cif")
+                #
+                dp = RcsbDpUtility(tmpPath=ws.getPath(), siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                dp.imp(ws.snapshot(inpPath))
+                if self.__linkArgs is not None:
+                    dp.addInput(name="link_arguments", value=self.__linkArgs)
+                dp.op("annot-link-ssbond-with-ptm")
+                dp.expLog(logPath1)
+                dp.expList(dstPathList=[retPath1, csvPath])
                 #
-            #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            dp.imp(inpPath)
-            if self.__linkArgs is not None:
-                dp.addInput(name="link_arguments", value=self.__linkArgs)
-            dp.op("annot-link-ssbond-with-ptm")
-            dp.expLog(logPath1)
-            dp.expList(dstPathList=[retPath1, csvPath])
-            self.addDownloadPath(retPath1)
-            self.addDownloadPath(logPath1)
-            #
-
-            dp.imp(retPath1)
-            dp.op("annot-cis-peptide")
-            dp.expLog(logPath2)
-            dp.exp(retPath2)
-            self.addDownloadPath(retPath2)
-            self.addDownloadPath(logPath2)
 
-            if updateInput:
-                dp.exp(inpPath)
+                dp.imp(retPath1)
+                dp.op("annot-cis-peptide")
+                dp.expLog(logPath2)
+                dp.exp(retPath2)
+                dp.cleanup()
+                ws.publish([csvPath])
+                for filePath in ws.publish([retPath1, logPath1, retPath2, logPath2]):
+                    self.addDownloadPath(filePath)
+                #
+                ok = True
+                if updateInput:
+                    ok = ws.commit(retPath2, inpPath)
+                #
             if self.__verbose:
                 self.__lfh.write("+Link.run-  completed for entryId %s file %s\n" % (entryId, inpPath))
 
-            dp.cleanup()
-            return True
+            return ok
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
             return False
@@ -3,6 +3,7 @@
 # Date:  16-Jul-2014  J. Westbrook
 #
 # Update:
+#  18-Oct-2026  add progress notes for local map calculations which are running or have failed
 ##
 """
 Manage tabular presentation of local electron maps with options for 3D display --
@@ -49,7 +50,11 @@ class MapDisplay(object):
         else:
             return {}
 
-    def renderLocalMapTable(self, rowDL, title="Table of local electron density maps for non-polymer chemical components", subdir="np-cc-maps"):
+    def renderLocalMapNote(self, title, note):
+        """Title and note for a set of local maps without a table (e.g. while the first calculation is running) --"""
+        return ["<BR />", "<h4>%s</h4>" % title, '<p class="text-info">%s</p>' % note, "<br />"]
+
+    def renderLocalMapTable(self, rowDL, title="Table of local electron density maps for non-polymer chemical components", subdir="np-cc-maps", note=None):
         """ """
 
         colList = [
@@ -87,6 +92,8 @@ class MapDisplay(object):
         #
         oL.append("<BR />")
         oL.append("<h4>%s</h4>" % title)
+        if note:
+            oL.append('<p class="text-info">%s</p>' % note)
         oL.append('<table class="table table-bordered table-striped">')
 
         # column headers --
@@ -3,6 +3,8 @@
 # Date:  16-Jul-2014  J. Westbrook
 #
 # Update:
+#  18-Oct-2026  run the regular and omit map calculations concurrently in a task workspace and record their progress
+#  18-Oct-2026  an entry without ligands replaces the previous maps with an empty directory, the running state is always cleared
 #
 ##
 """
@@ -15,13 +17,18 @@ __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
+import json
 import sys
 import os.path
 import os
+import threading
+import time
 import traceback
 
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.TaskPool import TaskPool
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
 
 
 class NpCcMapCalc(SessionWebDownloadUtils):
@@ -30,6 +37,8 @@ class NpCcMapCalc(SessionWebDownloadUtils):
 
     """
 
+    __progressFileName = "np-cc-maps-progress.json"
+
     def __init__(self, reqObj=None, verbose=False, log=sys.stderr):
         super(NpCcMapCalc, self).__init__(reqObj=reqObj, verbose=verbose, log=log)
         self.__verbose = verbose
@@ -38,6 +47,7 @@ class NpCcMapCalc(SessionWebDownloadUtils):
         #
         self.__mapArgs = None
         self.__cleanup = True
+        self.__progressLock = threading.Lock()
         #
         self.__setup()
 
@@ -50,7 +60,14 @@ class NpCcMapCalc(SessionWebDownloadUtils):
         self.__mapArgs = mapArgs
 
     def run(self, entryId, modelInputFile=None, expInputFile=None, updateInput=True, doOmit=False):  # pylint: disable=unused-argument
-        """Run map calculations operation -"""
+        """Run map calculations operation -
+
+        The regular and omit map calculations run concurrently on snapshots of the model and structure
+        factor files, each writing to its own scratch directory.  The session map directory of each
+        calculation ('np-cc-maps' and 'np-cc-omit-maps') is replaced as soon as that calculation
+        completes and its state is recorded in the progress file (see readProgress()).
+        """
+        inpPath = None
         try:
             if modelInputFile is None:
                 modelFileName = entryId + "_model_P1.cif"
@@ -64,64 +81,95 @@ class NpCcMapCalc(SessionWebDownloadUtils):
             else:
                 sfPath = os.path.join(self.__sessionPath, expInputFile)
             #
-            logPath = os.path.join(self.__sessionPath, entryId + "_map-npcc-calc.log")
-            if os.access(logPath, os.R_OK):
-                os.remove(logPath)
-            #
-            outDataPath = os.path.join(self.__sessionPath, "np-cc-maps")
-            outIndexPath = os.path.join(self.__sessionPath, "np-cc-maps", "np-cc-maps-index.cif")
+            mapTypeList = ["np-cc-maps", "np-cc-omit-maps"] if doOmit else ["np-cc-maps"]
+            with TaskWorkspace(self.__sessionPath, entryId, "np-cc-maps", verbose=self.__verbose, log=self.__lfh) as ws:
+                modelSnapPath = ws.snapshot(inpPath)
+                sfSnapPath = ws.snapshot(sfPath)
+                self.__setProgress({mapType: "running" for mapType in mapTypeList})
+                ok = False
+                try:
+                    tP = TaskPool(maxWorkers=len(mapTypeList), verbose=self.__verbose, log=self.__lfh)
+                    for mapType in mapTypeList:
+                        tP.add(mapType, self.__makeMaps, ws, entryId, modelSnapPath, sfSnapPath, mapType)
+                    ok = all(tOk and result for _mapType, tOk, result in tP.run())
+                finally:
+                    # Calculations which did not finish are not left in the running state
+                    self.__clearRunning(mapTypeList)
+                #
+            if self.__verbose:
+                self.__lfh.write("+NpCcMapCalc.run-  completed for entryId %s file %s status %r\n" % (entryId, inpPath, ok))
+            return ok
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+NpCcMapCalc.run-  failed with exception for entryId %s file %s\n" % (entryId, inpPath))
+
+            traceback.print_exc(file=self.__lfh)
+            return False
+
+    def __makeMaps(self, ws, entryId, modelPath, sfPath, mapType):
+        """Calculate one set of local maps in the scratch directory and install it in the session."""
+        ok = False
+        try:
+            logFileName = entryId + ("_map-omit-npcc-calc.log" if mapType == "np-cc-omit-maps" else "_map-npcc-calc.log")
+            workPath = ws.getPath(mapType + "-work")
+            os.makedirs(workPath)
+            outDataPath = ws.getPath(mapType)
+            outIndexPath = os.path.join(outDataPath, mapType + "-index.cif")
             #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+            dp = RcsbDpUtility(tmpPath=workPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
             dp.setDebugMode(flag=True)
-            dp.imp(inpPath)
+            dp.imp(modelPath)
             dp.addInput(name="sf_file_path", value=sfPath)
 
             if self.__mapArgs is not None:
                 dp.addInput(name="map_arguments", value=self.__mapArgs)
 
+            if mapType == "np-cc-omit-maps":
+                dp.addInput(name="omit_map", value=True)
             dp.addInput(name="output_data_path", value=outDataPath)
             dp.addInput(name="output_index_path", value=outIndexPath)
             dp.op("annot-make-ligand-maps")
-            dp.expLog(logPath)
-            self.addDownloadPath(logPath)
-            #
-            #
-            if self.__verbose:
-                self.__lfh.write("+NpCcMapCalc.run-  completed for entryId %s file %s\n" % (entryId, inpPath))
+            dp.expLog(ws.getPath(logFileName))
             if self.__cleanup:
                 dp.cleanup()
-
-            if doOmit:
-                dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=True, log=self.__lfh)
-                dp.setDebugMode(flag=True)
-                #
-                logPath = os.path.join(self.__sessionPath, entryId + "_map-omit-npcc-calc.log")
-                if os.access(logPath, os.R_OK):
-                    os.remove(logPath)
-                #
-                outDataPath = os.path.join(self.__sessionPath, "np-cc-omit-maps")
-                outIndexPath = os.path.join(self.__sessionPath, "np-cc-omit-maps", "np-cc-omit-maps-index.cif")
-                dp.imp(inpPath)
-                dp.addInput(name="sf_file_path", value=sfPath)
-
-                if self.__mapArgs is not None:
-                    dp.addInput(name="map_arguments", value=self.__mapArgs)
-
-                dp.addInput(name="omit_map", value=True)
-                dp.addInput(name="output_data_path", value=outDataPath)
-                dp.addInput(name="output_index_path", value=outIndexPath)
-                dp.op("annot-make-ligand-maps")
-                dp.expLog(logPath)
-                self.addDownloadPath(logPath)
+            #
+            for filePath in ws.publish([ws.getPath(logFileName)]):
+                self.addDownloadPath(filePath)
+            # An entry without ligands has no output directory - the previous results are replaced by an empty directory
+            if not os.path.isdir(outDataPath):
                 if self.__verbose:
-                    self.__lfh.write("+NpCcMapCalc.run-  completed for entryId %s file %s\n" % (entryId, inpPath))
-                if self.__cleanup:
-                    dp.cleanup()
-
-            return True
-        except:  # noqa: E722 pylint: disable=bare-except
+                    self.__lfh.write("+NpCcMapCalc.__makeMaps-  %s no local maps for entryId %s\n" % (mapType, entryId))
+                os.makedirs(outDataPath)
+            ws.publishDirectory(outDataPath)
+            ok = True
             if self.__verbose:
-                self.__lfh.write("+NpCcMapCalc.run-  failed with exception for entryId %s file %s\n" % (entryId, inpPath))
-
-            traceback.print_exc(file=self.__lfh)
-            return False
+                self.__lfh.write("+NpCcMapCalc.__makeMaps-  %s completed for entryId %s\n" % (mapType, entryId))
+            return True
+        finally:
+            self.__setProgress({mapType: "done" if ok else "failed"})
+
+    def __clearRunning(self, mapTypeList):
+        """Record calculations in mapTypeList which are still marked as running as failed."""
+        progressD = NpCcMapCalc.readProgress(self.__sessionPath)
+        self.__setProgress({mapType: "failed" for mapType in mapTypeList if progressD.get(mapType, {}).get("state") == "running"})
+
+    def __setProgress(self, stateD):
+        with self.__progressLock:
+            progressD = NpCcMapCalc.readProgress(self.__sessionPath)
+            for mapType, state in stateD.items():
+                progressD[mapType] = {"state": state, "time": time.time()}
+            progressPath = os.path.join(self.__sessionPath, self.__progressFileName)
+            with open(progressPath + ".tmp", "w") as ofh:
+                json.dump(progressD, ofh)
+            os.replace(progressPath + ".tmp", progressPath)
+
+    @staticmethod
+    def readProgress(sessionPath):
+        """Return the state of the last local map calculations - dictionary of map directory name ('np-cc-maps' or 'np-cc-omit-maps')
+        and {"state": running|done|failed, "time": time of the last change}.
+        """
+        try:
+            with open(os.path.join(sessionPath, NpCcMapCalc.__progressFileName), "r") as ifh:
+                return json.load(ifh)
+        except (IOError, OSError, ValueError):
+            return {}
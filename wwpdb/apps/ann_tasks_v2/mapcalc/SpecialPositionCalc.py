@@ -4,6 +4,7 @@
 #
 # Update:
 # 28-Feb -2014  Add base class
+# 18-Oct -2026  Run in a private task workspace and publish the report and log to the session
 #
 ##
 """
@@ -24,6 +25,7 @@ import traceback
 
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
 from mmcif.io.IoAdapterCore import IoAdapterCore
 
 
@@ -70,13 +72,10 @@ class SpecialPositionCalc(SessionWebDownloadUtils):
             else:
                 inpPath = os.path.join(self.__sessionPath, modelInputFile)
             #
-            logPath = os.path.join(self.__sessionPath, entryId + "_special-position-calc.log")
-            if os.access(logPath, os.R_OK):
-                os.remove(logPath)
-            #
-            self.__reportPath = os.path.join(self.__sessionPath, entryId + "_special-position-report_P1.txt.V1")
-            if os.access(self.__reportPath, os.R_OK):
-                os.remove(self.__reportPath)
+            logFileName = entryId + "_special-position-calc.log"
+            reportFileName = entryId + "_special-position-report_P1.txt.V1"
+            self.__reportPath = os.path.join(self.__sessionPath, reportFileName)
+            self.__reportFileSize = 0
             #
             # We should not run special position check for NMR, EM.  Program detects no unit cell and complains
             # Program used to crash - which is why error being reported.
@@ -95,30 +94,35 @@ class SpecialPositionCalc(SessionWebDownloadUtils):
                                 break
 
                         if not runProcess:
+                            for fileName in (reportFileName, logFileName):
+                                if os.access(os.path.join(self.__sessionPath, fileName), os.F_OK):
+                                    os.remove(os.path.join(self.__sessionPath, fileName))
                             return True
             except:  # noqa: E722 pylint: disable=bare-except
                 pass
 
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            dp.imp(inpPath)
-            # if (self.__dccArgs is not None):
-            #    dp.addInput(name="dcc_arguments",value=self.__dccArgs)
-            dp.op("annot-dcc-special-position")
-            dp.expLog(logPath)
-            self.__reportFileSize = dp.expSize()
-            if self.__reportFileSize > 0:
-                dp.exp(self.__reportPath)
-                self.addDownloadPath(self.__reportPath)
-            #
-            self.addDownloadPath(logPath)
+            with TaskWorkspace(self.__sessionPath, entryId, "special-position", verbose=self.__verbose, log=self.__lfh) as ws:
+                dp = RcsbDpUtility(tmpPath=ws.getPath(), siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                dp.imp(ws.snapshot(inpPath))
+                # if (self.__dccArgs is not None):
+                #    dp.addInput(name="dcc_arguments",value=self.__dccArgs)
+                dp.op("annot-dcc-special-position")
+                dp.expLog(ws.getPath(logFileName))
+                self.__reportFileSize = dp.expSize()
+                if self.__reportFileSize > 0:
+                    dp.exp(ws.getPath(reportFileName))
+                #
+                if self.__cleanup:
+                    dp.cleanup()
+                #
+                for filePath in ws.publish([ws.getPath(reportFileName), ws.getPath(logFileName)]):
+                    self.addDownloadPath(filePath)
+                #
             if self.__verbose:
                 self.__lfh.write(
                     "+%s.%s special position check completed for entryId %s file %s report size %d\n"
                     % (self.__class__.__name__, inspect.currentframe().f_code.co_name, entryId, inpPath, self.__reportFileSize)
                 )
-
-            if self.__cleanup:
-                dp.cleanup()
             #
             return True
         except:  # noqa: E722 pylint: disable=bare-except
@@ -5,6 +5,7 @@
 # Update:
 #   4-July-2012 jdw  - tested in webapp
 #   28-Feb -2014  Add base class
+#   18-Oct -2026  Run in a private task workspace and commit the model update with a version history
 ##
 """
 Manage the calculation of geometrical features of nucleic acid polymers.
@@ -23,6 +24,7 @@ import traceback
 
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
 
 
 class NAFeatures(SessionWebDownloadUtils):
@@ -53,35 +55,29 @@ class NAFeatures(SessionWebDownloadUtils):
         """Run the geometrical feature calculation and merge the result with model file."""
         try:
             inpPath = os.path.join(self.__sessionPath, inpFile)
-            logPath1 = os.path.join(self.__sessionPath, entryId + "-na-anal.log")
-            retPath = os.path.join(self.__sessionPath, entryId + "_model-updated_P1.cif")
-            for filePath in (retPath, logPath1):
-                if os.access(filePath, os.R_OK):
-                    os.remove(filePath)
+            with TaskWorkspace(self.__sessionPath, entryId, "na-features", verbose=self.__verbose, log=self.__lfh) as ws:
+                logPath1 = ws.getPath(entryId + "-na-anal.log")
+                retPath = ws.getPath(entryId + "_model-updated_P1.cif")
+                #
+                dp = RcsbDpUtility(tmpPath=ws.getPath(), siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                dp.imp(ws.snapshot(inpPath))
+                if self.__naArgs is not None:
+                    dp.addInput(name="na_arguments", value=self.__naArgs)
+                dp.op("annot-base-pair-info")
+                dp.expLog(logPath1)
+                dp.exp(retPath)
+                dp.cleanup()
+                #
+                for filePath in ws.publish([retPath, logPath1]):
+                    self.addDownloadPath(filePath)
+                ok = os.access(retPath, os.R_OK)
+                if updateInput and ok:
+                    ok = ws.commit(retPath, inpPath)
                 #
-            #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            dp.imp(inpPath)
-            if self.__naArgs is not None:
-                dp.addInput(name="na_arguments", value=self.__naArgs)
-            dp.op("annot-base-pair-info")
-            dp.expLog(logPath1)
-            dp.exp(retPath)
-            #
-            self.addDownloadPath(retPath)
-            self.addDownloadPath(logPath1)
-            if updateInput and os.access(retPath, os.R_OK):
-                dp.exp(inpPath)
-            #
             if self.__verbose:
                 self.__lfh.write("+NAFeatures.run-  completed for entryId %s file %s\n" % (entryId, inpPath))
             #
-            dp.cleanup()
-            if os.access(retPath, os.R_OK):
-                return True
-            else:
-                return False
-            #
+            return ok
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
             return False
@@ -2,6 +2,9 @@
 # File:  NmrChemShiftProcessUtils.py
 # Date:  18-Sep-2018  Zukang Feng
 #
+# Updates:
+#  18-Oct-2026  run the processing steps as a stage pipeline which skips steps with unchanged inputs
+#
 ##
 """
 Chemical shift nomenclature checking and update tools --
@@ -26,6 +29,7 @@ from wwpdb.io.locator.PathInfo import PathInfo
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.utils.nmr.NmrDpUtility import NmrDpUtility
 from wwpdb.apps.ann_tasks_v2.utils.NmrRemediationUtils import remediate_cs_file, starToPdbx
+from wwpdb.apps.ann_tasks_v2.utils.StagePipeline import StagePipeline
 
 
 class NmrChemShiftProcessUtils(object):
@@ -52,6 +56,9 @@ class NmrChemShiftProcessUtils(object):
         self.__outNefFilePath = ""
         self.__outReportFilePath = ""
         self.__validationResultPath = []
+        #
+        self.__stageCaching = True
+        self.__stageReport = []
 
     def setWorkingDirPath(self, dirPath=""):
         """Set working dir path"""
@@ -136,48 +143,123 @@ class NmrChemShiftProcessUtils(object):
             dstPathList = []
         self.__validationResultPath = dstPathList
 
+    def setStageCaching(self, flag=True):
+        """Skip processing steps whose input files are unchanged since their last run in the working directory (default True)"""
+        self.__stageCaching = flag
+
+    def getStageReport(self):
+        """Return the list of (step, action, seconds) of the last run - action is 'run', 'failed' or 'skipped'"""
+        return self.__stageReport
+
     def run(self):
-        """Run all processing steps required by annotator team"""
-        self.__moveBestRepresentativeModel()
-        self.__updateCsFileAndRunNomenclatureCheck()
-        self.__runNmrValidationMiscellaneousCheck()
-        self.__outputReportFile()
+        """Run all processing steps required by annotator team
+
+        The miscellaneous checks and the report file do not depend on each other and are run concurrently.
+        """
+        sp = self.__getPipeline()
+        self.__addRepresentativeModelStage(sp)
+        sp.addStage(
+            "cs-update",
+            self.__stage(self.__updateCsFileAndRunNomenclatureCheck),
+            inputD={"cs": self.__inCsFilePath, "model": self.__inModelFilePath, "out-model": self.__outModelFilePath},
+            outputList=[self.__outCsFilePath],
+            dependsOn=["representative-model"],
+            restoreFunc=self.__applyStageMeta,
+        )
+        sp.addStage(
+            "misc-check",
+            self.__stage(self.__runNmrValidationMiscellaneousCheck),
+            inputD={"cs": self.__inCsFilePath, "out-cs": self.__outCsFilePath, "model": self.__inModelFilePath, "out-model": self.__outModelFilePath},
+            outputList=self.__validationResultPath,
+            dependsOn=["cs-update"],
+        )
+        sp.addStage("report", self.__stage(self.__outputReportFile), outputList=[self.__outReportFilePath], dependsOn=["cs-update"], cache=False)
+        sp.run()
+        self.__stageReport = sp.getReport()
 
     def runNefProcess(self, identifier=""):
         """ Run ref file checking & updating process
         """
-        self.__moveBestRepresentativeModel()
+        sp = self.__getPipeline()
+        self.__addRepresentativeModelStage(sp)
+        sp.addStage(
+            "nef-update",
+            self.__stage(self.__updateNefFile, identifier),
+            inputD={"nef": self.__inNefFilePath, "model": self.__inModelFilePath, "out-model": self.__outModelFilePath},
+            outputList=[self.__outNefFilePath, self.__outReportFilePath],
+            paramD={"identifier": identifier},
+            dependsOn=["representative-model"],
+            restoreFunc=self.__applyStageMeta,
+        )
+        sp.run()
+        self.__stageReport = sp.getReport()
+
+    def __getPipeline(self):
+        manifestPath = os.path.join(self.__workingDirPath, "nmr-cs-process-stages.json") if self.__stageCaching else None
+        return StagePipeline(manifestPath=manifestPath, verbose=self.__verbose, log=self.__lfh)
+
+    def __addRepresentativeModelStage(self, sp):
+        sp.addStage(
+            "representative-model",
+            self.__stage(self.__moveBestRepresentativeModel),
+            inputD={"model": self.__inModelFilePath},
+            outputList=[self.__outModelFilePath],
+            restoreFunc=self.__applyStageMeta,
+        )
+
+    def __stage(self, func, *args):
+        """Wrap a processing step as a pipeline stage function returning (ok, metaD)"""
+
+        def runStage():
+            metaD = {"messages": [], "outputs": []}
+            ok = func(metaD, *args)
+            self.__applyStageMeta(metaD)
+            return ok, metaD
+
+        return runStage
+
+    def __applyStageMeta(self, metaD):
+        """Apply the messages and check report produced by a processing step (also when the step is skipped)"""
+        for msg in metaD.get("messages", []):
+            self.__insertSystemLogMessage(msg)
+        #
+        if metaD.get("checkReportFilePath"):
+            self.__checkReportFilePath = metaD["checkReportFilePath"]
         #
+
+    def __updateNefFile(self, metaD, identifier=""):
+        """Update the nef file relative to the coordinate model"""
         if not self.__inNefFilePath:
-            self.__insertSystemLogMessage("Input nef file was not provided.")
-            return
+            metaD["messages"].append("Input nef file was not provided.")
+            return False
         #
         if not os.access(self.__inNefFilePath, os.R_OK):
-            self.__insertSystemLogMessage("Nef file '" + self.__inNefFilePath + "' does not exist.")
-            return
+            metaD["messages"].append("Nef file '" + self.__inNefFilePath + "' does not exist.")
+            return False
         #
         xyzFilePath = ""
         if self.__inModelFilePath and os.access(self.__inModelFilePath, os.R_OK):
             xyzFilePath = self.__inModelFilePath
         else:
-            return
+            return False
         #
         if self.__outModelFilePath and os.access(self.__outModelFilePath, os.R_OK):
             xyzFilePath = self.__outModelFilePath
         #
-        self.__updateNefFileAndRunNomenclatureCheck(xyzFilePath)
-        self.__updateNefFileWithNmrDpUtility(xyzFilePath, identifier=identifier)
+        self.__updateNefFileAndRunNomenclatureCheck(xyzFilePath, metaD)
+        return self.__updateNefFileWithNmrDpUtility(xyzFilePath, identifier=identifier)
 
-    def __moveBestRepresentativeModel(self):
+    def __moveBestRepresentativeModel(self, metaD):
         """Run the selection of representative model update from _pdbx_nmr_representative.conformer_id"""
+        ok = False
         try:
             if not self.__inModelFilePath:
-                self.__insertSystemLogMessage("Input model file was not provided.")
-                return
+                metaD["messages"].append("Input model file was not provided.")
+                return False
             #
             if not os.access(self.__inModelFilePath, os.R_OK):
-                self.__insertSystemLogMessage("Model file '" + self.__inModelFilePath + "' does not exist.")
-                return
+                metaD["messages"].append("Model file '" + self.__inModelFilePath + "' does not exist.")
+                return False
             #
             self.__lfh.write("\nStarting %s %s\n" % (self.__class__.__name__, inspect.currentframe().f_code.co_name))
             #
@@ -192,38 +274,42 @@ class NmrChemShiftProcessUtils(object):
                 dp.exp(self.__outModelFilePath)
             #
             if logMessage:
-                self.__insertSystemLogMessage(logMessage)
+                metaD["messages"].append(logMessage)
             #
             dp.cleanup()
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
+            ok = False
         #
+        return ok
 
-    def __updateCsFileAndRunNomenclatureCheck(self):
+    def __updateCsFileAndRunNomenclatureCheck(self, metaD):
         """Update chemical shift atom naming relative to any changes in the coordinate model.
         This operation acts on chemical shift files that are in PDBx format and have been
         preprocessed with to contain original atom nomenclature details.
         """
+        ok = False
         try:
             if not self.__inCsFilePath:
-                self.__insertSystemLogMessage("Input chemical shifts file was not provided.")
-                return
+                metaD["messages"].append("Input chemical shifts file was not provided.")
+                return False
             #
             if not os.access(self.__inCsFilePath, os.R_OK):
-                self.__insertSystemLogMessage("Chemical shifts file '" + self.__inCsFilePath + "' does not exist.")
-                return
+                metaD["messages"].append("Chemical shifts file '" + self.__inCsFilePath + "' does not exist.")
+                return False
             #
             xyzFilePath = ""
             if self.__inModelFilePath and os.access(self.__inModelFilePath, os.R_OK):
                 xyzFilePath = self.__inModelFilePath
             else:
-                return
+                return False
             #
             if self.__outModelFilePath and os.access(self.__outModelFilePath, os.R_OK):
                 xyzFilePath = self.__outModelFilePath
             #
             self.__lfh.write("\nStarting %s %s\n" % (self.__class__.__name__, inspect.currentframe().f_code.co_name))
-            self.__checkReportFilePath = os.path.join(self.__workingDirPath, "chem-shifts-update-checking-" + str(time.strftime("%Y%m%d%H%M%S", time.localtime())) + ".cif")
+            metaD["checkReportFilePath"] = os.path.join(self.__workingDirPath, "chem-shifts-update-checking-" + str(time.strftime("%Y%m%d%H%M%S", time.localtime())) + ".cif")
+            metaD["outputs"].append(metaD["checkReportFilePath"])
             #
             dp = RcsbDpUtility(tmpPath=self.__workingDirPath, siteId=self.__siteId, verbose=True)
             #
@@ -236,24 +322,26 @@ class NmrChemShiftProcessUtils(object):
             dp.expLog(logPath)
             ok, logMessage = self.__processLogFile("RcsbDpUtility.op='annot-chem-shifts-update'", logPath)
             if ok:
-                dp.expList(dstPathList=[self.__outCsFilePath, self.__checkReportFilePath])
+                dp.expList(dstPathList=[self.__outCsFilePath, metaD["checkReportFilePath"]])
             #
             if logMessage:
-                self.__insertSystemLogMessage(logMessage)
+                metaD["messages"].append(logMessage)
             #
             dp.cleanup()
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
+            ok = False
         #
+        return ok
 
-    def __updateNefFileAndRunNomenclatureCheck(self, xyzFilePath):
+    def __updateNefFileAndRunNomenclatureCheck(self, xyzFilePath, metaD):
         """Update chemical shift atom naming relative to any changes in the coordinate model.
         This operation acts on chemical shift files that are in PDBx format and have been
         preprocessed with to contain original atom nomenclature details.
         """
         try:
             self.__lfh.write("\nStarting %s %s\n" % (self.__class__.__name__, inspect.currentframe().f_code.co_name))
-            self.__checkReportFilePath = os.path.join(self.__workingDirPath, "nef-update-checking-" + str(time.strftime("%Y%m%d%H%M%S", time.localtime())) + ".cif")
+            metaD["checkReportFilePath"] = os.path.join(self.__workingDirPath, "nef-update-checking-" + str(time.strftime("%Y%m%d%H%M%S", time.localtime())) + ".cif")
             #
             dp = RcsbDpUtility(tmpPath=self.__workingDirPath, siteId=self.__siteId, verbose=True)
             #
@@ -296,7 +384,7 @@ class NmrChemShiftProcessUtils(object):
                     #
                 #
                 if identifier == "":
-                    return
+                    return False
                 #
             #
             nefFilePath = self.__inNefFilePath
@@ -322,7 +410,7 @@ class NmrChemShiftProcessUtils(object):
             dp.exp(nmrDataStrFilePath)
             dp.cleanup()
             if not os.access(nmrDataStrFilePath, os.R_OK):
-                return
+                return False
             #
             ndp = NmrDpUtility()
             ndp.setSource(nmrDataStrFilePath)
@@ -362,25 +450,27 @@ class NmrChemShiftProcessUtils(object):
 #           #
             if os.access(updatedNmrDataFilePath, os.R_OK):
                 shutil.copyfile(updatedNmrDataFilePath, self.__outNefFilePath)
+                return True
             #
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
         #
+        return False
 
-    def __runNmrValidationMiscellaneousCheck(self):
+    def __runNmrValidationMiscellaneousCheck(self, metaD):  # pylint: disable=unused-argument
         """Run NMR miscellaneous checks implemented in the validation pipeline"""
         try:
             xyzFilePath = ""
             if self.__inModelFilePath and os.access(self.__inModelFilePath, os.R_OK):
                 xyzFilePath = self.__inModelFilePath
             else:
-                return
+                return False
             #
             csFilePath = ""
             if self.__inCsFilePath and os.access(self.__inCsFilePath, os.R_OK):
                 csFilePath = self.__inCsFilePath
             else:
-                return
+                return False
             #
             if self.__outModelFilePath and os.access(self.__outModelFilePath, os.R_OK):
                 xyzFilePath = self.__outModelFilePath
@@ -408,19 +498,21 @@ class NmrChemShiftProcessUtils(object):
             #
             logPath = os.path.join(self.__workingDirPath, "nmr-cs-check-rpt-" + str(time.strftime("%Y%m%d%H%M%S", time.localtime())) + ".log")
             dp.expLog(logPath)
-            dp.expList(dstPathList=self.__validationResultPath)
+            ok = dp.expList(dstPathList=self.__validationResultPath)
             #
             # do something with logPath file?
             #
             dp.cleanup()
+            return bool(ok)
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
         #
+        return False
 
-    def __outputReportFile(self):
+    def __outputReportFile(self, metaD):  # pylint: disable=unused-argument
         """Write atom nomenclature checking result"""
         if not self.__outReportFilePath:
-            return
+            return False
         #
         jsonObj = {}
         #
@@ -437,6 +529,7 @@ class NmrChemShiftProcessUtils(object):
         with open(self.__outReportFilePath, "w") as outfile:
             json.dump(jsonObj, outfile)
         #
+        return True
 
     def __insertSystemLogMessage(self, msg):
         """Append log message to self.__systemLogMessage"""
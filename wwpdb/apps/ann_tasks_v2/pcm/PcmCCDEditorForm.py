@@ -11,6 +11,7 @@ import traceback
 
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.io.locator.PathInfo import PathInfo
+from wwpdb.apps.ann_tasks_v2.utils.DetachStatus import DetachStatus
 
 
 class PcmCCDEditorForm(object):
@@ -60,6 +61,7 @@ class PcmCCDEditorForm(object):
             return False
         #
         if self.__identifier == self.__entryId:
+            self.__setStage("running PCM CCD check")
             self.__runPcmCcdCheck()
 
         if os.access(self.__csvPath, os.F_OK):
@@ -67,6 +69,12 @@ class PcmCCDEditorForm(object):
         #
         return False
 
+    def __setStage(self, stage):
+        """Report the stage of the operation when it is run detached."""
+        dS = DetachStatus.fromRequest(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        if dS is not None:
+            dS.setStage(stage)
+
     def __runPcmCcdCheck(self):
         """Run PCM script to check missing annotation"""
         self.__entryFile = self.__reqObj.getValue("entryfilename")
@@ -84,6 +92,7 @@ class PcmCCDEditorForm(object):
             dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
             dp.imp(inpPdbxPath)
             dp.op("annot-pcm-check-ccd-ann")
+            self.__setStage("saving PCM CCD check results")
             dp.expList(dstPathList=[inpPdbxPath, self.__csvPath])
             dp.cleanup()
         except:  # noqa: E722 pylint: disable=bare-except
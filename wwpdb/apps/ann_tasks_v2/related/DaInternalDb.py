@@ -2,6 +2,7 @@
 # Date:  16-Feb-2020 E. Peisach
 #
 # Update:
+#  18-Oct-2026  Add batched getDatabase2Many(), in-process cache of resolved ids and lazy connection open
 #
 ##
 """
@@ -10,19 +11,41 @@ Retrives data from da_internal pertaining lookup data
 
 from wwpdb.utils.db.MyConnectionBase import MyConnectionBase
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 
 class DaInternalDb(object):
-    def __init__(self, siteId=None):
+    """Lookups in da_internal.
+
+    Connections are taken from (and returned to) the process connection pool maintained by
+    MyConnectionBase.  The connection is opened on first use and held until close() so a
+    single instance may be used for any number of lookups.
+
+    database_2 assignments for a deposition do not change once made, so resolved ids are held
+    in an in-process cache for cacheTtl seconds.  Depositions without assignments are not cached.
+    """
+
+    # (siteId, structure_id) -> (time stored, {database_id: database_code})
+    _cacheD = {}
+    _cacheLock = threading.Lock()
+    # Maximum number of ids in a single IN () query
+    _maxBatch = 500
+
+    def __init__(self, siteId=None, cacheTtl=600):
         self.__mydb = None
         self.__siteId = siteId
-        self.__open()
+        self.__cacheTtl = cacheTtl
 
     def __del__(self):
         self.__close()
 
+    def close(self):
+        """Return the connection to the pool."""
+        self.__close()
+
     def __open(self, resource="DA_INTERNAL"):
         """Opens up DB connection"""
         self.__mydb = MyConnectionBase(siteId=self.__siteId)
@@ -40,22 +63,79 @@ class DaInternalDb(object):
             self.__mydb.closeConnection()
             self.__mydb = None
 
-    def getDatabase2(self, structure_id):
-        query = """select database_id, database_code from database_2 where Structure_id = %s"""
+    def __getCursor(self):
+        if self.__mydb is None and not self.__open():
+            return None
+        return self.__mydb.getCursor()
+
+    def __getCached(self, structure_id):
+        if not self.__cacheTtl:
+            return None
+        key = (self.__siteId, structure_id)
+        with DaInternalDb._cacheLock:
+            entry = DaInternalDb._cacheD.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.__cacheTtl:
+                del DaInternalDb._cacheD[key]
+                return None
+            return dict(entry[1])
+
+    def __setCached(self, structure_id, data):
+        if not self.__cacheTtl or not data:
+            return
+        with DaInternalDb._cacheLock:
+            DaInternalDb._cacheD[(self.__siteId, structure_id)] = (time.time(), dict(data))
+
+    @classmethod
+    def clearCache(cls):
+        with cls._cacheLock:
+            cls._cacheD.clear()
 
-        curs = self.__mydb.getCursor()
-
-        data = {}
-        curs.execute(query, (structure_id,))
-
-        row = curs.fetchone()
-        while row is not None:
-            data[row[0]] = row[1]
-            row = curs.fetchone()
-
-        curs.close()
-
-        return data
+    def getDatabase2(self, structure_id):
+        return self.getDatabase2Many([structure_id]).get(structure_id, {})
+
+    def getDatabase2Many(self, structureIdList):
+        """Return a dictionary of database_2 assignments for each of the input deposition ids -
+
+        {structure_id: {database_id: database_code, ...}, ...}
+
+        Ids without assignments are returned with an empty dictionary.
+        """
+        retD = {}
+        missL = []
+        for structure_id in structureIdList:
+            if structure_id in retD:
+                continue
+            data = self.__getCached(structure_id)
+            if data is None:
+                retD[structure_id] = {}
+                if structure_id not in missL:
+                    missL.append(structure_id)
+            else:
+                retD[structure_id] = data
+        if not missL:
+            return retD
+        #
+        curs = self.__getCursor()
+        if curs is None:
+            return retD
+        try:
+            for ii in range(0, len(missL), self._maxBatch):
+                batch = missL[ii : ii + self._maxBatch]
+                query = "select Structure_id, database_id, database_code from database_2 where Structure_id in (%s)" % ",".join(["%s"] * len(batch))
+                curs.execute(query, tuple(batch))
+                row = curs.fetchone()
+                while row is not None:
+                    if row[0] in retD:
+                        retD[row[0]][row[1]] = row[2]
+                    row = curs.fetchone()
+        finally:
+            curs.close()
+        #
+        for structure_id in missL:
+            self.__setCached(structure_id, retD[structure_id])
+        return retD
 
 
 if __name__ == "__main__":
@@ -64,3 +144,5 @@ if __name__ == "__main__":
     print(dt)
     dt = da.getDatabase2("D_800099")
     print(dt)
+    dt = da.getDatabase2Many(["D_800012", "D_800099"])
+    print(dt)
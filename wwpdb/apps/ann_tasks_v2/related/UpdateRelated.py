@@ -2,6 +2,8 @@
 # Date:  16-Feb-2020 E. Peisach
 #
 # Update:
+#  18-Oct-2026  Resolve all related deposition ids with one batched lookup
+#  18-Oct-2026  Read and write back only pdbx_database_related
 #
 ##
 """
@@ -9,10 +11,8 @@ Resolve pdbx_database_related that point at other deposition s
 """
 
 import sys
-import os
-import tempfile
 import logging
-from mmcif.io.IoAdapterCore import IoAdapterCore
+from wwpdb.apps.ann_tasks_v2.io.PdbxCategoryIo import PdbxCategoryIo
 from wwpdb.apps.ann_tasks_v2.related.DaInternalDb import DaInternalDb
 
 logger = logging.getLogger(__name__)
@@ -23,7 +23,8 @@ class UpdateRelated(object):
         # self.__verbose = verbose
         # self.__lfh = log
         self.__siteId = siteId
-        self.__ioObj = IoAdapterCore()
+        self.__ioObj = PdbxCategoryIo()
+        self.__categoryList = ["pdbx_database_related"]
 
     def updateRelatedEntries(self, fPathIn, fPathOut, logPath):
         """Updates pdbx_database_related in fPathIn.  If updates made, fPathOut written.
@@ -34,15 +35,14 @@ class UpdateRelated(object):
         logger.info("Starting with update %s to %s", fPathIn, fPathOut)
         ret = False
         with open(logPath, "w") as logf:
-            cin = self.__getContainerList(fPathIn)
-            if cin is None:
+            block0 = self.__getContainer(fPathIn)
+            if block0 is None:
                 logf.write("Could not load %s\n" % fPathIn)
                 return False
 
-            block0 = cin[0]
             ret = self.__updateRelatedCategory(block0, logf)
             if ret:
-                self.__writeContainerList(fPathOut, cin)
+                self.__writeContainer(fPathIn, fPathOut, block0)
                 logger.info("Updated file %s written", fPathOut)
 
             logf.write("Done\n")
@@ -57,56 +57,57 @@ class UpdateRelated(object):
         cobj = block.getObj("pdbx_database_related")
         if cobj:
             # Category exists
+            rowL = []
             for row in range(cobj.getRowCount()):
                 db_name = cobj.getValue("db_name", row)
                 db_id = cobj.getValue("db_id", row)
                 if db_id is not None:
                     db_id = db_id.strip()
                 if db_name in ["PDB", "BMRB", "EMDB"] and db_id[:2] == "D_":
-                    dbids = self.__getRelatedIds(db_id)
-                    if dbids is None:
-                        logf.write("Failed to retrieve database_2 info for %s\n" % db_id)
-                        continue
-                    if db_name in dbids:
-                        update = dbids[db_name]
-                        cobj.setValue(update, "db_id", row)
-                        logf.write("Updating %s %s to %s\n" % (db_name, db_id, update))
-                        ret = True
-                    else:
-                        logf.write("database_2 info for %s does not contain %s id\n" % (db_id, db_name))
+                    rowL.append((row, db_name, db_id))
+            if not rowL:
+                return ret
+            #
+            relatedD = self.__getRelatedIdsMany([db_id for _row, _db_name, db_id in rowL])
+            for row, db_name, db_id in rowL:
+                dbids = relatedD.get(db_id)
+                if dbids is None:
+                    logf.write("Failed to retrieve database_2 info for %s\n" % db_id)
+                    continue
+                if db_name in dbids:
+                    update = dbids[db_name]
+                    cobj.setValue(update, "db_id", row)
+                    logf.write("Updating %s %s to %s\n" % (db_name, db_id, update))
+                    ret = True
+                else:
+                    logf.write("database_2 info for %s does not contain %s id\n" % (db_id, db_name))
 
         return ret
 
-    def __getRelatedIds(self, depid):
-        """Returns a dictionary of data from database_2 as found in da_internal for depid
-        If depid is not present in da_internal, return None
+    def __getRelatedIdsMany(self, depidList):
+        """Returns a dictionary keyed by depid of data from database_2 as found in da_internal.
+        depids not present in da_internal are omitted.
         """
-
         dai = DaInternalDb(siteId=self.__siteId)
-        data = dai.getDatabase2(depid)
-        if len(data) > 0:
-            return data
-        return None
-
-    def __getOutDir(self, fPath):
-        """Attempts to find a writeable place for log file during read"""
-        for dp in [os.path.dirname(fPath), ".", tempfile.gettempdir()]:
-            if os.access(dp, os.W_OK):
-                return dp
-
-    def __getContainerList(self, fPath):
-        outDirPath = self.__getOutDir(fPath)
         try:
-            return self.__ioObj.readFile(fPath, outDirPath=outDirPath)
+            dataD = dai.getDatabase2Many(depidList)
+        finally:
+            dai.close()
+        return {depid: data for depid, data in dataD.items() if len(data) > 0}
+
+    def __getContainer(self, fPath):
+        try:
+            return self.__ioObj.getContainer(fPath, self.__categoryList)
         except Exception as _e:  # noqa: F841
             logger.exception("Failed to parse %s", fPath)
             return None
 
-    def __writeContainerList(self, fPath, containerList):
+    def __writeContainer(self, fPathIn, fPathOut, container):
+        """Write fPathIn to fPathOut with the updated categories from container"""
         try:
-            return self.__ioObj.writeFile(fPath, containerList)
+            return self.__ioObj.spliceCategories(fPathIn, fPathOut, container, self.__categoryList)
         except Exception as e:
-            logger.error("Failed to write out %s error: %s", fPath, str(e))
+            logger.error("Failed to write out %s error: %s", fPathOut, str(e))
             return False
 
 
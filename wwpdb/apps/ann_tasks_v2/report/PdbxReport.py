@@ -5,6 +5,11 @@
 # Updates:
 # 15-Jun-2014  jdw add accessor methods for struct_title/pdb_id
 # 09-Dec-2024  zf  add "nmr-cs-validation-report" with CSValidationReportIo/CSValidationReportStyle
+# 18-Oct-2026      share one parse of the input file between report types and link rather than copy the local report file
+# 18-Oct-2026      materialize only rendered categories, optional row windows and makeCategoryPage()
+# 18-Oct-2026      share parsed input files across the web request by default (request model context)
+# 18-Oct-2026      add writeTabularReport(), page windows use the report reader for the content type
+# 18-Oct-2026      request scope reads go through the request model context (ModelContext.getIoAdapter()) and read the input file path
 ##
 """
 PDBx general report generator -
@@ -17,12 +22,13 @@ __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.01"
 
 import os
-import shutil
 import sys
 import traceback
 
 from mmcif_utils.style.PdbxGeometryReportCategoryStyle import PdbxGeometryReportCategoryStyle
 
+from wwpdb.apps.ann_tasks_v2.io.ModelContext import ModelContext
+from wwpdb.apps.ann_tasks_v2.io.PdbxContainerCache import CachingIoAdapter, PdbxContainerCache
 from wwpdb.apps.ann_tasks_v2.report.PdbxReportDepictBootstrap import PdbxReportDepictBootstrap
 from wwpdb.apps.ann_tasks_v2.report.styles.CSValidationReport import CSValidationReportStyle
 from wwpdb.apps.ann_tasks_v2.report.styles.CSValidationReportIo import CSValidationReportIo
@@ -31,6 +37,7 @@ from wwpdb.apps.ann_tasks_v2.report.styles.ModelReport import PdbxReportCategory
 from wwpdb.apps.ann_tasks_v2.report.styles.LinksReport import PdbxLinksReportCategoryStyle
 from wwpdb.apps.ann_tasks_v2.report.styles.PdbxEmExtensionCategoryStyle import PdbxEmExtensionCategoryStyle
 from wwpdb.apps.ann_tasks_v2.report.styles.PdbxIo import PdbxReportIo, PdbxGeometryReportIo, PdbxXrayExpReportIo, PdbxLinksReportIo, EmInfoReportIo
+from wwpdb.apps.ann_tasks_v2.utils.FileLinkUtils import FileLinkUtils
 
 
 class PdbxReport(object):
@@ -62,6 +69,28 @@ class PdbxReport(object):
         self.__structTitle = None
         self.__primary_contour_level = None
         #
+        # Parsed files are shared by all reports made in this request (see setContainerCacheScope())
+        self.__ioAdapter = None
+        self.setContainerCacheScope("request")
+        #
+
+    def setContainerCacheScope(self, scope="request"):
+        """Set the lifetime of parsed input files -
+
+        scope = report   parsed files are shared by the reports made with this object
+                request  parsed files are shared with all PdbxReport objects and model readers serving the current request (default)
+                process  parsed files are shared with all PdbxReport objects in this process
+        """
+        if scope == "request":
+            self.__ioAdapter = ModelContext.fromRequest(self.__reqObj, verbose=self.__verbose, log=self.__lfh).getIoAdapter()
+        else:
+            self.__ioAdapter = CachingIoAdapter(cache=PdbxContainerCache(shared=(scope == "process"), verbose=self.__verbose, log=self.__lfh))
+
+    def getContainerCacheStats(self):
+        """Return the parse and reuse counts of the input files read in the current cache scope."""
+        if isinstance(self.__ioAdapter, CachingIoAdapter):
+            return self.__ioAdapter.getCache().getStats()
+        return self.__ioAdapter.getModelContext().getStats()
 
     def getPdbIdCode(self):
         return self.__pdbIdCode
@@ -72,72 +101,74 @@ class PdbxReport(object):
     def getPrimaryContourlevel(self):
         return self.__primary_contour_level
 
-    def makeTabularReport(self, filePath=None, contentType=None, idCode=None, layout="tabs", leadingHtmlL=None, trailingHtmlL=None):
+    def makeTabularReport(self, filePath=None, contentType=None, idCode=None, layout="tabs", leadingHtmlL=None, trailingHtmlL=None, rowLimit=None):
         """Leading method to create a tabular report corresponding to the input Pdbx file.
 
         layout = tabs|accordion|multiaccordion|page-mutiaccordion|page-accordion
 
+        If rowLimit is set, row-wise categories are rendered with at most rowLimit rows and a pager
+        element from which further rows may be requested (see makeCategoryPage()).
+
         Return data as a list of HTML markup for the section containing the tabular report.
         """
+        oL = list(self.__iterTabularReport(filePath, contentType, idCode, layout, leadingHtmlL, trailingHtmlL, rowLimit))
+        if self.__debug:
+            self.__lfh.write("+PdbxReport.makeTabularReport - generated HTML \n%s\n" % "\n".join(oL))
+        #
+        return oL
+
+    def writeTabularReport(self, outputPath, filePath=None, contentType=None, idCode=None, layout="tabs", leadingHtmlL=None, trailingHtmlL=None, rowLimit=None):
+        """Write the tabular report (see makeTabularReport()) to outputPath as it is rendered.
+
+        The markup is written line by line so the complete report is never held in memory.  Returns True
+        if any report markup was written.
+        """
+        tmpPath = outputPath + ".tmp-%d" % os.getpid()
+        try:
+            nLines = 0
+            with open(tmpPath, "w") as ofh:
+                for line in self.__iterTabularReport(filePath, contentType, idCode, layout, leadingHtmlL, trailingHtmlL, rowLimit):
+                    ofh.write(line)
+                    ofh.write("\n")
+                    nLines += 1
+            #
+            os.rename(tmpPath, outputPath)
+            if self.__verbose:
+                self.__lfh.write("+PdbxReport.writeTabularReport() - wrote %d lines to %s\n" % (nLines, outputPath))
+            return nLines > 0
+        except:  # noqa: E722 pylint: disable=bare-except
+            self.__lfh.write("+PdbxReport.writeTabularReport() - failed for %s\n" % outputPath)
+            traceback.print_exc(file=self.__lfh)
+            if os.access(tmpPath, os.F_OK):
+                os.remove(tmpPath)
+        return False
+
+    def __iterTabularReport(self, filePath, contentType, idCode, layout, leadingHtmlL, trailingHtmlL, rowLimit):
+        """Generate the HTML markup of the tabular report line by line."""
         if self.__verbose:
             self.__lfh.write("+PdbxReport.makeTabularReport() file path %s id code %s content type %s layout %s\n" % (filePath, idCode, contentType, layout))
         #
-        templatePath = self.__reqObj.getValue("TemplatePath")
-        includePath = os.path.join(templatePath, "includes")
-        #
-        oL = []
-        fileFormat = "cif"
-        #
-        if filePath is not None and contentType is not None:
-            if contentType in ["model"]:
-                self.setFilePath(filePath, fileFormat=fileFormat, idCode=idCode)
-                dd = self.doReport(contentType)
-                #
-                if "pdb_id" in dd:
-                    self.__pdbIdCode = dd["pdb_id"]
-                if "struct_title" in dd:
-                    self.__structTitle = dd["struct_title"]
-                if "primary_contour_level" in dd:
-                    self.__primary_contour_level = dd["primary_contour_level"]
-                #
-                rdd = PdbxReportDepictBootstrap(styleObject=PdbxReportCategoryStyle(), includePath=includePath, verbose=self.__verbose, log=self.__lfh)
-                oL = rdd.render(dd, style=layout, leadingHtmlL=leadingHtmlL, trailingHtmlL=trailingHtmlL)
-            #
-            if contentType in ["dcc-report"]:
-                self.setFilePath(filePath, fileFormat=fileFormat, idCode=idCode)
-                dd = self.doReport(contentType)
-                rdd = PdbxReportDepictBootstrap(styleObject=PdbxXrayExpReportCategoryStyle(), includePath=includePath, verbose=self.__verbose, log=self.__lfh)
-                oL = rdd.render(dd, style=layout, leadingHtmlL=leadingHtmlL, trailingHtmlL=trailingHtmlL)
-            #
-            if contentType in ["geometry-check-report"]:
-                self.setFilePath(filePath, fileFormat=fileFormat, idCode=idCode)
-                dd = self.doReport(contentType)
-                rdd = PdbxReportDepictBootstrap(styleObject=PdbxGeometryReportCategoryStyle(), includePath=includePath, verbose=self.__verbose, log=self.__lfh)
-                oL = rdd.render(dd, style=layout, leadingHtmlL=leadingHtmlL, trailingHtmlL=trailingHtmlL)
-            #
-            if contentType in ["links-report"]:
-                self.setFilePath(filePath, fileFormat=fileFormat, idCode=idCode)
-                dd = self.doReport(contentType)
-                rdd = PdbxReportDepictBootstrap(styleObject=PdbxLinksReportCategoryStyle(), includePath=includePath, verbose=self.__verbose, log=self.__lfh)
-                oL = rdd.render(dd, style=layout, leadingHtmlL=leadingHtmlL, trailingHtmlL=trailingHtmlL)
-            #
-            if contentType in ["em-map-info-report"]:
-                self.setFilePath(filePath, fileFormat=fileFormat, idCode=idCode)
-                dd = self.doReport(contentType)
-                rdd = PdbxReportDepictBootstrap(styleObject=PdbxEmExtensionCategoryStyle(), includePath=includePath, verbose=self.__verbose, log=self.__lfh)
-                oL = rdd.render(dd, style=layout, leadingHtmlL=leadingHtmlL, trailingHtmlL=trailingHtmlL)
-            #
-            if contentType in ["nmr-cs-validation-report"]:
-                self.setFilePath(filePath, fileFormat=fileFormat, idCode=idCode)
-                dd = self.doReport(contentType)
-                rdd = PdbxReportDepictBootstrap(styleObject=CSValidationReportStyle(), includePath=includePath, verbose=self.__verbose, log=self.__lfh)
-                oL = rdd.render(dd, style=layout, leadingHtmlL=leadingHtmlL, trailingHtmlL=trailingHtmlL)
-            #
-            if self.__debug:
-                self.__lfh.write("+PdbxReport.makeTabularReport - generated HTML \n%s\n" % "\n".join(oL))
-            #
+        if filePath is None or contentType is None:
+            return
+        styleObj = CSValidationReportStyle() if contentType == "nmr-cs-validation-report" else self.__getStyleObject(contentType)
+        if styleObj is None:
+            return
         #
-        return oL
+        includePath = os.path.join(self.__reqObj.getValue("TemplatePath"), "includes")
+        self.setFilePath(filePath, fileFormat="cif", idCode=idCode)
+        rdd = PdbxReportDepictBootstrap(styleObject=styleObj, includePath=includePath, verbose=self.__verbose, log=self.__lfh)
+        dd = self.doReport(contentType, categoryNameList=rdd.getReportCategoryNameList(), rowLimit=rowLimit)
+        #
+        if contentType in ["model"]:
+            if "pdb_id" in dd:
+                self.__pdbIdCode = dd["pdb_id"]
+            if "struct_title" in dd:
+                self.__structTitle = dd["struct_title"]
+            if "primary_contour_level" in dd:
+                self.__primary_contour_level = dd["primary_contour_level"]
+        #
+        for line in rdd.iterRender(dd, style=layout, leadingHtmlL=leadingHtmlL, trailingHtmlL=trailingHtmlL):
+            yield line
 
     def setFilePath(self, filePath, fileFormat="cif", idCode=None):
         self.__filePath = filePath
@@ -152,8 +183,13 @@ class PdbxReport(object):
     def getFilePath(self):
         return self.__filePath
 
-    def doReport(self, contentType="model"):
-        """Return data content required to render report --"""
+    def doReport(self, contentType="model", categoryNameList=None, rowLimit=None):
+        """Return data content required to render report --
+
+        categoryNameList  optional list of the categories to be returned (others are not materialized)
+        rowLimit          optional maximum number of rows returned for each category - the total row counts
+                          of truncated categories are returned in "rowCountDict"
+        """
         #
         oD = {}
         oD["dataDict"] = {}
@@ -166,7 +202,7 @@ class PdbxReport(object):
             self.__lfh.flush()
         #
         #
-        # make a local copy of the file (if required)
+        # make a local copy of the file (if required) - the local copy is read-only so a hard link is preferred
         #
         (_pth, fileName) = os.path.split(filePath)
         dirPath = os.path.join(self.__sessionPath, "report")
@@ -175,10 +211,10 @@ class PdbxReport(object):
         if filePath != localPath:
             if not os.access(dirPath, os.F_OK):
                 os.makedirs(dirPath)
-            shutil.copyfile(filePath, localPath)
+            method = FileLinkUtils(verbose=self.__verbose, log=self.__lfh).place(filePath, localPath)
             #
             if self.__verbose:
-                self.__lfh.write("+PdbxReport.doReport() - Copied input file %s to report session path %s \n" % (filePath, localPath))
+                self.__lfh.write("+PdbxReport.doReport() - Placed input file %s at report session path %s (%s)\n" % (filePath, localPath, method))
                 self.__lfh.flush()
         #
         # Path context --
@@ -186,33 +222,33 @@ class PdbxReport(object):
         oD["filePath"] = filePath
         oD["localPath"] = localPath
         oD["localRelativePath"] = localRelativePath
+        oD["localFileName"] = fileName
+        oD["contentType"] = contentType
         oD["sessionId"] = self.__sessionId
         oD["editOpNumber"] = 0
         oD["requestHost"] = self.__reqObj.getValue("request_host")
         #
         try:
-            if contentType == "model":
-                pdbxR = PdbxReportIo(verbose=self.__verbose, log=self.__lfh)
-            elif contentType == "geometry-check-report":
-                pdbxR = PdbxGeometryReportIo(verbose=self.__verbose, log=self.__lfh)
-            elif contentType == "dcc-report":
-                pdbxR = PdbxXrayExpReportIo(verbose=self.__verbose, log=self.__lfh)
-            elif contentType == "links-report":
-                pdbxR = PdbxLinksReportIo(verbose=self.__verbose, log=self.__lfh)
-            elif contentType == "em-map-info-report":
-                pdbxR = EmInfoReportIo(verbose=self.__verbose, log=self.__lfh)
-            elif contentType == "nmr-cs-validation-report":
-                pdbxR = CSValidationReportIo(verbose=self.__verbose, log=self.__lfh)
-            else:
+            pdbxR = self.__getReportIo(contentType)
+            if pdbxR is None:
                 self.__lfh.write("+PdbxReport.doReport() - unknown contentType %s\n" % contentType)
                 return oD
 
-            pdbxR.setFilePath(localPath, idCode=None)
+            # The input file is read rather than its local copy so the parse is shared with other readers of the request
+            pdbxR.setFilePath(filePath, idCode=None)
             # pdbxR.get()
             oD["blockId"] = pdbxR.getCurrentContainerId()
             if self.__verbose:
                 self.__lfh.write("+PdbxReport.doReport() - category name list %r \n" % pdbxR.getCurrentCategoryNameList())
             for catName in pdbxR.getCurrentCategoryNameList():
+                if categoryNameList is not None and catName not in categoryNameList:
+                    continue
+                if rowLimit is not None and contentType != "nmr-cs-validation-report":
+                    nRows = pdbxR.getRowCount(catName)
+                    if nRows > rowLimit:
+                        oD["dataDict"][catName] = self.__getCategoryWindow(pdbxR, catName, 0, rowLimit)
+                        oD.setdefault("rowCountDict", {})[catName] = nRows
+                        continue
                 oD["dataDict"][catName] = pdbxR.getCategory(catName=catName)
 
             if contentType == "model":
@@ -230,6 +266,81 @@ class PdbxReport(object):
 
         return oD
 
+    def __getCategoryWindow(self, pdbxR, catName, offset, limit):
+        """Return row dictionaries for rows [offset, offset + limit) of the input category without converting the remaining rows."""
+        rL = []
+        catObj = pdbxR.getCurrentContainer().getObj(catName)
+        if catObj is None:
+            return rL
+        itNameList = catObj.getItemNameList()
+        for row in catObj.getRowList()[offset : offset + limit]:
+            rL.append(dict(zip(itNameList, row)))
+        return rL
+
+    def __getReportIo(self, contentType, ioAdapter=None):
+        ioAdapter = ioAdapter if ioAdapter is not None else self.__ioAdapter
+        if contentType == "model":
+            return PdbxReportIo(verbose=self.__verbose, log=self.__lfh, ioAdapter=ioAdapter)
+        elif contentType == "geometry-check-report":
+            return PdbxGeometryReportIo(verbose=self.__verbose, log=self.__lfh, ioAdapter=ioAdapter)
+        elif contentType == "dcc-report":
+            return PdbxXrayExpReportIo(verbose=self.__verbose, log=self.__lfh, ioAdapter=ioAdapter)
+        elif contentType == "links-report":
+            return PdbxLinksReportIo(verbose=self.__verbose, log=self.__lfh, ioAdapter=ioAdapter)
+        elif contentType == "em-map-info-report":
+            return EmInfoReportIo(verbose=self.__verbose, log=self.__lfh, ioAdapter=ioAdapter)
+        elif contentType == "nmr-cs-validation-report":
+            return CSValidationReportIo(verbose=self.__verbose, log=self.__lfh)
+        return None
+
+    def __getStyleObject(self, contentType):
+        if contentType == "model":
+            return PdbxReportCategoryStyle()
+        elif contentType == "geometry-check-report":
+            return PdbxGeometryReportCategoryStyle()
+        elif contentType == "dcc-report":
+            return PdbxXrayExpReportCategoryStyle()
+        elif contentType == "links-report":
+            return PdbxLinksReportCategoryStyle()
+        elif contentType == "em-map-info-report":
+            return PdbxEmExtensionCategoryStyle()
+        return None
+
+    def makeCategoryPage(self, fileName, contentType, catName, offset=0, limit=100):
+        """Return a window of rows for a category of a paged report as a dictionary -
+
+        {"html": <list of HTML table rows>, "offset": <next row offset>, "total": <total rows>}
+
+        The report file must be a file previously placed in the session report directory by doReport().
+        Returns None if the request cannot be satisfied.
+        """
+        if fileName != os.path.basename(fileName):
+            return None
+        styleObj = self.__getStyleObject(contentType)
+        if styleObj is None:
+            return None
+        filePath = os.path.join(self.__sessionPath, "report", fileName)
+        if not os.access(filePath, os.R_OK):
+            return None
+        try:
+            rdd = PdbxReportDepictBootstrap(styleObject=styleObj, verbose=self.__verbose, log=self.__lfh)
+            if catName not in rdd.getReportCategoryNameList():
+                return None
+            # Successive pages of the same file are served from the process level container cache
+            pdbxR = self.__getReportIo(contentType, ioAdapter=CachingIoAdapter(cache=PdbxContainerCache(shared=True, verbose=self.__verbose, log=self.__lfh)))
+            if not pdbxR.setFilePath(filePath, idCode=None):
+                return None
+            nRows = pdbxR.getRowCount(catName)
+            offset = max(0, min(int(offset), nRows))
+            rL = self.__getCategoryWindow(pdbxR, catName, offset, int(limit))
+            htmlL = rdd.renderCategoryRows(catName, rL, requestHost=self.__reqObj.getValue("request_host"))
+            return {"html": htmlL, "offset": offset + len(rL), "total": nRows}
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+PdbxReport.makeCategoryPage() - failed for %s category %s\n" % (fileName, catName))
+                traceback.print_exc(file=self.__lfh)
+            return None
+
 
 if __name__ == "__main__":
     pass
@@ -4,6 +4,7 @@
 #
 # Updates:
 # 09-Dec-2024  zf  add "NMR_CHEMICAL_SHIFT_VALIDATION_REPORT_V1" section
+# 18-Oct-2026      generator based rendering (iterRender()) and row windows for paged categories
 #
 ##
 """
@@ -151,8 +152,28 @@ class PdbxReportDepictBootstrap(PdbxDepictBootstrapBase):
             self.__lfh.write("Error: PdbxReportDepict.__setup unknown style %s\n" % self.__st.getStyleId())
         #
 
+    def getReportCategoryNameList(self):
+        """Return the names of the categories rendered in this report style."""
+        return [catName for catName, _catNameAbbrev, _catStyle in self.__reportCategories]
+
+    def getReportCategoryStyle(self, catName):
+        """Return the display style (row-wise|column-wise) of the input report category or None."""
+        for tName, _catNameAbbrev, catStyle in self.__reportCategories:
+            if tName == catName:
+                return catStyle
+        return None
+
     def render(self, eD, style="tabs", leadingHtmlL=None, trailingHtmlL=None):
-        """ """
+        """Return the report as a list of HTML markup lines (see iterRender())."""
+        return list(self.iterRender(eD, style=style, leadingHtmlL=leadingHtmlL, trailingHtmlL=trailingHtmlL))
+
+    def iterRender(self, eD, style="tabs", leadingHtmlL=None, trailingHtmlL=None):
+        """Generate the report HTML markup line by line.
+
+        If eD contains 'rowCountDict' (category -> total row count) and a category holds fewer
+        rows than its total, only the rows provided are rendered followed by a pager element
+        carrying the details needed to request further rows with renderCategoryRows().
+        """
         if style in ["tabs"]:
             return self.__doRenderTabs(eD)
         elif style in ["accordion", "multiaccordion"]:
@@ -160,7 +181,15 @@ class PdbxReportDepictBootstrap(PdbxDepictBootstrapBase):
         elif style in ["page-multiaccordion", "page-accordion"]:
             return self.__doRenderPage(eD, leadingHtmlL, trailingHtmlL)
         else:
-            return []
+            return iter([])
+
+    def renderCategoryRows(self, catName, rL, requestHost=None):
+        """Return the HTML table rows (without column labels) for the input list of row dictionaries.
+
+        Used to serve subsequent row windows of a paged category.
+        """
+        self.__requestHost = requestHost
+        return list(self.__renderTableRows(catName, rL))
 
     def __doRenderPage(self, eD, leadingHtmlL, trailingHtmlL):
         """
@@ -170,26 +199,29 @@ class PdbxReportDepictBootstrap(PdbxDepictBootstrapBase):
             </div>
         </div> <!-- end review admin dialog -->
         """
-        oL = []
-        oL.extend(self.appPageTop())
+        for line in self.appPageTop():
+            yield line
 
-        oL.append('<div class="page-header">')
-        oL.append("<h3>Data Review Report</h3>")
-        oL.append("</div>")
+        yield '<div class="page-header">'
+        yield "<h3>Data Review Report</h3>"
+        yield "</div>"
         if leadingHtmlL is not None and len(leadingHtmlL) > 0:
-            oL.extend(leadingHtmlL)
-        oL.append('<div id="review-admin-dialog">')
-        oL.append('<div id="review-report-container">')
-        oL.append('<div id="review-inline-idops-report"  class="report-content">')
-        oL.extend(self.__doRenderAccordion(eD))
-        oL.append("</div>")
-        oL.append("</div>")
-        oL.append("</div>")
+            for line in leadingHtmlL:
+                yield line
+        yield '<div id="review-admin-dialog">'
+        yield '<div id="review-report-container">'
+        yield '<div id="review-inline-idops-report"  class="report-content">'
+        for line in self.__doRenderAccordion(eD):
+            yield line
+        yield "</div>"
+        yield "</div>"
+        yield "</div>"
         if trailingHtmlL is not None and len(trailingHtmlL) > 0:
-            oL.extend(trailingHtmlL)
+            for line in trailingHtmlL:
+                yield line
 
-        oL.extend(self.appPageBottom())
-        return oL
+        for line in self.appPageBottom():
+            yield line
 
     def __doRenderTabs(self, eD):
         """Render a tabbed table set.
@@ -221,9 +253,6 @@ class PdbxReportDepictBootstrap(PdbxDepictBootstrapBase):
                 self.__lfh.write("PdbxReportDepict (doRenderTabs) ii %d  tup %r\n" % (ii, tup))
             for ii, (x, y, z) in enumerate(catList):
                 self.__lfh.write("PdbxReportDepict (doRenderTabs) ii %d  values  %s %s %s\n" % (ii, x, y, z))
-        #
-        oL = []
-
         #
         # need for URL construction --
         self.__requestHost = eD["requestHost"]
@@ -233,39 +262,42 @@ class PdbxReportDepictBootstrap(PdbxDepictBootstrapBase):
         #
         # Write the tabs --
         #
-        oL.append('<div class="tabbable">')
-        oL.append('<ul class="nav nav-tabs">')
-        oL.append('<li><a  class="active" href="#%s-tabs-id" data-toggle="tab">%s</a></li>' % (idPrefix, idCode))
+        yield '<div class="tabbable">'
+        yield '<ul class="nav nav-tabs">'
+        yield '<li><a  class="active" href="#%s-tabs-id" data-toggle="tab">%s</a></li>' % (idPrefix, idCode)
 
         for ii, (catName, catNameAbbrev, catStyle) in enumerate(catList):
             # For only popuated categories
             if catName in cD and (len(cD[catName]) > 0):
-                oL.append('<li><a href="#%s-tabs-%d" data-toggle="tab">%s</a></li>' % (idPrefix, ii, catNameAbbrev))
-        oL.append("</ul>")
+                yield '<li><a href="#%s-tabs-%d" data-toggle="tab">%s</a></li>' % (idPrefix, ii, catNameAbbrev)
+        yield "</ul>"
         #
         # Write the tables --
         #
-        oL.append('<div  class="tab-content"> ')
+        yield '<div  class="tab-content"> '
         #
-        oL.append('<div class="tab-pane active"  id="%s-tabs-id"></div>' % (idPrefix))
+        yield '<div class="tab-pane active"  id="%s-tabs-id"></div>' % (idPrefix)
 
         for ii, (catName, catNameAbbrev, catStyle) in enumerate(catList):
             # For only popuated categories
             if catName in cD and (len(cD[catName]) > 0):
-                oL.append('<div class="tab-pane"  id="%s-tabs-%d">' % (idPrefix, ii))
-                oL.append('<table class="table table-striped table-bordered table-condensed" id="%s-%s">' % (idPrefix, catName))
+                tableId = "%s-%s" % (idPrefix, catName)
+                yield '<div class="tab-pane"  id="%s-tabs-%d">' % (idPrefix, ii)
+                yield '<table class="table table-striped table-bordered table-condensed" id="%s">' % tableId
                 if catStyle == "column-wise":
-                    self.__renderTableColumnWise(catName, cD[catName][0], oL)
+                    for line in self.__renderTableColumnWise(catName, cD[catName][0]):
+                        yield line
                 else:
-                    self.__renderTableRowWise(catName, cD[catName], oL)
+                    for line in self.__renderTableRowWise(catName, cD[catName]):
+                        yield line
 
-                oL.append("</table>")
+                yield "</table>"
+                for line in self.__renderPager(eD, catName, catStyle, tableId):
+                    yield line
 
-                oL.append("</div>")
-        oL.append('</div>  <!-- end "tab-content" -->')
-        oL.append("</div>  <!-- end tabbable -->")
-        #
-        return oL
+                yield "</div>"
+        yield '</div>  <!-- end "tab-content" -->'
+        yield "</div>  <!-- end tabbable -->"
 
     def __doRenderAccordion(self, eD):
         """
@@ -300,10 +332,10 @@ class PdbxReportDepictBootstrap(PdbxDepictBootstrapBase):
 
         #
         idPrefix = "acc" + str(random.randint(0, 100000))
-        oL = []
         catList = self.__reportCategories
         self.__requestHost = eD["requestHost"]
         cD = eD["dataDict"]
+        rowCountD = eD.get("rowCountDict", {})
         #
         idTop = idPrefix + "-top"
 
@@ -312,18 +344,18 @@ class PdbxReportDepictBootstrap(PdbxDepictBootstrapBase):
         #
         surroundOp = True
         #
-        oL.append('<div class="accordion" id="%s">' % idTop)
+        yield '<div class="accordion" id="%s">' % idTop
         if surroundOp:
             idCode = eD["idCode"] if eD["idCode"] is not None else eD["blockId"]
             idSectionTop = idCode + "-" + idPrefix
             active = "in"
-            oL.append('<div class="accordion-group">')
-            oL.append('<div class="accordion-heading">')
-            oL.append('<a class="accordion-toggle pull-right" data-toggle="collapse" href="#%s">Show/hide report for %s</a>' % (idSectionTop, idCode))
-            oL.append("<br />")
-            oL.append("</div>")
-            oL.append('<div id="%s" class="accordion-body collapse %s">' % (idSectionTop, active))
-            oL.append('<div  class="accordion-inner">')
+            yield '<div class="accordion-group">'
+            yield '<div class="accordion-heading">'
+            yield '<a class="accordion-toggle pull-right" data-toggle="collapse" href="#%s">Show/hide report for %s</a>' % (idSectionTop, idCode)
+            yield "<br />"
+            yield "</div>"
+            yield '<div id="%s" class="accordion-body collapse %s">' % (idSectionTop, active)
+            yield '<div  class="accordion-inner">'
 
         #
         isMulti = True
@@ -333,8 +365,8 @@ class PdbxReportDepictBootstrap(PdbxDepictBootstrapBase):
             if catName in cD and (len(cD[catName]) > 0):
                 active = "in" if isFirst else ""
                 idSection = idPrefix + "-sec-" + str(ii)
-                oL.append('<div class="accordion-group">')
-                oL.append('<div class="accordion-heading">')
+                yield '<div class="accordion-group">'
+                yield '<div class="accordion-heading">'
 
                 if self.__st.getStyleId() in ["NMR_CHEMICAL_SHIFT_VALIDATION_REPORT_V1"]:
                     abbrev = catNameAbbrev
@@ -343,39 +375,60 @@ class PdbxReportDepictBootstrap(PdbxDepictBootstrapBase):
                 #
 
                 if isMulti:
-                    oL.append('<a class="accordion-toggle" data-toggle="collapse" href="#%s"> <h4>%s</h4></a>' % (idSection, abbrev))
+                    yield '<a class="accordion-toggle" data-toggle="collapse" href="#%s"> <h4>%s</h4></a>' % (idSection, abbrev)
                 else:
-                    oL.append('<a class="accordion-toggle" data-toggle="collapse" data-parent="#%s" href="#%s"><h4>%s</h4></a>' % (idTop, idSection, abbrev))
-                oL.append("</div>")
-                oL.append('<div id="%s" class="accordion-body collapse %s">' % (idSection, active))
+                    yield '<a class="accordion-toggle" data-toggle="collapse" data-parent="#%s" href="#%s"><h4>%s</h4></a>' % (idTop, idSection, abbrev)
+                yield "</div>"
+                yield '<div id="%s" class="accordion-body collapse %s">' % (idSection, active)
 
-                if len(cD[catName]) > PdbxReportDepictBootstrap.MAX_LINES:
-                    oL.append('<div  class="accordion-inner" style="max-height: 50vh; overflow-y: scroll;">')
+                if max(len(cD[catName]), rowCountD.get(catName, 0)) > PdbxReportDepictBootstrap.MAX_LINES:
+                    yield '<div  class="accordion-inner" style="max-height: 50vh; overflow-y: scroll;">'
                 else:
-                    oL.append('<div  class="accordion-inner">')
+                    yield '<div  class="accordion-inner">'
                 #
-                oL.append('<table class="table table-striped table-bordered table-condensed">')
+                if catName in rowCountD:
+                    yield '<table class="table table-striped table-bordered table-condensed" id="%s-table">' % idSection
+                else:
+                    yield '<table class="table table-striped table-bordered table-condensed">'
                 if catStyle == "column-wise":
-                    self.__renderTableColumnWise(catName, cD[catName][0], oL)
+                    for line in self.__renderTableColumnWise(catName, cD[catName][0]):
+                        yield line
                 else:
-                    self.__renderTableRowWise(catName, cD[catName], oL)
-                oL.append("</table>")
+                    for line in self.__renderTableRowWise(catName, cD[catName]):
+                        yield line
+                yield "</table>"
+                for line in self.__renderPager(eD, catName, catStyle, idSection + "-table"):
+                    yield line
                 #
-                oL.append("</div>")
-                oL.append("</div>")
+                yield "</div>"
+                yield "</div>"
                 #
-                oL.append("</div> <!-- end of accordion group -->")
+                yield "</div> <!-- end of accordion group -->"
 
         if surroundOp:
-            oL.append("</div>")
-            oL.append("</div>")
-            oL.append("</div>")
-
-        oL.append("</div> <!-- end of accordion -->")
-        #
-        return oL
-
-    def __renderTableColumnWise(self, catName, rD, oL):
+            yield "</div>"
+            yield "</div>"
+            yield "</div>"
+
+        yield "</div> <!-- end of accordion -->"
+
+    def __renderPager(self, eD, catName, catStyle, tableId):
+        """Render the pager element for a row-wise category which has more rows than were provided."""
+        rowCountD = eD.get("rowCountDict", {})
+        if catStyle == "column-wise" or catName not in rowCountD:
+            return
+        nShown = len(eD["dataDict"][catName])
+        nTotal = rowCountD[catName]
+        if nShown >= nTotal:
+            return
+        yield (
+            '<div class="report-category-pager" data-table-id="%s" data-report-file="%s" data-content-type="%s" data-category="%s" data-offset="%d" data-limit="%d" data-total="%d">'
+            % (tableId, eD.get("localFileName", ""), eD.get("contentType", ""), catName, nShown, nShown, nTotal)
+        )
+        yield '<a href="#" class="report-category-more">Showing %d of %d rows - load more</a>' % (nShown, nTotal)
+        yield "</div>"
+
+    def __renderTableColumnWise(self, catName, rD):
         """Render table with unit cardinality.  Columns for the single row are listed vertically
         to the left of column values.
         """
@@ -392,34 +445,39 @@ class PdbxReportDepictBootstrap(PdbxDepictBootstrapBase):
 
             itemValue = "<br />".join(itemValue.split("\n"))
 
-            oL.append("<tr>")
-            oL.append("<td>%s</td>" % self.__attributePart(itemName))
+            yield "<tr>"
+            yield "<td>%s</td>" % self.__attributePart(itemName)
 
-            oL.append("<td>%s</td>" % (itemValue))
-            oL.append("</tr>")
+            yield "<td>%s</td>" % (itemValue)
+            yield "</tr>"
             iCol += 1
 
-    def __renderTableRowWise(self, catName, rL, oL):
+    def __renderTableRowWise(self, catName, rL):
         """Render a multirow table."""
         # Column labels --
-        oL.append("<tr>")
+        yield "<tr>"
         for itemName in self.__st.getItemNameList(catName):
-            oL.append("<th>%s</th>" % self.__attributePart(itemName))
-        oL.append("</tr>")
+            yield "<th>%s</th>" % self.__attributePart(itemName)
+        yield "</tr>"
         #
         # Column data ---
         #
+        for line in self.__renderTableRows(catName, rL):
+            yield line
+        #
+        #
+
+    def __renderTableRows(self, catName, rL):
         iRow = 0
         for row in rL:
             self.__markupRow(catName, row)
-            self.__renderRow(catName, row, iRow, oL, insertDefault=False, insertCode="", opNum=0)
+            for line in self.__renderRow(catName, row, iRow, insertDefault=False, insertCode="", opNum=0):
+                yield line
             iRow += 1
-        #
-        #
 
-    def __renderRow(self, catName, row, iRow, oL, insertDefault=False, insertCode="", opNum=0):  # pylint: disable=unused-argument
+    def __renderRow(self, catName, row, iRow, insertDefault=False, insertCode="", opNum=0):  # pylint: disable=unused-argument
         """Render a row in a multirow table."""
-        oL.append("<tr>")
+        yield "<tr>"
         #
         for itemName, itemDefault in self.__st.getItemNameAndDefaultList(catName):
             if insertDefault:
@@ -430,8 +488,8 @@ class PdbxReportDepictBootstrap(PdbxDepictBootstrapBase):
                 itemValue = itemDefault
             itemValue = "<br />".join(itemValue.split("\n"))
 
-            oL.append("<td>%s</td>" % (itemValue))
-        oL.append("</tr>")
+            yield "<td>%s</td>" % (itemValue)
+        yield "</tr>"
         #
 
     def __markupRow(self, catName, rD):
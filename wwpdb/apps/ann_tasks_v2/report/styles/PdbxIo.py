@@ -18,6 +18,7 @@
 # 12-Feb-2018  ep  Add pdbx_depui_entry_details.requested_accession_types to __getInfoGeneral()
 #  7-Jul-2019  ep  Retrieve pdbx_database_status.post_rel_status in __getInfoGeneral()
 # 15-Jul-2019  ep  Retrieve pdbx_database_status.post_rel_recvd_coord* to __getInfoGeneral()
+# 18-Oct-2026      Optional ioAdapter argument for report readers (shared parse via CachingIoAdapter)
 #
 ##
 """
@@ -53,8 +54,11 @@ logger = logging.getLogger()
 class PdbxReportIo(PdbxStyleIoUtil):
     """Methods for reading PDBx data files for reporting applications including style details."""
 
-    def __init__(self, verbose=True, log=sys.stderr):
-        super(PdbxReportIo, self).__init__(styleObject=PdbxReportCategoryStyle(), verbose=verbose, log=log)
+    def __init__(self, verbose=True, log=sys.stderr, ioAdapter=None):
+        if ioAdapter is not None:
+            super(PdbxReportIo, self).__init__(styleObject=PdbxReportCategoryStyle(), IoAdapter=ioAdapter, verbose=verbose, log=log)
+        else:
+            super(PdbxReportIo, self).__init__(styleObject=PdbxReportCategoryStyle(), verbose=verbose, log=log)
 
         # self.__verbose = verbose
         # self.__debug = False
@@ -138,8 +142,11 @@ class PdbxReportIo(PdbxStyleIoUtil):
 class PdbxLinksReportIo(PdbxStyleIoUtil):
     """Methods for reading PDBx data files for reporting including style details. Specific to link information."""
 
-    def __init__(self, verbose=True, log=sys.stderr):
-        super(PdbxLinksReportIo, self).__init__(styleObject=PdbxLinksReportCategoryStyle(), verbose=verbose, log=log)
+    def __init__(self, verbose=True, log=sys.stderr, ioAdapter=None):
+        if ioAdapter is not None:
+            super(PdbxLinksReportIo, self).__init__(styleObject=PdbxLinksReportCategoryStyle(), IoAdapter=ioAdapter, verbose=verbose, log=log)
+        else:
+            super(PdbxLinksReportIo, self).__init__(styleObject=PdbxLinksReportCategoryStyle(), verbose=verbose, log=log)
         self.__lfh = log
         self.__filePath = None
         self.__idCode = None
@@ -188,8 +195,11 @@ class PdbxLinksReportIo(PdbxStyleIoUtil):
 class PdbxGeometryReportIo(PdbxStyleIoUtil):
     """Methods for reading PDBx geometry data files for reporting applications including style details."""
 
-    def __init__(self, verbose=True, log=sys.stderr):
-        super(PdbxGeometryReportIo, self).__init__(styleObject=PdbxGeometryReportCategoryStyle(), verbose=verbose, log=log)
+    def __init__(self, verbose=True, log=sys.stderr, ioAdapter=None):
+        if ioAdapter is not None:
+            super(PdbxGeometryReportIo, self).__init__(styleObject=PdbxGeometryReportCategoryStyle(), IoAdapter=ioAdapter, verbose=verbose, log=log)
+        else:
+            super(PdbxGeometryReportIo, self).__init__(styleObject=PdbxGeometryReportCategoryStyle(), verbose=verbose, log=log)
 
         # self.__verbose = verbose
         # self.__debug = False
@@ -243,8 +253,11 @@ class PdbxGeometryReportIo(PdbxStyleIoUtil):
 class PdbxXrayExpReportIo(PdbxStyleIoUtil):
     """Methods for reading PDBx exp data files for reporting applications including style details."""
 
-    def __init__(self, verbose=True, log=sys.stderr):
-        super(PdbxXrayExpReportIo, self).__init__(styleObject=PdbxXrayExpReportCategoryStyle(), verbose=verbose, log=log)
+    def __init__(self, verbose=True, log=sys.stderr, ioAdapter=None):
+        if ioAdapter is not None:
+            super(PdbxXrayExpReportIo, self).__init__(styleObject=PdbxXrayExpReportCategoryStyle(), IoAdapter=ioAdapter, verbose=verbose, log=log)
+        else:
+            super(PdbxXrayExpReportIo, self).__init__(styleObject=PdbxXrayExpReportCategoryStyle(), verbose=verbose, log=log)
 
         # self.__verbose = verbose
         # self.__debug = False
@@ -878,8 +891,11 @@ class PdbxLocalMapIndexIo(PdbxStyleIoUtil):
 class EmInfoReportIo(PdbxStyleIoUtil):
     """Methods for reading EM information details."""
 
-    def __init__(self, verbose=True, log=sys.stderr):
-        super(EmInfoReportIo, self).__init__(styleObject=PdbxEmExtensionCategoryStyle(), verbose=verbose, log=log)
+    def __init__(self, verbose=True, log=sys.stderr, ioAdapter=None):
+        if ioAdapter is not None:
+            super(EmInfoReportIo, self).__init__(styleObject=PdbxEmExtensionCategoryStyle(), IoAdapter=ioAdapter, verbose=verbose, log=log)
+        else:
+            super(EmInfoReportIo, self).__init__(styleObject=PdbxEmExtensionCategoryStyle(), verbose=verbose, log=log)
 
         # self.__verbose = verbose
         # self.__debug = False
@@ -5,6 +5,7 @@
 # Update:
 #  2-July-2012  jdw Add command line argument option
 # 28-Feb -2014  jdw Add base class
+# 18-Oct -2026      Run in a private task workspace and commit the model update with a version history
 #
 ##
 """
@@ -23,6 +24,7 @@ import os
 import traceback
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
 
 
 class Site(SessionWebDownloadUtils):
@@ -53,43 +55,40 @@ class Site(SessionWebDownloadUtils):
         """Run the site calculation and merge the result with model file."""
         try:
             inpPath = os.path.join(self.__sessionPath, inpFile)
-            logPath1 = os.path.join(self.__sessionPath, entryId + "_site-anal.log")
-            logPath2 = os.path.join(self.__sessionPath, entryId + "_site-merge.log")
-            resultPath = os.path.join(self.__sessionPath, entryId + "_site-anal_P1.cif")
-            retPath = os.path.join(self.__sessionPath, entryId + "_model-updated_P1.cif")
-            for filePath in (resultPath, retPath, logPath1, logPath2):
-                if os.access(filePath, os.R_OK):
-                    os.remove(filePath)
+            with TaskWorkspace(self.__sessionPath, entryId, "site", verbose=self.__verbose, log=self.__lfh) as ws:
+                logPath1 = ws.getPath(entryId + "_site-anal.log")
+                logPath2 = ws.getPath(entryId + "_site-merge.log")
+                resultPath = ws.getPath(entryId + "_site-anal_P1.cif")
+                retPath = ws.getPath(entryId + "_model-updated_P1.cif")
+                snapPath = ws.snapshot(inpPath)
                 #
-            #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            dp.imp(inpPath)
-            dp.addInput(name="block_id", value=entryId)
-            if self.__siteArgs is not None:
-                dp.addInput(name="site_arguments", value=self.__siteArgs)
-            dp.op("annot-site")
-            dp.expLog(logPath1)
-            dp.exp(resultPath)
-            self.addDownloadPath(resultPath)
-            self.addDownloadPath(logPath1)
+                dp = RcsbDpUtility(tmpPath=ws.getPath(), siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                dp.imp(snapPath)
+                dp.addInput(name="block_id", value=entryId)
+                if self.__siteArgs is not None:
+                    dp.addInput(name="site_arguments", value=self.__siteArgs)
+                dp.op("annot-site")
+                dp.expLog(logPath1)
+                dp.exp(resultPath)
 
-            # Step 2
-            dp.imp(inpPath)
-            dp.addInput(name="site_info_file_path", value=resultPath, type="file")
-            dp.op("annot-merge-struct-site")
-            #
-            dp.expLog(logPath2)
-            dp.exp(retPath)
-            self.addDownloadPath(retPath)
-            self.addDownloadPath(logPath2)
-            if updateInput and os.access(retPath, os.R_OK):
-                dp.exp(inpPath)
-            #
+                # Step 2
+                dp.imp(snapPath)
+                dp.addInput(name="site_info_file_path", value=resultPath, type="file")
+                dp.op("annot-merge-struct-site")
+                #
+                dp.expLog(logPath2)
+                dp.exp(retPath)
+                dp.cleanup()
+                for filePath in ws.publish([resultPath, logPath1, retPath, logPath2]):
+                    self.addDownloadPath(filePath)
+                ok = True
+                if updateInput and os.access(retPath, os.R_OK):
+                    ok = ws.commit(retPath, inpPath)
+                #
             if self.__verbose:
                 self.__lfh.write("+Site.run-  completed for entryId %s file %s\n" % (entryId, inpPath))
             #
-            dp.cleanup()
-            return True
+            return ok
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
             return False
@@ -6,6 +6,7 @@
 #   4-July-2012 - jdw swap and test method "annot-reposition-solvent"
 #  17-Dec -2012 - jdw add option to compute selected derived categories after solvent adjustment.
 #  28-Feb -2014 - jdw add base class
+#  18-Oct -2026 -     run in a private task workspace and commit the model update with a version history
 ##
 """
 Manage calculation of symmetry related solvent position in closest proximity to the macromolecule components
@@ -25,6 +26,7 @@ import traceback
 
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
 
 
 class Solvent(SessionWebDownloadUtils):
@@ -53,41 +55,40 @@ class Solvent(SessionWebDownloadUtils):
         self.__solventArgs = solventArgs
 
     def run(self, entryId, inpFile, updateInput=True):
-        """Run the solvent shuffling algorithm and merge the result with the model input data."""
+        """Run the solvent shuffling algorithm and merge the result with the model input data.
+
+        The calculation runs in a private scratch directory on a snapshot of the input model -
+        the input model is replaced only if it has not been changed by another task meanwhile.
+        """
         try:
             inpPath = os.path.join(self.__sessionPath, inpFile)
-            logPath1 = os.path.join(self.__sessionPath, entryId + "-solvent-anal.log")
-            retPath = os.path.join(self.__sessionPath, entryId + "_model-updated_P1.cif")
-            for filePath in (retPath, logPath1):
-                if os.access(filePath, os.R_OK):
-                    os.remove(filePath)
+            with TaskWorkspace(self.__sessionPath, entryId, "solvent", verbose=self.__verbose, log=self.__lfh) as ws:
+                logPath1 = ws.getPath(entryId + "-solvent-anal.log")
+                retPath = ws.getPath(entryId + "_model-updated_P1.cif")
                 #
-            #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            dp.imp(inpPath)
-            if self.__solventArgs is not None:
-                dp.addInput(name="solvent_arguments", value=self.__solventArgs)
-            #
-            # dp.op("annot-reposition-solvent")
-            # dp.op("annot-distant-solvent")
-            dp.op("annot-reposition-solvent-add-derived")
+                dp = RcsbDpUtility(tmpPath=ws.getPath(), siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                dp.imp(ws.snapshot(inpPath))
+                if self.__solventArgs is not None:
+                    dp.addInput(name="solvent_arguments", value=self.__solventArgs)
+                #
+                # dp.op("annot-reposition-solvent")
+                # dp.op("annot-distant-solvent")
+                dp.op("annot-reposition-solvent-add-derived")
 
-            dp.expLog(logPath1)
-            dp.exp(retPath)
-            self.addDownloadPath(retPath)
-            self.addDownloadPath(logPath1)
-            if updateInput and os.access(retPath, os.R_OK):
-                dp.exp(inpPath)
-            #
+                dp.expLog(logPath1)
+                dp.exp(retPath)
+                dp.cleanup()
+                for filePath in ws.publish([retPath, logPath1]):
+                    self.addDownloadPath(filePath)
+                #
+                ok = os.access(retPath, os.R_OK)
+                if updateInput and ok:
+                    ok = ws.commit(retPath, inpPath)
+                #
             if self.__verbose:
                 self.__lfh.write("+Solvent.run-  completed for entryId %s file %s\n" % (entryId, inpPath))
             #
-            dp.cleanup()
-            if os.access(retPath, os.R_OK):
-                return True
-            else:
-                return False
-            #
+            return ok
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
             return False
@@ -0,0 +1,254 @@
+##
+# File:  StatusBatchUpdate.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Status code updates for a list of entries.
+
+All requested transitions are checked before any change is made.  Model files are
+fetched, checked and rewritten concurrently.  The workflow status records of all
+entries are then updated in one transaction, and the rewritten model files are
+loaded into the status database with a single loader run.  A result is reported
+for each entry.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import traceback
+
+from mmcif.io.IoAdapterCore import IoAdapterCore
+from wwpdb.io.locator.PathInfo import PathInfo
+from wwpdb.utils.db.StatusHistoryUtils import StatusHistoryUtils
+
+from wwpdb.apps.ann_tasks_v2.status.StatusUpdate import StatusUpdate
+from wwpdb.apps.ann_tasks_v2.utils.SessionDownloadUtils import SessionDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.TaskPool import TaskPool
+from wwpdb.apps.wf_engine.engine.WFEapplications import killAllWF
+
+
+class StatusBatchUpdate(object):
+    """Apply requested status code changes to a list of entries.
+
+    Each request is a dictionary with keys:
+
+        idcode               deposition data set id
+        status-code          new PDB processing status code
+        approval-type        (optional)
+        postrel-status-code  (optional) post release status code
+        em_new_status        (optional) new EM processing status code
+
+    run() returns a list of per entry result dictionaries in request order with keys
+    idcode, status ('updated', 'rejected' or 'failed') and msg.
+    """
+
+    def __init__(self, reqObj, maxWorkers=None, verbose=False, log=sys.stderr):
+        self.__reqObj = reqObj
+        self.__maxWorkers = maxWorkers
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__siteId = self.__reqObj.getValue("WWPDB_SITE_ID")
+        self.__sessionPath = self.__reqObj.newSessionObj().getPath()
+        self.__annotatorInitials = None
+
+    def run(self, requestList, annotatorInitials=None):
+        self.__annotatorInitials = annotatorInitials
+        resultL = []
+        entryL = []
+        seenS = set()
+        for reqD in requestList:
+            idCode = str(reqD.get("idcode", "")).strip().upper()
+            rD = {"idcode": idCode, "status": "rejected", "msg": ""}
+            resultL.append(rD)
+            if not idCode or idCode in seenS:
+                rD["msg"] = "Missing or repeated data set id"
+                continue
+            seenS.add(idCode)
+            entryL.append({"idcode": idCode, "reqD": reqD, "result": rD})
+        #
+        # Fetch each model file and check the requested transition before anything is changed
+        self.__runTasks("check", self.__checkEntry, entryL)
+        entryL = [eD for eD in entryL if eD["result"]["msg"] == "ok"]
+        #
+        self.__createHistory(entryL)
+        #
+        self.__runTasks("rewrite", self.__rewriteEntry, entryL)
+        entryL = [eD for eD in entryL if eD["result"]["msg"] == "ok"]
+        if not entryL:
+            return resultL
+        #
+        sU = StatusUpdate(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        updateL = [(eD["idcode"], eD["pdbArgD"], eD["emArgD"]) for eD in entryL]
+        if not sU.wfLoadMany(updateL):
+            self.__setFailed(entryL, "WF status database update failed.")
+            return resultL
+        #
+        for eD in entryL:
+            shutil.copyfile(eD["outPath"], eD["archivePath"])
+            status = killAllWF(eD["idcode"], "statMod")
+            if self.__verbose:
+                self.__lfh.write("+StatusBatchUpdate.run() %s killallwf returns %r\n" % (eD["idcode"], status))
+        #
+        if not sU.dbLoadMany([eD["outPath"] for eD in entryL]):
+            if sU.wfRollBackMany([eD["idcode"] for eD in entryL]):
+                self.__setFailed(entryL, "Data file status update failed and workflow status rolled back.")
+            else:
+                self.__setFailed(entryL, "Data file status update failed and workflow status roll back failed.")
+            return resultL
+        #
+        for eD in entryL:
+            eD["result"]["status"] = "updated"
+            eD["result"]["msg"] = "Status updated"
+        self.__updateHistory(entryL)
+        return resultL
+
+    def __runTasks(self, stage, func, entryL):
+        tP = TaskPool(maxWorkers=self.__maxWorkers, verbose=self.__verbose, log=self.__lfh)
+        for eD in entryL:
+            tP.add(eD["idcode"], func, eD)
+        for idCode, ok, _result in tP.run():
+            if not ok:
+                self.__lfh.write("+StatusBatchUpdate.run() %s %s failed\n" % (idCode, stage))
+        for eD in entryL:
+            if eD["result"]["msg"] == "" or (eD["result"]["msg"] == "ok" and not eD.get(stage, False)):
+                eD["result"]["status"] = "failed"
+                eD["result"]["msg"] = "Status update %s failed" % stage
+
+    def __checkEntry(self, eD):
+        """Fetch the model file and check the requested status change against the current status."""
+        idCode = eD["idcode"]
+        reqD = eD["reqD"]
+        rD = eD["result"]
+        du = SessionDownloadUtils(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+        if not du.fetchId(idCode, "model", formatType="pdbx"):
+            rD["status"] = "failed"
+            rD["msg"] = "Status update failed, data file cannot be accessed."
+            return False
+        eD["inpPath"] = du.getDownloadPath()
+        sU = StatusUpdate(reqObj=self.__reqObj, IoAdapter=IoAdapterCore(), verbose=self.__verbose, log=self.__lfh)
+        sUD = sU.getV2(eD["inpPath"])
+        #
+        reqAccTypes = sUD["reqAccTypes"]
+        hasPdb = len(reqAccTypes) < 2 or "PDB" in reqAccTypes
+        hasEM = "EMDB" in reqAccTypes
+        statusCode = reqD.get("status-code", "")
+        postRelStatusCode = reqD.get("postrel-status-code", "")
+        msg, statusCode, emStatusCode = sU.checkTransition(
+            statusCode,
+            sUD["statusCode"],
+            orgAuthRelCode=sUD["authReleaseCode"],
+            orgPostRelStatusCode=sUD.get("postRelStatus", ""),
+            emStatusCode=reqD.get("em_new_status", ""),
+            orgEmStatusCode=sUD["emStatusCode"],
+            orgEmAuthRelCode=sUD["emAuthReleaseCode"],
+            hasPdb=hasPdb,
+            hasEM=hasEM,
+        )
+        rD["msg"] = msg
+        if msg != "ok":
+            return False
+        #
+        eD["hasPdb"] = hasPdb
+        eD["statusCode"] = statusCode
+        eD["orgStatusCode"] = sUD["statusCode"]
+        eD["reqAccTypes"] = reqAccTypes
+        eD["statusD"] = {"em_current_status": emStatusCode}
+        eD["approvalType"] = reqD.get("approval-type", "")
+        eD["postRelStatusCode"] = postRelStatusCode
+        eD["expMethods"] = sUD["expMethods"]
+        eD["pdbArgD"] = None
+        eD["emArgD"] = None
+        if hasPdb:
+            eD["pdbArgD"] = {"statusCode": statusCode, "initialDepositionDate": sUD["initialDepositionDate"], "postRelStatusCode": postRelStatusCode}
+        if hasEM:
+            eD["emArgD"] = {"statusCode": emStatusCode, "annotatorInitials": self.__annotatorInitials}
+            rD["em_current_status"] = emStatusCode
+        rD["statuscode"] = statusCode
+        eD["check"] = True
+        return True
+
+    def __rewriteEntry(self, eD):
+        """Write the status changes to a session copy of the model file."""
+        idCode = eD["idcode"]
+        # The download file may share content with the archive file - write a separate file
+        eD["outPath"] = os.path.join(self.__sessionPath, idCode + "_model-status_P1.cif")
+        pI = PathInfo(siteId=self.__siteId, sessionPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
+        eD["archivePath"] = pI.getModelPdbxFilePath(dataSetId=idCode, wfInstanceId=None, fileSource="archive", versionId="next", mileStone=None)
+        sU = StatusUpdate(reqObj=self.__reqObj, IoAdapter=IoAdapterCore(), verbose=self.__verbose, log=self.__lfh)
+        ok = sU.setBoth(
+            eD["inpPath"],
+            eD["outPath"],
+            eD["reqAccTypes"],
+            eD["statusCode"],
+            eD["statusD"],
+            eD["approvalType"],
+            annotatorInitials=None,
+            expMethods=eD["expMethods"],
+            postRelStatusCode=eD["postRelStatusCode"],
+        )
+        if not ok:
+            eD["result"]["status"] = "failed"
+            eD["result"]["msg"] = "Data file status update failed."
+            return False
+        eD["rewrite"] = True
+        return True
+
+    def __setFailed(self, entryL, msg):
+        for eD in entryL:
+            eD["result"]["status"] = "failed"
+            eD["result"]["msg"] = msg
+
+    def __createHistory(self, entryL):
+        """Create status history files where required for the PDB entries in the list."""
+        pdbL = [eD for eD in entryL if eD["hasPdb"]]
+        if not pdbL:
+            return
+        try:
+            shu = StatusHistoryUtils(self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+            # Entries going to AUTH or WAIT get an initial record for that status
+            groupD = {}
+            for eD in pdbL:
+                groupD.setdefault(eD["statusCode"] if eD["statusCode"] in ["AUTH", "WAIT"] else None, []).append(eD)
+            for statusUpdateAuthWait, gL in groupD.items():
+                rL = shu.createHistory([eD["idcode"] for eD in gL], overWrite=False, statusUpdateAuthWait=statusUpdateAuthWait)
+                for eD in gL:
+                    eD["newHistoryFile"] = eD["idcode"] in rL
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+StatusBatchUpdate.__createHistory() status history file create failed with exception\n")
+                traceback.print_exc(file=self.__lfh)
+
+    def __updateHistory(self, entryL):
+        """Add the status changes to the status history files and load the history database once."""
+        pdbL = [eD for eD in entryL if eD["hasPdb"]]
+        if not pdbL:
+            return
+        try:
+            shu = StatusHistoryUtils(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+            loadL = [eD["idcode"] for eD in pdbL if eD.get("newHistoryFile", False)]
+            groupD = {}
+            for eD in pdbL:
+                groupD.setdefault((eD["statusCode"], eD["orgStatusCode"]), []).append(eD["idcode"])
+            for (statusCode, orgStatusCode), idL in groupD.items():
+                okShUpdate = shu.updateEntryStatusHistory(
+                    entryIdList=idL, statusCode=statusCode, annotatorInitials=self.__annotatorInitials, details="Update by status module", statusCodePrior=orgStatusCode
+                )
+                if okShUpdate:
+                    loadL.extend([idCode for idCode in idL if idCode not in loadL])
+            if loadL:
+                okShLoad = shu.loadEntryStatusHistory(entryIdList=loadL)
+                if self.__verbose:
+                    self.__lfh.write("+StatusBatchUpdate.__updateHistory() status history database load for %d entries status %r\n" % (len(loadL), okShLoad))
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+StatusBatchUpdate.__updateHistory() status history update and database load failed with exception\n")
+                traceback.print_exc(file=self.__lfh)
@@ -7,6 +7,11 @@
 #  18-Jan-2015 jdw integrate status history tracking
 #   2-Mar-2016 jdw add annotator initials to the wfemload() method...
 #  12-Feb-2018 ep  Rewrite get() operation as getV2 that returns dictionary
+#  18-Oct-2026 ep  add checkTransition(), wfLoadMany(), wfRollBackMany() and dbLoadMany() for batched status updates
+#  18-Oct-2026 ep  replace rather than rewrite output files which share content with another file (session download links)
+#  18-Oct-2026 ep  getV2() may read the model file through a request model context
+#  18-Oct-2026 ep  add statusCategoryList - the categories read by getV2()
+#  18-Oct-2026 ep  wfLoadMany()/wfRollBackMany() lock the deposition rows and write only the changed status columns
 ##
 """
 Methods to manage model PDBx database release and progress status updates
@@ -18,13 +23,16 @@ __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.01"
 
+import os
 import sys
 import time
 import traceback
 import copy
 
 from mmcif.io.IoAdapterCore import IoAdapterCore
+from wwpdb.utils.db.DBLoadUtil import DBLoadUtil
 from wwpdb.utils.db.DbLoadingApi import DbLoadingApi
+from wwpdb.utils.db.MyConnectionBase import MyConnectionBase
 from wwpdb.utils.wf.dbapi.WfDbApi import WfDbApi
 
 #
@@ -38,6 +46,24 @@ logger = logging.getLogger()
 class StatusUpdate(object):
     """Update release status items."""
 
+    # Categories read from the model file by getV2()
+    statusCategoryList = ["database_2", "pdbx_database_status", "pdbx_depui_entry_details", "em_admin", "em_depui", "exptl"]
+
+    # Workflow deposition table and the status columns written by wfLoadMany() - other columns belong to the workflow engine
+    __wfTableName = "deposition"
+    __wfStatusColumnD = {
+        "STATUS_CODE": "status_code",
+        "POST_REL_STATUS": "post_rel_status",
+        "ANNOTATOR_INITIALS": "annotator_initials",
+        "INITIAL_DEPOSITION_DATE": "initial_deposition_date",
+        "AUTHOR_RELEASE_STATUS_CODE": "author_release_status_code",
+        "POST_REL_RECVD_COORD": "post_rel_recvd_coord",
+        "POST_REL_RECVD_COORD_DATE": "post_rel_recvd_coord_date",
+        "STATUS_CODE_EMDB": "status_code_emdb",
+        "DEP_AUTHOR_RELEASE_STATUS_CODE_EMDB": "dep_author_release_status_code_emdb",
+        "TITLE_EMDB": "title_emdb",
+    }
+
     def __init__(self, reqObj, IoAdapter=IoAdapterCore(), verbose=False, log=sys.stderr):
         """
         :param `verbose`:  boolean flag to activate verbose logging.
@@ -55,6 +81,8 @@ class StatusUpdate(object):
         self.__sessionPath = self.__sObj.getPath()
         #
         self.__savedStatusD = {}
+        # Prior and updated status column values of the depositions updated by wfLoadMany()
+        self.__savedStatusManyD = {}
         #
         # Temporary placeholder for annotator initials to assign - process_site - defaults
         # Also used for list of processing sites
@@ -77,6 +105,38 @@ class StatusUpdate(object):
                 traceback.print_exc(file=self.__lfh)
             return False
 
+    def dbLoadMany(self, pdbxFilePathList):
+        """Load the input model files into the status database with a single loader run."""
+        if not pdbxFilePathList:
+            return True
+        try:
+            loadPath = os.path.join(self.__sessionPath, "dbload")
+            if not os.access(loadPath, os.F_OK):
+                os.makedirs(loadPath)
+            sqlPath = os.path.join(loadPath, "DB_LOADER.sql")
+            logPath = os.path.join(loadPath, "sqlload.log")
+            for fp in [sqlPath, logPath]:
+                if os.access(fp, os.F_OK):
+                    os.remove(fp)
+            #
+            dbLd = DBLoadUtil(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+            dbLd.doLoading(pdbxFilePathList)
+            if not os.access(sqlPath, os.R_OK):
+                self.__lfh.write("+StatusUpdate.dbLoadMany() no load file created for %d files\n" % len(pdbxFilePathList))
+                return False
+            if os.access(logPath, os.R_OK):
+                with open(logPath, "r") as ifh:
+                    for line in ifh:
+                        if "ERROR" in [word.upper() for word in line.split()]:
+                            self.__lfh.write("+StatusUpdate.dbLoadMany() error loading status database - see %s\n" % logPath)
+                            return False
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+StatusUpdate.dbLoadMany() dbload failed for %r\n" % pdbxFilePathList)
+                traceback.print_exc(file=self.__lfh)
+            return False
+
     def wfRollBack(self, idCode):
         try:
             c = WfDbApi(self.__lfh, self.__verbose)
@@ -90,6 +150,44 @@ class StatusUpdate(object):
                 traceback.print_exc(file=self.__lfh)
             return False
 
+    def checkTransition(self, statusCode, orgStatusCode, orgAuthRelCode="", orgPostRelStatusCode="", emStatusCode="", orgEmStatusCode="", orgEmAuthRelCode="", hasPdb=True, hasEM=False):
+        """Check a requested status code change against the current status of the entry.
+
+        Returns (msg, statusCode, emStatusCode) where msg is 'ok' if the change is permitted.
+        For a post release update of a released entry statusCode is returned as REL, and an
+        empty EM status code is returned as the current EM status.
+        """
+        msg = "ok"
+        if hasPdb:
+            if (str(statusCode).upper() == "HPUB") and (str(orgAuthRelCode).upper() == "HOLD"):
+                msg = "Processing status code and author release status are inconsistent"
+
+            if (str(orgStatusCode).upper() == "PROC") and (str(statusCode).upper() in ["HPUB", "HOLD"]):
+                msg = "Processing status code change from PROC to HPUB or HOLD prohibited"
+
+            if str(orgStatusCode).upper() == "REL":
+                if len(orgPostRelStatusCode) == 0:
+                    msg = "Processing status code change from REL prohibited"
+                else:
+                    # Web form does not set in this case
+                    statusCode = "REL"
+
+            if str(orgStatusCode).upper() == "OBS":
+                msg = "Processing status code change from OBS prohibited"
+
+        if hasEM and msg == "ok":
+            # For PostRel PDB - this will be empty
+            if emStatusCode == "":
+                emStatusCode = orgEmStatusCode
+
+            if (str(orgEmStatusCode).upper() == "PROC") and (str(emStatusCode).upper() in ["HPUB", "HOLD"]):
+                msg = "EM processing status code change from PROC to HPUB or HOLD prohibited"
+
+            if (str(emStatusCode).upper() == "HPUB") and (str(orgEmAuthRelCode).upper() == "HOLD"):
+                msg = "Processing status code and author release status are inconsistent"
+
+        return msg, statusCode, emStatusCode
+
     def wfLoad(
         self,
         idCode,
@@ -122,43 +220,17 @@ class StatusUpdate(object):
                     self.__lfh.write("+StatusUpdate.__wfload() %r  %r\n" % (k, v))
 
             self.__savedStatusD = copy.deepcopy(rd)
-            if statusCode is not None:
-                rd["STATUS_CODE"] = statusCode
-
-            if postRelStatusCode is not None:
-                if len(postRelStatusCode) > 0:
-                    rd["POST_REL_STATUS"] = postRelStatusCode
-                else:
-                    rd["POST_REL_STATUS"] = None
-
-            if annotatorInitials is not None and len(annotatorInitials) > 1:
-                rd["ANNOTATOR_INITIALS"] = annotatorInitials
-
-            if "TITLE" in rd and (len(rd["TITLE"]) > 0):
-                maxlen = 370
-                rd["TITLE"] = str(rd["TITLE"]).replace("'", "''")
-                if len(rd["TITLE"]) > maxlen:
-                    rd["TITLE"] = rd["TITLE"][0:maxlen]
-            if "AUTHOR_LIST" in rd and (len(rd["AUTHOR_LIST"]) > 0):
-                rd["AUTHOR_LIST"] = str(rd["AUTHOR_LIST"]).replace("'", "''")
-
-            if (initialDepositionDate is not None) and (len(initialDepositionDate) > 4):
-                rd["INITIAL_DEPOSITION_DATE"] = initialDepositionDate
-
-            if (authRelCode is not None) and (len(authRelCode) > 2):
-                rd["AUTHOR_RELEASE_STATUS_CODE"] = authRelCode
-
-            if postRelRecvdCoord is not None:
-                if postRelRecvdCoord != "":
-                    rd["POST_REL_RECVD_COORD"] = postRelRecvdCoord
-                else:
-                    rd["POST_REL_RECVD_COORD"] = None
-
-            if postRelRecvdCoordDate is not None:
-                if postRelRecvdCoordDate != "":
-                    rd["POST_REL_RECVD_COORD_DATE"] = postRelRecvdCoordDate
-                else:
-                    rd["POST_REL_RECVD_COORD_DATE"] = None
+            self.__setWfRecord(
+                rd,
+                statusCode=statusCode,
+                annotatorInitials=annotatorInitials,
+                initialDepositionDate=initialDepositionDate,
+                authRelCode=authRelCode,
+                postRelStatusCode=postRelStatusCode,
+                postRelRecvdCoord=postRelRecvdCoord,
+                postRelRecvdCoordDate=postRelRecvdCoordDate,
+            )
+            self.__quoteWfRecord(rd)
 
             constDict = {}
             constDict["DEP_SET_ID"] = idCode
@@ -174,6 +246,58 @@ class StatusUpdate(object):
                 traceback.print_exc(file=self.__lfh)
             return False
 
+    def __setWfRecord(
+        self,
+        rd,
+        statusCode=None,
+        annotatorInitials=None,
+        initialDepositionDate=None,
+        authRelCode=None,
+        postRelStatusCode=None,
+        postRelRecvdCoord=None,
+        postRelRecvdCoordDate=None,
+    ):
+        """Apply PDB status changes to the input workflow deposition record."""
+        if statusCode is not None:
+            rd["STATUS_CODE"] = statusCode
+
+        if postRelStatusCode is not None:
+            if len(postRelStatusCode) > 0:
+                rd["POST_REL_STATUS"] = postRelStatusCode
+            else:
+                rd["POST_REL_STATUS"] = None
+
+        if annotatorInitials is not None and len(annotatorInitials) > 1:
+            rd["ANNOTATOR_INITIALS"] = annotatorInitials
+
+        if (initialDepositionDate is not None) and (len(initialDepositionDate) > 4):
+            rd["INITIAL_DEPOSITION_DATE"] = initialDepositionDate
+
+        if (authRelCode is not None) and (len(authRelCode) > 2):
+            rd["AUTHOR_RELEASE_STATUS_CODE"] = authRelCode
+
+        if postRelRecvdCoord is not None:
+            if postRelRecvdCoord != "":
+                rd["POST_REL_RECVD_COORD"] = postRelRecvdCoord
+            else:
+                rd["POST_REL_RECVD_COORD"] = None
+
+        if postRelRecvdCoordDate is not None:
+            if postRelRecvdCoordDate != "":
+                rd["POST_REL_RECVD_COORD_DATE"] = postRelRecvdCoordDate
+            else:
+                rd["POST_REL_RECVD_COORD_DATE"] = None
+
+    def __quoteWfRecord(self, rd):
+        """Quote the text values of the workflow deposition record for the SQL written by WfDbApi."""
+        if "TITLE" in rd and (len(rd["TITLE"]) > 0):
+            maxlen = 370
+            rd["TITLE"] = str(rd["TITLE"]).replace("'", "''")
+            if len(rd["TITLE"]) > maxlen:
+                rd["TITLE"] = rd["TITLE"][0:maxlen]
+        if "AUTHOR_LIST" in rd and (len(rd["AUTHOR_LIST"]) > 0):
+            rd["AUTHOR_LIST"] = str(rd["AUTHOR_LIST"]).replace("'", "''")
+
     def wfEmLoad(self, idCode, statusCode=None, title=None, authRelCode=None, annotatorInitials=None):
         """
         c=WfDbApi(self.__lfh, self.__verbose)
@@ -191,24 +315,8 @@ class StatusUpdate(object):
             c = WfDbApi(self.__lfh, self.__verbose)
             rd = c.getObject(idCode)
             self.__savedStatusD = copy.deepcopy(rd)
-
-            if statusCode is not None and len(statusCode) > 0:
-                rd["STATUS_CODE_EMDB"] = statusCode
-
-            if "TITLE_EMDB" in rd and rd["TITLE_EMDB"] is not None and (len(rd["TITLE_EMDB"]) > 0):
-                rd["TITLE"] = str(rd["TITLE"]).replace("'", "''")
-
-            if "AUTHOR_LIST_EMDB" in rd and rd["AUTHOR_LIST_EMDB"] is not None and (len(rd["AUTHOR_LIST_EMDB"]) > 0):
-                rd["AUTHOR_LIST_EMDB"] = str(rd["AUTHOR_LIST_EMDB"]).replace("'", "''")
-
-            if (authRelCode is not None) and (len(authRelCode) > 2):
-                rd["DEP_AUTHOR_RELEASE_STATUS_CODE_EMDB"] = authRelCode
-
-            if (title is not None) and (len(title) > 2):
-                rd["TITLE_EMDB"] = title
-
-            if annotatorInitials is not None and len(annotatorInitials) > 1:
-                rd["ANNOTATOR_INITIALS"] = annotatorInitials
+            self.__setWfEmRecord(rd, statusCode=statusCode, title=title, authRelCode=authRelCode, annotatorInitials=annotatorInitials)
+            self.__quoteWfEmRecord(rd)
 
             constDict = {}
             constDict["DEP_SET_ID"] = idCode
@@ -220,6 +328,137 @@ class StatusUpdate(object):
                 traceback.print_exc(file=self.__lfh)
             return False
 
+    def __setWfEmRecord(self, rd, statusCode=None, title=None, authRelCode=None, annotatorInitials=None):
+        """Apply EM status changes to the input workflow deposition record."""
+        if statusCode is not None and len(statusCode) > 0:
+            rd["STATUS_CODE_EMDB"] = statusCode
+
+        if (authRelCode is not None) and (len(authRelCode) > 2):
+            rd["DEP_AUTHOR_RELEASE_STATUS_CODE_EMDB"] = authRelCode
+
+        if (title is not None) and (len(title) > 2):
+            rd["TITLE_EMDB"] = title
+
+        if annotatorInitials is not None and len(annotatorInitials) > 1:
+            rd["ANNOTATOR_INITIALS"] = annotatorInitials
+
+    def __quoteWfEmRecord(self, rd):
+        """Quote the EM text values of the workflow deposition record for the SQL written by WfDbApi."""
+        if "TITLE_EMDB" in rd and rd["TITLE_EMDB"] is not None and (len(rd["TITLE_EMDB"]) > 0):
+            rd["TITLE"] = str(rd["TITLE"]).replace("'", "''")
+
+        if "AUTHOR_LIST_EMDB" in rd and rd["AUTHOR_LIST_EMDB"] is not None and (len(rd["AUTHOR_LIST_EMDB"]) > 0):
+            rd["AUTHOR_LIST_EMDB"] = str(rd["AUTHOR_LIST_EMDB"]).replace("'", "''")
+
+    def wfLoadMany(self, updateList):
+        """Update the workflow status records of several depositions in a single transaction.
+
+        :param updateList: list of (idCode, pdbArgD, emArgD) where pdbArgD and emArgD are the keyword
+                           arguments of wfLoad() and wfEmLoad() (without idCode) or None if that update
+                           is not required.
+
+        The deposition rows are locked while they are read and only the status columns which change
+        are written, so changes made to other columns by the workflow engine are kept.  All updates
+        are committed together.  On failure nothing is changed and False is returned.  The prior
+        values are held for wfRollBackMany().
+        """
+        if not updateList:
+            return True
+        savedD = {}
+
+        def updateRecords(curs):
+            recD = self.__readWfRecords(curs, [tup[0] for tup in updateList])
+            for idCode, pdbArgD, emArgD in updateList:
+                if idCode not in recD:
+                    raise ValueError("No workflow status record for %s" % idCode)
+                rd = recD[idCode]
+                orgD = copy.deepcopy(rd)
+                if pdbArgD is not None:
+                    self.__setWfRecord(rd, **pdbArgD)
+                if emArgD is not None:
+                    self.__setWfEmRecord(rd, **emArgD)
+                keyL = [k for k in self.__wfStatusColumnD if rd[k] != orgD[k]]
+                savedD[idCode] = ({k: orgD[k] for k in keyL}, {k: rd[k] for k in keyL})
+                self.__writeWfRecord(curs, idCode, savedD[idCode][1])
+
+        ok = self.__runWfTransaction(updateRecords)
+        if ok:
+            self.__savedStatusManyD.update(savedD)
+        return ok
+
+    def wfRollBackMany(self, idCodeList):
+        """Restore the status columns changed by wfLoadMany() for the input depositions in a single transaction.
+
+        A column which has been changed again since wfLoadMany() is left as it is.
+        """
+        idCodeList = [idCode for idCode in idCodeList if idCode in self.__savedStatusManyD]
+        if not idCodeList:
+            return True
+
+        def restoreRecords(curs):
+            recD = self.__readWfRecords(curs, idCodeList)
+            for idCode in idCodeList:
+                orgD, newD = self.__savedStatusManyD[idCode]
+                rd = recD.get(idCode, {})
+                self.__writeWfRecord(curs, idCode, {k: v for k, v in orgD.items() if k in rd and rd[k] == newD[k]})
+
+        ok = self.__runWfTransaction(restoreRecords)
+        if ok:
+            for idCode in idCodeList:
+                del self.__savedStatusManyD[idCode]
+        return ok
+
+    def __runWfTransaction(self, func):
+        """Run func(cursor) in one transaction on the status database and commit, or roll back on failure.
+
+        MyConnectionBase takes the connection from the engine pool shared through MyDbPool and
+        closeConnection() returns it to that pool.
+        """
+        myDb = MyConnectionBase(siteId=self.__reqObj.getValue("WWPDB_SITE_ID"))
+        myDb.setResource(resourceName="STATUS")
+        if not myDb.openConnection():
+            self.__lfh.write("+StatusUpdate.__runWfTransaction() status database connection failed\n")
+            return False
+        dbCon = myDb.getConnection()
+        try:
+            curs = dbCon.cursor()
+            try:
+                func(curs)
+            finally:
+                curs.close()
+            dbCon.commit()
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            dbCon.rollback()
+            self.__lfh.write("+StatusUpdate.__runWfTransaction() status database update failed and was rolled back\n")
+            traceback.print_exc(file=self.__lfh)
+        finally:
+            myDb.closeConnection()
+        return False
+
+    def __readWfRecords(self, curs, idCodeList):
+        """Read and lock the status columns of the deposition rows until the transaction ends."""
+        keyL = list(self.__wfStatusColumnD.keys())
+        query = "SELECT dep_set_id,%s FROM %s WHERE dep_set_id IN (%s) FOR UPDATE" % (  # noqa: S608
+            ",".join([self.__wfStatusColumnD[k] for k in keyL]),
+            self.__wfTableName,
+            ",".join(["%s"] * len(idCodeList)),
+        )
+        curs.execute(query, tuple(idCodeList))
+        recD = {}
+        for row in curs.fetchall():
+            recD[row[0]] = dict(zip(keyL, row[1:]))
+        return recD
+
+    def __writeWfRecord(self, curs, idCode, rd):
+        """Write the input status column values of a deposition row - nothing is written for an empty dictionary."""
+        if not rd:
+            return
+        keyL = list(rd.keys())
+        query = "UPDATE %s SET %s WHERE dep_set_id = %%s" % (self.__wfTableName, ", ".join(["%s = %%s" % self.__wfStatusColumnD[k] for k in keyL]))  # noqa: S608
+        valL = [None if rd[k] is None or rd[k] == "None" else rd[k] for k in keyL]
+        curs.execute(query, tuple(valL + [idCode]))
+
     # This interface is still used by wwpdb.utils.letters.AutoOnHold
     def setEmStatusDetails(self, inpFilePath, outFilePath, statusD, processSite=None, annotatorInitials=None, approvalType=None):
         self.__lfh.write(
@@ -232,7 +471,7 @@ class StatusUpdate(object):
 
             ok = self.__setEmStatusDetails(container, statusD=statusD, processSite=processSite, annotatorInitials=annotatorInitials, approvalType=approvalType)
             if ok:
-                return self.__io.writeFile(outFilePath, cList)
+                return self.__writeFile(outFilePath, cList)
 
         except:  # noqa: E722 pylint: disable=bare-except
             if self.__verbose:
@@ -420,7 +659,7 @@ class StatusUpdate(object):
                 postRelStatusCode=postRelStatusCode,
             )
             if ok:
-                return self.__io.writeFile(outFilePath, cList)
+                return self.__writeFile(outFilePath, cList)
 
         except:  # noqa: E722 pylint: disable=bare-except
             if self.__verbose:
@@ -566,6 +805,12 @@ class StatusUpdate(object):
                 traceback.print_exc(file=self.__lfh)
             return False
 
+    def __writeFile(self, outFilePath, cList):
+        """Write the output file - a file linked to another (e.g. a session download of an archive file) is replaced, not rewritten."""
+        if os.path.islink(outFilePath) or (os.path.exists(outFilePath) and os.stat(outFilePath).st_nlink > 1):
+            os.remove(outFilePath)
+        return self.__io.writeFile(outFilePath, cList)
+
     def __inMethod(self, tag, methodString):
         if str(methodString).upper().find(tag) != -1:
             return True
@@ -583,8 +828,11 @@ class StatusUpdate(object):
         else:
             return default
 
-    def getV2(self, inpFilePath):
-        """Return selected status items from the input model files."""
+    def getV2(self, inpFilePath, modelContext=None):
+        """Return selected status items from the input model files.
+
+        The file is read through modelContext (see ModelContext) if provided.
+        """
         #
         logger.debug("Starting %s", inpFilePath)
 
@@ -601,13 +849,20 @@ class StatusUpdate(object):
             "annotatorInitials",
             "titleSupp",
             "reqAccTypes",
+            "emStatusCode",
+            "emAuthReleaseCode",
+            "expMethods",
         ]
 
         for i in initList:
             ret[i] = ""
 
         try:
-            cList = self.__io.readFile(inpFilePath, selectList=["database_2", "pdbx_database_status", "pdbx_depui_entry_details"])
+            selectList = StatusUpdate.statusCategoryList
+            if modelContext is not None:
+                cList = modelContext.getContainerList(inpFilePath, selectList)
+            else:
+                cList = self.__io.readFile(inpFilePath, selectList=selectList)
             container = cList[0]
             catObj = container.getObj("database_2")
             vals = catObj.selectValuesWhere("database_code", "PDB", "database_id")
@@ -630,6 +885,15 @@ class StatusUpdate(object):
             if dcObj is not None:
                 ret["reqAccTypes"] = dcObj.getValueOrDefault(attributeName="requested_accession_types", rowIndex=0, defaultValue="")
                 logger.debug("requested_accession_Types %r", ret["reqAccTypes"])
+            dcObj = container.getObj("em_admin")
+            if dcObj is not None:
+                ret["emStatusCode"] = dcObj.getValueOrDefault(attributeName="current_status", rowIndex=0, defaultValue="")
+            dcObj = container.getObj("em_depui")
+            if dcObj is not None:
+                ret["emAuthReleaseCode"] = dcObj.getValueOrDefault(attributeName="depositor_hold_instructions", rowIndex=0, defaultValue="")
+            dcObj = container.getObj("exptl")
+            if dcObj is not None:
+                ret["expMethods"] = ",".join(dcObj.getAttributeValueList("method"))
 
         except:  # noqa: E722 pylint: disable=bare-except
             if self.__verbose:
@@ -668,7 +932,7 @@ class StatusUpdate(object):
                 if self.__debug:
                     self.__lfh.write("+StatusUpdate.__setProcessSite() before writefile \n")
                     dcObj.dumpIt(fh=self.__lfh)
-                return self.__io.writeFile(outFilePath, cList)
+                return self.__writeFile(outFilePath, cList)
             else:
                 return False
         except:  # noqa: E722 pylint: disable=bare-except
@@ -732,7 +996,7 @@ class StatusUpdate(object):
 
             if ok:
                 self.__lfh.write("\n+StatusUpdate.setBoth() about to write file %s\n" % outFilePath)
-                return self.__io.writeFile(outFilePath, cList)
+                return self.__writeFile(outFilePath, cList)
 
         except:  # noqa: E722 pylint: disable=bare-except
             if self.__verbose:
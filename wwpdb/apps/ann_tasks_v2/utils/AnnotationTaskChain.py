@@ -0,0 +1,269 @@
+##
+# File:  AnnotationTaskChain.py
+# Date:  18-Oct-2026
+#
+# Update:
+#   18-Oct-2026  Report the progress of the run to an optional callback
+#   18-Oct-2026  Merge the categories changed by each calculation, publish the merged model and reject unknown names
+##
+"""
+Run the standard annotation calculations on a model file as a task graph.
+
+Each calculation declares the model categories it reads and writes (None for the complete
+model) -  these declarations order the calculations.  Calculations which do not conflict run
+concurrently (see TaskGraph), each on its own copy of the current chain model.  When a
+calculation completes, its result is compared with its input and the categories it added,
+changed or removed are applied to the chain model.  The chain model is committed to the
+session model file at the end of the run (see TaskWorkspace.commit()) and is published as
+the updated model file of all of the calculations.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import filecmp
+import os
+import shutil
+import sys
+import threading
+import time
+import traceback
+
+try:
+    from mmcif.io.IoAdapterCore import IoAdapterCore as IoAdapter
+except ImportError:
+    from mmcif.io.IoAdapterPy import IoAdapterPy as IoAdapter
+
+from wwpdb.apps.ann_tasks_v2.check.GeometryCalc import GeometryCalc
+from wwpdb.apps.ann_tasks_v2.link.Link import Link
+from wwpdb.apps.ann_tasks_v2.mapcalc.SpecialPositionCalc import SpecialPositionCalc
+from wwpdb.apps.ann_tasks_v2.nafeatures.NAFeatures import NAFeatures
+from wwpdb.apps.ann_tasks_v2.secstruct.SecondaryStructure import SecondaryStructure
+from wwpdb.apps.ann_tasks_v2.site.Site import Site
+from wwpdb.apps.ann_tasks_v2.solvent.Solvent import Solvent
+from wwpdb.apps.ann_tasks_v2.utils.TaskGraph import TaskGraph
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
+from wwpdb.apps.ann_tasks_v2.utils.TerminalAtoms import TerminalAtoms
+
+
+class AnnotationTaskChain(object):
+    """Run a selection of the standard annotation calculations on a session model file."""
+
+    # Calculations in chain order - name, task name, form id, categories read and categories written (used to order the calculations)
+    _taskList = [
+        ("terminal-atoms", "Terminal atom replacement", "#terminal-atoms-task-form", None, None),
+        ("solvent", "Solvent", "#solvent-task-form", None, None),
+        (
+            "link",
+            "Link",
+            "#link-task-form",
+            ["atom_site", "cell", "symmetry", "chem_comp", "entity", "pdbx_poly_seq_scheme", "pdbx_nonpoly_scheme"],
+            ["struct_conn", "struct_conn_type", "struct_mon_prot_cis", "pdbx_modification_feature"],
+        ),
+        (
+            "secstruct",
+            "Secondary structure",
+            "#secstruct-task-form",
+            ["atom_site", "entity_poly", "pdbx_poly_seq_scheme"],
+            ["struct_conf", "struct_conf_type", "struct_sheet", "struct_sheet_order", "struct_sheet_range", "pdbx_struct_sheet_hbond"],
+        ),
+        (
+            "nafeatures",
+            "NA features",
+            "#nafeature-task-form",
+            ["atom_site", "entity_poly", "pdbx_poly_seq_scheme"],
+            ["ndb_struct_conf_na", "ndb_struct_feature_na", "ndb_struct_na_base_pair", "ndb_struct_na_base_pair_step"],
+        ),
+        (
+            "site",
+            "Site",
+            "#site-task-form",
+            ["atom_site", "cell", "symmetry", "struct_conn", "pdbx_entity_nonpoly", "pdbx_nonpoly_scheme"],
+            ["struct_site", "struct_site_gen"],
+        ),
+        (
+            "geometry",
+            "Geometry validation",
+            "#geom-valid-task-form",
+            ["atom_site", "cell", "symmetry", "struct_conn", "chem_comp"],
+            [
+                "pdbx_validate_close_contact",
+                "pdbx_validate_symm_contact",
+                "pdbx_validate_rmsd_bond",
+                "pdbx_validate_rmsd_angle",
+                "pdbx_validate_torsion",
+                "pdbx_validate_peptide_omega",
+                "pdbx_validate_chiral",
+                "pdbx_validate_planes",
+                "pdbx_validate_planes_atom",
+                "pdbx_validate_main_chain_plane",
+                "pdbx_validate_polymer_linkage",
+            ],
+        ),
+        ("special-position", "Special position", "#special-position-task-form", ["atom_site", "cell", "symmetry", "exptl"], []),
+    ]
+
+    def __init__(self, reqObj=None, maxWorkers=None, verbose=False, log=sys.stderr):
+        self.__reqObj = reqObj
+        self.__maxWorkers = maxWorkers
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__sessionPath = self.__reqObj.getSessionObj().getPath()
+        self.__lock = threading.Lock()
+        self.__ws = None
+        self.__chainPath = None
+        self.__modelChanged = False
+
+    def getTaskNameList(self, includeTerminalAtoms=False):
+        """Return the names of the standard calculations - terminal atom replacement changes the model contents and is only included on request."""
+        return [tT[0] for tT in self._taskList if includeTerminalAtoms or tT[0] != "terminal-atoms"]
+
+    def getUnknownTaskNameList(self, taskNameList):
+        """Return the names in taskNameList which are not calculations of the chain."""
+        return [name for name in taskNameList if self.__getTask(name) is None]
+
+    def run(self, entryId, inpFile, taskNameList=None, taskArgD=None, progressFunc=None):
+        """Run the calculations in taskNameList (default - the standard calculations) on the session model file inpFile.
+
+        taskArgD holds optional arguments for each calculation name (terminal-atoms - update option).
+        If provided, progressFunc(text) is called with a description of the progress as each calculation finishes.
+
+        Returns a tuple (ok, result list) where ok is False if the model file could not be updated and the
+        result list has a dictionary for each calculation with keys name, taskname, formid, ok, tags, after,
+        start, end and seconds, followed by a dictionary with name "total" with the elapsed time and the
+        critical path of the run.  Nothing is run if taskNameList includes an unknown name (see getUnknownTaskNameList()).
+        """
+        taskNameList = taskNameList if taskNameList is not None else self.getTaskNameList()
+        unknownL = self.getUnknownTaskNameList(taskNameList)
+        if unknownL:
+            self.__lfh.write("+AnnotationTaskChain.run() %s unknown calculation names %s\n" % (entryId, ",".join(unknownL)))
+            return False, []
+        taskArgD = taskArgD if taskArgD else {}
+        inpPath = os.path.join(self.__sessionPath, inpFile)
+        startTime = time.time()
+        ok = False
+        rL = []
+        try:
+            with TaskWorkspace(self.__sessionPath, entryId, "annotation-chain", verbose=self.__verbose, log=self.__lfh) as ws:
+                self.__ws = ws
+                self.__chainPath = ws.snapshot(inpPath)
+                self.__modelChanged = False
+                tG = TaskGraph(maxWorkers=self.__maxWorkers, verbose=self.__verbose, log=self.__lfh)
+                for name, _taskName, _formId, readList, writeList in self._taskList:
+                    if name in taskNameList:
+                        tG.add(name, self.__runTask, readList, writeList, entryId, name, writeList, taskArgD.get(name))
+                #
+                rL = tG.run(progressFunc=self.__getTaskProgressFunc(progressFunc))
+                ok = True
+                if self.__modelChanged:
+                    ok = ws.commit(self.__chainPath, inpPath)
+                # Each calculation publishes its own updated model under the same name - replace it with the merged model
+                if rL:
+                    updatedPath = ws.getPath(entryId + "_model-updated_P1.cif")
+                    shutil.copyfile(self.__chainPath, updatedPath)
+                    ws.publish([updatedPath])
+                #
+            for rD in rL:
+                taskOk, tagList = rD["result"] if rD["ok"] else (False, [])
+                rD.update({"taskname": self.__getTask(rD["name"])[1], "formid": self.__getTask(rD["name"])[2], "ok": taskOk, "tags": tagList})
+                del rD["result"]
+            #
+            pathL, pathTime = TaskGraph.getCriticalPath(rL)
+            rL.append({"name": "total", "ok": ok, "seconds": time.time() - startTime, "criticalpath": pathL, "criticalpathseconds": pathTime})
+            if self.__verbose:
+                self.__lfh.write(
+                    "+AnnotationTaskChain.run() %s completed %d calculations in %.2f s critical path %s %.2f s\n"
+                    % (entryId, len(rL) - 1, time.time() - startTime, ",".join(pathL), pathTime)
+                )
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+            ok = False
+        finally:
+            self.__ws = None
+        return ok, rL
+
+    def __getTaskProgressFunc(self, progressFunc):
+        if progressFunc is None:
+            return None
+
+        def taskProgress(name, ok, numberDone, numberOfTasks):
+            progressFunc("%s %s (%d of %d calculations)" % (self.__getTask(name)[1], "completed" if ok else "failed", numberDone, numberOfTasks))
+
+        return taskProgress
+
+    def __getTask(self, name):
+        for tT in self._taskList:
+            if tT[0] == name:
+                return tT
+        return None
+
+    def __runTask(self, entryId, name, writeList, taskArgs):
+        """Run one calculation on a copy of the current chain model and merge its result - returns (status, download anchor tags)"""
+        taskPath = self.__ws.getPath(entryId + "_model-" + name + "_P1.cif")
+        taskInpPath = self.__ws.getPath(entryId + "_model-" + name + "-input_P1.cif")
+        with self.__lock:
+            shutil.copyfile(self.__chainPath, taskInpPath)
+            shutil.copyfile(taskInpPath, taskPath)
+        taskFile = os.path.relpath(taskPath, self.__sessionPath)
+        #
+        if name == "terminal-atoms":
+            calc = TerminalAtoms(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+            ok = calc.run(entryId, taskFile, updateOption=taskArgs if taskArgs else "delete")
+        elif name == "special-position":
+            calc = SpecialPositionCalc(reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh)
+            ok = calc.run(entryId, modelInputFile=taskFile)
+        else:
+            calc = {"solvent": Solvent, "link": Link, "secstruct": SecondaryStructure, "nafeatures": NAFeatures, "site": Site, "geometry": GeometryCalc}[name](
+                reqObj=self.__reqObj, verbose=self.__verbose, log=self.__lfh
+            )
+            if taskArgs and hasattr(calc, "setArguments"):
+                calc.setArguments(taskArgs)
+            ok = calc.run(entryId, taskFile)
+        #
+        if ok and not filecmp.cmp(taskInpPath, taskPath, shallow=False):
+            ok = self.__merge(name, taskInpPath, taskPath, writeList)
+        return ok, calc.getAnchorTagList(label=None, target="_blank", cssClass="")
+
+    def __isSameCategory(self, catObj1, catObj2):
+        return catObj1.getAttributeList() == catObj2.getAttributeList() and catObj1.getRowList() == catObj2.getRowList()
+
+    def __merge(self, name, taskInpPath, taskPath, writeList):
+        """Apply the categories added, changed or removed by the calculation (taskPath compared with taskInpPath) to the chain model."""
+        try:
+            io = IoAdapter(raiseExceptions=True, verbose=self.__verbose, log=self.__lfh)
+            iContainer = io.readFile(taskInpPath)[0]
+            rContainer = io.readFile(taskPath)[0]
+            changedL = [
+                catName for catName in rContainer.getObjNameList() if not iContainer.exists(catName) or not self.__isSameCategory(iContainer.getObj(catName), rContainer.getObj(catName))
+            ]
+            removedL = [catName for catName in iContainer.getObjNameList() if not rContainer.exists(catName)]
+            if writeList is not None:
+                undeclaredL = [catName for catName in changedL + removedL if catName not in writeList]
+                if undeclaredL:
+                    self.__lfh.write("+AnnotationTaskChain.__merge() %s changed undeclared categories %s\n" % (name, ",".join(undeclaredL)))
+            if self.__verbose:
+                self.__lfh.write("+AnnotationTaskChain.__merge() %s changed %s removed %s\n" % (name, ",".join(changedL), ",".join(removedL)))
+            if not changedL and not removedL:
+                return True
+            #
+            with self.__lock:
+                cList = io.readFile(self.__chainPath)
+                for catName in changedL:
+                    if cList[0].exists(catName):
+                        cList[0].replace(rContainer.getObj(catName))
+                    else:
+                        cList[0].append(rContainer.getObj(catName))
+                for catName in removedL:
+                    cList[0].remove(catName)
+                tmpPath = self.__chainPath + ".tmp"
+                io.writeFile(tmpPath, cList)
+                os.replace(tmpPath, self.__chainPath)
+                self.__modelChanged = True
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            self.__lfh.write("+AnnotationTaskChain.__merge() merging %s failed\n" % taskPath)
+            traceback.print_exc(file=self.__lfh)
+            return False
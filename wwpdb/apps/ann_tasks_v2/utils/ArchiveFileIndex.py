@@ -0,0 +1,171 @@
+##
+# File:  ArchiveFileIndex.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#   18-Oct-2026  add getFilePath(refresh=True) to list the directory again before resolving the version
+##
+"""
+Memoized resolution of versioned project file paths.
+
+PathInfo resolves symbolic versions (e.g. 'latest') by listing the target directory
+on every call.  ArchiveFileIndex lists each directory once and answers subsequent
+latest-version and partition queries from memory.  Instances are meant to live for
+the duration of a single request - files written after a directory has been listed
+are not seen until invalidate() is called or the path is resolved with refresh=True.
+Callers which may write to the directory between lookups should use refresh=True.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import logging
+import os
+import re
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveFileIndex(object):
+    """Directory listing index over PathInfo file path resolution."""
+
+    def __init__(self, pathInfo, verbose=False, log=sys.stderr):
+        self.__pI = pathInfo
+        self.__verbose = verbose
+        self.__lfh = log
+        # dirPath -> {file name base: [version, ...]}
+        self.__dirD = {}
+
+    def invalidate(self, dirPath=None):
+        """Discard the listing of dirPath (or all listings)."""
+        if dirPath is None:
+            self.__dirD = {}
+        else:
+            self.__dirD.pop(dirPath, None)
+
+    def getFilePath(
+        self, dataSetId, contentType=None, formatType=None, fileSource="archive", wfInstanceId=None, mileStone=None, versionId="latest", partNumber="1", refresh=False
+    ):
+        """Return the file path for the input file signature (see PathInfo.getFilePath()).
+
+        Versions 'latest', 'next' and 'previous' are resolved from the directory index,
+        other version selections are passed to PathInfo.  With refresh=True the directory
+        is listed again first.
+        """
+        if versionId not in ["latest", "next", "previous"] or str(partNumber) in ["latest", "next", "previous", "original", "none"]:
+            return self.__pI.getFilePath(
+                dataSetId,
+                wfInstanceId=wfInstanceId,
+                contentType=contentType,
+                formatType=formatType,
+                fileSource=fileSource,
+                versionId=versionId,
+                partNumber=partNumber,
+                mileStone=mileStone,
+            )
+        basePath = self.__getBasePath(dataSetId, contentType, formatType, fileSource, wfInstanceId, mileStone, partNumber)
+        if basePath is None:
+            return None
+        dirPath, baseName = os.path.split(basePath)
+        if refresh:
+            self.invalidate(dirPath)
+        iV = self.__latestVersion(dirPath, baseName)
+        # Follows the conventions of DataFileReference
+        if versionId == "latest":
+            return basePath + ".V" + str(max(iV, 1))
+        elif versionId == "next":
+            return basePath + ".V" + str(iV + 1)
+        else:
+            return basePath + ".V" + str(iV - 1) if iV > 1 else None
+
+    def getVersionList(self, dataSetId, contentType=None, formatType=None, fileSource="archive", wfInstanceId=None, mileStone=None, partNumber="1"):
+        """Return the sorted list of existing version numbers for the input file signature."""
+        basePath = self.__getBasePath(dataSetId, contentType, formatType, fileSource, wfInstanceId, mileStone, partNumber)
+        if basePath is None:
+            return []
+        dirPath, baseName = os.path.split(basePath)
+        return sorted(self.__getListing(dirPath).get(baseName, []))
+
+    def getPartitionNumberList(self, dataSetId, contentType=None, formatType=None, fileSource="archive", wfInstanceId=None, mileStone=None):
+        """Return the sorted list of partition numbers having at least one versioned file for the input content and format."""
+        basePath = self.__getBasePath(dataSetId, contentType, formatType, fileSource, wfInstanceId, mileStone, "1")
+        if basePath is None:
+            return []
+        dirPath, baseName = os.path.split(basePath)
+        idx = baseName.rfind("_P1")
+        if idx < 0:
+            return []
+        pat = re.compile(re.escape(baseName[:idx]) + r"_P(\d+)" + re.escape(baseName[idx + 3 :]) + "$")
+        pL = set()
+        for name in self.__getListing(dirPath):
+            mObj = pat.match(name)
+            if mObj:
+                pL.add(int(mObj.group(1)))
+        return sorted(pL)
+
+    def getLatestPartitionFilePathList(
+        self, dataSetId, contentType=None, formatType=None, fileSource="archive", wfInstanceId=None, mileStone=None
+    ):
+        """Return the latest version file paths for the contiguous partitions 1,2,... of the input content and format."""
+        pathList = []
+        partitionList = self.getPartitionNumberList(
+            dataSetId, contentType=contentType, formatType=formatType, fileSource=fileSource, wfInstanceId=wfInstanceId, mileStone=mileStone
+        )
+        for partNum, iP in enumerate(partitionList, 1):
+            if iP != partNum:
+                break
+            pathList.append(
+                self.getFilePath(
+                    dataSetId,
+                    contentType=contentType,
+                    formatType=formatType,
+                    fileSource=fileSource,
+                    wfInstanceId=wfInstanceId,
+                    mileStone=mileStone,
+                    versionId="latest",
+                    partNumber=str(iP),
+                )
+            )
+        return pathList
+
+    def __getBasePath(self, dataSetId, contentType, formatType, fileSource, wfInstanceId, mileStone, partNumber):
+        """Unversioned file path - PathInfo does not inspect the file system for this."""
+        return self.__pI.getFilePath(
+            dataSetId,
+            wfInstanceId=wfInstanceId,
+            contentType=contentType,
+            formatType=formatType,
+            fileSource=fileSource,
+            versionId="none",
+            partNumber=str(partNumber),
+            mileStone=mileStone,
+        )
+
+    def __latestVersion(self, dirPath, baseName):
+        # As in DataFileReference, any file name starting with baseName contributes its version
+        vList = []
+        for name, versionList in self.__getListing(dirPath).items():
+            if name.startswith(baseName):
+                vList.extend(versionList)
+        return max(vList) if vList else 0
+
+    def __getListing(self, dirPath):
+        if dirPath not in self.__dirD:
+            listD = {}
+            try:
+                with os.scandir(dirPath) as it:
+                    for entry in it:
+                        fSp = entry.name.split(".V")
+                        if (len(fSp) < 2) or (not fSp[1].isdigit()):
+                            continue
+                        listD.setdefault(fSp[0], []).append(int(fSp[1]))
+            except OSError as e:
+                logger.debug("Listing %s failed %s", dirPath, str(e))
+            self.__dirD[dirPath] = listD
+            if self.__verbose:
+                self.__lfh.write("+ArchiveFileIndex.__getListing() indexed %d file names in %s\n" % (len(listD), dirPath))
+        return self.__dirD[dirPath]
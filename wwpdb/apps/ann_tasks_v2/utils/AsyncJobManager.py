@@ -0,0 +1,302 @@
+##
+# File:  AsyncJobManager.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#   18-Oct-2026  Add setJobProgress() for progress reports from the operation run by a job
+##
+"""
+Local asynchronous job execution for long running web service operations.
+
+A job is a callable run in a detached process (as in DetachUtils).  Each job is
+described by a record in the job table kept in the 'jobs' directory of the session -
+
+    <jobId>.json        job record (status, progress, pid, timing)
+    <jobId>.log         log of the detached process
+    <jobId>-result.json result returned by the job callable
+
+Job status is one of 'queued', 'running', 'completed', 'failed' or 'cancelled'.  Code run
+by a job reports its progress with setJobProgress() - outside a job process the call does nothing.
+
+The number of jobs running at one time across all sessions is limited by a set of
+slot files in a site wide directory - a job holds an exclusive lock on one slot file
+while it runs and waits (queued) until a slot is free.  Locks are released by the
+operating system when a job process exits for any reason.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import fcntl
+import json
+import logging
+import os
+import signal
+import sys
+import time
+import traceback
+import uuid
+
+from wwpdb.apps.ann_tasks_v2.utils.TaskPool import getDefaultMaxWorkers
+
+logger = logging.getLogger(__name__)
+
+# (manager, job identifier) of the job run by this process
+_currentJob = None
+
+
+def setJobProgress(progress):
+    """Update the progress text of the job run by this process - returns False if the process is not running a job."""
+    if _currentJob is None:
+        return False
+    jobManager, jobId = _currentJob
+    return jobManager.setProgress(jobId, progress)
+
+
+class AsyncJobManager(object):
+    """Submit, monitor and cancel detached jobs for a session."""
+
+    _activeStatusList = ["queued", "running"]
+
+    def __init__(self, sessionPath, slotPath=None, maxJobs=None, pollInterval=1.0, verbose=False, log=sys.stderr):
+        """
+        :param sessionPath: session directory holding the job table
+        :param slotPath: site wide directory of job slot files (default - parent of the session directory)
+        :param maxJobs: maximum number of concurrently running jobs on this host for the site
+        :param pollInterval: seconds between checks for a free slot by a queued job
+        """
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__jobPath = os.path.join(sessionPath, "jobs")
+        self.__slotPath = slotPath if slotPath else os.path.join(os.path.dirname(os.path.abspath(sessionPath)), ".ann-tasks-job-slots")
+        self.__maxJobs = int(maxJobs) if maxJobs else getDefaultMaxWorkers()
+        self.__pollInterval = pollInterval
+
+    def submit(self, jobFunc, jobName="", setLogFunc=None):
+        """Run jobFunc() in a detached process and return the job identifier (None on failure).
+
+        jobFunc must return a JSON serializable result.  If provided, setLogFunc(log=fh) is called in the
+        job process to redirect diagnostic output to the job log.
+        """
+        try:
+            for dirPath in [self.__jobPath, self.__slotPath]:
+                if not os.access(dirPath, os.F_OK):
+                    os.makedirs(dirPath, 0o755)
+            jobId = "J_%s_%s" % (time.strftime("%Y%m%d%H%M%S", time.localtime()), uuid.uuid4().hex[:8])
+            self.__writeRecord(
+                jobId, {"jobid": jobId, "name": jobName, "status": "queued", "progress": "submitted", "pid": None, "submitted": time.time(), "started": None, "finished": None}
+            )
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+            return None
+        #
+        childPid = os.fork()
+        if childPid == 0:
+            # First child - detach from the parent session and exit so the job process is reparented
+            try:
+                os.setsid()
+                if os.fork() == 0:
+                    self.__runJob(jobId, jobFunc, setLogFunc)
+            finally:
+                os._exit(0)  # pylint: disable=protected-access
+        os.waitpid(childPid, 0)
+        if self.__verbose:
+            self.__lfh.write("+AsyncJobManager.submit() submitted job %s %s\n" % (jobId, jobName))
+        return jobId
+
+    def getStatus(self, jobId):
+        """Return the job record for jobId or None if the job is not known."""
+        with self.__lock(jobId) as ok:
+            if not ok:
+                return None
+            rD = self.__readRecord(jobId)
+            if rD is None:
+                return None
+            if rD["status"] in self._activeStatusList and rD["pid"] and not self.__isAlive(rD["pid"]):
+                rD.update({"status": "failed", "progress": "job process exited unexpectedly", "finished": time.time()})
+                self.__writeRecord(jobId, rD)
+        rD["elapsed"] = (rD["finished"] or time.time()) - (rD["started"] or rD["submitted"])
+        return rD
+
+    def getResult(self, jobId):
+        """Return the result of a completed job or None."""
+        rD = self.getStatus(jobId)
+        if rD is None or rD["status"] != "completed":
+            return None
+        try:
+            with open(self.__getPath(jobId, "-result.json"), "r") as ifh:
+                return json.load(ifh)
+        except (IOError, OSError, ValueError) as e:
+            logger.error("Reading result for job %s failed %s", jobId, str(e))
+        return None
+
+    def getLogPath(self, jobId):
+        return self.__getPath(jobId, ".log")
+
+    def getJobList(self):
+        """Return the job records for the session ordered by submission time."""
+        rL = []
+        try:
+            for fileName in os.listdir(self.__jobPath):
+                if fileName.startswith("J_") and fileName.endswith(".json") and not fileName.endswith("-result.json"):
+                    rD = self.getStatus(fileName[:-5])
+                    if rD is not None:
+                        rL.append(rD)
+        except OSError:
+            pass
+        return sorted(rL, key=lambda rD: rD["submitted"])
+
+    def cancel(self, jobId):
+        """Cancel a queued or running job - returns True if the job was active."""
+        with self.__lock(jobId) as ok:
+            if not ok:
+                return False
+            rD = self.__readRecord(jobId)
+            if rD is None or rD["status"] not in self._activeStatusList:
+                return False
+            pid = rD["pid"]
+            rD.update({"status": "cancelled", "progress": "cancelled", "finished": time.time()})
+            self.__writeRecord(jobId, rD)
+        if pid and rD.get("started"):
+            # The job process leads its own process group which includes any external programs it has started
+            try:
+                os.killpg(pid, signal.SIGTERM)
+            except OSError:
+                pass
+        if self.__verbose:
+            self.__lfh.write("+AsyncJobManager.cancel() cancelled job %s\n" % jobId)
+        return True
+
+    def setProgress(self, jobId, progress):
+        """Update the progress text of an active job."""
+        return self.__update(jobId, {"progress": progress}, onlyActive=True)
+
+    # ---------------------------------------------------------------------------------------------
+    #
+    def __runJob(self, jobId, jobFunc, setLogFunc):
+        """Body of the job process - does not return."""
+        global _currentJob  # pylint: disable=global-statement
+        slotFh = None
+        try:
+            os.setpgrp()
+            os.umask(0o022)
+            logFh = open(self.__getPath(jobId, ".log"), "w")
+            sys.stdout = logFh
+            sys.stderr = logFh
+            self.__lfh = logFh
+            if setLogFunc is not None:
+                setLogFunc(log=logFh)
+            #
+            if not self.__update(jobId, {"pid": os.getpid(), "progress": "waiting for a job slot"}, onlyActive=True):
+                return
+            while True:
+                slotFh = self.__acquireSlot()
+                if slotFh is not None:
+                    break
+                if not self.__isActive(jobId):
+                    return
+                time.sleep(self.__pollInterval)
+            if not self.__update(jobId, {"status": "running", "progress": "running", "started": time.time()}, onlyActive=True):
+                return
+            logFh.write("+AsyncJobManager job %s started pid %d\n" % (jobId, os.getpid()))
+            logFh.flush()
+            #
+            try:
+                _currentJob = (self, jobId)
+                result = jobFunc()
+                tmpPath = self.__getPath(jobId, "-result.json.tmp")
+                with open(tmpPath, "w") as ofh:
+                    json.dump(result, ofh)
+                os.rename(tmpPath, self.__getPath(jobId, "-result.json"))
+                self.__update(jobId, {"status": "completed", "progress": "completed", "finished": time.time()}, onlyActive=True)
+            except Exception as e:  # pylint: disable=broad-except
+                traceback.print_exc(file=logFh)
+                self.__update(jobId, {"status": "failed", "progress": "failed: %s" % str(e), "finished": time.time()}, onlyActive=True)
+            logFh.write("+AsyncJobManager job %s finished\n" % jobId)
+            logFh.flush()
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+            self.__update(jobId, {"status": "failed", "progress": "failed", "finished": time.time()}, onlyActive=True)
+        finally:
+            if slotFh is not None:
+                slotFh.close()
+            os._exit(0)  # pylint: disable=protected-access
+
+    def __acquireSlot(self):
+        for ii in range(self.__maxJobs):
+            fh = open(os.path.join(self.__slotPath, "slot-%03d.lock" % ii), "a")
+            try:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fh
+            except (IOError, OSError):
+                fh.close()
+        return None
+
+    def __isActive(self, jobId):
+        rD = self.__readRecord(jobId)
+        return rD is not None and rD["status"] in self._activeStatusList
+
+    @staticmethod
+    def __isAlive(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            pass
+        return True
+
+    def __update(self, jobId, uD, onlyActive=False):
+        with self.__lock(jobId) as ok:
+            if not ok:
+                return False
+            rD = self.__readRecord(jobId)
+            if rD is None or (onlyActive and rD["status"] not in self._activeStatusList):
+                return False
+            rD.update(uD)
+            return self.__writeRecord(jobId, rD)
+
+    def __getPath(self, jobId, suffix):
+        return os.path.join(self.__jobPath, os.path.basename(jobId) + suffix)
+
+    def __readRecord(self, jobId):
+        try:
+            with open(self.__getPath(jobId, ".json"), "r") as ifh:
+                return json.load(ifh)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def __writeRecord(self, jobId, rD):
+        tmpPath = self.__getPath(jobId, ".json.tmp")
+        with open(tmpPath, "w") as ofh:
+            json.dump(rD, ofh)
+        os.rename(tmpPath, self.__getPath(jobId, ".json"))
+        return True
+
+    def __lock(self, jobId):
+        return _JobLock(self.__getPath(jobId, ".json"), self.__getPath(jobId, ".lock"))
+
+
+class _JobLock(object):
+    """Exclusive lock on a job record - yields False if the job does not exist."""
+
+    def __init__(self, recordPath, lockPath):
+        self.__recordPath = recordPath
+        self.__lockPath = lockPath
+        self.__fh = None
+
+    def __enter__(self):
+        if not os.access(self.__recordPath, os.F_OK):
+            return False
+        self.__fh = open(self.__lockPath, "a")
+        fcntl.flock(self.__fh.fileno(), fcntl.LOCK_EX)
+        return True
+
+    def __exit__(self, *args):
+        if self.__fh is not None:
+            self.__fh.close()
+            self.__fh = None
+        return False
@@ -0,0 +1,641 @@
+##
+# File:  AtomContactFinder.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#   18-Oct-2026  Element pair contact limits, link candidate classification, symmetry contacts and
+#                symmetry aware covalent bond distances as reported by the annotation tools
+##
+"""
+In process close contact and covalent bond listing for model files.
+
+The atom_site and struct_conn categories are read once.  Atom pairs within a distance
+cutoff are found with a uniform cell grid: coordinates are binned into cubic cells of
+the cutoff size and only atoms in the same or adjacent cells are compared, so the
+search is linear in the number of atoms rather than quadratic.
+
+Results are returned as the row lists written by the annot-get-close-contact and
+annot-get-covalent-bond tools, so the same HTML builders and update operations
+can be used with either source.
+
+Contacts are listed below a distance limit for each element pair (2.2 A between
+non-hydrogen atoms, as in pdbx_validate_close_contact).  A contact at a bonding
+distance for its elements (sum of covalent radii plus 0.4 A) which does not involve
+water is classified 'green' as a candidate for conversion to a link.
+
+Contacts with symmetry related atoms are searched using the space group operators
+in International Tables order, so symmetry codes n_klm are as in struct_conn and
+pdbx_validate_symm_contact.  The operators are taken from gemmi when it is installed -
+getSymmetryOperators() returns None when they are not available.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import itertools
+import logging
+import re
+import sys
+import time
+import traceback
+
+import numpy as np
+
+try:
+    from mmcif.io.IoAdapterCore import IoAdapterCore as IoAdapter
+except ImportError:
+    from mmcif.io.IoAdapterPy import IoAdapterPy as IoAdapter
+
+try:
+    import gemmi
+except ImportError:  # pragma: no cover
+    gemmi = None
+
+logger = logging.getLogger(__name__)
+
+# Neighbor cell offsets covering each pair of adjacent cells once - the cell itself and the 13 cells "after" it
+_HALF_SHELL_OFFSETS = [(0, 0, 0)] + [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1) if (dx, dy, dz) > (0, 0, 0)]
+
+# Atom name pairs (lower residue, next residue) of standard polymer linkages
+_POLYMER_LINKAGE_ATOMS = [("C", "N"), ("O3'", "P")]
+
+# Close contact distance limits - between non-hydrogen atoms and for pairs involving hydrogen
+_CONTACT_LIMIT = 2.2
+_HYDROGEN_CONTACT_LIMIT = 1.6
+
+# Covalent radii (Cordero et al. 2008) and the tolerance for a bonding distance
+_COVALENT_RADII = {
+    "H": 0.31, "D": 0.31, "B": 0.84, "C": 0.76, "N": 0.71, "O": 0.66, "F": 0.57, "NA": 1.66, "MG": 1.41, "AL": 1.21, "SI": 1.11,
+    "P": 1.07, "S": 1.05, "CL": 1.02, "K": 2.03, "CA": 1.76, "V": 1.53, "CR": 1.39, "MN": 1.39, "FE": 1.32, "CO": 1.26, "NI": 1.24,
+    "CU": 1.32, "ZN": 1.22, "GA": 1.22, "AS": 1.19, "SE": 1.20, "BR": 1.20, "RB": 2.20, "SR": 1.95, "MO": 1.54, "RU": 1.46,
+    "RH": 1.42, "PD": 1.39, "AG": 1.45, "CD": 1.44, "SN": 1.39, "SB": 1.39, "TE": 1.38, "I": 1.39, "CS": 2.44, "BA": 2.15,
+    "W": 1.62, "RE": 1.51, "OS": 1.44, "IR": 1.41, "PT": 1.36, "AU": 1.36, "HG": 1.32, "TL": 1.45, "PB": 1.46, "U": 1.96,
+}
+_BOND_TOLERANCE = 0.4
+_WATER_COMP_IDS = ("HOH", "DOD")
+
+# Rotation parts in International Tables order of the general positions of the point groups
+# 432 (which also orders 23, 222, 2 and 1), 422, 622 and 32 on rhombohedral axes
+_ROTATION_ORDER_CUBIC = [
+    "x,y,z", "-x,-y,z", "-x,y,-z", "x,-y,-z", "z,x,y", "z,-x,-y", "-z,-x,y", "-z,x,-y", "y,z,x", "-y,z,-x", "y,-z,-x", "-y,-z,x",
+    "y,x,-z", "-y,-x,-z", "y,-x,z", "-y,x,z", "x,z,-y", "-x,z,y", "-x,-z,-y", "x,-z,y", "z,y,-x", "z,-y,x", "-z,y,x", "-z,-y,-x",
+]
+_ROTATION_ORDER_TETRAGONAL = ["x,y,z", "-x,-y,z", "-y,x,z", "y,-x,z", "-x,y,-z", "x,-y,-z", "y,x,-z", "-y,-x,-z"]
+_ROTATION_ORDER_RHOMBOHEDRAL = ["x,y,z", "z,x,y", "y,z,x", "-z,-y,-x", "-y,-x,-z", "-x,-z,-y"]
+_ROTATION_ORDER_HEXAGONAL = [
+    "x,y,z", "-y,x-y,z", "-x+y,-x,z", "-x,-y,z", "y,-x+y,z", "x-y,x,z", "y,x,-z", "x-y,-y,-z", "-x,-x+y,-z", "-y,-x,-z", "-x+y,y,-z", "x,x-y,-z",
+]
+
+
+def parseSymmetryOperator(triplet):
+    """Return the (3 x 3 rotation, translation) arrays of a symmetry operator given as e.g. '-y+1/2,x,z+1/4'."""
+    rot = np.zeros((3, 3))
+    tran = np.zeros(3)
+    for row, expr in enumerate(triplet.replace(" ", "").lower().split(",")):
+        for sign, term in re.findall(r"([+-]?)([^+-]+)", expr):
+            fac = -1.0 if sign == "-" else 1.0
+            if term in ("x", "y", "z"):
+                rot[row, "xyz".index(term)] += fac
+            elif "/" in term:
+                num, den = term.split("/")
+                tran[row] += fac * float(num) / float(den)
+            else:
+                tran[row] += fac * float(term)
+            #
+        #
+    #
+    return rot, tran
+
+
+def _getRotationKey(rot):
+    return tuple(int(round(v)) for v in np.asarray(rot).flatten())
+
+
+def sortSymmetryOperators(opList):
+    """Sort (rotation, translation) operators of a space group into International Tables order.
+
+    Operators are ordered by centring translation and then by the rotation order of the point group.  The operators
+    of each centring translation are expected together, as listed by gemmi (identity translation first) - returns None
+    for operators with improper rotations (not found in protein crystals) which are not ordered here.
+    """
+    rotKeyS = set(_getRotationKey(rot) for rot, _tran in opList)
+    hexD = {_getRotationKey(parseSymmetryOperator(op)[0]): ii for ii, op in enumerate(_ROTATION_ORDER_HEXAGONAL)}
+    cubD = {_getRotationKey(parseSymmetryOperator(op)[0]): ii for ii, op in enumerate(_ROTATION_ORDER_CUBIC)}
+    tetD = {_getRotationKey(parseSymmetryOperator(op)[0]): ii for ii, op in enumerate(_ROTATION_ORDER_TETRAGONAL)}
+    rhoD = {_getRotationKey(parseSymmetryOperator(op)[0]): ii for ii, op in enumerate(_ROTATION_ORDER_RHOMBOHEDRAL)}
+    if rotKeyS <= set(tetD):
+        orderD = tetD
+    elif rotKeyS <= set(rhoD):
+        orderD = rhoD
+    elif rotKeyS <= set(cubD):
+        orderD = cubD
+    else:
+        orderD = hexD
+    #
+    if not rotKeyS <= set(orderD):
+        return None
+    #
+    # Centring blocks keep the order of their first appearance, each block holds one operator per rotation
+    blockL = []
+    keyL = []
+    for rot, tran in opList:
+        rotKey = _getRotationKey(rot)
+        block = 0
+        while (block < len(blockL)) and (rotKey in blockL[block]):
+            block += 1
+        #
+        if block == len(blockL):
+            blockL.append(set())
+        #
+        blockL[block].add(rotKey)
+        keyL.append((block, orderD[rotKey]))
+    #
+    return [opList[ii] for ii in sorted(range(len(opList)), key=lambda ii: keyL[ii])]
+
+
+def findAtomPairs(xyz, cutoff):
+    """Return index arrays (i, j) with i < j and the distance array of all atom pairs closer than cutoff.
+
+    :param xyz: N x 3 array of coordinates
+    :param cutoff: distance cutoff
+    """
+    xyz = np.asarray(xyz, dtype=np.float64).reshape(-1, 3)
+    nAtoms = len(xyz)
+    if nAtoms < 2 or cutoff <= 0.0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+    #
+    # Cell coordinates are shifted by one and the grid padded so that neighbor cell keys never wrap -
+    cell = np.floor((xyz - xyz.min(axis=0)) / cutoff).astype(np.int64) + 1
+    dims = cell.max(axis=0) + 2
+    key = (cell[:, 0] * dims[1] + cell[:, 1]) * dims[2] + cell[:, 2]
+    order = np.argsort(key, kind="stable")
+    sKey = key[order]
+    sXyz = xyz[order]
+    cellKey, cellStart, cellCount = np.unique(sKey, return_index=True, return_counts=True)
+    #
+    iL = []
+    jL = []
+    dL = []
+    cutoff2 = cutoff * cutoff
+    for dx, dy, dz in _HALF_SHELL_OFFSETS:
+        nKey = sKey + (dx * dims[1] + dy) * dims[2] + dz
+        pos = np.minimum(np.searchsorted(cellKey, nKey), len(cellKey) - 1)
+        ii = np.nonzero(cellKey[pos] == nKey)[0]
+        if len(ii) == 0:
+            continue
+        #
+        cnt = cellCount[pos[ii]]
+        # Expand each atom against every atom of its neighbor cell -
+        jj = np.repeat(cellStart[pos[ii]], cnt) + (np.arange(cnt.sum()) - np.repeat(np.cumsum(cnt) - cnt, cnt))
+        ii = np.repeat(ii, cnt)
+        if (dx, dy, dz) == (0, 0, 0):
+            sel = jj > ii
+            ii = ii[sel]
+            jj = jj[sel]
+        #
+        d2 = np.sum((sXyz[ii] - sXyz[jj]) ** 2, axis=1)
+        sel = d2 < cutoff2
+        iL.append(order[ii[sel]])
+        jL.append(order[jj[sel]])
+        dL.append(np.sqrt(d2[sel]))
+    #
+    if not iL:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+    #
+    iA = np.concatenate(iL)
+    jA = np.concatenate(jL)
+    dA = np.concatenate(dL)
+    iA, jA = np.minimum(iA, jA), np.maximum(iA, jA)
+    srt = np.lexsort((jA, iA))
+    return iA[srt], jA[srt], dA[srt]
+
+
+class AtomContactFinder(object):
+    """Close contacts and covalent bonds of the first model in a model file."""
+
+    def __init__(self, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        # Per atom (auth_asym_id, comp_id, auth_seq_id, ins_code, atom_id, alt_id, label_asym_id, label_seq_id, type_symbol)
+        self.__atomL = []
+        self.__xyz = np.zeros((0, 3))
+        self.__resIdx = np.zeros(0, dtype=np.int64)
+        self.__connL = []
+        self.__cellL = []
+        self.__spaceGroupName = ""
+        self.__timingD = {}
+
+    def read(self, filePath):
+        """Read the atom_site, struct_conn, cell and symmetry categories of filePath - returns True on success."""
+        try:
+            startTime = time.time()
+            io = IoAdapter(raiseExceptions=True)
+            cL = io.readFile(filePath, selectList=["atom_site", "struct_conn", "cell", "symmetry", "space_group"])
+            if not cL or not cL[0].exists("atom_site"):
+                return False
+            #
+            self.__setAtoms(cL[0].getObj("atom_site"))
+            self.__connL = self.__getRowDictList(cL[0].getObj("struct_conn")) if cL[0].exists("struct_conn") else []
+            self.__setSymmetry(cL[0])
+            self.__timingD["read"] = time.time() - startTime
+            if self.__verbose:
+                self.__lfh.write("+AtomContactFinder.read() %d atoms %d struct_conn records from %s in %.2f seconds\n"
+                                 % (len(self.__atomL), len(self.__connL), filePath, self.__timingD["read"]))
+            #
+            return True
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+        #
+        return False
+
+    def getTimings(self):
+        """Return the dictionary of elapsed seconds of the read and search steps."""
+        return dict(self.__timingD)
+
+    def getSymmetryOperators(self):
+        """Return the list of (rotation, translation) space group operators in International Tables order.
+
+        The list is empty for models without a crystal cell (no symmetry contacts), and None if the operators of
+        the space group are not available.
+        """
+        if not self.__cellL:
+            return []
+        #
+        if (gemmi is None) or (not self.__spaceGroupName):
+            return None
+        #
+        try:
+            sg = gemmi.find_spacegroup_by_name(self.__spaceGroupName)
+            if sg is None:
+                return None
+            #
+            opList = []
+            for op in sg.operations():
+                tran = (np.array(op.tran, dtype=np.float64) / op.DEN) % 1.0
+                opList.append((np.array(op.rot, dtype=np.float64) / op.DEN, tran))
+            #
+            return sortSymmetryOperators(opList)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error("Space group %s operators not available %s", self.__spaceGroupName, str(e))
+        #
+        return None
+
+    def getContactLimit(self, type1, type2):
+        """Return the close contact distance limit for a pair of elements."""
+        if (type1 in ("H", "D")) or (type2 in ("H", "D")):
+            return _HYDROGEN_CONTACT_LIMIT
+        #
+        return _CONTACT_LIMIT
+
+    def getContactClass(self, atom1, atom2, dist):
+        """Return 'green' for a contact at a bonding distance for its elements which does not involve water, otherwise ''."""
+        if (atom1[1] in _WATER_COMP_IDS) or (atom2[1] in _WATER_COMP_IDS):
+            return ""
+        #
+        r1 = _COVALENT_RADII.get(atom1[8])
+        r2 = _COVALENT_RADII.get(atom2[8])
+        if (r1 is None) or (r2 is None):
+            return ""
+        #
+        return "green" if dist <= r1 + r2 + _BOND_TOLERANCE else ""
+
+    def getCloseContacts(self, cutoff=None, includeHydrogen=False):
+        """Return the list of inter-residue atom pairs within the contact limit which are not recorded in struct_conn.
+
+        Standard polymer linkages between consecutive residues and pairs of different alternate conformers
+        are excluded.  Each row is [chain, residue, number, ins_code, atom, alt_id] for both atoms followed by
+        the distance and the classification (color) of the contact.
+
+        :param cutoff: a single distance limit used for all element pairs rather than getContactLimit()
+        """
+        startTime = time.time()
+        selA = self.__getSelection(includeHydrogen)
+        iA, jA, dA = findAtomPairs(self.__xyz[selA], self.__getSearchLimit(cutoff, includeHydrogen))
+        iA = selA[iA]
+        jA = selA[jA]
+        sel = self.__resIdx[iA] != self.__resIdx[jA]
+        #
+        connSet = self.__getConnSet(symmetry=False)
+        rowL = []
+        for idx1, idx2, dist in zip(iA[sel], jA[sel], dA[sel]):
+            atom1 = self.__atomL[idx1]
+            atom2 = self.__atomL[idx2]
+            if not self.__isContact(atom1, atom2, dist, cutoff):
+                continue
+            #
+            if self.__isPolymerLinkage(atom1, atom2):
+                continue
+            #
+            if frozenset([atom1[:5], atom2[:5]]) in connSet:
+                continue
+            #
+            rowL.append(list(atom1[:6]) + list(atom2[:6]) + ["%.3f" % dist, self.getContactClass(atom1, atom2, dist)])
+        #
+        self.__timingD["close_contact"] = time.time() - startTime
+        if self.__verbose:
+            self.__lfh.write("+AtomContactFinder.getCloseContacts() %d close contacts in %.2f seconds\n" % (len(rowL), self.__timingD["close_contact"]))
+        #
+        return rowL
+
+    def getSymmetryContacts(self, cutoff=None, includeHydrogen=False):
+        """Return the list of contacts between atoms of the model and symmetry related atoms.
+
+        Each row is [chain, residue, number, ins_code, atom, alt_id, symmetry] for both atoms followed by the
+        distance and the classification (color) of the contact.  The first atom has symmetry 1_555.  Each contact
+        is listed once and pairs recorded in struct_conn with a symmetry operator are excluded.  Returns None if
+        the space group operators are not available.
+        """
+        opList = self.getSymmetryOperators()
+        if opList is None:
+            return None
+        #
+        startTime = time.time()
+        rowL = []
+        connSet = self.__getConnSet(symmetry=True)
+        for idx1, idx2, opNum, tran, dist in self.__findSymmetryPairs(opList, self.__getSelection(includeHydrogen), self.__getSearchLimit(cutoff, includeHydrogen)):
+            atom1 = self.__atomL[idx1]
+            atom2 = self.__atomL[idx2]
+            if not self.__isContact(atom1, atom2, dist, cutoff):
+                continue
+            #
+            # An atom close to its own image is on a special position which is reported by the special position check
+            if (idx1 == idx2) and (dist < 0.5):
+                continue
+            #
+            if frozenset([atom1[:5], atom2[:5]]) in connSet:
+                continue
+            #
+            rowL.append(list(atom1[:6]) + ["1_555"] + list(atom2[:6]) + [self.__getSymmetryCode(opNum, tran), "%.3f" % dist, self.getContactClass(atom1, atom2, dist)])
+        #
+        self.__timingD["symmetry_contact"] = time.time() - startTime
+        if self.__verbose:
+            self.__lfh.write("+AtomContactFinder.getSymmetryContacts() %d symmetry contacts with %d operators in %.2f seconds\n"
+                             % (len(rowL), len(opList), self.__timingD["symmetry_contact"]))
+        #
+        return rowL
+
+    def getCovalentBonds(self):
+        """Return the list of covalent struct_conn records.
+
+        Each row is [chain, residue, number, ins_code, atom, alt_id, symmetry] for both atoms followed by the
+        leaving atom flag, the distance and the connection id.  The distance is calculated from the coordinates,
+        applying the symmetry operators of the record, and the recorded distance is used if it cannot be.
+        """
+        atomD = {}
+        for idx, atom in enumerate(self.__atomL):
+            atomD.setdefault(atom[:6], idx)
+        #
+        opList = self.getSymmetryOperators()
+        rowL = []
+        for rowD in self.__connL:
+            if not rowD.get("conn_type_id", "").lower().startswith("covale"):
+                continue
+            #
+            row = []
+            for ptnr in ("ptnr1", "ptnr2"):
+                row.extend(list(self.__getConnAtomKey(rowD, ptnr)))
+                row.append(self.__getConnValue(rowD, "pdbx_" + ptnr + "_label_alt_id"))
+                row.append(self.__getConnValue(rowD, ptnr + "_symmetry"))
+            #
+            dist = self.__getConnValue(rowD, "pdbx_dist_value")
+            idx1 = atomD.get(tuple(row[0:6]))
+            idx2 = atomD.get(tuple(row[7:13]))
+            if (idx1 is not None) and (idx2 is not None):
+                xyz1 = self.__getSymmetryPosition(idx1, row[6], opList)
+                xyz2 = self.__getSymmetryPosition(idx2, row[13], opList)
+                if (xyz1 is not None) and (xyz2 is not None):
+                    dist = "%.3f" % np.sqrt(np.sum((xyz1 - xyz2) ** 2))
+                #
+            #
+            row.extend([self.__getConnValue(rowD, "pdbx_leaving_atom_flag"), dist, self.__getConnValue(rowD, "id")])
+            rowL.append(row)
+        #
+        return rowL
+
+    def __getSelection(self, includeHydrogen):
+        if includeHydrogen:
+            return np.arange(len(self.__atomL))
+        #
+        return np.array([idx for idx, atom in enumerate(self.__atomL) if atom[8] not in ("H", "D")], dtype=np.int64)
+
+    def __getSearchLimit(self, cutoff, includeHydrogen):
+        if cutoff is not None:
+            return cutoff
+        #
+        return max(_CONTACT_LIMIT, _HYDROGEN_CONTACT_LIMIT) if includeHydrogen else _CONTACT_LIMIT
+
+    def __isContact(self, atom1, atom2, dist, cutoff):
+        if atom1[5] and atom2[5] and atom1[5] != atom2[5]:
+            return False
+        #
+        # Distances are compared at the two decimal precision of the pdbx_validate_* reports
+        return (cutoff is not None) or (round(dist, 2) < self.getContactLimit(atom1[8], atom2[8]))
+
+    def __getConnSet(self, symmetry=False):
+        """Atom pairs recorded in struct_conn - with an identity (symmetry=False) or other symmetry operator"""
+        connSet = set()
+        for rowD in self.__connL:
+            isSym = self.__getConnValue(rowD, "ptnr1_symmetry") not in ("", "1_555") or self.__getConnValue(rowD, "ptnr2_symmetry") not in ("", "1_555")
+            if isSym == symmetry:
+                connSet.add(frozenset([self.__getConnAtomKey(rowD, "ptnr1"), self.__getConnAtomKey(rowD, "ptnr2")]))
+            #
+        #
+        return connSet
+
+    def __setSymmetry(self, container):
+        """Store the cell and space group name - models with a unit cell (1 A edges or less) have no crystal symmetry"""
+        self.__cellL = []
+        self.__spaceGroupName = ""
+        try:
+            if container.exists("cell"):
+                cObj = container.getObj("cell")
+                cellL = [float(cObj.getValue(name, 0)) for name in ("length_a", "length_b", "length_c", "angle_alpha", "angle_beta", "angle_gamma")]
+                if min(cellL[:3]) > 1.0:
+                    self.__cellL = cellL
+                #
+            #
+        except (ValueError, TypeError, IndexError, KeyError):
+            pass
+        #
+        for catName, attName in (("symmetry", "space_group_name_H-M"), ("space_group", "name_H-M_alt")):
+            if container.exists(catName) and container.getObj(catName).hasAttribute(attName):
+                val = str(container.getObj(catName).getValue(attName, 0)).strip()
+                if val not in ("", "?", "."):
+                    self.__spaceGroupName = val
+                    break
+                #
+            #
+        #
+
+    def __getOrthogonalMatrix(self):
+        """Fractional to Cartesian coordinate matrix in the PDB convention (a along x, b in the xy plane)"""
+        a, b, c = self.__cellL[:3]
+        ca, cb, cg = [np.cos(np.radians(ang)) for ang in self.__cellL[3:]]
+        sg = np.sin(np.radians(self.__cellL[5]))
+        vol = np.sqrt(max(0.0, 1.0 - ca * ca - cb * cb - cg * cg + 2.0 * ca * cb * cg))
+        return np.array([[a, b * cg, c * cb], [0.0, b * sg, c * (ca - cb * cg) / sg], [0.0, 0.0, c * vol / sg]])
+
+    def __getSymmetryCode(self, opNum, tran):
+        return "%d_%d%d%d" % (opNum, 5 + tran[0], 5 + tran[1], 5 + tran[2])
+
+    def __getSymmetryPosition(self, idx, code, opList):
+        """Return the coordinates of atom idx under the symmetry operator code n_klm or None if it cannot be applied"""
+        if code in ("", "1_555"):
+            return self.__xyz[idx]
+        #
+        mObj = re.match(r"^(\d+)_(\d)(\d)(\d)$", code)
+        if (not opList) or (mObj is None) or (int(mObj.group(1)) > len(opList)):
+            return None
+        #
+        rot, tran = opList[int(mObj.group(1)) - 1]
+        shift = np.array([int(mObj.group(ii)) - 5 for ii in (2, 3, 4)], dtype=np.float64)
+        oM = self.__getOrthogonalMatrix()
+        frac = np.linalg.solve(oM, self.__xyz[idx])
+        return oM.dot(rot.dot(frac) + tran + shift)
+
+    def __findSymmetryPairs(self, opList, selA, limit):
+        """Yield (idx1, idx2, operator number, lattice translation, distance) of atom pairs between the model and its
+        symmetry images - each pair is given once, as the one of the pair and its inverse image which sorts first.
+        """
+        if (len(selA) == 0) or (not opList):
+            return
+        #
+        oM = self.__getOrthogonalMatrix()
+        fM = np.linalg.inv(oM)
+        xyz = self.__xyz[selA]
+        frac = xyz.dot(fM.T)
+        nAtoms = len(xyz)
+        boxLo = xyz.min(axis=0) - limit
+        boxHi = xyz.max(axis=0) + limit
+        cornerF = np.array([[x, y, z] for x in (boxLo[0], boxHi[0]) for y in (boxLo[1], boxHi[1]) for z in (boxLo[2], boxHi[2])]).dot(fM.T)
+        fLo = cornerF.min(axis=0)
+        fHi = cornerF.max(axis=0)
+        rotKeyL = [_getRotationKey(rot) for rot, _tran in opList]
+        for opIdx, (rot, tran) in enumerate(opList):
+            imgF = frac.dot(rot.T) + tran
+            iLo = imgF.min(axis=0)
+            iHi = imgF.max(axis=0)
+            rangeL = [range(int(np.ceil(fLo[ii] - iHi[ii])), int(np.floor(fHi[ii] - iLo[ii])) + 1) for ii in range(3)]
+            # Inverse operator - rotation and translation of its listed form
+            invRot = np.round(np.linalg.inv(rot))
+            invIdx = rotKeyL.index(_getRotationKey(invRot)) if _getRotationKey(invRot) in rotKeyL else None
+            for shift in itertools.product(*rangeL):
+                if (opIdx == 0 and shift == (0, 0, 0)) or max([abs(v) for v in shift]) > 4:
+                    continue
+                #
+                imgXyz = (imgF + np.array(shift, dtype=np.float64)).dot(oM.T)
+                jSel = np.nonzero(np.all((imgXyz >= boxLo) & (imgXyz <= boxHi), axis=1))[0]
+                if len(jSel) == 0:
+                    continue
+                #
+                iA, jA, dA = findAtomPairs(np.vstack([xyz, imgXyz[jSel]]), limit)
+                cross = (iA < nAtoms) & (jA >= nAtoms)
+                invShift = None
+                if invIdx is not None:
+                    invTran = -invRot.dot(tran + np.array(shift, dtype=np.float64)) - opList[invIdx][1]
+                    invShift = tuple(int(round(v)) for v in invTran)
+                #
+                for ii, jj, dist in zip(iA[cross], jA[cross] - nAtoms, dA[cross]):
+                    idx1 = int(selA[ii])
+                    idx2 = int(selA[jSel[jj]])
+                    if (invShift is not None) and ((idx2, idx1, invIdx, invShift) < (idx1, idx2, opIdx, tuple(shift))):
+                        continue
+                    #
+                    yield idx1, idx2, opIdx + 1, shift, float(dist)
+                #
+            #
+        #
+
+    def __setAtoms(self, aObj):
+        """Store the atoms of the first model"""
+        nameL = aObj.getAttributeList()
+        idxD = {name: idx for idx, name in enumerate(nameL)}
+
+        def colIdx(*names):
+            for name in names:
+                if name in idxD:
+                    return idxD[name]
+                #
+            #
+            return None
+
+        iChain = colIdx("auth_asym_id", "label_asym_id")
+        iComp = colIdx("auth_comp_id", "label_comp_id")
+        iSeq = colIdx("auth_seq_id", "label_seq_id")
+        iIns = colIdx("pdbx_PDB_ins_code")
+        iAtom = colIdx("label_atom_id", "auth_atom_id")
+        iAlt = colIdx("label_alt_id")
+        iLabelAsym = colIdx("label_asym_id")
+        iLabelSeq = colIdx("label_seq_id")
+        iType = colIdx("type_symbol")
+        iModel = colIdx("pdbx_PDB_model_num")
+        iXyz = [colIdx("Cartn_x"), colIdx("Cartn_y"), colIdx("Cartn_z")]
+        #
+        atomL = []
+        xyzL = []
+        resIdxL = []
+        resD = {}
+        firstModel = None
+        for row in aObj.getRowList():
+            if iModel is not None:
+                if firstModel is None:
+                    firstModel = row[iModel]
+                elif row[iModel] != firstModel:
+                    continue
+                #
+            #
+            atom = tuple([self.__getValue(row, iCol) for iCol in (iChain, iComp, iSeq, iIns, iAtom, iAlt, iLabelAsym, iLabelSeq, iType)])
+            atom = atom[:8] + (atom[8].upper(),)
+            atomL.append(atom)
+            xyzL.append([float(row[iCol]) for iCol in iXyz])
+            resIdxL.append(resD.setdefault(atom[:4], len(resD)))
+        #
+        self.__atomL = atomL
+        self.__xyz = np.array(xyzL, dtype=np.float64).reshape(-1, 3)
+        self.__resIdx = np.array(resIdxL, dtype=np.int64)
+
+    def __getRowDictList(self, cObj):
+        nameL = cObj.getAttributeList()
+        return [dict(zip(nameL, row)) for row in cObj.getRowList()]
+
+    def __getValue(self, row, iCol):
+        if iCol is None:
+            return ""
+        #
+        val = str(row[iCol]).strip()
+        return "" if val in ("?", ".") else val
+
+    def __getConnValue(self, rowD, name):
+        val = str(rowD.get(name, "")).strip()
+        return "" if val in ("?", ".") else val
+
+    def __getConnAtomKey(self, rowD, ptnr):
+        """Return the (chain, residue, number, ins_code, atom) key of a struct_conn partner"""
+        return (
+            self.__getConnValue(rowD, ptnr + "_auth_asym_id") or self.__getConnValue(rowD, ptnr + "_label_asym_id"),
+            self.__getConnValue(rowD, ptnr + "_auth_comp_id") or self.__getConnValue(rowD, ptnr + "_label_comp_id"),
+            self.__getConnValue(rowD, ptnr + "_auth_seq_id") or self.__getConnValue(rowD, ptnr + "_label_seq_id"),
+            self.__getConnValue(rowD, "pdbx_" + ptnr + "_PDB_ins_code"),
+            self.__getConnValue(rowD, ptnr + "_label_atom_id"),
+        )
+
+    def __isPolymerLinkage(self, atom1, atom2):
+        """Test for the standard linkage between consecutive residues of the same polymer chain"""
+        if (atom1[6] != atom2[6]) or (not atom1[7]) or (not atom2[7]):
+            return False
+        #
+        try:
+            seq1 = int(atom1[7])
+            seq2 = int(atom2[7])
+        except ValueError:
+            return False
+        #
+        if seq2 == seq1 + 1:
+            return (atom1[4], atom2[4]) in _POLYMER_LINKAGE_ATOMS
+        elif seq1 == seq2 + 1:
+            return (atom2[4], atom1[4]) in _POLYMER_LINKAGE_ATOMS
+        #
+        return False
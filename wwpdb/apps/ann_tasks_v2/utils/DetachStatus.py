@@ -0,0 +1,143 @@
+##
+# File:  DetachStatus.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#   18-Oct-2026  Stage updates from the detached operation, default wait limit and status record clean up
+##
+"""
+Completion wait and status record for operations run through DetachUtils.
+
+DetachUtils signals completion of a detached operation by writing the semaphore
+file in the session directory.  DetachStatus keeps a small status record beside
+it (<semaphore>.status) holding the start time and the current stage of the
+operation, and provides a bounded wait which returns as soon as the semaphore
+file is written rather than after a fixed delay.
+
+The detached operation reports its stage through fromRequest(reqObj).setStage() -
+DetachUtils records the semaphore in the request object before the operation
+starts.  The status record is removed by clear() once completion has been reported.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import json
+import os
+import sys
+import time
+
+
+class DetachStatus(object):
+    """Status record and completion wait for a DetachUtils semaphore."""
+
+    # Longest wait in seconds for a single status request unless a site limit is given
+    _defaultMaxWait = 2.0
+
+    @classmethod
+    def fromRequest(cls, reqObj, verbose=False, log=sys.stderr):
+        """Return the status record for the detached operation of the request or None if there is none."""
+        try:
+            sph = reqObj.getSemaphore()
+            if sph:
+                return cls(reqObj.getSessionObj().getPath(), sph, verbose=verbose, log=log)
+        except AttributeError:
+            pass
+        return None
+
+    @classmethod
+    def removeCompleted(cls, sessionPath):
+        """Remove the status records of completed operations in sessionPath - returns the number removed."""
+        nRemoved = 0
+        try:
+            for fileName in os.listdir(sessionPath):
+                if fileName.endswith(".status") and os.access(os.path.join(sessionPath, fileName[: -len(".status")]), os.F_OK):
+                    try:
+                        os.remove(os.path.join(sessionPath, fileName))
+                        nRemoved += 1
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+        return nRemoved
+
+    def __init__(self, sessionPath, semaphore, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__semaphorePath = os.path.join(sessionPath, os.path.basename(semaphore))
+        self.__statusPath = self.__semaphorePath + ".status"
+
+    def isDone(self):
+        return os.access(self.__semaphorePath, os.F_OK)
+
+    def setStage(self, stage, replace=True):
+        """Record the current stage of the operation (the first call also records the start time).
+
+        With replace=False an existing stage is kept - used to record the initial stage after the
+        operation has been started, as the operation may already have reported its own stage.
+        """
+        rD = self.__read()
+        if not replace and "stage" in rD:
+            return True
+        now = time.time()
+        rD.setdefault("started", now)
+        rD.update({"stage": stage, "updated": now})
+        try:
+            tmpPath = self.__statusPath + ".tmp"
+            with open(tmpPath, "w") as ofh:
+                json.dump(rD, ofh)
+            os.rename(tmpPath, self.__statusPath)
+            return True
+        except (IOError, OSError) as e:
+            self.__lfh.write("+DetachStatus.setStage() failed for %s: %s\n" % (self.__statusPath, str(e)))
+        return False
+
+    def getStatus(self):
+        """Return {'stage': ..., 'elapsed': seconds since start} for the operation."""
+        rD = self.__read()
+        started = rD.get("started")
+        return {"stage": rD.get("stage", "running"), "elapsed": time.time() - started if started else 0.0}
+
+    def clear(self):
+        """Remove the status record."""
+        try:
+            os.remove(self.__statusPath)
+        except OSError:
+            pass
+
+    def getWaitTime(self, delay, maxWait=None):
+        """Time in seconds a status request waits for completion - the requested delay limited by maxWait (default _defaultMaxWait)."""
+        try:
+            wait = max(0.0, float(delay or 0))
+        except (TypeError, ValueError):
+            wait = 0.0
+        try:
+            maxWait = float(maxWait) if maxWait not in (None, "") else self._defaultMaxWait
+        except (TypeError, ValueError):
+            maxWait = self._defaultMaxWait
+        return min(wait, maxWait)
+
+    def getRetryAfter(self, minDelay=1.0, maxDelay=10.0):
+        """Suggested delay before the next status request - grows with the elapsed time of the operation."""
+        return min(maxDelay, max(minDelay, self.getStatus()["elapsed"] / 4.0))
+
+    def waitFor(self, timeout, interval=0.05, maxInterval=0.25):
+        """Wait up to timeout seconds for the semaphore - returns True as soon as it exists."""
+        tEnd = time.time() + max(0.0, timeout)
+        while not self.isDone():
+            tLeft = tEnd - time.time()
+            if tLeft <= 0:
+                return False
+            time.sleep(min(interval, tLeft))
+            interval = min(interval * 2.0, maxInterval)
+        return True
+
+    def __read(self):
+        try:
+            with open(self.__statusPath, "r") as ifh:
+                return json.load(ifh)
+        except (IOError, OSError, ValueError):
+            return {}
@@ -0,0 +1,144 @@
+##
+# File:  FileLinkUtils.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#   18-Oct-2026  Add symlink strategy and content sharing guard
+#   18-Oct-2026  Add isUnderPath() to decide content sharing by the resolved source location
+##
+"""
+Place a file at a target path by hard link, reflink or symbolic link where possible, falling back to a copy.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import logging
+import os
+import shutil
+import sys
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Linux ioctl request code for FICLONE  _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+
+class FileLinkUtils(object):
+    """Materialize a source file at a target path without copying data where the filesystem allows it.
+
+    The strategy list is tried in order - supported methods are:
+
+    'hardlink'  : os.link() - source and target share an inode (same filesystem only)
+    'reflink'   : copy-on-write clone (FICLONE) on filesystems which support it (btrfs, xfs)
+    'symlink'   : symbolic link to the resolved source path
+    'copy'      : full data copy (preserving the modification time)
+
+    Hard and symbolic links share content with the source, so they must only be used for targets
+    which are never modified in place and for sources which are never rewritten.  place() with
+    shareContent=False restricts the strategies to those which give the target its own content.
+    """
+
+    _sharedStrategyList = ["hardlink", "symlink"]
+
+    def __init__(self, strategyList=None, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__strategyList = strategyList if strategyList else ["hardlink", "reflink", "copy"]
+
+    def isSameFile(self, srcPath, dstPath):
+        try:
+            return os.path.samefile(srcPath, dstPath)
+        except OSError:
+            return False
+
+    def isUnderPath(self, filePath, dirPathList):
+        """Return True if filePath, with all symbolic links resolved, lies within one of the directories in dirPathList."""
+        try:
+            fP = os.path.realpath(filePath)
+            for dirPath in dirPathList:
+                if not dirPath:
+                    continue
+                dP = os.path.realpath(dirPath)
+                if os.path.commonpath([fP, dP]) == dP and fP != dP:
+                    return True
+        except (OSError, ValueError):
+            pass
+        return False
+
+    def isCurrent(self, srcPath, dstPath, shareContent=True):
+        """Return True if dstPath is srcPath or a copy with the same size and modification time.
+
+        With shareContent=False a link to srcPath is not considered current.
+        """
+        if self.isSameFile(srcPath, dstPath):
+            return shareContent
+        if os.path.islink(dstPath):
+            return False
+        try:
+            sSt = os.stat(srcPath)
+            dSt = os.stat(dstPath)
+            return sSt.st_size == dSt.st_size and int(sSt.st_mtime) == int(dSt.st_mtime)
+        except OSError:
+            return False
+
+    def place(self, srcPath, dstPath, skipCurrent=True, shareContent=True):
+        """Place srcPath at dstPath - returns the name of the method used or None on failure.
+
+        If skipCurrent is set and dstPath is already current (see isCurrent()) nothing is done and 'current' is returned.
+        If shareContent is not set the hardlink and symlink strategies are skipped, so later changes to srcPath
+        are not seen through dstPath.
+        """
+        if os.path.realpath(srcPath) == os.path.realpath(dstPath) and not os.path.islink(dstPath):
+            return "same"
+        if skipCurrent and self.isCurrent(srcPath, dstPath, shareContent=shareContent):
+            return "current"
+        dirPath = os.path.dirname(dstPath)
+        if dirPath and not os.access(dirPath, os.F_OK):
+            os.makedirs(dirPath)
+        for strategy in self.__strategyList:
+            if not shareContent and strategy in self._sharedStrategyList:
+                continue
+            try:
+                if os.path.lexists(dstPath):
+                    os.remove(dstPath)
+                if strategy == "hardlink":
+                    os.link(srcPath, dstPath)
+                elif strategy == "reflink":
+                    if not self.__reflink(srcPath, dstPath):
+                        continue
+                elif strategy == "symlink":
+                    os.symlink(os.path.realpath(srcPath), dstPath)
+                elif strategy == "copy":
+                    shutil.copy2(srcPath, dstPath)
+                else:
+                    logger.error("Unknown link strategy %s", strategy)
+                    continue
+                if self.__verbose:
+                    self.__lfh.write("+FileLinkUtils.place() %s %s -> %s\n" % (strategy, srcPath, dstPath))
+                return strategy
+            except (IOError, OSError) as e:
+                logger.debug("Link strategy %s failed for %s: %s", strategy, srcPath, e)
+                continue
+        return None
+
+    def __reflink(self, srcPath, dstPath):
+        if fcntl is None or not sys.platform.startswith("linux"):
+            return False
+        try:
+            with open(srcPath, "rb") as ifh, open(dstPath, "wb") as ofh:
+                fcntl.ioctl(ofh.fileno(), FICLONE, ifh.fileno())
+            shutil.copystat(srcPath, dstPath)
+            return True
+        except (IOError, OSError):
+            if os.path.lexists(dstPath):
+                os.remove(dstPath)
+            return False
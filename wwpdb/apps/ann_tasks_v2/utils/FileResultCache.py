@@ -0,0 +1,183 @@
+##
+# File:  FileResultCache.py
+# Date:  18-Oct-2026
+#
+# Update:
+#
+##
+"""
+Content-addressed on-disk cache for the output files of external tool runs.
+
+A cache key is a hash of the content of the input files plus a dictionary of
+run parameters.  Each entry stores a set of named output files (e.g. report, log)
+which are copied back to the caller's target paths on a hit.  The total size of
+the cache is bounded and least recently used entries are evicted first.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def hashFile(filePath, blockSize=1048576):
+    """Return the sha256 hex digest of the content of the input file."""
+    h = hashlib.sha256()
+    with open(filePath, "rb") as ifh:
+        while True:
+            buf = ifh.read(blockSize)
+            if not buf:
+                break
+            h.update(buf)
+    return h.hexdigest()
+
+
+class FileResultCache(object):
+    """Content-addressed store of named output files with size bounded LRU eviction."""
+
+    # Hit/miss counters are kept per cache directory for the life of the process -
+    _statsD = {}
+    _lock = threading.Lock()
+
+    def __init__(self, cachePath, maxSize=2 * 1024 * 1024 * 1024, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__cachePath = cachePath
+        self.__maxSize = maxSize
+        self.__metaFileName = "cache-meta.json"
+        with FileResultCache._lock:
+            FileResultCache._statsD.setdefault(self.__cachePath, {"hits": 0, "misses": 0, "stores": 0, "evictions": 0})
+
+    def __incr(self, name, n=1):
+        with FileResultCache._lock:
+            FileResultCache._statsD[self.__cachePath][name] += n
+
+    def getStats(self):
+        """Return a copy of the hit/miss/store/eviction counters for this cache directory."""
+        with FileResultCache._lock:
+            return dict(FileResultCache._statsD[self.__cachePath])
+
+    def makeKey(self, filePathList, paramD=None):
+        """Return the cache key for the content of the input files and the run parameters.
+
+        Returns None if any input file cannot be read.
+        """
+        try:
+            h = hashlib.sha256()
+            for filePath in filePathList:
+                h.update(hashFile(filePath).encode("ascii"))
+            h.update(json.dumps(paramD if paramD else {}, sort_keys=True, default=str).encode("utf-8"))
+            return h.hexdigest()
+        except (IOError, OSError) as e:
+            logger.info("Cannot make cache key for %r: %s", filePathList, e)
+            return None
+
+    def __entryPath(self, key):
+        return os.path.join(self.__cachePath, key[:2], key)
+
+    def fetch(self, key, pathD):
+        """Copy the stored files for key to the target paths in pathD (role -> path).
+
+        Roles which were not stored with the entry are removed from their target path so
+        a stale file from a previous run is never mistaken for output.  Returns the stored
+        meta data dictionary on a hit and None on a miss.
+        """
+        if key is None:
+            return None
+        entryPath = self.__entryPath(key)
+        try:
+            with open(os.path.join(entryPath, self.__metaFileName), "r") as ifh:
+                metaD = json.load(ifh)
+            storedRoles = metaD.get("roles", [])
+            for role, targetPath in pathD.items():
+                if targetPath is None:
+                    continue
+                if os.access(targetPath, os.F_OK):
+                    os.remove(targetPath)
+                if role in storedRoles:
+                    shutil.copyfile(os.path.join(entryPath, role), targetPath)
+            # Mark as recently used -
+            os.utime(entryPath, None)
+            self.__incr("hits")
+            if self.__verbose:
+                self.__lfh.write("+FileResultCache.fetch() hit %s\n" % key)
+            return metaD
+        except (IOError, OSError, ValueError):
+            self.__incr("misses")
+            return None
+
+    def store(self, key, pathD, metaD=None):
+        """Store copies of the existing files in pathD (role -> path) under key."""
+        if key is None:
+            return False
+        tmpPath = None
+        try:
+            entryPath = self.__entryPath(key)
+            parentPath = os.path.dirname(entryPath)
+            if not os.access(parentPath, os.W_OK):
+                os.makedirs(parentPath, 0o755)
+            # Build the entry in a scratch directory and rename into place so readers never see a partial entry -
+            tmpPath = tempfile.mkdtemp(prefix="tmp-", dir=parentPath)
+            roles = []
+            for role, srcPath in pathD.items():
+                if srcPath is not None and os.access(srcPath, os.R_OK):
+                    shutil.copyfile(srcPath, os.path.join(tmpPath, role))
+                    roles.append(role)
+            oD = dict(metaD) if metaD else {}
+            oD["roles"] = roles
+            oD["created"] = time.time()
+            with open(os.path.join(tmpPath, self.__metaFileName), "w") as ofh:
+                json.dump(oD, ofh)
+            if os.access(entryPath, os.F_OK):
+                shutil.rmtree(entryPath, ignore_errors=True)
+            os.rename(tmpPath, entryPath)
+            tmpPath = None
+            self.__incr("stores")
+            self.__evict()
+            return True
+        except (IOError, OSError) as e:
+            logger.error("Cache store failed for %s: %s", key, e)
+            return False
+        finally:
+            if tmpPath is not None:
+                shutil.rmtree(tmpPath, ignore_errors=True)
+
+    def __evict(self):
+        """Remove least recently used entries until the cache is within its size bound."""
+        entryL = []
+        totalSize = 0
+        for subDir in os.listdir(self.__cachePath):
+            subPath = os.path.join(self.__cachePath, subDir)
+            if not os.path.isdir(subPath):
+                continue
+            for key in os.listdir(subPath):
+                if key.startswith("tmp-"):
+                    continue
+                entryPath = os.path.join(subPath, key)
+                try:
+                    size = sum([os.path.getsize(os.path.join(entryPath, fn)) for fn in os.listdir(entryPath)])
+                    entryL.append((os.path.getmtime(entryPath), size, entryPath))
+                    totalSize += size
+                except OSError:
+                    continue
+        if totalSize <= self.__maxSize:
+            return
+        for _mtime, size, entryPath in sorted(entryL):
+            shutil.rmtree(entryPath, ignore_errors=True)
+            self.__incr("evictions")
+            totalSize -= size
+            if totalSize <= self.__maxSize:
+                break
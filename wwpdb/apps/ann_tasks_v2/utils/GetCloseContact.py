@@ -3,6 +3,8 @@
 # Date:  28-Sep-2020  Zukang Feng
 #
 # Update:
+#   18-Oct-2026   optional in process calculation (AtomContactFinder) and linear time table building
+#   18-Oct-2026   in process calculation falls back to the tool, symmetry contacts listed
 ##
 """
 Manage utility to correct close contact problems
@@ -19,6 +21,7 @@ import os
 import sys
 import traceback
 
+from wwpdb.apps.ann_tasks_v2.utils.AtomContactFinder import AtomContactFinder
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 
 
@@ -39,8 +42,16 @@ class GetCloseContact(object):
         self.__sObj = self.__reqObj.getSessionObj()
         self.__sessionPath = self.__sObj.getPath()
 
-    def run(self, entryId, inpFile):
-        """Run the calculation"""
+    def run(self, entryId, inpFile, engine=None):
+        """Run the calculation
+
+        :param engine: 'native' to calculate in process with AtomContactFinder rather than with the annot-get-close-contact tool
+                       (default from request value 'contact_engine') - the tool is used when the space group
+                       operators for the model are not available
+        """
+        if engine is None:
+            engine = self.__reqObj.getValue("contact_engine")
+        #
         retD = {}
         retD["found"] = "no"
         try:
@@ -52,12 +63,15 @@ class GetCloseContact(object):
                     os.remove(filePath)
                 #
             #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            #
-            dp.imp(inpPath)
-            dp.op("annot-get-close-contact")
-            dp.expLog(dstPath=logPath, appendMode=False)
-            dp.exp(retPath)
+            # The tool is run if the in process calculation is not requested or can not be made for the model
+            if (engine != "native") or (not self.__runNative(inpPath, logPath, retPath)):
+                dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                #
+                dp.imp(inpPath)
+                dp.op("annot-get-close-contact")
+                dp.expLog(dstPath=logPath, appendMode=False)
+                dp.exp(retPath)
+                dp.cleanup()
             #
             if os.access(retPath, os.R_OK):
                 with open(retPath) as ifh:
@@ -69,16 +83,35 @@ class GetCloseContact(object):
                     #
                 #
             #
-            dp.cleanup()
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
         #
         return retD
 
+    def __runNative(self, inpPath, logPath, retPath):
+        """Write the close contacts of the model file in the same JSON form as the annot-get-close-contact tool
+
+        Contacts with symmetry related atoms are listed as 'symmetry_contact' rows - returns False if the
+        model can not be read or its space group operators are not available.
+        """
+        finder = AtomContactFinder(verbose=self.__verbose, log=self.__lfh)
+        if (not finder.read(inpPath)) or (finder.getSymmetryOperators() is None):
+            return False
+        #
+        rowList = finder.getCloseContacts()
+        symRowList = finder.getSymmetryContacts()
+        with open(retPath, "w") as ofh:
+            json.dump({"close_contact": rowList, "symmetry_contact": symRowList}, ofh)
+        #
+        with open(logPath, "w") as ofh:
+            ofh.write("Found %d close contacts %d symmetry contacts\nFinished!\n" % (len(rowList), len(symRowList)))
+        #
+        return True
+
     def __processCloseContactContent(self, jsonObj):
         """ """
         if (not jsonObj) or ("close_contact" not in jsonObj) or (not jsonObj["close_contact"]):
-            return ""
+            return self.__processSymmetryContactContent(jsonObj)
         #
         htmlTemplate = """
         <input type="hidden" name="total_close_contact_num" value="%s" />
@@ -114,37 +147,39 @@ class GetCloseContact(object):
         """
         #
         green_count = 0
-        tablerow = ""
+        # Rows are collected and joined once - repeated string concatenation is quadratic for thousands of contacts
+        rowList = []
         count = 0
         for tupL in jsonObj["close_contact"]:
             if tupL[13] == "green":
                 green_count += 1
             #
-            tablerow += "<tr>"
-            #
-            atom = tupL[4]
+            atom1 = tupL[4]
             if tupL[5]:
-                atom += "(" + tupL[5] + ")"
+                atom1 += "(" + tupL[5] + ")"
             #
-            tablerow += "<td>" + tupL[0] + "</td>" + "<td>" + tupL[1] + "</td>" + "<td>" + tupL[2] + tupL[3] + "</td>" + "<td>" + atom + "</td>"
-            atom = tupL[10]
+            atom2 = tupL[10]
             if tupL[11]:
-                atom += "(" + tupL[11] + ")"
+                atom2 += "(" + tupL[11] + ")"
             #
-            tablerow += "<td>" + tupL[6] + "</td>" + "<td>" + tupL[7] + "</td>" + "<td>" + tupL[8] + tupL[9] + "</td>" + "<td>" + atom + "</td>"
+            close_id = "close_contact_" + str(count)
+            row = [
+                "<tr>",
+                "<td>", tupL[0], "</td>", "<td>", tupL[1], "</td>", "<td>", tupL[2], tupL[3], "</td>", "<td>", atom1, "</td>",
+                "<td>", tupL[6], "</td>", "<td>", tupL[7], "</td>", "<td>", tupL[8], tupL[9], "</td>", "<td>", atom2, "</td>",
+            ]
             #
             if tupL[13]:
-                tablerow += '<td style="color:' + tupL[13] + ';">' + tupL[12]
+                row.extend(['<td style="color:', tupL[13], ';">', tupL[12]])
             else:
-                tablerow += "<td>" + tupL[12]
+                row.extend(["<td>", tupL[12]])
             #
-            close_id = "close_contact_" + str(count)
-            tablerow += '&nbsp; &nbsp; &nbsp; &nbsp; <input type="checkbox" id="' + close_id + '" name="' + close_id + '" value="' + "_".join(tupL[:13]) + '"'
+            row.extend(['&nbsp; &nbsp; &nbsp; &nbsp; <input type="checkbox" id="', close_id, '" name="', close_id, '" value="', "_".join(tupL[:13]), '"'])
             if tupL[13]:
-                tablerow += ' class="' + tupL[13] + '"'
+                row.extend([' class="', tupL[13], '"'])
             #
-            tablerow += "/></td>"
-            tablerow += "</tr>\n"
+            row.append("/></td></tr>\n")
+            rowList.append("".join(row))
             count += 1
         #
         select_green_button = ""
@@ -154,7 +189,61 @@ class GetCloseContact(object):
                 + "onClick=\"select_close_contact_covalent_bond('update-close-contact-form', 'close_contact_', 'close_contact_select_all_green', 'green');\" /></th>"
             )
         #
-        return htmlTemplate % (str(count), select_green_button, tablerow)
+        return htmlTemplate % (str(count), select_green_button, "".join(rowList)) + self.__processSymmetryContactContent(jsonObj)
+
+    def __processSymmetryContactContent(self, jsonObj):
+        """Table of the contacts with symmetry related atoms - listed for review only as the updates do not apply symmetry"""
+        if (not jsonObj) or (not jsonObj.get("symmetry_contact")):
+            return ""
+        #
+        htmlTemplate = """
+        <br/>
+        <table class="table table-bordered table-striped width100">
+          <tr><th colspan="11">Contacts with symmetry related atoms</th></tr>
+          <tr>
+            <th colspan="5">Atom1</th>
+            <th colspan="5">Atom2</th>
+            <th rowspan="2">Distance</th>
+          </tr>
+          <tr>
+            <th>Chain ID</th>
+            <th>Residue</th>
+            <th>Number</th>
+            <th>Atom</th>
+            <th>Symmetry</th>
+            <th>Chain ID</th>
+            <th>Residue</th>
+            <th>Number</th>
+            <th>Atom</th>
+            <th>Symmetry</th>
+          </tr>
+          %s
+        </table>
+        """
+        #
+        rowList = []
+        for tupL in jsonObj["symmetry_contact"]:
+            atom1 = tupL[4]
+            if tupL[5]:
+                atom1 += "(" + tupL[5] + ")"
+            #
+            atom2 = tupL[11]
+            if tupL[12]:
+                atom2 += "(" + tupL[12] + ")"
+            #
+            row = [
+                "<tr>",
+                "<td>", tupL[0], "</td>", "<td>", tupL[1], "</td>", "<td>", tupL[2], tupL[3], "</td>", "<td>", atom1, "</td>", "<td>", tupL[6], "</td>",
+                "<td>", tupL[7], "</td>", "<td>", tupL[8], "</td>", "<td>", tupL[9], tupL[10], "</td>", "<td>", atom2, "</td>", "<td>", tupL[13], "</td>",
+            ]
+            if tupL[15]:
+                row.extend(['<td style="color:', tupL[15], ';">', tupL[14], "</td></tr>\n"])
+            else:
+                row.extend(["<td>", tupL[14], "</td></tr>\n"])
+            #
+            rowList.append("".join(row))
+        #
+        return htmlTemplate % "".join(rowList)
 
 
 def main():
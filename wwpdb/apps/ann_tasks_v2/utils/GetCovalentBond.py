@@ -3,6 +3,8 @@
 # Date:  28-Sep-2020  Zukang Feng
 #
 # Update:
+#   18-Oct-2026   optional in process calculation (AtomContactFinder) and linear time table building
+#   18-Oct-2026   in process calculation falls back to the tool, distances calculated with symmetry operators
 ##
 """
 Manage utility to correct covalent bond problems
@@ -19,6 +21,7 @@ import os
 import sys
 import traceback
 
+from wwpdb.apps.ann_tasks_v2.utils.AtomContactFinder import AtomContactFinder
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 
 
@@ -39,8 +42,16 @@ class GetCovalentBond(object):
         self.__sObj = self.__reqObj.getSessionObj()
         self.__sessionPath = self.__sObj.getPath()
 
-    def run(self, entryId, inpFile):
-        """Run the calculation"""
+    def run(self, entryId, inpFile, engine=None):
+        """Run the calculation
+
+        :param engine: 'native' to calculate in process with AtomContactFinder rather than with the annot-get-covalent-bond tool
+                       (default from request value 'contact_engine') - the tool is used when the space group
+                       operators for the model are not available
+        """
+        if engine is None:
+            engine = self.__reqObj.getValue("contact_engine")
+        #
         retD = {}
         retD["found"] = "no"
         try:
@@ -52,12 +63,15 @@ class GetCovalentBond(object):
                     os.remove(filePath)
                 #
             #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            #
-            dp.imp(inpPath)
-            dp.op("annot-get-covalent-bond")
-            dp.expLog(dstPath=logPath, appendMode=False)
-            dp.exp(retPath)
+            # The tool is run if the in process calculation is not requested or can not be made for the model
+            if (engine != "native") or (not self.__runNative(inpPath, logPath, retPath)):
+                dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                #
+                dp.imp(inpPath)
+                dp.op("annot-get-covalent-bond")
+                dp.expLog(dstPath=logPath, appendMode=False)
+                dp.exp(retPath)
+                dp.cleanup()
             #
             if os.access(retPath, os.R_OK):
                 with open(retPath) as ifh:
@@ -69,12 +83,26 @@ class GetCovalentBond(object):
                     #
                 #
             #
-            dp.cleanup()
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
         #
         return retD
 
+    def __runNative(self, inpPath, logPath, retPath):
+        """Write the covalent bonds of the model file in the same JSON form as the annot-get-covalent-bond tool"""
+        finder = AtomContactFinder(verbose=self.__verbose, log=self.__lfh)
+        if (not finder.read(inpPath)) or (finder.getSymmetryOperators() is None):
+            return False
+        #
+        rowList = finder.getCovalentBonds()
+        with open(retPath, "w") as ofh:
+            json.dump({"covalent_bond": rowList}, ofh)
+        #
+        with open(logPath, "w") as ofh:
+            ofh.write("Found %d covalent bonds\nFinished!\n" % len(rowList))
+        #
+        return True
+
     def __processCloseContactContent(self, jsonObj):
         """ """
         if (not jsonObj) or ("covalent_bond" not in jsonObj) or (not jsonObj["covalent_bond"]):
@@ -117,38 +145,37 @@ class GetCovalentBond(object):
         </table>
         """
         #
-        tablerow = ""
+        # Rows are collected and joined once - repeated string concatenation is quadratic for thousands of bonds
+        rowList = []
         count = 0
         for tupL in jsonObj["covalent_bond"]:
-            tablerow += "<tr>"
-            #
-            atom = tupL[4]
+            atom1 = tupL[4]
             if tupL[5]:
-                atom += "(" + tupL[5] + ")"
+                atom1 += "(" + tupL[5] + ")"
             #
             linkid = tupL[16]
             linkitem = '<a href="#" onclick="inspect(\'%s\'); return false;">%s</a>' % (
                 linkid.strip(), linkid)
-            tablerow += "<td>" + linkitem + "</td><td>" + tupL[0] + "</td><td>" + tupL[1] + "</td><td>" + tupL[2] + tupL[3] + "</td><td>" \
-                + atom + "</td><td>" + tupL[6] + "</td>"
-            atom = tupL[11]
+            atom2 = tupL[11]
             if tupL[12]:
-                atom += "(" + tupL[12] + ")"
+                atom2 += "(" + tupL[12] + ")"
             #
-            tablerow += "<td>" + tupL[7] + "</td><td>" + tupL[8] + "</td><td>" + tupL[9] + tupL[10] + "</td><td>" + atom + "</td><td>" \
-                + tupL[13] + "</td><td>" + tupL[14] + "</td>"
+            row = [
+                "<tr>",
+                "<td>", linkitem, "</td><td>", tupL[0], "</td><td>", tupL[1], "</td><td>", tupL[2], tupL[3], "</td><td>", atom1, "</td><td>", tupL[6], "</td>",
+                "<td>", tupL[7], "</td><td>", tupL[8], "</td><td>", tupL[9], tupL[10], "</td><td>", atom2, "</td><td>", tupL[13], "</td><td>", tupL[14], "</td>",
+            ]
             #
             tupL[6] = tupL[6].replace("_", "-")
             tupL[13] = tupL[13].replace("_", "-")
             bond_id = "covalent_bond_" + str(count)
             #
-            tablerow += "<td>" + tupL[15] + '&nbsp; &nbsp; &nbsp; &nbsp; <input type="checkbox" id="' + bond_id + '" name="' + bond_id \
-                + '" value="' + "_".join(tupL[:16]) + '"/></td>'
-            #
-            tablerow += "</tr>\n"
+            row.extend(["<td>", tupL[15], '&nbsp; &nbsp; &nbsp; &nbsp; <input type="checkbox" id="', bond_id, '" name="', bond_id,
+                        '" value="', "_".join(tupL[:16]), '"/></td>', "</tr>\n"])
+            rowList.append("".join(row))
             count += 1
         #
-        return htmlTemplate % (str(count), tablerow)
+        return htmlTemplate % (str(count), "".join(rowList))
 
 
 def main():
@@ -4,6 +4,7 @@
 #
 # Update:
 # 28-Feb -2014  Add base class
+# 18-Oct -2026  Run in a private task workspace and commit the model update with a version history
 #
 ##
 """
@@ -22,6 +23,7 @@ import os
 import traceback
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
 
 
 class MergeXyz(SessionWebDownloadUtils):
@@ -75,39 +77,33 @@ class MergeXyz(SessionWebDownloadUtils):
         """Run the merging operation on inpFile using replacement coordinate data from self.__newXyzFilePath"""
         try:
             inpPath = os.path.join(self.__sessionPath, inpFile)
-            logPath1 = os.path.join(self.__sessionPath, entryId + "-merge-xyz.log")
-            retPath = os.path.join(self.__sessionPath, entryId + "_model-updated_P1.cif")
-            for filePath in (retPath, logPath1):
-                if os.access(filePath, os.R_OK):
-                    os.remove(filePath)
+            with TaskWorkspace(self.__sessionPath, entryId, "merge-xyz", verbose=self.__verbose, log=self.__lfh) as ws:
+                logPath1 = ws.getPath(entryId + "-merge-xyz.log")
+                retPath = ws.getPath(entryId + "_model-updated_P1.cif")
                 #
-            #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            dp.imp(inpPath)
+                dp = RcsbDpUtility(tmpPath=ws.getPath(), siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                dp.imp(ws.snapshot(inpPath))
 
-            if self.__newXyzFilePath is not None:
-                dp.addInput(name="new_coordinate_file_path", value=self.__newXyzFilePath)
-                dp.addInput(name="new_coordinate_format", value=self.__xyzFormat)
+                if self.__newXyzFilePath is not None:
+                    dp.addInput(name="new_coordinate_file_path", value=self.__newXyzFilePath)
+                    dp.addInput(name="new_coordinate_format", value=self.__xyzFormat)
 
-            dp.op("annot-merge-xyz")
-            dp.expLog(logPath1)
-            dp.exp(retPath)
+                dp.op("annot-merge-xyz")
+                dp.expLog(logPath1)
+                dp.exp(retPath)
+                dp.cleanup()
 
-            self.addDownloadPath(retPath)
-            self.addDownloadPath(logPath1)
-            if updateInput and os.access(retPath, os.R_OK):
-                dp.exp(inpPath)
-            #
-            self.__status = self.__checkStatus(logPath1)
+                for filePath in ws.publish([retPath, logPath1]):
+                    self.addDownloadPath(filePath)
+                ok = os.access(retPath, os.R_OK)
+                if updateInput and ok:
+                    ok = ws.commit(retPath, inpPath)
+                #
+                self.__status = self.__checkStatus(logPath1)
             if self.__verbose:
                 self.__lfh.write("+MergeXyz.run-  completed with status %s for entryId %s file %s\n" % (self.__status, entryId, inpPath))
             #
-            dp.cleanup()
-            if os.access(retPath, os.R_OK):
-                return True
-            else:
-                return False
-            #
+            return ok
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
             return False
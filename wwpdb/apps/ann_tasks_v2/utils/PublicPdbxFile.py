@@ -6,6 +6,7 @@
 # 28-Feb -2014  jdw Add base class
 # 4-Jun-2014    jdw Added V4 dictionary argument --
 # 25-May-2023   zf  Added run_conversion() method to generate different flavor of public PDBx/mmCIF files
+# 18-Oct-2026       Added get_conversion_paths()
 ##
 """
 Generate public pdbx cif file.
@@ -65,14 +66,19 @@ class PublicPdbxFile(SessionWebDownloadUtils):
         #
         return False
 
+    def get_conversion_paths(self, op, entryId):
+        """Return the (converted file path, log path) written by run_conversion() for the input operation."""
+        if op not in self.__opMap:
+            return None, None
+        return os.path.join(self._exportPath, entryId + self.__opMap[op][0]), os.path.join(self._exportPath, entryId + self.__opMap[op][1])
+
     def run_conversion(self, op, entryId, inpPath):
         """Run conversion."""
         try:
             if op not in self.__opMap:
                 return
             #
-            pdbxPath = os.path.join(self._exportPath, entryId + self.__opMap[op][0])
-            logPath = os.path.join(self._exportPath, entryId + self.__opMap[op][1])
+            pdbxPath, logPath = self.get_conversion_paths(op, entryId)
             #
             for filePath in (pdbxPath, logPath):
                 if os.access(filePath, os.R_OK):
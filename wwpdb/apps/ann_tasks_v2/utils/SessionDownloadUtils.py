@@ -4,6 +4,10 @@
 #
 # Updated:
 #  27-Feb-2014  jdw --  add version parameters --
+#  18-Oct-2026  ep  --  resolve file versions through a memoized directory index --
+#  18-Oct-2026  ep  --  place download files by link where possible rather than copying --
+#  18-Oct-2026  ep  --  share content only with versioned files resolving into the archive or workflow instance tree --
+#  18-Oct-2026  ep  --  list the directory again for each version lookup so files written by the caller are seen --
 #
 """
 Common methods for managing download operations for project files within the session context.
@@ -18,19 +22,32 @@ __version__ = "V0.07"
 import sys
 import os
 import os.path
-import shutil
+import re
 import traceback
 
 from wwpdb.io.locator.PathInfo import PathInfo
 from wwpdb.io.locator.DataReference import ReferenceFileComponents
+from wwpdb.utils.config.ConfigInfo import ConfigInfo
+from wwpdb.apps.ann_tasks_v2.utils.ArchiveFileIndex import ArchiveFileIndex
+from wwpdb.apps.ann_tasks_v2.utils.FileLinkUtils import FileLinkUtils
 
 
 class SessionDownloadUtils(object):
-    """Common methods for managing download operations for project files within the session context."""
+    """Common methods for managing download operations for project files within the session context.
 
-    #
+    Files are placed in the download directory using the first workable method in the link strategy
+    list (see FileLinkUtils) - the site may override the default with a comma separated list in the
+    configuration item ANN_TASKS_DOWNLOAD_LINK_STRATEGY.  Links which share content with the source
+    (hardlink, symlink) are only made to versioned project files whose resolved path lies in the archive
+    or workflow instance directories of the entry - these are never rewritten, so a session download always
+    refers to the version that was fetched.  Other files, including versioned files written within the
+    session, are reflinked or copied.
+    """
 
-    def __init__(self, reqObj=None, verbose=False, log=sys.stderr):
+    _defaultLinkStrategyList = ["hardlink", "reflink", "symlink", "copy"]
+    _versionedFileRe = re.compile(r"\.V\d+$")
+
+    def __init__(self, reqObj=None, verbose=False, log=sys.stderr, linkStrategyList=None):
         """Input request object is used to determine session context."""
         self.__verbose = verbose
         self.__lfh = log
@@ -42,6 +59,7 @@ class SessionDownloadUtils(object):
         self.__sessionPath = self.__reqObj.getSessionPath()
         sP = os.path.join(self.__sessionPath, self.__sessionId)
         self.__pI = PathInfo(siteId=self.__siteId, sessionPath=sP, verbose=self.__verbose, log=self.__lfh)
+        self.__fileIndex = ArchiveFileIndex(self.__pI, verbose=self.__verbose, log=self.__lfh)
         #
         self.__sessionDir = "sessions"
         self.__downloadDir = "downloads"
@@ -53,14 +71,32 @@ class SessionDownloadUtils(object):
         self.__targetFilePath = None
         self.__targetFileName = None
         self.__downloadFilePath = None
+        self.__linkStrategyList = linkStrategyList if linkStrategyList else self.__getLinkStrategyList()
         self.__setup()
 
+    def __getLinkStrategyList(self):
+        try:
+            sVal = ConfigInfo(self.__siteId).get("ANN_TASKS_DOWNLOAD_LINK_STRATEGY")
+            if sVal:
+                return [strategy.strip() for strategy in str(sVal).split(",") if strategy.strip()]
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                traceback.print_exc(file=self.__lfh)
+        return self._defaultLinkStrategyList
+
     def __setup(self):
         if not os.access(self.__downloadDirPath, os.W_OK):
             os.makedirs(self.__downloadDirPath, 0o755)
 
     def getFilePath(self, idCode, contentType="model", formatType="pdbx", fileSource="archive", instance=None, mileStone=None, versionId="latest"):
-        return self.__pI.getFilePath(idCode, contentType=contentType, formatType=formatType, fileSource=fileSource, wfInstanceId=instance, mileStone=mileStone, versionId=versionId)
+        # Callers write new versions between lookups (e.g. copy to 'next' then fetch 'latest') - the directory is listed again
+        return self.__fileIndex.getFilePath(
+            idCode, contentType=contentType, formatType=formatType, fileSource=fileSource, wfInstanceId=instance, mileStone=mileStone, versionId=versionId, refresh=True
+        )
+
+    def getFileIndex(self):
+        """Return the directory index used to resolve file versions for this instance."""
+        return self.__fileIndex
 
     def getWebDownloadPath(self):
         return self.__webDownloadDirPath
@@ -129,8 +165,16 @@ class SessionDownloadUtils(object):
 
     def fetchId(self, idCode, contentType="model", formatType="pdbx", fileSource="archive", instance=None, mileStone=None, versionId="latest", partNumber="1"):
         """Copy the file with the input signature from the fileSource directory to the session download directory."""
-        filePath = self.__pI.getFilePath(
-            idCode, contentType=contentType, formatType=formatType, fileSource=fileSource, wfInstanceId=instance, mileStone=mileStone, versionId=versionId, partNumber=partNumber
+        filePath = self.__fileIndex.getFilePath(
+            idCode,
+            contentType=contentType,
+            formatType=formatType,
+            fileSource=fileSource,
+            wfInstanceId=instance,
+            mileStone=mileStone,
+            versionId=versionId,
+            partNumber=partNumber,
+            refresh=True,
         )
         if self.__verbose:
             self.__lfh.write(
@@ -164,13 +208,18 @@ class SessionDownloadUtils(object):
                 if self.__verbose:
                     self.__lfh.write("+SessionDownloadUtils.fetchFile() input file not found %s\n" % filePath)
                 return False
-            if self.__verbose:
-                self.__lfh.write("+SessionDownloadUtils.fetchFile() copying input path %s\n" % filePath)
             self.__targetFilePath = filePath
             (_pth, self.__targetFileName) = os.path.split(self.__targetFilePath)
             self.__downloadFilePath = os.path.join(self.__downloadDirPath, self.__targetFileName)
             if self.__targetFilePath != self.__downloadFilePath:
-                shutil.copyfile(self.__targetFilePath, self.__downloadFilePath)
+                shareContent = self.__isArchiveFile(self.__targetFilePath)
+                method = FileLinkUtils(strategyList=self.__linkStrategyList, verbose=self.__verbose, log=self.__lfh).place(
+                    self.__targetFilePath, self.__downloadFilePath, shareContent=shareContent
+                )
+                if self.__verbose:
+                    self.__lfh.write("+SessionDownloadUtils.fetchFile() placed input path %s (%s)\n" % (filePath, method))
+                if method is None:
+                    return False
             self.__webDownloadFilePath = os.path.join(self.__webDownloadDirPath, self.__targetFileName)
             return True
         except:  # noqa: E722 pylint: disable=bare-except
@@ -179,6 +228,17 @@ class SessionDownloadUtils(object):
                 traceback.print_exc(file=self.__lfh)
         return False
 
+    def __isArchiveFile(self, filePath):
+        """Return True if filePath resolves to a versioned file in the archive or workflow instance tree of its entry."""
+        realPath = os.path.realpath(filePath)
+        if self._versionedFileRe.search(realPath) is None:
+            return False
+        idCode = self.getIdFromFileName(realPath)
+        if not idCode:
+            return False
+        dirPathList = [self.__pI.getArchivePath(idCode), self.__pI.getInstanceTopPath(idCode)]
+        return FileLinkUtils(verbose=self.__verbose, log=self.__lfh).isUnderPath(realPath, dirPathList)
+
     def getWebPath(self):
         """ """
         return self.__webDownloadFilePath
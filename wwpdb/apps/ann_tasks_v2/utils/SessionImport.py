@@ -0,0 +1,251 @@
+##
+# File:  SessionImport.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#   18-Oct-2026  pending files may be copied individually on first access (materialize(pathList=...))
+##
+"""
+Import of workflow data files into an annotation session.
+
+Source file versions are resolved from a single listing of each workflow directory
+(see ArchiveFileIndex) and the files are copied concurrently.  Large or rarely used
+files (maps, local ligand map directories and assembly model files) may be deferred -
+these are recorded in a pending list in the session directory and are copied on first
+use by materialize() - callers pass the session paths they are about to read so that only
+those files are copied.  A pending file which has been replaced in the session since the
+import (e.g. by a new map calculation) is not copied.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import fcntl
+import glob
+import json
+import os
+import shutil
+import sys
+import time
+import traceback
+
+from wwpdb.io.locator.PathInfo import PathInfo
+
+from wwpdb.apps.ann_tasks_v2.utils.ArchiveFileIndex import ArchiveFileIndex
+from wwpdb.apps.ann_tasks_v2.utils.TaskPool import TaskPool
+
+
+class SessionImport(object):
+    """Copy the annotation data files of a data set from workflow storage into the current session."""
+
+    # Content type and format of the files copied at import
+    _importList = [
+        ("assembly-report", "xml"),
+        ("assembly-assign", "txt"),
+        ("site-assign", "pdbx"),
+        ("validation-report", "pdf"),
+        ("validation-report-full", "pdf"),
+        ("validation-report-slider", "svg"),
+        ("validation-data", "xml"),
+        ("validation-data", "pdbx"),
+        ("validation-report-2fo-map-coef", "pdbx"),
+        ("validation-report-fo-map-coef", "pdbx"),
+        ("dict-check-report", "txt"),
+        ("xml-check-report", "txt"),
+        ("pcm-missing-data", "csv"),
+        ("nmr-shift-error-report", "json"),
+        ("nmr-data-error-report", "json"),
+        ("fsc", "xml"),
+    ]
+    # Files taken from the archive if missing in the input file source
+    _archiveFallbackList = [
+        ("structure-factors", "pdbx"),
+        ("nmr-chemical-shifts", "pdbx"),
+        ("nmr-data-str", "pdbx"),
+    ]
+    _mapList = [("map-2fofc", "map"), ("map-fofc", "map"), ("map-omit-2fofc", "map"), ("map-omit-fofc", "map")]
+    _mapDirList = ["np-cc-maps", "np-cc-omit-maps"]
+
+    def __init__(self, reqObj, identifier, maxWorkers=None, verbose=False, log=sys.stderr):
+        self.__reqObj = reqObj
+        self.__identifier = identifier
+        self.__maxWorkers = maxWorkers
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__siteId = self.__reqObj.getValue("WWPDB_SITE_ID")
+        self.__sessionPath = self.__reqObj.getSessionObj().getPath()
+        self.__pI = PathInfo(siteId=self.__siteId, sessionPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
+        self.__fileIndex = ArchiveFileIndex(self.__pI, verbose=self.__verbose, log=self.__lfh)
+        self.__pendingPath = os.path.join(self.__sessionPath, self.__identifier + "_import-pending.json")
+
+    def importFiles(self, fileSource="wf-archive", instanceWf="", getMaps=False, defer=True):
+        """Copy the data files of the data set into the session.
+
+        Maps are included if getMaps is set.  With defer=True maps, local map directories and
+        assembly model files are recorded for later copying by materialize().
+
+        Returns False if there is no model file.
+        """
+        startTime = time.time()
+        wfInstanceId = instanceWf if instanceWf else None
+        if self.__copyFile(self.__getSourcePath("model", "pdbx", fileSource, wfInstanceId), self.__getSessionFilePath("model", "pdbx")) is None:
+            return False
+        #
+        itemL = []
+        for contentType, formatType in self._importList:
+            itemL.append((None, self.__getSourcePath(contentType, formatType, fileSource, wfInstanceId), self.__getSessionFilePath(contentType, formatType)))
+        for contentType, formatType in self._archiveFallbackList:
+            srcPath = self.__getSourcePath(contentType, formatType, fileSource, wfInstanceId)
+            if (srcPath is None or not os.access(srcPath, os.R_OK)) and fileSource != "archive":
+                srcPath = self.__getSourcePath(contentType, formatType, "archive", wfInstanceId)
+            itemL.append((None, srcPath, self.__getSessionFilePath(contentType, formatType)))
+        #
+        partitionL = self.__fileIndex.getPartitionNumberList(self.__identifier, contentType="assembly-model-xyz", formatType="pdbx", fileSource=fileSource, wfInstanceId=wfInstanceId)
+        for partNum, iP in enumerate(partitionL, 1):
+            if iP != partNum or partNum > 49:
+                break
+            srcPath = self.__getSourcePath("assembly-model-xyz", "pdbx", fileSource, wfInstanceId, partNumber=str(partNum))
+            itemL.append(("assembly-models", srcPath, self.__getSessionFilePath("assembly-model-xyz", "pdbx", partNumber=str(partNum))))
+        if getMaps:
+            for contentType, formatType in self._mapList:
+                itemL.append(("maps", self.__getSourcePath(contentType, formatType, fileSource, wfInstanceId), self.__getSessionFilePath(contentType, formatType)))
+            dirPath = self.__getSourceDirPath(fileSource, wfInstanceId)
+            for dirName in self._mapDirList:
+                itemL.append(("np-cc-maps", os.path.join(dirPath, dirName) if dirPath else None, os.path.join(self.__sessionPath, dirName)))
+        #
+        itemL = [item for item in itemL if item[1] is not None and os.access(item[1], os.R_OK)]
+        copyL = [item for item in itemL if item[0] is None or not defer]
+        pendingL = [item for item in itemL if item[0] is not None and defer]
+        self.__copyItems(copyL)
+        with self.__lock():
+            self.__writePending({"created": time.time(), "items": [{"group": group, "src": srcPath, "dst": dstPath} for group, srcPath, dstPath in pendingL]})
+        #
+        if self.__verbose:
+            self.__lfh.write(
+                "+SessionImport.importFiles() %s copied %d files deferred %d in %.2f s\n" % (self.__identifier, len(copyL) + 1, len(pendingL), time.time() - startTime)
+            )
+        return True
+
+    def getPendingList(self, groupList=None):
+        """Return the session paths of files and directories which have not been copied yet."""
+        with self.__lock():
+            pD = self.__readPending()
+        return [iD["dst"] for iD in pD["items"] if groupList is None or iD["group"] in groupList]
+
+    def materialize(self, groupList=None, pathList=None):
+        """Copy pending files in the input groups ('maps', 'np-cc-maps', 'assembly-models' or all) into the session.
+
+        If pathList is given only the pending files and directories with these session paths are copied.
+        Returns the list of session paths copied.
+        """
+        pathS = set(os.path.realpath(pth) for pth in pathList) if pathList is not None else None
+        with self.__lock():
+            pD = self.__readPending()
+            selL = [iD for iD in pD["items"] if (groupList is None or iD["group"] in groupList) and (pathS is None or os.path.realpath(iD["dst"]) in pathS)]
+            if not selL:
+                return []
+            # Session content written after the import takes precedence
+            copyL = [(iD["group"], iD["src"], iD["dst"]) for iD in selL if not (os.access(iD["dst"], os.F_OK) and os.path.getmtime(iD["dst"]) > pD["created"])]
+            startTime = time.time()
+            copiedL = self.__copyItems(copyL)
+            pD["items"] = [iD for iD in pD["items"] if iD not in selL]
+            self.__writePending(pD)
+        if self.__verbose:
+            self.__lfh.write("+SessionImport.materialize() %s copied %d of %d pending in %.2f s\n" % (self.__identifier, len(copiedL), len(selL), time.time() - startTime))
+        return copiedL
+
+    def __getSourcePath(self, contentType, formatType, fileSource, wfInstanceId, partNumber="1"):
+        try:
+            return self.__fileIndex.getFilePath(
+                self.__identifier, contentType=contentType, formatType=formatType, fileSource=fileSource, wfInstanceId=wfInstanceId, versionId="latest", partNumber=partNumber
+            )
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+SessionImport.__getSourcePath() no path for %s %s in %s\n" % (contentType, formatType, fileSource))
+            return None
+
+    def __getSessionFilePath(self, contentType, formatType, partNumber="1"):
+        return os.path.join(self.__sessionPath, self.__pI.getFileName(self.__identifier, contentType=contentType, formatType=formatType, versionId="none", partNumber=partNumber))
+
+    def __getSourceDirPath(self, fileSource, wfInstanceId):
+        if fileSource in ["archive", "wf-archive"]:
+            return self.__pI.getArchivePath(self.__identifier)
+        elif fileSource == "deposit":
+            return self.__pI.getDepositPath(self.__identifier)
+        elif fileSource == "wf-instance":
+            return self.__pI.getInstancePath(self.__identifier, wfInstanceId)
+        return None
+
+    def __copyItems(self, itemL):
+        tP = TaskPool(maxWorkers=self.__maxWorkers, verbose=self.__verbose, log=self.__lfh)
+        for _group, srcPath, dstPath in itemL:
+            tP.add(dstPath, self.__copyDir if os.path.isdir(srcPath) else self.__copyFile, srcPath, dstPath)
+        return [dstPath for dstPath, ok, result in tP.run() if ok and result]
+
+    def __copyFile(self, srcPath, dstPath):
+        """Copy through a temporary file so that a partially copied file is never visible -"""
+        if srcPath is None or not os.access(srcPath, os.R_OK):
+            return None
+        try:
+            tmpPath = dstPath + ".import-tmp-%d" % os.getpid()
+            shutil.copyfile(srcPath, tmpPath)
+            os.replace(tmpPath, dstPath)
+            if self.__verbose:
+                self.__lfh.write("+SessionImport.__copyFile() copied %s to %s\n" % (srcPath, dstPath))
+            return dstPath
+        except:  # noqa: E722 pylint: disable=bare-except
+            if self.__verbose:
+                self.__lfh.write("+SessionImport.__copyFile() failing for %s\n" % srcPath)
+                traceback.print_exc(file=self.__lfh)
+            return None
+
+    def __copyDir(self, srcPath, dstPath):
+        if not os.path.isdir(dstPath):
+            os.makedirs(dstPath, 0o755)
+        for fp in filter(os.path.isfile, glob.glob(os.path.join(srcPath, "*"))):
+            if self.__copyFile(fp, os.path.join(dstPath, os.path.basename(fp))) is None:
+                return None
+        return dstPath
+
+    def __readPending(self):
+        try:
+            with open(self.__pendingPath, "r") as ifh:
+                return json.load(ifh)
+        except (IOError, OSError, ValueError):
+            return {"created": 0, "items": []}
+
+    def __writePending(self, pD):
+        try:
+            if not pD["items"]:
+                if os.access(self.__pendingPath, os.F_OK):
+                    os.remove(self.__pendingPath)
+                return
+            tmpPath = self.__pendingPath + ".tmp"
+            with open(tmpPath, "w") as ofh:
+                json.dump(pD, ofh)
+            os.replace(tmpPath, self.__pendingPath)
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self.__lfh)
+
+    def __lock(self):
+        return _PendingLock(self.__pendingPath + ".lock")
+
+
+class _PendingLock(object):
+    """Exclusive lock serializing pending list updates and copies across requests."""
+
+    def __init__(self, lockPath):
+        self.__lockPath = lockPath
+        self.__fh = None
+
+    def __enter__(self):
+        self.__fh = open(self.__lockPath, "a")
+        fcntl.flock(self.__fh, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        fcntl.flock(self.__fh, fcntl.LOCK_UN)
+        self.__fh.close()
@@ -0,0 +1,172 @@
+##
+# File:  StageManifest.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#   18-Oct-2026  Add getToolIdentity() so a stage is run again after its programs are updated
+#   18-Oct-2026  getToolIdentity() is a static method for caches kept without a manifest
+##
+"""
+Input fingerprints and output records for skipping repeated processing stages.
+
+A manifest file records, for each named stage of a multi-step operation, the
+fingerprints of the inputs of its last successful run and the output files it
+produced.  A stage is current (and may be skipped) when its inputs have the same
+fingerprints and its outputs are still present and unmodified.
+
+Input files are fingerprinted by content (sha256).  The digest is remembered with
+the file size and modification time so unchanged files, which may be large map or
+structure factor files, are not read again on later runs.
+
+The programs run by a stage are part of its inputs - getToolIdentity() returns the
+installed package versions and the size and modification time of program files.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import json
+import logging
+import os
+import sys
+
+from wwpdb.apps.ann_tasks_v2.utils.FileResultCache import hashFile
+
+try:
+    from importlib.metadata import version as getPackageVersion
+except ImportError:  # pragma: no cover
+    getPackageVersion = None
+
+logger = logging.getLogger(__name__)
+
+
+class StageManifest(object):
+    """Per-stage input fingerprints and output records kept in a JSON file."""
+
+    def __init__(self, manifestPath, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__manifestPath = manifestPath
+        self.__mD = self.__read()
+        self.__reportL = []
+
+    def fingerprint(self, filePath):
+        """Return the content digest of filePath or None if it cannot be read."""
+        if not filePath:
+            return None
+        try:
+            st = os.stat(filePath)
+        except OSError:
+            return None
+        fD = self.__mD["files"]
+        rec = fD.get(filePath)
+        if rec and rec[0] == st.st_size and rec[1] == st.st_mtime_ns:
+            return rec[2]
+        try:
+            digest = hashFile(filePath)
+        except (IOError, OSError):
+            return None
+        fD[filePath] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    @staticmethod
+    def getToolIdentity(packageNameList=None, pathList=None):
+        """Return the identity of the programs run by a stage for inclusion in its inputs.
+
+        This is a dictionary of the installed version of each package in packageNameList and the size and
+        modification time of each file in pathList (of each file directly within a directory).  Items which
+        are not available have the value None.
+        """
+        tD = {}
+        for packageName in packageNameList if packageNameList else []:
+            try:
+                tD[packageName] = getPackageVersion(packageName) if getPackageVersion else None
+            except Exception:  # pylint: disable=broad-except
+                tD[packageName] = None
+        for path in pathList if pathList else []:
+            tD[path] = StageManifest.__getPathIdentity(path)
+        return tD
+
+    @staticmethod
+    def __getPathIdentity(path):
+        try:
+            if not os.path.isdir(path):
+                st = os.stat(path)
+                return [st.st_size, st.st_mtime_ns]
+            rL = []
+            for fileName in sorted(os.listdir(path)):
+                st = os.stat(os.path.join(path, fileName))
+                rL.append([fileName, st.st_size, st.st_mtime_ns])
+            return rL
+        except (OSError, TypeError):
+            return None
+
+    def isCurrent(self, stage, inputD):
+        """Return True if stage last ran with the same inputs and all of its outputs are unchanged."""
+        sD = self.__mD["stages"].get(stage)
+        if not sD or sD["inputs"] != inputD or not sD["outputs"]:
+            return False
+        for filePath, rec in sD["outputs"].items():
+            try:
+                st = os.stat(filePath)
+            except OSError:
+                return False
+            if st.st_size != rec[0] or st.st_mtime_ns != rec[1]:
+                return False
+        return True
+
+    def record(self, stage, inputD, outputPathList, metaD=None):
+        """Record a completed run of stage - only outputs which exist are recorded.
+
+        metaD is an optional JSON serializable dictionary of results of the stage other than files.
+        """
+        outD = {}
+        for filePath in outputPathList:
+            try:
+                st = os.stat(filePath)
+                outD[filePath] = [st.st_size, st.st_mtime_ns]
+            except OSError:
+                pass
+        self.__mD["stages"][stage] = {"inputs": inputD, "outputs": outD, "meta": metaD if metaD else {}}
+
+    def getMeta(self, stage):
+        """Return the meta data dictionary recorded with the last run of stage."""
+        sD = self.__mD["stages"].get(stage)
+        return sD.get("meta", {}) if sD else {}
+
+    def invalidate(self, stage):
+        self.__mD["stages"].pop(stage, None)
+
+    def report(self, stage, action):
+        """Note what was done for stage in this run (e.g. 'run', 'reused', 'skipped')."""
+        self.__reportL.append((stage, action))
+        if self.__verbose:
+            self.__lfh.write("+StageManifest.report() stage %-30s %s\n" % (stage, action))
+
+    def getReport(self):
+        """Return the list of (stage, action) for this run."""
+        return list(self.__reportL)
+
+    def save(self):
+        try:
+            tmpPath = self.__manifestPath + ".tmp"
+            with open(tmpPath, "w") as ofh:
+                json.dump(self.__mD, ofh, indent=1, sort_keys=True)
+            os.rename(tmpPath, self.__manifestPath)
+            return True
+        except (IOError, OSError) as e:
+            logger.error("Writing stage manifest %s failed %s", self.__manifestPath, str(e))
+        return False
+
+    def __read(self):
+        try:
+            with open(self.__manifestPath, "r") as ifh:
+                mD = json.load(ifh)
+            if isinstance(mD.get("files"), dict) and isinstance(mD.get("stages"), dict):
+                return mD
+        except (IOError, OSError, ValueError):
+            pass
+        return {"files": {}, "stages": {}}
@@ -0,0 +1,167 @@
+##
+# File:  StagePipeline.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#   18-Oct-2026  Document how a failed stage affects the stages which follow it
+##
+"""
+Declarative pipeline of processing stages with input based skipping.
+
+Each stage declares its input files, output files, parameters and the stages it
+must follow.  Stages are run in dependency order - stages which are ready at the
+same time run concurrently on a TaskPool.  If a manifest path is given, a stage
+whose inputs have the same content as after its last successful run, and whose
+outputs are unchanged, is skipped (see StageManifest).
+
+A stage function takes no arguments and returns (ok, metaD).  metaD is a JSON
+serializable dictionary holding any results other than files - it is recorded
+with the stage and passed to the stage restore function when the stage is
+skipped.  File paths listed under metaD["outputs"] are recorded as additional
+outputs of the stage.
+
+dependsOn only orders stages - a stage still runs when a stage it follows has
+failed, as the processing steps did when they were run in sequence.  A failed
+stage is reported as 'failed', has False in the status returned by run() and its
+manifest record is removed so it is run again on the next run.
+
+Input fingerprints are recorded after a stage has run, so a stage which updates
+one of its input files in place is skipped on a later run if that file still
+holds the content the stage produced.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import logging
+import sys
+import time
+import traceback
+
+from wwpdb.apps.ann_tasks_v2.utils.StageManifest import StageManifest
+from wwpdb.apps.ann_tasks_v2.utils.TaskPool import TaskPool
+
+logger = logging.getLogger(__name__)
+
+
+class StagePipeline(object):
+    """Run declared stages in dependency order, concurrently where possible, skipping current stages."""
+
+    def __init__(self, manifestPath=None, maxWorkers=None, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__maxWorkers = maxWorkers
+        self.__sm = StageManifest(manifestPath, verbose=verbose, log=log) if manifestPath else None
+        self.__stageL = []
+        self.__stageD = {}
+        self.__reportL = []
+
+    def addStage(self, name, func, inputD=None, outputList=None, paramD=None, dependsOn=None, restoreFunc=None, cache=True):
+        """Declare a stage.
+
+        :param name: unique stage name
+        :param func: stage function returning (ok, metaD)
+        :param inputD: dictionary of role -> input file path
+        :param outputList: list of output file paths
+        :param paramD: dictionary of parameters which affect the result of the stage
+        :param dependsOn: list of names of stages which must be run first
+        :param restoreFunc: called with the recorded metaD when the stage is skipped
+        :param cache: if False the stage is always run
+        """
+        if name in self.__stageD:
+            raise ValueError("Duplicate stage %s" % name)
+        for depName in dependsOn or []:
+            if depName not in self.__stageD:
+                raise ValueError("Stage %s depends on undeclared stage %s" % (name, depName))
+        self.__stageD[name] = {
+            "func": func,
+            "inputD": inputD if inputD else {},
+            "outputList": [fp for fp in (outputList or []) if fp],
+            "paramD": paramD if paramD else {},
+            "dependsOn": list(dependsOn or []),
+            "restoreFunc": restoreFunc,
+            "cache": cache,
+        }
+        self.__stageL.append(name)
+
+    def getReport(self):
+        """Return the list of (stage, action, seconds) for the last run - action is 'run', 'failed' or 'skipped'."""
+        return list(self.__reportL)
+
+    def run(self):
+        """Run all stages and return a dictionary of stage name -> status."""
+        self.__reportL = []
+        statusD = {}
+        pendingL = list(self.__stageL)
+        while pendingL:
+            readyL = [name for name in pendingL if all(depName in statusD for depName in self.__stageD[name]["dependsOn"])]
+            runL = []
+            for name in readyL:
+                pendingL.remove(name)
+                if self.__isCurrent(name):
+                    self.__restore(name)
+                    statusD[name] = True
+                    self.__report(name, "skipped", 0.0)
+                else:
+                    runL.append(name)
+            #
+            if len(runL) == 1:
+                t0 = time.time()
+                resultL = [(runL[0], True, self.__runStage(runL[0]))]
+                tD = {runL[0]: time.time() - t0}
+            else:
+                tP = TaskPool(maxWorkers=self.__maxWorkers, verbose=self.__verbose, log=self.__lfh)
+                for name in runL:
+                    tP.add(name, self.__runStage, name)
+                resultL = tP.run()
+                tD = tP.getTimings()
+            for name, ok, result in resultL:
+                stageOk, metaD = result if ok and result else (False, {})
+                statusD[name] = stageOk
+                self.__record(name, stageOk, metaD)
+                self.__report(name, "run" if stageOk else "failed", tD.get(name, 0.0))
+        #
+        if self.__sm is not None:
+            self.__sm.save()
+        return statusD
+
+    def __runStage(self, name):
+        try:
+            ok, metaD = self.__stageD[name]["func"]()
+            return bool(ok), metaD if metaD else {}
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error("Stage %s failed %s", name, str(e))
+            traceback.print_exc(file=self.__lfh)
+        return False, {}
+
+    def __getInputs(self, name):
+        sD = self.__stageD[name]
+        inpD = {role: self.__sm.fingerprint(filePath) for role, filePath in sD["inputD"].items()}
+        inpD["params"] = sD["paramD"]
+        return inpD
+
+    def __isCurrent(self, name):
+        if self.__sm is None or not self.__stageD[name]["cache"]:
+            return False
+        return self.__sm.isCurrent(name, self.__getInputs(name))
+
+    def __restore(self, name):
+        restoreFunc = self.__stageD[name]["restoreFunc"]
+        if restoreFunc is not None:
+            restoreFunc(self.__sm.getMeta(name))
+
+    def __record(self, name, ok, metaD):
+        if self.__sm is None:
+            return
+        if ok and self.__stageD[name]["cache"]:
+            self.__sm.record(name, self.__getInputs(name), self.__stageD[name]["outputList"] + list(metaD.get("outputs", [])), metaD=metaD)
+        else:
+            self.__sm.invalidate(name)
+
+    def __report(self, name, action, seconds):
+        self.__reportL.append((name, action, seconds))
+        if self.__verbose:
+            self.__lfh.write("+StagePipeline.run() stage %-30s %-8s %.2f seconds\n" % (name, action, seconds))
@@ -0,0 +1,140 @@
+##
+# File:  TaskGraph.py
+# Date:  18-Oct-2026
+#
+# Update:
+#   18-Oct-2026  Report each completed task to an optional progress callback
+##
+"""
+Concurrent execution of tasks which declare the data they read and write.
+
+Each task names the data items (e.g. model file categories) it reads and writes.  A task
+conflicts with an earlier task if either one writes an item the other reads or writes - a
+task then runs after the earlier tasks it conflicts with.  Tasks without conflicts run
+concurrently on a bounded thread pool (see TaskPool).
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import logging
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from wwpdb.apps.ann_tasks_v2.utils.TaskPool import getDefaultMaxWorkers
+
+logger = logging.getLogger(__name__)
+
+
+class TaskGraph(object):
+    """Run keyed callables in the order required by their declared reads and writes.
+
+    Usage::
+
+        tG = TaskGraph(maxWorkers=4)
+        tG.add("link", calc.run, ["atom_site"], ["struct_conn"], entryId, fileName)
+        ...
+        for rD in tG.run():
+            ...
+
+    readList and writeList are lists of item names - None stands for all items.  A task runs
+    after the tasks it depends on have finished, whether these succeeded or not.  run() returns a
+    dictionary for each task in the order added with keys name, ok, result, after (the names of
+    the tasks it waited for), start and end (seconds from the start of the run) and seconds.
+    """
+
+    def __init__(self, maxWorkers=None, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__maxWorkers = maxWorkers if maxWorkers else getDefaultMaxWorkers()
+        self.__taskList = []
+
+    def add(self, name, func, readList, writeList, *args, **kwargs):
+        """Register a task - name is returned with the result and must be unique."""
+        self.__taskList.append({"name": name, "func": func, "reads": readList, "writes": writeList, "args": args, "kwargs": kwargs})
+
+    def __overlaps(self, itemList1, itemList2):
+        if itemList1 is None:
+            return itemList2 is None or len(itemList2) > 0
+        if itemList2 is None:
+            return len(itemList1) > 0
+        return len(set(itemList1) & set(itemList2)) > 0
+
+    def __conflicts(self, tD1, tD2):
+        return self.__overlaps(tD1["writes"], tD2["reads"]) or self.__overlaps(tD1["writes"], tD2["writes"]) or self.__overlaps(tD1["reads"], tD2["writes"])
+
+    def getDependencies(self):
+        """Return a dictionary of the names of the earlier tasks each task waits for."""
+        depD = {}
+        for ii, tD in enumerate(self.__taskList):
+            depD[tD["name"]] = [pD["name"] for pD in self.__taskList[:ii] if self.__conflicts(pD, tD)]
+        return depD
+
+    def __runTask(self, tD, startTime):
+        t0 = time.time()
+        try:
+            return tD["func"](*tD["args"], **tD["kwargs"])
+        finally:
+            tD["start"] = t0 - startTime
+            tD["end"] = time.time() - startTime
+
+    def run(self, progressFunc=None):
+        """Execute all registered tasks and return the list of task result dictionaries in the order added.
+
+        If provided, progressFunc(name, ok, numberDone, numberOfTasks) is called as each task finishes.
+        """
+        if not self.__taskList:
+            return []
+        #
+        depD = self.getDependencies()
+        rD = {}
+        startTime = time.time()
+        pendingL = list(self.__taskList)
+        runningD = {}
+        executor = ThreadPoolExecutor(max_workers=min(self.__maxWorkers, len(self.__taskList)))
+        try:
+            while pendingL or runningD:
+                for tD in [tD for tD in pendingL if all(name in rD for name in depD[tD["name"]])]:
+                    pendingL.remove(tD)
+                    runningD[executor.submit(self.__runTask, tD, startTime)] = tD
+                #
+                doneS, _ = wait(list(runningD.keys()), return_when=FIRST_COMPLETED)
+                for future in doneS:
+                    tD = runningD.pop(future)
+                    try:
+                        rD[tD["name"]] = (True, future.result())
+                    except Exception as e:  # pylint: disable=broad-except
+                        logger.error("Task %s failed %s", tD["name"], e)
+                        if self.__verbose:
+                            traceback.print_exc(file=self.__lfh)
+                        rD[tD["name"]] = (False, None)
+                    if progressFunc is not None:
+                        progressFunc(tD["name"], rD[tD["name"]][0], len(rD), len(self.__taskList))
+        finally:
+            executor.shutdown(wait=True)
+        #
+        rL = []
+        for tD in self.__taskList:
+            ok, result = rD[tD["name"]]
+            rL.append({"name": tD["name"], "ok": ok, "result": result, "after": depD[tD["name"]], "start": tD["start"], "end": tD["end"], "seconds": tD["end"] - tD["start"]})
+        self.__taskList = []
+        if self.__verbose:
+            self.__lfh.write("+TaskGraph.run() completed %d tasks in %.2f seconds\n" % (len(rL), time.time() - startTime))
+        return rL
+
+    @staticmethod
+    def getCriticalPath(resultList):
+        """Return the names of the longest chain of dependent tasks in a run() result list and its total task time in seconds."""
+        pathD = {}
+        for rD in resultList:
+            prevL, prevTime = [], 0.0
+            for name in rD["after"]:
+                if pathD[name][1] > prevTime:
+                    prevL, prevTime = pathD[name]
+            pathD[rD["name"]] = (prevL + [rD["name"]], prevTime + rD["seconds"])
+        return max(pathD.values(), key=lambda t: t[1]) if pathD else ([], 0.0)
@@ -0,0 +1,129 @@
+##
+# File:  TaskPool.py
+# Date:  18-Oct-2026
+#
+# Update:
+#
+##
+"""
+Bounded pool for running independent session tasks concurrently.
+
+The tasks run by this module are thin wrappers around RcsbDpUtility which spends
+nearly all of its time waiting on external programs, so a thread pool gives real
+parallelism without requiring the request and session objects to be picklable.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import logging
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+def getDefaultMaxWorkers(limit=8):
+    """Default concurrency - number of cores capped at limit."""
+    try:
+        nCpu = os.cpu_count() or 1
+    except AttributeError:
+        nCpu = 1
+    return max(1, min(limit, nCpu))
+
+
+class TaskPool(object):
+    """Run a list of keyed callables on a bounded pool and return results in submission order.
+
+    Usage::
+
+        tP = TaskPool(maxWorkers=4, timeout=600)
+        tP.add("checkv5", chk.run, entryId=entryId, inpPath=modelFilePath)
+        ...
+        for key, ok, result in tP.run():
+            ...
+
+    A task which raises or exceeds the per-task timeout is reported with ok=False and
+    result=None.  The timeout bounds how long the caller waits for each task, it does not
+    interrupt a task which is already running.
+    """
+
+    def __init__(self, maxWorkers=None, timeout=None, verbose=False, log=sys.stderr):
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__maxWorkers = maxWorkers if maxWorkers else getDefaultMaxWorkers()
+        self.__timeout = timeout
+        self.__taskList = []
+        self.__timingD = {}
+        self.__startD = {}
+
+    def add(self, key, func, *args, **kwargs):
+        """Register a task - key is returned with the result and must be unique."""
+        self.__taskList.append((key, func, args, kwargs))
+
+    def getTaskCount(self):
+        return len(self.__taskList)
+
+    def getTimings(self):
+        """Return a dictionary of wall times (seconds) for each completed task key."""
+        return self.__timingD
+
+    def __runTask(self, key, func, args, kwargs):
+        t0 = time.time()
+        self.__startD[key] = t0
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.__timingD[key] = time.time() - t0
+
+    def __waitResult(self, key, future):
+        """Wait for the task result - the timeout is measured from when the task started, not from when it was queued."""
+        if self.__timeout is None:
+            return future.result()
+        while True:
+            t0 = self.__startD.get(key)
+            if t0 is None:
+                try:
+                    return future.result(timeout=1.0)
+                except FuturesTimeoutError:
+                    continue
+            return future.result(timeout=max(0.0, t0 + self.__timeout - time.time()))
+
+    def run(self):
+        """Execute all registered tasks and return a list of (key, ok, result) in the order added."""
+        rL = []
+        if not self.__taskList:
+            return rL
+        #
+        startTime = time.time()
+        nWorkers = min(self.__maxWorkers, len(self.__taskList))
+        executor = ThreadPoolExecutor(max_workers=nWorkers)
+        try:
+            futureL = [(key, executor.submit(self.__runTask, key, func, args, kwargs)) for key, func, args, kwargs in self.__taskList]
+            for key, future in futureL:
+                try:
+                    rL.append((key, True, self.__waitResult(key, future)))
+                except FuturesTimeoutError:
+                    logger.error("Task %s exceeded timeout %r seconds", key, self.__timeout)
+                    future.cancel()
+                    rL.append((key, False, None))
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.error("Task %s failed %s", key, e)
+                    if self.__verbose:
+                        traceback.print_exc(file=self.__lfh)
+                    rL.append((key, False, None))
+        finally:
+            # Do not block on tasks which have timed out -
+            executor.shutdown(wait=False)
+        #
+        self.__taskList = []
+        self.__startD = {}
+        if self.__verbose:
+            self.__lfh.write("+TaskPool.run() completed %d tasks with %d workers in %.2f seconds\n" % (len(rL), nWorkers, time.time() - startTime))
+        return rL
@@ -0,0 +1,227 @@
+##
+# File:  TaskWorkspace.py
+# Date:  18-Oct-2026
+#
+# Updates:
+#  18-Oct-2026  do not keep versions of intermediate files in the scratch area
+#  18-Oct-2026  add publishDirectory()
+#
+##
+"""
+Private working storage for a single run of a session task.
+
+Each task run works in its own scratch directory below the session directory on a
+private snapshot of its input files, so several tasks may run on the same entry at
+the same time.  Results are installed in the session directory by -
+
+    publish()           replace session files (reports, logs) with the files made by the task
+    publishDirectory()  replace a session directory (e.g. a set of map files) with one made by the task
+    commit()            replace a session data file (e.g. the model) with a new version
+
+Files are installed by rename so readers never see a partially written file.  A commit
+is refused if the target file has been replaced since the snapshot was taken, and the
+replaced version is kept in the session version history where it may be recovered with
+restoreVersion().
+
+Usage::
+
+    with TaskWorkspace(sessionPath, entryId, "solvent") as ws:
+        snapPath = ws.snapshot(inpPath)
+        ... write results to ws.getPath(fileName) ...
+        ws.publish([ws.getPath(logFileName)])
+        ws.commit(ws.getPath(modelFileName), inpPath)
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import fcntl
+import json
+import os
+import shutil
+import sys
+import time
+import traceback
+import uuid
+
+
+class TaskWorkspace(object):
+    """Scratch directory, input snapshots and result installation for one task run."""
+
+    def __init__(self, sessionPath, entryId, taskName, maxVersions=20, verbose=False, log=sys.stderr):
+        self.__sessionPath = sessionPath
+        self.__entryId = entryId
+        self.__taskName = taskName
+        self.__maxVersions = maxVersions
+        self.__verbose = verbose
+        self.__lfh = log
+        self.__workPath = os.path.join(sessionPath, "task-scratch", "%s-%s-%s" % (taskName, entryId, uuid.uuid4().hex[:8]))
+        os.makedirs(self.__workPath)
+        # realpath of snapshot source -> identity of the source file at snapshot time
+        self.__snapshotD = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def getPath(self, fileName=None):
+        """Return the scratch directory or the path of fileName in the scratch directory."""
+        return os.path.join(self.__workPath, fileName) if fileName else self.__workPath
+
+    def snapshot(self, filePath, fileName=None):
+        """Copy filePath into the scratch directory and return the path of the copy.
+
+        Later commit() calls targeting filePath check that it has not been replaced since.
+        """
+        snapPath = self.getPath(fileName if fileName else os.path.basename(filePath))
+        with _FileLock(self.__getLockPath(filePath)):
+            self.__snapshotD[os.path.realpath(filePath)] = self.__getIdentity(filePath)
+            shutil.copyfile(filePath, snapPath)
+        return snapPath
+
+    def publish(self, pathList, removeMissing=True):
+        """Install the input scratch files in the session directory under the same file names.
+
+        The session copy of a file the task did not produce is removed if removeMissing is set.
+        Returns the list of installed session file paths.
+        """
+        installedL = []
+        for filePath in pathList:
+            sessionFilePath = os.path.join(self.__sessionPath, os.path.basename(filePath))
+            if os.access(filePath, os.R_OK):
+                self.__install(filePath, sessionFilePath)
+                installedL.append(sessionFilePath)
+            elif removeMissing and os.access(sessionFilePath, os.F_OK):
+                os.remove(sessionFilePath)
+        return installedL
+
+    def publishDirectory(self, dirPath):
+        """Install the scratch directory dirPath in the session directory under the same name.
+
+        An existing session directory is replaced (by rename, the replaced directory is removed with
+        the scratch directory).  Returns the session directory path.
+        """
+        dirName = os.path.basename(os.path.normpath(dirPath))
+        sessionDirPath = os.path.join(self.__sessionPath, dirName)
+        with _FileLock(self.__getLockPath(sessionDirPath)):
+            if os.access(sessionDirPath, os.F_OK):
+                os.rename(sessionDirPath, self.getPath(".replaced-%s-%s" % (dirName, uuid.uuid4().hex[:8])))
+            os.rename(dirPath, sessionDirPath)
+        return sessionDirPath
+
+    def commit(self, resultPath, targetPath):
+        """Replace targetPath with resultPath and keep the replaced version in the version history.
+
+        Files below the scratch area (e.g. intermediate models of a task chain) are not versioned.
+
+        Returns False without changes if targetPath was replaced after its snapshot was taken.
+        """
+        if not os.access(resultPath, os.R_OK):
+            return False
+        with _FileLock(self.__getLockPath(targetPath)):
+            key = os.path.realpath(targetPath)
+            if key in self.__snapshotD and self.__getIdentity(targetPath) != self.__snapshotD[key]:
+                self.__lfh.write("+TaskWorkspace.commit() %s %s changed by another task since the snapshot - not updated\n" % (self.__taskName, targetPath))
+                return False
+            # Intermediate files in the scratch area of another task run are not kept
+            if os.access(targetPath, os.F_OK) and not key.startswith(os.path.realpath(os.path.join(self.__sessionPath, "task-scratch")) + os.sep):
+                self.__saveVersion(targetPath)
+            self.__install(resultPath, targetPath)
+            self.__snapshotD[key] = self.__getIdentity(targetPath)
+        if self.__verbose:
+            self.__lfh.write("+TaskWorkspace.commit() %s installed new version of %s\n" % (self.__taskName, targetPath))
+        return True
+
+    def close(self):
+        """Remove the scratch directory."""
+        shutil.rmtree(self.__workPath, ignore_errors=True)
+
+    def getVersionList(self, targetPath):
+        """Return the version history of targetPath (oldest first) - list of dictionaries with keys version, task, time and path."""
+        return TaskWorkspace.readVersionList(self.__sessionPath, targetPath)
+
+    @staticmethod
+    def readVersionList(sessionPath, targetPath):
+        try:
+            with open(TaskWorkspace.__getHistoryIndexPath(sessionPath, targetPath), "r") as ifh:
+                return json.load(ifh)
+        except (IOError, OSError, ValueError):
+            return []
+
+    @staticmethod
+    def restoreVersion(sessionPath, targetPath, version, log=sys.stderr):
+        """Reinstall a saved version of targetPath - the current file is saved in the history first."""
+        vD = {vD["version"]: vD for vD in TaskWorkspace.readVersionList(sessionPath, targetPath)}
+        if version not in vD or not os.access(vD[version]["path"], os.R_OK):
+            return False
+        with TaskWorkspace(sessionPath, "restore", "version-%s" % version, log=log) as ws:
+            return ws.commit(ws.snapshot(vD[version]["path"], os.path.basename(targetPath)), targetPath)
+
+    @staticmethod
+    def __getHistoryIndexPath(sessionPath, targetPath):
+        return os.path.join(sessionPath, "task-history", os.path.basename(targetPath) + "-versions.json")
+
+    def __saveVersion(self, targetPath):
+        """Move the current target into the version history (a link - the target is then replaced by rename)."""
+        try:
+            historyPath = os.path.join(self.__sessionPath, "task-history")
+            if not os.access(historyPath, os.F_OK):
+                os.makedirs(historyPath, 0o755)
+            vL = self.getVersionList(targetPath)
+            version = vL[-1]["version"] + 1 if vL else 1
+            versionPath = os.path.join(historyPath, "%s.%d" % (os.path.basename(targetPath), version))
+            if os.access(versionPath, os.F_OK):
+                os.remove(versionPath)
+            try:
+                os.link(targetPath, versionPath)
+            except OSError:
+                shutil.copyfile(targetPath, versionPath)
+            vL.append({"version": version, "task": self.__taskName, "time": time.time(), "path": versionPath})
+            while len(vL) > self.__maxVersions:
+                oD = vL.pop(0)
+                if os.access(oD["path"], os.F_OK):
+                    os.remove(oD["path"])
+            indexPath = self.__getHistoryIndexPath(self.__sessionPath, targetPath)
+            with open(indexPath + ".tmp", "w") as ofh:
+                json.dump(vL, ofh)
+            os.replace(indexPath + ".tmp", indexPath)
+        except:  # noqa: E722 pylint: disable=bare-except
+            self.__lfh.write("+TaskWorkspace.__saveVersion() saving version of %s failed\n" % targetPath)
+            traceback.print_exc(file=self.__lfh)
+
+    def __install(self, srcPath, dstPath):
+        tmpPath = os.path.join(os.path.dirname(dstPath), ".%s.%s.tmp" % (os.path.basename(dstPath), uuid.uuid4().hex[:8]))
+        shutil.copyfile(srcPath, tmpPath)
+        os.replace(tmpPath, dstPath)
+
+    def __getLockPath(self, filePath):
+        return os.path.join(self.__sessionPath, "task-scratch", os.path.basename(filePath) + ".lock")
+
+    def __getIdentity(self, filePath):
+        try:
+            st = os.stat(filePath)
+            return (st.st_ino, st.st_mtime, st.st_size)
+        except OSError:
+            return None
+
+
+class _FileLock(object):
+    """Exclusive lock on a lock file held for the duration of a with block."""
+
+    def __init__(self, lockPath):
+        self.__lockPath = lockPath
+        self.__fh = None
+
+    def __enter__(self):
+        self.__fh = open(self.__lockPath, "a")
+        fcntl.flock(self.__fh, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *args):
+        fcntl.flock(self.__fh, fcntl.LOCK_UN)
+        self.__fh.close()
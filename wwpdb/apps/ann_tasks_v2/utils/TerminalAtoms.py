@@ -4,6 +4,7 @@
 #
 # Update:
 # 28-Feb -2014  Add base class
+# 18-Oct -2026  Run in a private task workspace and commit the model update with a version history
 ##
 """
 Manage utility to remove or rename  terminal OXT atoms.
@@ -22,6 +23,7 @@ import traceback
 
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
 
 
 class TerminalAtoms(SessionWebDownloadUtils):
@@ -66,35 +68,29 @@ class TerminalAtoms(SessionWebDownloadUtils):
         """Run the calculation - updateOption = delete|rename"""
         try:
             inpPath = os.path.join(self.__sessionPath, inpFile)
-            logPath1 = os.path.join(self.__sessionPath, entryId + "-terminal-atoms.log")
-            retPath = os.path.join(self.__sessionPath, entryId + "_model-updated_P1.cif")
-            for filePath in (retPath, logPath1):
-                if os.access(filePath, os.R_OK):
-                    os.remove(filePath)
+            with TaskWorkspace(self.__sessionPath, entryId, "terminal-atoms", verbose=self.__verbose, log=self.__lfh) as ws:
+                logPath1 = ws.getPath(entryId + "-terminal-atoms.log")
+                retPath = ws.getPath(entryId + "_model-updated_P1.cif")
                 #
-            #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            dp.imp(inpPath)
-            dp.addInput(name="option", value=updateOption)
+                dp = RcsbDpUtility(tmpPath=ws.getPath(), siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
+                dp.imp(ws.snapshot(inpPath))
+                dp.addInput(name="option", value=updateOption)
 
-            dp.op("annot-update-terminal-atoms")
-            dp.expLog(logPath1)
-            dp.exp(retPath)
-            self.addDownloadPath(retPath)
-            self.addDownloadPath(logPath1)
-            if updateInput and os.access(retPath, os.R_OK):
-                dp.exp(inpPath)
-            #
-            self.__status = self.__checkStatus(logPath1)
+                dp.op("annot-update-terminal-atoms")
+                dp.expLog(logPath1)
+                dp.exp(retPath)
+                dp.cleanup()
+                for filePath in ws.publish([retPath, logPath1]):
+                    self.addDownloadPath(filePath)
+                ok = os.access(retPath, os.R_OK)
+                if updateInput and ok:
+                    ok = ws.commit(retPath, inpPath)
+                #
+                self.__status = self.__checkStatus(logPath1)
             if self.__verbose:
                 self.__lfh.write("+TerminalAtoms.run-  completed with status %s for entryId %s file %s\n" % (self.__status, entryId, inpPath))
             #
-            dp.cleanup()
-            if os.access(retPath, os.R_OK):
-                return True
-            else:
-                return False
-            #
+            return ok
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
             return False
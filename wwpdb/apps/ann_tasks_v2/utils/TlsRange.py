@@ -3,6 +3,7 @@
 # Date:  16-May-2018  Zukang Feng
 #
 # Update:
+#  18-Oct-2026  run in a private task workspace and commit the model update with a version history
 ##
 """
 Manage utility to correct TLS problems
@@ -21,6 +22,7 @@ import traceback
 
 from wwpdb.utils.dp.RcsbDpUtility import RcsbDpUtility
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
 
 
 class TlsRange(SessionWebDownloadUtils):
@@ -63,41 +65,46 @@ class TlsRange(SessionWebDownloadUtils):
         """Run the calculation"""
         try:
             inpPath = os.path.join(self.__sessionPath, inpFile)
-            logPath = os.path.join(self.__sessionPath, entryId + "-tls-range.log")
-            retPath = os.path.join(self.__sessionPath, entryId + "-tls-correction.cif")
-            for filePath in (retPath, logPath):
-                if os.access(filePath, os.R_OK):
-                    os.remove(filePath)
+            with TaskWorkspace(self.__sessionPath, entryId, "tls-range", verbose=self.__verbose, log=self.__lfh) as ws:
+                logPath = ws.getPath(entryId + "-tls-range.log")
+                retPath = ws.getPath(entryId + "-tls-correction.cif")
+                outPath = ws.getPath(entryId + "-tls-merged.cif")
+                snapPath = ws.snapshot(inpPath)
                 #
-            #
-            dp = RcsbDpUtility(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
-            #
-            dp.imp(inpPath)
-            dp.addInput(name="depfile", value=depFileName)
-            dp.op("annot-tls-range-correction")
-            dp.expLog(dstPath=logPath, appendMode=False)
-            dp.exp(retPath)
-            #
-            self.addDownloadPath(logPath)
-            #
-            if os.access(retPath, os.R_OK):
-                dp.imp(inpPath)
-                dp.addInput(name="tlsfile", value=retPath)
-                dp.op("annot-merge-tls-range-data")
-                dp.expLog(dstPath=logPath)
+                dp = RcsbDpUtility(tmpPath=ws.getPath(), siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
                 #
-                self.__status = self.__checkStatus(logPath)
-                if self.__status == "ok":
-                    dp.exp(inpPath)
-                    self.addDownloadPath(inpPath)
+                dp.imp(snapPath)
+                dp.addInput(name="depfile", value=depFileName)
+                dp.op("annot-tls-range-correction")
+                dp.expLog(dstPath=logPath, appendMode=False)
+                dp.exp(retPath)
+                #
+                if os.access(retPath, os.R_OK):
+                    dp.imp(snapPath)
+                    dp.addInput(name="tlsfile", value=retPath)
+                    dp.op("annot-merge-tls-range-data")
+                    dp.expLog(dstPath=logPath)
+                    #
+                    self.__status = self.__checkStatus(logPath)
+                    if self.__status == "ok":
+                        dp.exp(outPath)
+                        if ws.commit(outPath, inpPath):
+                            self.addDownloadPath(inpPath)
+                        else:
+                            self.__status = "error"
+                        #
+                    #
+                else:
+                    self.__status = "error"
+                #
+                dp.cleanup()
+                ws.publish([retPath])
+                for filePath in ws.publish([logPath]):
+                    self.addDownloadPath(filePath)
                 #
-            else:
-                self.__status = "error"
-            #
             if self.__verbose:
                 self.__lfh.write("+TlsRange.run-  completed with status %s for entryId %s file %s\n" % (self.__status, entryId, inpPath))
             #
-            dp.cleanup()
             return True
         except:  # noqa: E722 pylint: disable=bare-except
             traceback.print_exc(file=self.__lfh)
@@ -11,6 +11,8 @@
 # 14-July-2016 jdw add validation_mode="annotate" as an optional argument
 # 18-Dec-2016  ep Remove obsolete RunAlt and Run...
 # 30-Jun-2020  zk added validation-report-images output
+# 18-Oct-2026     reuse results of runAll() and CS remediation when inputs are unchanged from the previous run
+# 18-Oct-2026     include the validation and remediation program identity in the stage inputs
 ##
 """
 Manage invoking validation processing -
@@ -29,7 +31,9 @@ import traceback
 
 from wwpdb.utils.dp.ValidationWrapper import ValidationWrapper
 from wwpdb.io.locator.PathInfo import PathInfo
+from wwpdb.utils.config.ConfigInfoApp import ConfigInfoAppValidation
 from wwpdb.apps.ann_tasks_v2.utils.SessionWebDownloadUtils import SessionWebDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.StageManifest import StageManifest
 from wwpdb.apps.ann_tasks_v2.utils.NmrRemediationUtils import remediate_cs_file, starToPdbx
 
 
@@ -47,6 +51,7 @@ class Validate(SessionWebDownloadUtils):
         #
         self.__validateArgs = None
         self.__cleanup = False
+        self.__stageReport = []
         #
         self.__setup()
 
@@ -58,6 +63,18 @@ class Validate(SessionWebDownloadUtils):
     def setArguments(self, validateArgs):
         self.__validateArgs = validateArgs
 
+    def __getValidationToolIdentity(self, sm):
+        """Versions of the validation packages and the state of the validation support files."""
+        try:
+            toolsPath = ConfigInfoAppValidation(self.__siteId).get_validation_tools_path()
+        except Exception:  # pylint: disable=broad-except
+            toolsPath = None
+        return sm.getToolIdentity(packageNameList=["wwpdb.apps.validation", "wwpdb.utils.dp"], pathList=[toolsPath] if toolsPath else [])
+
+    def getStageReport(self):
+        """Return the list of (stage, action) of the last runAll() - action is 'run' or 'reused'."""
+        return self.__stageReport
+
     def run(self, entryId, modelInputFile=None, expInputFile=None, updateInput=True):
         """Old entry point. Believed not in use..."""
         ret = self.runAll(entryId, modelInputFile=modelInputFile, reflnInputFile=expInputFile, updateInput=updateInput)
@@ -76,11 +93,19 @@ class Validate(SessionWebDownloadUtils):
         updateInput=True,
         annotationContext=False,
         validation_mode="annotate",
+        reuse=True,
     ):  # pylint: disable=unused-argument
-        """Run the validation operation for all supported methods"""
+        """Run the validation operation for all supported methods
+
+        Unless reuse is False, the results of the previous run in this session are returned without running
+        the validation again if all inputs and arguments are unchanged and the previous results have not been
+        modified.  The stages run or reused are reported by getStageReport().
+        """
         uploadVersionOp = "none"
+        self.__stageReport = []
         try:
             pI = PathInfo(siteId=self.__siteId, sessionPath=self.__sessionPath, verbose=self.__verbose, log=self.__lfh)
+            sm = StageManifest(os.path.join(self.__sessionPath, entryId + "_val-report-manifest.json"), verbose=self.__verbose, log=self.__lfh)
             if modelInputFile is None:
                 modelFileName = pI.getFileName(entryId, contentType="model", formatType="pdbx", versionId=uploadVersionOp, partNumber="1")
                 inpPath = os.path.join(self.__sessionPath, modelFileName)
@@ -110,8 +135,14 @@ class Validate(SessionWebDownloadUtils):
             if nmrdata is False and os.access(csPath, os.R_OK):
                 tmpfile1 = csPath + ".str"
                 tmpfile2 = csPath + ".cif"
-                remediate_cs_file(csPath, tmpfile1)
-                starToPdbx(tmpfile1, tmpfile2)
+                csInputD = {"cs": sm.fingerprint(csPath), "tool": sm.getToolIdentity(packageNameList=["wwpdb.apps.ann_tasks_v2"])}
+                if reuse and sm.isCurrent("cs-remediation", csInputD):
+                    sm.report("cs-remediation", "reused")
+                else:
+                    remediate_cs_file(csPath, tmpfile1)
+                    starToPdbx(tmpfile1, tmpfile2)
+                    sm.record("cs-remediation", csInputD, [tmpfile2])
+                    sm.report("cs-remediation", "run")
                 csPath = tmpfile2
 
             if restraintInputFile is None:
@@ -159,6 +190,24 @@ class Validate(SessionWebDownloadUtils):
             resultFoPath = os.path.join(self.__sessionPath, fName)
             #
             logPath = os.path.join(self.__sessionPath, entryId + "_val-report.log")
+            resultPathList = [resultPdfPath, resultXmlPath, resultFullPdfPath, resultPngPath, resultSvgPath, resultImageTarPath, resultCifPath, resultFoPath, result2FoPath]
+            #
+            valInputD = {"entry_id": entryId, "model": sm.fingerprint(inpPath)}
+            for name, filePath in [("sf", sfPath), ("cs", csPath), ("nmr_restraint", resPath), ("vol", volPath), ("fsc", authorFscPath)]:
+                valInputD[name] = sm.fingerprint(filePath) if os.access(filePath, os.R_OK) else None
+            valInputD.update({"annotation_context": annotationContext, "validation_mode": validation_mode, "validate_arguments": self.__validateArgs})
+            valInputD["tool"] = self.__getValidationToolIdentity(sm)
+            if reuse and sm.isCurrent("validation", valInputD):
+                sm.report("validation", "reused")
+                for filePath in [resultFullPdfPath, resultPdfPath, resultXmlPath, resultPngPath, resultSvgPath, resultImageTarPath, resultCifPath, resultFoPath, result2FoPath, logPath]:
+                    self.addDownloadPath(filePath)
+                self.__stageReport = sm.getReport()
+                sm.save()
+                if self.__verbose:
+                    self.__lfh.write("+Validate.runAll-  inputs unchanged - reusing results of previous run for entryId %s\n" % entryId)
+                return True
+            sm.invalidate("validation")
+            sm.save()
             #
             dp = ValidationWrapper(tmpPath=self.__sessionPath, siteId=self.__siteId, verbose=self.__verbose, log=self.__lfh)
             dp.imp(inpPath)
@@ -197,7 +246,12 @@ class Validate(SessionWebDownloadUtils):
                 dp.addInput(name="validate_arguments", value=self.__validateArgs)
             dp.op("annot-wwpdb-validate-all-sf")
             dp.expLog(logPath)
-            dp.expList(dstPathList=[resultPdfPath, resultXmlPath, resultFullPdfPath, resultPngPath, resultSvgPath, resultImageTarPath, resultCifPath, resultFoPath, result2FoPath])
+            dp.expList(dstPathList=resultPathList)
+            if os.access(resultXmlPath, os.R_OK):
+                sm.record("validation", valInputD, resultPathList + [logPath])
+            sm.report("validation", "run")
+            self.__stageReport = sm.getReport()
+            sm.save()
 
             self.addDownloadPath(resultFullPdfPath)
             self.addDownloadPath(resultPdfPath)
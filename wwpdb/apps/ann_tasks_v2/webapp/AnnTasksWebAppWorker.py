@@ -13,6 +13,14 @@
 #   22-Jan-2024  zf  add _getCovalentBondContentOp() and _updateCovalentBondContentOp()
 #   09-Aug-2024  zf  add "/service/ann_tasks_v2/upload_biomt" and "/service/ann_tasks_v2/assemblyaccept" service
 #   10-Sep-2024  zf  add missingpcmstatus parameter based on PCM missing data csv file
+#   18-Oct-2026      add "/service/ann_tasks_v2/reportcategorypage" service
+#   18-Oct-2026      add "/service/ann_tasks_v2/job_submit|job_status|job_result|job_cancel" asynchronous job services
+#   18-Oct-2026      reuse the parsed validation XML summary in the chemical shift diagnostics page
+#   18-Oct-2026      read the assembly categories at launch through the request model context
+#   18-Oct-2026      add "/service/ann_tasks_v2/annotationtaskscalc" service to run the standard annotation calculations together
+#   18-Oct-2026      add "/service/ann_tasks_v2/assemblymodel" service returning assembly coordinate files made on demand
+#   18-Oct-2026      allow any service other than the job, session and file services to be submitted as a job
+#   18-Oct-2026      declare the assembly categories before the model file is read at launch
 #
 ##
 """
@@ -100,6 +108,7 @@ class AnnTasksWebAppWorker(CommonTasksWebAppWorker):
             "/service/ann_tasks_v2/assemblyrestart": "_assemblyRestartOp",
             "/service/ann_tasks_v2/assemblyview": "_assemblyViewOp",
             "/service/ann_tasks_v2/genassemblyview": "_genAssemblyViewOp",
+            "/service/ann_tasks_v2/assemblymodel": "_assemblyModelOp",
             "/service/ann_tasks_v2/assemblyselect": "_assemblySelectOp",
             # '/service/ann_tasks_v2/sitecalc': '_siteCalcOp',
             "/service/ann_tasks_v2/dictcheck": "_dictCheckOp",
@@ -128,6 +137,7 @@ class AnnTasksWebAppWorker(CommonTasksWebAppWorker):
             "/service/ann_tasks_v2/mergexyzcalc": "_mergeXyzCalcOp",
             "/service/ann_tasks_v2/terminalatomscalc": "_terminalAtomsCalcOp",
             "/service/ann_tasks_v2/geomvalidcalc": "_geometryValidationCalcOp",
+            "/service/ann_tasks_v2/annotationtaskscalc": "_annotationTasksCalcOp",
             "/service/ann_tasks_v2/getsessioninfo": "_getSessionInfoOp",
             "/service/ann_tasks_v2/start": "_launchOp",
             "/service/ann_tasks_v2/new_session/wf": "_launchOp",
@@ -152,6 +162,11 @@ class AnnTasksWebAppWorker(CommonTasksWebAppWorker):
             "/service/ann_tasks_v2/manualcseditorsave": "_saveCSEditorOp",
             "/service/ann_tasks_v2/manualcseditorupdate": "_updateCSEditorOp",
             "/service/ann_tasks_v2/checkreports": "_fetchAndReportIdOps",
+            "/service/ann_tasks_v2/reportcategorypage": "_reportCategoryPageOp",
+            "/service/ann_tasks_v2/job_submit": "_jobSubmitOp",
+            "/service/ann_tasks_v2/job_status": "_jobStatusOp",
+            "/service/ann_tasks_v2/job_result": "_jobResultOp",
+            "/service/ann_tasks_v2/job_cancel": "_jobCancelOp",
             "/service/ann_tasks_v2/update_reflection_file": "_updateRefelectionFileOp",
             "/service/ann_tasks_v2/list_em_maps": "_listEmMapsOp",
             "/service/ann_tasks_v2/edit_em_map_header": "_editEmMapHeaderOp",
@@ -164,6 +179,16 @@ class AnnTasksWebAppWorker(CommonTasksWebAppWorker):
         }
         self.addServices(self.__appPathD)
         #
+        #  Services which may be submitted through job_submit with jobservice=<service name> - all except the job
+        #  services themselves, session start and finish and services returning file content --
+        #
+        syncServiceList = ["newsession", "start", "new_session/wf", "finish", "assemblymodel"]
+        for path, methodName in self.__appPathD.items():
+            if path.startswith("/service/ann_tasks_v2/"):
+                serviceName = path[len("/service/ann_tasks_v2/") :]
+                if not serviceName.startswith("job_") and serviceName not in syncServiceList:
+                    self._asyncServiceD[serviceName] = methodName
+        #
         # self.__debug = False
         self.__doStatusUpdate = True
         if self._siteId in ["WWPDB_DEPLOY_MACOSX"]:
@@ -172,6 +197,9 @@ class AnnTasksWebAppWorker(CommonTasksWebAppWorker):
         self.__topPath = self._reqObj.getValue("TopPath")
         self.__templatePath = os.path.join(self.__topPath, "htdocs", "ann_tasks_v2")
         self._reqObj.setValue("TemplatePath", self.__templatePath)
+        #
+        # Categories read from the model file at launch -  the first three must be present for existing assembly information
+        self.__assemblyCategoryList = ["pdbx_struct_assembly", "pdbx_struct_assembly_gen", "pdbx_struct_oper_list", "pdbx_depui_status_flags"]
 
     def _launchOp(self):
         """Launch annotation tasks module interface
@@ -317,6 +345,7 @@ class AnnTasksWebAppWorker(CommonTasksWebAppWorker):
         auto_assembly_status = ""
         assembly_inferred = ""
         if bIsWorkflow:
+            self._getModelContext().require(os.path.join(self._sessionPath, entryFileName), self.__assemblyCategoryList)
             hasAssemblyInfo, assembly_inferred = self.__checkAssemblyInfo(os.path.join(self._sessionPath, entryFileName))
             if hasAssemblyInfo:
                 auto_assembly_status = "existed"
@@ -867,17 +896,25 @@ class AnnTasksWebAppWorker(CommonTasksWebAppWorker):
     def __checkAssemblyInfo(self, modelFile):
         """Check if model file already has assembly information"""
         if not os.access(modelFile, os.F_OK):
-            return False
+            return False, ""
         #
-        cifObj = mmCIFUtil(filePath=modelFile)
-        assemblyList = cifObj.GetValue("pdbx_struct_assembly")
-        genList = cifObj.GetValue("pdbx_struct_assembly_gen")
-        operList = cifObj.GetValue("pdbx_struct_oper_list")
-        assembly_inferred = cifObj.GetSingleValue("pdbx_depui_status_flags", "assembly_inferred")
-        if (len(assemblyList) > 0) and (len(genList) > 0) and (len(operList) > 0):
-            return True, assembly_inferred
+        container = self._getModelContext().getContainer(modelFile, self.__assemblyCategoryList)
+        if container is None:
+            return False, ""
+        #
+        hasRows = []
+        for catName in self.__assemblyCategoryList[:3]:
+            catObj = container.getObj(catName)
+            hasRows.append((catObj is not None) and any(v not in ("?", ".") for row in catObj for v in row))
+        #
+        assembly_inferred = ""
+        catObj = container.getObj("pdbx_depui_status_flags")
+        if catObj is not None:
+            assembly_inferred = catObj.getValueOrDefault("assembly_inferred", 0, "")
+            if assembly_inferred in ("?", "."):
+                assembly_inferred = ""
         #
-        return False, assembly_inferred
+        return all(hasRows), assembly_inferred
 
     def __getNmrDiagnosticsHtmlText(self, entryId):
         """Get diagnostics from validation xml and nmr-shift-error-report json files"""
@@ -921,7 +958,7 @@ class AnnTasksWebAppWorker(CommonTasksWebAppWorker):
                 htmlText += "<h2>Diagnostics from update of chemical shifts:</h2>"
                 htmlText += "<pre>" + diagText + "</pre>"
             #
-            validObj = ValidateXml(FileName=xmlFilePath)
+            validObj = ValidateXml(FileName=xmlFilePath, verbose=self._verbose, log=self._lfh, useCache=True)
             mappingErrorNumber = validObj.getCsMappingErrorNumber()
             notFoundCsList = validObj.getNotFoundInStructureCsList()
             #
@@ -26,6 +26,25 @@
 #  26-Aug-2024  zf   add copying PCM missing data csv file
 #  19-Sep-2024  zf   add "primaryMapOnly" parameter to __molstarDisplay() method
 #  07-Dec-2024  zf   add "nmr-cs-validation-report" and "ext_pdb_id" (value got from /py-mmcif_utils/mmcif_utils/pdbx/PdbxIo.py)
+#  18-Oct-2026       run _makeCheckReports() operations concurrently on a bounded TaskPool
+#  18-Oct-2026       add _reportCategoryPageOp() to serve row windows of paged tabular reports
+#  18-Oct-2026       optional lazy assembly coordinate generation in _assemblyCalcOp()
+#  18-Oct-2026       add asynchronous job submit/status/result/cancel operations
+#  18-Oct-2026       replace fixed sleep in detached form polling by a bounded wait on the semaphore with status/retry hints
+#  18-Oct-2026       _valReportOp() reuses unchanged validation results unless forcerun=yes
+#  18-Oct-2026       add _getModelContext() request scoped model file parsing with per request parse counts
+#  18-Oct-2026       _importFromWF() copies files concurrently and defers maps and assembly models (SessionImport)
+#  18-Oct-2026       add _annotationTasksCalcOp() to run the standard annotation calculations as a task graph
+#  18-Oct-2026       _mapDisplayOp() shows each local map set when available with the state of running calculations
+#  18-Oct-2026       render tabular check reports in row windows (_getReportRowLimit())
+#  18-Oct-2026       add _assemblyModelOp() to serve assembly coordinate files created on demand
+#  18-Oct-2026       report the progress of annotation task and check report operations run as jobs (_setProgress())
+#  18-Oct-2026       limit the wait of detached operation status requests by default and remove completed status records
+#  18-Oct-2026       declare the model categories read by a request before the first read (_makeCheckReports(requireModel=True))
+#  18-Oct-2026       copy files deferred at import only when the file itself is requested
+#  18-Oct-2026       report unknown calculation names in _annotationTasksCalcOp()
+#  18-Oct-2026       note local map calculations which completed without ligand maps in _mapDisplayOp()
+#  18-Oct-2026       render complete check report categories unless the site sets a row limit
 ##
 """
 Common  annotation tasks.
@@ -56,6 +75,7 @@ import glob
 
 # from json import loads, dumps
 import filecmp
+import fnmatch
 import inspect
 import logging
 import ntpath
@@ -63,10 +83,8 @@ import operator
 import os
 import shutil
 import sys
-import time
 import traceback
 
-from wwpdb.io.file.DataExchange import DataExchange
 from wwpdb.io.file.DataFile import DataFile
 from wwpdb.io.locator.PathInfo import PathInfo
 from wwpdb.utils.detach.DetachUtils import DetachUtils
@@ -87,7 +105,7 @@ from wwpdb.apps.ann_tasks_v2.assembly.AssemblySelect import AssemblySelect
 from wwpdb.apps.ann_tasks_v2.check.Check import Check
 from wwpdb.apps.ann_tasks_v2.check.XmlCheck import XmlCheck
 from wwpdb.apps.ann_tasks_v2.check.EmdXmlCheck import EmdXmlCheck
-from wwpdb.apps.ann_tasks_v2.check.EmMapCheck import EmMapCheck
+from wwpdb.apps.ann_tasks_v2.check.EmMapCheck import EmMapCheck, EmMapCheckTask
 from wwpdb.apps.ann_tasks_v2.check.ExtraCheck import ExtraCheck
 from wwpdb.apps.ann_tasks_v2.check.FormatCheck import FormatCheck
 from wwpdb.apps.ann_tasks_v2.check.GeometryCalc import GeometryCalc
@@ -109,6 +127,7 @@ from wwpdb.apps.ann_tasks_v2.em3d.EmEditUtils import EmEditUtils
 from wwpdb.apps.ann_tasks_v2.em3d.EmModelUtils import EmModelUtils
 from wwpdb.apps.ann_tasks_v2.em3d.EmUtils import EmUtils
 from wwpdb.apps.ann_tasks_v2.expIoUtils.PdbxExpUpdate import PdbxExpUpdate
+from wwpdb.apps.ann_tasks_v2.io.ModelContext import ModelContext
 from wwpdb.apps.ann_tasks_v2.link.Link import Link
 from wwpdb.apps.ann_tasks_v2.mapcalc.BisoFullCalc import BisoFullCalc
 from wwpdb.apps.ann_tasks_v2.mapcalc.DccCalc import DccCalc
@@ -133,15 +152,17 @@ from wwpdb.apps.ann_tasks_v2.secstruct.SecondaryStructure import SecondaryStruct
 from wwpdb.apps.ann_tasks_v2.site.Site import Site
 from wwpdb.apps.ann_tasks_v2.solvent.Solvent import Solvent
 
-#
-from mmcif.io.IoAdapterCore import IoAdapterCore
-
 #
 from wwpdb.apps.ann_tasks_v2.transformCoord.TransformCoord import TransformCoord
+from wwpdb.apps.ann_tasks_v2.utils.AnnotationTaskChain import AnnotationTaskChain
+from wwpdb.apps.ann_tasks_v2.utils.AsyncJobManager import AsyncJobManager, setJobProgress
+from wwpdb.apps.ann_tasks_v2.utils.DetachStatus import DetachStatus
 from wwpdb.apps.ann_tasks_v2.utils.MergeXyz import MergeXyz
 from wwpdb.apps.ann_tasks_v2.utils.PdbFile import PdbFile
 from wwpdb.apps.ann_tasks_v2.utils.PointSuite import PointSuite
 from wwpdb.apps.ann_tasks_v2.utils.SessionDownloadUtils import SessionDownloadUtils
+from wwpdb.apps.ann_tasks_v2.utils.SessionImport import SessionImport
+from wwpdb.apps.ann_tasks_v2.utils.TaskPool import TaskPool
 from wwpdb.apps.ann_tasks_v2.utils.TaskSessionState import TaskSessionState
 
 #
@@ -177,6 +198,27 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
         super(CommonTasksWebAppWorker, self).__init__(reqObj=reqObj, verbose=verbose, log=log)
         #
         self.__debug = False
+        #
+        # Operations which may be run as asynchronous jobs -  service name -> method name (set by subclasses)
+        self._asyncServiceD = {}
+        # Rows rendered for each category of a tabular report unless set by ANN_TASKS_REPORT_ROW_LIMIT
+        # Row windows are only used where the site enables them (the pager client is not available yet)
+        self.__defaultReportRowLimit = 0
+
+    def doOp(self):
+        rC = super(CommonTasksWebAppWorker, self).doOp()
+        if self._verbose:
+            mC = self._reqObj.getRawValue(ModelContext._requestKey)  # pylint: disable=protected-access
+            if mC is not None:
+                sD = mC.getStats()
+                self._lfh.write("+CommonTasksWebAppWorker.doOp() %s model file parses %d reuses %d\n" % (self._reqObj.getRequestPath(), sD["parses"], sD["hits"]))
+                for filePath, nParse in sD["files"].items():
+                    self._lfh.write("+CommonTasksWebAppWorker.doOp()    %3d parse(s) of %s\n" % (nParse, filePath))
+        return rC
+
+    def _getModelContext(self):
+        """Return the parsed model file context shared by all helpers serving this request (see ModelContext)."""
+        return ModelContext.fromRequest(self._reqObj, verbose=self._verbose, log=self._lfh)
 
     ################################################################################################################
     # ------------------------------------------------------------------------------------------------------------
@@ -255,6 +297,7 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
         entryId = self._reqObj.getValue("entryid")
         fileName = self._reqObj.getValue("entryfilename")
 
+        self._materializeImport(entryId, ["maps"], pathList=[os.path.join(self._sessionPath, entryId + "_map-2fofc_P1.map")])
         rModelPath = os.path.join(self._rltvSessionPath, fileName)
         rMapPath = os.path.join(self._rltvSessionPath, entryId + "_map-2fofc_P1.map")
 
@@ -285,7 +328,9 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
             self._saveSessionParameter(param="assembly_arguments", value=assemArgs, prefix=entryId)
 
         assemSessionName = "session-" + entryId
-        ok = assem.run(entryId, fileName, assemSessionName)
+        # Optionally defer assembly coordinate files until an assembly is viewed
+        lazyModels = self._reqObj.getValue("assemblylazymodels") == "yes"
+        ok = assem.run(entryId, fileName, assemSessionName, lazy=lazyModels)
 
         assem.setReportContext(entryId)
         aCount = assem.getAssemblyCount(entryId)
@@ -383,6 +428,23 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
         rC.setHtmlText(assem.getLaunchJmolHtml(assemblyId, entryId, generated=False))
         return rC
 
+    def _assemblyModelOp(self):
+        """Return the coordinate file for the specified assembly - lazily computed coordinates are made on first request."""
+        if self._verbose:
+            self._lfh.write("+CommonTasksWebAppWorker._assemblyModelOp() starting\n")
+        self._getSession(useContext=True)
+        #
+        assemblyId = self._reqObj.getValue("assemblyid")
+        entryId = self._reqObj.getValue("entryid")
+        if not assemblyId.isdigit():
+            rC = ResponseContent(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+            rC.setReturnFormat("json")
+            rC.setError(errMsg="Invalid assembly id %r" % assemblyId)
+            return rC
+        #
+        assem = AssemblySelect(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        return self.__makeDownloadResponse(assem.getAssemblyModelPath(entryId, assemblyId), attachmentFlag=False, compressFlag=False)
+
     def _genAssemblyViewOp(self):
         """Return the HTML to launch viewer applet for the specified assembly."""
         if self._verbose:
@@ -761,10 +823,11 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
             authorFscFile=authorFscName,
             restraintInputFile=pdbxResFile,
             annotationContext=True,
+            reuse=self._reqObj.getValue("forcerun") != "yes",
         )
 
         if self._verbose:
-            self._lfh.write("+CommonTasksWebAppWorker._valReportOp() status %r\n" % ok)
+            self._lfh.write("+CommonTasksWebAppWorker._valReportOp() status %r stages %r\n" % (ok, calc.getStageReport()))
         #
         tagL = calc.getAnchorTagList(label=None, target="_blank", cssClass="")
         #
@@ -1152,24 +1215,44 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
         #
         myD = {}
         sph = self._reqObj.getSemaphore()
-        delayValue = self._reqObj.getValue("delay")
         if sph:
-            if dU.semaphoreExists(sph):
+            myD = self.__waitForDetached(sph)
+            if myD is None:
                 myD = ccdEditorFormOp.getCCDForm()
-            else:
-                time.sleep(int(delayValue))
-                myD["statuscode"] = "running"
             #
         else:
             dU.set(workerObj=ccdEditorFormOp, workerMethod="run")
             dU.runDetach()
-            myD["statuscode"] = "running"
+            myD = self.__startDetached("running PCM CCD check")
         #
         rC = ResponseContent(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
         rC.setReturnFormat("json")
         rC.addDictionaryItems(myD)
         return rC
 
+    def __startDetached(self, stage):
+        """Record the start of the operation just detached by DetachUtils and return the initial polling response."""
+        DetachStatus.removeCompleted(self._sessionPath)
+        sph = self._reqObj.getSemaphore()
+        dS = DetachStatus(self._sessionPath, sph, verbose=self._verbose, log=self._lfh)
+        dS.setStage(stage, replace=False)
+        stD = dS.getStatus()
+        return {"statuscode": "running", "semaphore": sph, "stage": stD["stage"], "elapsed": "%.1f" % stD["elapsed"], "retryafter": "%.1f" % dS.getRetryAfter()}
+
+    def __waitForDetached(self, sph):
+        """Wait for the detached operation with semaphore sph - returns None once it has completed or the polling response.
+
+        The wait ends as soon as the semaphore is posted.  It is bounded by the client 'delay' and by the site setting
+        ANN_TASKS_MAX_POLL_WAIT (default DetachStatus._defaultMaxWait), so a request without a delay is answered
+        immediately and clients should poll again after 'retryafter' seconds.
+        """
+        dS = DetachStatus(self._sessionPath, sph, verbose=self._verbose, log=self._lfh)
+        if dS.waitFor(dS.getWaitTime(self._reqObj.getValue("delay"), maxWait=self._cI.get("ANN_TASKS_MAX_POLL_WAIT"))):
+            dS.clear()
+            return None
+        stD = dS.getStatus()
+        return {"statuscode": "running", "semaphore": sph, "stage": stD["stage"], "elapsed": "%.1f" % stD["elapsed"], "retryafter": "%.1f" % dS.getRetryAfter()}
+
     def _mergeXyzCalcOp(self):
         """ """
         if self._verbose:
@@ -1296,6 +1379,64 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
 
         return rC
 
+    def _annotationTasksCalcOp(self):
+        """Run the standard annotation calculations together -  calculations which do not conflict run concurrently.
+
+        Optional request values:  annotationtasks - comma separated list of calculation names (see AnnotationTaskChain),
+        terminalatomsoption - include terminal atom replacement with this update option (delete|rename).
+        """
+        if self._verbose:
+            self._lfh.write("+CommonTasksWebAppWorker._annotationTasksCalcOp() starting\n")
+
+        self._getSession(useContext=True)
+        fileName = self._reqObj.getValue("entryfilename")
+        entryId = self._reqObj.getValue("entryid")
+        taskNames = self._reqObj.getValue("annotationtasks")
+        terminalAtomsOption = self._reqObj.getValue("terminalatomsoption")
+        #
+        chain = AnnotationTaskChain(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        taskNameList = [name.strip() for name in taskNames.split(",") if name.strip()] if taskNames else chain.getTaskNameList()
+        taskArgD = {}
+        if terminalAtomsOption in ["delete", "rename"]:
+            taskArgD["terminal-atoms"] = terminalAtomsOption
+            if "terminal-atoms" not in taskNameList:
+                taskNameList.insert(0, "terminal-atoms")
+        #
+        unknownList = chain.getUnknownTaskNameList(taskNameList)
+        if unknownList:
+            rC = ResponseContent(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+            rC.setReturnFormat("json")
+            rC.setError(errMsg="Unknown annotation task name(s): %s" % ", ".join(unknownList))
+            return rC
+        #
+        ok, resultList = chain.run(entryId, fileName, taskNameList=taskNameList, taskArgD=taskArgD, progressFunc=self._setProgress)
+        if self._verbose:
+            self._lfh.write("+CommonTasksWebAppWorker._annotationTasksCalcOp() status %r\n" % ok)
+        #
+        rC = ResponseContent(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        rC.setReturnFormat("json")
+        timingL = []
+        for rD in resultList:
+            if rD["name"] == "total":
+                rC.set("annotationtaskstime", "%.1f" % rD["seconds"])
+                rC.set("annotationtaskscriticalpath", rD["criticalpath"])
+                rC.set("annotationtaskscriticalpathtime", "%.1f" % rD["criticalpathseconds"])
+                continue
+            #
+            taskOk = rD["ok"] and ok
+            tss = TaskSessionState(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+            tss.assign(name=rD["taskname"], formId=rD["formid"], args="", completionFlag=taskOk, tagList=rD["tags"], entryId=entryId, entryFileName=fileName)
+            tss.setTaskErrorFlag(not taskOk)
+            tss.setTaskStatusText("%s task %s in %.1f seconds." % (rD["taskname"], "completed" if taskOk else "failed", rD["seconds"]))
+            rC.set(tss.getFormId(), tss.get())
+            self._saveSessionParameter(param=tss.getFormId(), value=tss.get(), prefix=entryId)
+            timingL.append({"task": rD["name"], "status": "ok" if taskOk else "failed", "start": "%.1f" % rD["start"], "seconds": "%.1f" % rD["seconds"], "after": rD["after"]})
+        #
+        rC.set("annotationtasks", timingL)
+        if not ok:
+            rC.setError(errMsg="Annotation task calculations failed or the model file was changed during the calculations.")
+        return rC
+
     def _setSessionInfoWf(self, entryId, entryFileName):
         if self._verbose:
             self._lfh.write("\n\n+CommonTasksWebAppWorker._setSessionInfoWf() entryId %s entryFileName %s\n" % (entryId, entryFileName))
@@ -1408,11 +1549,11 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
                     val = tss.get()
                 rC.set(key, val)
             #
-            # get files --
+            # get files -- (including those deferred at import which are copied on first access)
             # ---
             fpattern = self._sessionPath + "/" + entryId + "_assembly-model-xyz_*"
             pthList = []
-            pthList = glob.glob(fpattern)
+            pthList = sorted(set(glob.glob(fpattern)) | set(pth for pth in self._getPendingImportList(entryId, ["assembly-models"]) if fnmatch.fnmatch(pth, fpattern)))
             fList = []
             for pth in pthList:
                 (_dirp, fileName) = os.path.split(pth)
@@ -1553,10 +1694,10 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
 
             rC.set("valreportfiles", tlist + olist)
 
-            # Map files
+            # Map files -- (including those deferred at import which are copied on first access)
             fpattern = self._sessionPath + "/" + entryId + "_map-*"
             pthList = []
-            pthList = glob.glob(fpattern)
+            pthList = sorted(set(glob.glob(fpattern)) | set(pth for pth in self._getPendingImportList(entryId, ["maps"]) if fnmatch.fnmatch(pth, fpattern)))
             #
             fList = []
             mapDisplayFlag = False
@@ -1622,92 +1763,35 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
         return rC
 
     def _importFromWF(self, identifier, fileSource="wf-archive", instanceWf="", getMaps=False):
-        """Import annotation data files from the input workflow storage into this annotation session"""
-        #
-        de = DataExchange(reqObj=self._reqObj, depDataSetId=identifier, wfInstanceId=instanceWf, fileSource=fileSource, verbose=self._verbose, log=self._lfh)
-        #
-        # model file -
-        #
-        pth = de.copyToSession(contentType="model", formatType="pdbx", version="latest", partitionNumber=1)
-        #
-        if pth is None:
-            return False
-        #
-        # assembly report file and assignment
-        #
-        pth = de.copyToSession(contentType="assembly-report", formatType="xml", version="latest", partitionNumber=1)
-        pth = de.copyToSession(contentType="assembly-assign", formatType="txt", version="latest", partitionNumber=1)
+        """Import annotation data files from the input workflow storage into this annotation session
 
-        # assembly model files
-        #
-        for ii in range(1, 50):
-            pth = de.copyToSession(contentType="assembly-model-xyz", formatType="pdbx", version="latest", partitionNumber=ii)
-            if pth is None:
-                break
-        #
-        pth = de.copyToSession(contentType="site-assign", formatType="pdbx", version="latest", partitionNumber=1)
-        #
-        # Validation files
-        #
-        pth = de.copyToSession(contentType="validation-report", formatType="pdf", version="latest", partitionNumber=1)
-        pth = de.copyToSession(contentType="validation-report-full", formatType="pdf", version="latest", partitionNumber=1)
-        pth = de.copyToSession(contentType="validation-report-slider", formatType="svg", version="latest", partitionNumber=1)
-        pth = de.copyToSession(contentType="validation-data", formatType="xml", version="latest", partitionNumber=1)
-        pth = de.copyToSession(contentType="validation-data", formatType="pdbx", version="latest", partitionNumber=1)
-        pth = de.copyToSession(contentType="validation-report-2fo-map-coef", formatType="pdbx", version="latest", partitionNumber=1)
-        pth = de.copyToSession(contentType="validation-report-fo-map-coef", formatType="pdbx", version="latest", partitionNumber=1)
-        #
-        # dictionary check file
-        #
-        pth = de.copyToSession(contentType="dict-check-report", formatType="txt", version="latest", partitionNumber=1)
-        #
-        # PDBML XML check file
-        #
-        pth = de.copyToSession(contentType="xml-check-report", formatType="txt", version="latest", partitionNumber=1)
-        #
-        # PCM missing data csv file
-        #
-        pth = de.copyToSession(contentType="pcm-missing-data", formatType="csv", version="latest", partitionNumber=1)
-        #
-        #  Handle maps if input option is set --
-        #
-        if getMaps:
-            pth = de.copyToSession(contentType="map-2fofc", formatType="map", version="latest", partitionNumber=1)
-            pth = de.copyToSession(contentType="map-fofc", formatType="map", version="latest", partitionNumber=1)
-            pth = de.copyToSession(contentType="map-omit-2fofc", formatType="map", version="latest", partitionNumber=1)
-            pth = de.copyToSession(contentType="map-omit-fofc", formatType="map", version="latest", partitionNumber=1)
-            de.copyDirToSession(dirName="np-cc-maps")
-            de.copyDirToSession(dirName="np-cc-omit-maps")
-        #
-        # SF file
-        #
-        pth = de.copyToSession(contentType="structure-factors", formatType="pdbx", version="latest", partitionNumber=1)
-        #
-        if pth is None:
-            deArchive = DataExchange(reqObj=self._reqObj, depDataSetId=identifier, wfInstanceId=instanceWf, fileSource="archive", verbose=self._verbose, log=self._lfh)
-            pth = deArchive.copyToSession(contentType="structure-factors", formatType="pdbx", version="latest", partitionNumber=1)
+        Maps, local map directories and assembly model files are copied on first use (see _materializeImport()).
+        """
+        sI = SessionImport(self._reqObj, identifier, verbose=self._verbose, log=self._lfh)
+        return sI.importFiles(fileSource=fileSource, instanceWf=instanceWf, getMaps=getMaps)
 
-        # CS file (PDBx)
-        #
-        pth = de.copyToSession(contentType="nmr-chemical-shifts", formatType="pdbx", version="latest", partitionNumber=1)
-        if pth is None:
-            deArchive = DataExchange(reqObj=self._reqObj, depDataSetId=identifier, wfInstanceId=None, fileSource="archive", verbose=self._verbose, log=self._lfh)
-            pth = deArchive.copyToSession(contentType="nmr-chemical-shifts", formatType="pdbx", version="latest", partitionNumber=1)
-        #
-        # NEF file (nmr-star)
-        #
-        pth = de.copyToSession(contentType="nmr-data-str", formatType="pdbx", version="latest", partitionNumber=1)
-        if pth is None:
-            deArchive = DataExchange(reqObj=self._reqObj, depDataSetId=identifier, wfInstanceId=None, fileSource="archive", verbose=self._verbose, log=self._lfh)
-            pth = deArchive.copyToSession(contentType="nmr-data-str", formatType="pdbx", version="latest", partitionNumber=1)
-        #
-        pth = de.copyToSession(contentType="nmr-shift-error-report", formatType="json", version="latest", partitionNumber=1)
-        pth = de.copyToSession(contentType="nmr-data-error-report", formatType="json", version="latest", partitionNumber=1)
+    def _materializeImport(self, entryId, groupList=None, pathList=None):
+        """Copy files deferred by _importFromWF() in the input groups ('maps', 'np-cc-maps', 'assembly-models') into the session.
 
-        # fsc file (xml)
-        #
-        pth = de.copyToSession(contentType="fsc", formatType="xml", version="latest", partitionNumber=1)
-        return True
+        If pathList is given only the deferred files with these session paths are copied.
+        """
+        if not entryId:
+            return []
+        try:
+            return SessionImport(self._reqObj, entryId, verbose=self._verbose, log=self._lfh).materialize(groupList, pathList=pathList)
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self._lfh)
+            return []
+
+    def _getPendingImportList(self, entryId, groupList=None):
+        """Return the session paths of files deferred by _importFromWF() which have not been copied yet."""
+        if not entryId:
+            return []
+        try:
+            return SessionImport(self._reqObj, entryId, verbose=self._verbose, log=self._lfh).getPendingList(groupList)
+        except:  # noqa: E722 pylint: disable=bare-except
+            traceback.print_exc(file=self._lfh)
+            return []
 
     # def _viewOp(self):
     #     """Call to display data for given chem component in comparison grid of standalone version of chem comp module.
@@ -1816,13 +1900,10 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
         #
         myD = {}
         sph = self._reqObj.getSemaphore()
-        delayValue = self._reqObj.getValue("delay")
         if sph:
-            if dU.semaphoreExists(sph):
+            myD = self.__waitForDetached(sph)
+            if myD is None:
                 myD = coordEditorFormOp.get()
-            else:
-                time.sleep(int(delayValue))
-                myD["statuscode"] = "running"
             #
         else:
             entryId = self._reqObj.getValue("entryid")
@@ -1830,7 +1911,7 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
             if (identifier == entryId) or identifier.startswith("chain_"):
                 dU.set(workerObj=coordEditorFormOp, workerMethod="run")
                 dU.runDetach()
-                myD["statuscode"] = "running"
+                myD = self.__startDetached("generating coordinate data")
             else:
                 myD = coordEditorFormOp.get()
             #
@@ -2026,14 +2107,16 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
         #
         return bSuccess
 
+    # Model file categories read for the Mol* map display
+    _molstarCategoryList = ["em_map"]
+
     def __molstarDisplay(self, entryId, fileSource="archive", instance=None, primaryMapOnly=False):
         du = SessionDownloadUtils(self._reqObj, verbose=self._verbose, log=self._lfh)
         molDisDict = {}
         # map display in binary cif
         # list of em file types to find
         ok = du.getFilePath(entryId)
-        ioObj = IoAdapterCore(verbose=self._verbose, log=self._lfh)
-        dIn = ioObj.readFile(inputFilePath=ok, selectList=["em_map"])
+        dIn = self._getModelContext().getContainerList(ok, self._molstarCategoryList) if ok else []
         # initiate data_files with map-xray to be appended with em files
         data_files = [("map-xray", "bcif", "1")]
         if dIn and len(dIn) != 0:
@@ -2119,11 +2202,137 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
         rC.setHtmlText(json.dumps(molstarDisplayDict.get("molStar-maps", [])))
         return rC
 
+    def _reportCategoryPageOp(self):
+        """Return a further window of rows for a paged category of a tabular report (see PdbxReport.makeCategoryPage())."""
+        self._getSession(useContext=True)
+        fileName = self._reqObj.getValue("reportfilename")
+        contentType = self._reqObj.getValue("contenttype")
+        catName = self._reqObj.getValue("category")
+        rC = ResponseContent(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        rC.setReturnFormat("json")
+        try:
+            offset = int(self._reqObj.getValue("offset"))
+            limit = min(int(self._reqObj.getValue("limit")), 5000)
+        except ValueError:
+            rC.setError(errMsg="Invalid row offset or limit")
+            return rC
+        #
+        pR = PdbxReport(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        pD = pR.makeCategoryPage(fileName, contentType, catName, offset=offset, limit=limit)
+        if pD is None:
+            rC.setError(errMsg="No report content for %s category %s" % (fileName, catName))
+        else:
+            rC.set("rowhtml", "\n".join(pD["html"]))
+            rC.set("offset", pD["offset"])
+            rC.set("total", pD["total"])
+            rC.setStatus(statusMsg="Rows %d of %d" % (pD["offset"], pD["total"]))
+        return rC
+
+    def __getJobManager(self):
+        return AsyncJobManager(self._sessionPath, maxJobs=self._cI.get("ANN_TASKS_MAX_ASYNC_JOBS"), verbose=self._verbose, log=self._lfh)
+
+    def __setJobLog(self, log):
+        self._lfh = log
+
+    def _setProgress(self, progress):
+        """Report the progress of a long running operation - shown by _jobStatusOp() when the operation is run as a job."""
+        if self._verbose:
+            self._lfh.write("+CommonTasksWebAppWorker._setProgress() %s\n" % progress)
+        setJobProgress(progress)
+
+    def _jobSubmitOp(self):
+        """Run the operation named by 'jobservice' as an asynchronous job and return the job identifier.
+
+        The response of the operation is retrieved with _jobResultOp() once _jobStatusOp() reports completion.
+        """
+        self._getSession(useContext=True)
+        serviceName = self._reqObj.getValue("jobservice")
+        rC = ResponseContent(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        rC.setReturnFormat("json")
+        if serviceName not in self._asyncServiceD:
+            rC.setError(errMsg="Operation %s cannot be run as a job" % serviceName)
+            return rC
+        methodName = self._asyncServiceD[serviceName]
+        if self._verbose:
+            self._lfh.write("+CommonTasksWebAppWorker._jobSubmitOp() submitting %s (%s)\n" % (serviceName, methodName))
+        #
+        jobId = self.__getJobManager().submit(lambda: getattr(self, methodName)().get(), jobName=serviceName, setLogFunc=self.__setJobLog)
+        if jobId is None:
+            rC.setError(errMsg="Job submission failed for %s" % serviceName)
+        else:
+            rC.set("jobid", jobId)
+            rC.set("statuscode", "queued")
+            rC.setStatus(statusMsg="Job submitted")
+        return rC
+
+    def _jobStatusOp(self):
+        """Return the status, progress text and elapsed time of a job."""
+        self._getSession()
+        jobId = self._reqObj.getValue("jobid")
+        rC = ResponseContent(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        rC.setReturnFormat("json")
+        rD = self.__getJobManager().getStatus(jobId) if jobId else None
+        if rD is None:
+            rC.setError(errMsg="Unknown job %s" % jobId)
+            return rC
+        rC.set("jobid", jobId)
+        rC.set("statuscode", rD["status"])
+        rC.set("progress", rD["progress"])
+        rC.set("elapsed", "%.1f" % rD["elapsed"])
+        rC.setStatus(statusMsg=rD["progress"])
+        return rC
+
+    def _jobResultOp(self):
+        """Return the response of a completed job as it would have been returned by the synchronous operation."""
+        self._getSession()
+        jobId = self._reqObj.getValue("jobid")
+        jM = self.__getJobManager()
+        rD = jM.getStatus(jobId) if jobId else None
+        if rD is not None and rD["status"] == "completed":
+            resultD = jM.getResult(jobId)
+            if resultD is not None:
+                return _JobResponseContent(resultD, reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        rC = ResponseContent(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        rC.setReturnFormat("json")
+        if rD is None:
+            rC.setError(errMsg="Unknown job %s" % jobId)
+        else:
+            rC.set("jobid", jobId)
+            rC.set("statuscode", rD["status"])
+            rC.setError(errMsg="Job %s has no result (%s)" % (jobId, rD["progress"]))
+        return rC
+
+    def _jobCancelOp(self):
+        """Cancel a queued or running job."""
+        self._getSession()
+        jobId = self._reqObj.getValue("jobid")
+        rC = ResponseContent(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        rC.setReturnFormat("json")
+        if jobId and self.__getJobManager().cancel(jobId):
+            rC.set("jobid", jobId)
+            rC.set("statuscode", "cancelled")
+            rC.setStatus(statusMsg="Job cancelled")
+        else:
+            rC.setError(errMsg="Job %s is not active" % jobId)
+        return rC
+
+    def _getReportRowLimit(self):
+        """Maximum number of rows rendered for a category of a tabular report - further rows are served by
+        _reportCategoryPageOp().  Set by the site setting ANN_TASKS_REPORT_ROW_LIMIT (default 0 for no limit).
+        """
+        try:
+            rowLimit = self._cI.get("ANN_TASKS_REPORT_ROW_LIMIT")
+            rowLimit = int(rowLimit) if rowLimit is not None else self.__defaultReportRowLimit
+        except (TypeError, ValueError):
+            rowLimit = self.__defaultReportRowLimit
+        return rowLimit if rowLimit > 0 else None
+
     def _renderCheckReports(self, entryId, fileSource="archive", instance=None, contentTypeList=None, useModelFileVersion=True):
         """Prepare HTML rendered reports for existing check report content for input Id code and fileSource.
 
              Rendered content is returned in a dictionary with the following content keys plus a tag list
-             of the data files containing the report data for each content type.
+             of the data files containing the report data for each content type.  Large categories of the
+             tabular reports are rendered in windows of rows if the site sets a row limit (see _getReportRowLimit()).
 
         Content types --
 
@@ -2148,6 +2357,7 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
         if contentTypeList is None:
             contentTypeList = []
         layout = "multiaccordion"
+        rowLimit = self._getReportRowLimit()
         #
         myD = {}
         for ky in [
@@ -2194,7 +2404,7 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
                 if ok:
                     downloadPath = du.getDownloadPath()
                     aTagList.append(du.getAnchorTag())
-                    myD[cT] = "\n".join(pR.makeTabularReport(filePath=downloadPath, contentType="model", idCode=entryId, layout=layout))
+                    myD[cT] = "\n".join(pR.makeTabularReport(filePath=downloadPath, contentType="model", idCode=entryId, layout=layout, rowLimit=rowLimit))
 
                     downloadWebPath = du.getWebPath()
                     myD["model-session"] = downloadWebPath
@@ -2222,7 +2432,7 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
                 if ok:
                     downloadPath = du.getDownloadPath()
                     aTagList.append(du.getAnchorTag())
-                    myD[cT] = "\n".join(pR.makeTabularReport(filePath=downloadPath, contentType="dcc-report", idCode=entryId, layout=layout))
+                    myD[cT] = "\n".join(pR.makeTabularReport(filePath=downloadPath, contentType="dcc-report", idCode=entryId, layout=layout, rowLimit=rowLimit))
 
                 else:
                     # myD[cT] = self.__getMessageTextWithMarkup('No X-ray experimental data check report.')
@@ -2233,7 +2443,7 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
                 if ok:
                     downloadPath = du.getDownloadPath()
                     aTagList.append(du.getAnchorTag())
-                    myD[cT] = "\n".join(pR.makeTabularReport(filePath=downloadPath, contentType="geometry-check-report", idCode=entryId, layout=layout))
+                    myD[cT] = "\n".join(pR.makeTabularReport(filePath=downloadPath, contentType="geometry-check-report", idCode=entryId, layout=layout, rowLimit=rowLimit))
                 else:
                     # myD[cT] = self.__getMessageTextWithMarkup('No geometry issues.')
                     myD[cT] = self.__getMessageTextWithMarkup("")
@@ -2243,7 +2453,7 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
                 if ok:
                     downloadPath = du.getDownloadPath()
                     aTagList.append(du.getAnchorTag())
-                    myD[cT] = "\n".join(pR.makeTabularReport(filePath=downloadPath, contentType="links-report", idCode=entryId, layout=layout))
+                    myD[cT] = "\n".join(pR.makeTabularReport(filePath=downloadPath, contentType="links-report", idCode=entryId, layout=layout, rowLimit=rowLimit))
                 else:
                     myD[cT] = self.__getMessageTextWithMarkup("")
             elif cT == "misc-check-report":
@@ -2363,7 +2573,7 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
                     ok = True
                 if ok:
                     aTagList.append(du.getAnchorTag())
-                    myD[cT] = "\n".join(pR.makeTabularReport(filePath=downloadPath, contentType="em-map-info-report", idCode=entryId, layout=layout))
+                    myD[cT] = "\n".join(pR.makeTabularReport(filePath=downloadPath, contentType="em-map-info-report", idCode=entryId, layout=layout, rowLimit=rowLimit))
                 else:
                     myD[cT] = self.__getMessageTextWithMarkup("None")
             elif cT == "downloads":
@@ -2464,11 +2674,17 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
         #
         return myD
 
-    def _makeCheckReports(self, entryIdList, fileSource="wf-archive", operationList=None, useFileVersions=True):
+    def _makeCheckReports(self, entryIdList, fileSource="wf-archive", operationList=None, useFileVersions=True, maxWorkers=None, timeout=None, requireModel=False):
         """Create reports from the input operation list, using data files from the input fileSource.
              Copy reports to the session download directory (e.g. output file source = 'session-download')
              and return a list of html anchors tags for the report files.
 
+             Checks are run concurrently on at most maxWorkers threads (default number of cores).  A check
+             taking longer than timeout seconds is not waited for and produces no report link.
+
+             Set requireModel if the complete model file is read later in the request (e.g. rendered by
+             _renderCheckReports()) so the checks share the same parse of the file.
+
         Content type list --
 
         'dict-check-report'           :  (['txt'], 'dict-check-report'),
@@ -2497,160 +2713,161 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
         formatType = "pdbx"
 
         self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() starting ops %s \n" % operationList)
-
+        #
+        # Checks on one entry are independent external tool runs (except checkxml which consumes the
+        # archive_next conversion made by checkNext) - fan them out over all entries on a bounded pool.
+        # Files are copied to the download area afterwards in entry/operation order so the returned
+        # anchor tag list is the same as for a serial run.
+        #
+        tP = TaskPool(maxWorkers=maxWorkers, timeout=timeout, verbose=self._verbose, log=self._lfh)
         for entryId in entryIdList:
             ok = duL.fetchId(entryId, "model", formatType=formatType, fileSource=fileSource, versionId=versionId)
             if not ok:
                 continue
 
             modelFilePath = duL.getDownloadPath()
-            if "cif2pdb" in operationList:
-                chk = PdbFile(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
-                ok = chk.runAlt(entryId=entryId, inpPath=modelFilePath)
-                if ok:
-                    pdbPath = chk.getPdbFilePath()
-                    duL.copyToDownload(pdbPath)
-                    aTagList.append(duL.getAnchorTag())
-
-            if "checkv5" in operationList:
-                chk = Check(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
-                chk.setDictionaryVersion(version="V5")
-                # Internal model file - check first block only
-                chk.setCheckFirstBlock(True)
-
-                chk.run(entryId=entryId, inpPath=modelFilePath)
-                rptPath = chk.getReportPath()
-                hasDiags = chk.getReportSize() > 0
-                if hasDiags:
-                    duL.copyToDownload(rptPath)
-                    aTagList.append(duL.getAnchorTag())
+            if requireModel:
+                self._getModelContext().require(modelFilePath)
+            elif "check-em-map" in operationList:
+                self._getModelContext().require(modelFilePath, EmMapCheckTask.modelCategoryList)
+            expFilePath = None
+            if "check-sf" in operationList:
+                ok = duL.fetchId(entryId, contentType="structure-factors", formatType="pdbx", fileSource=fileSource, versionId=versionId)
+                expFilePath = duL.getDownloadPath()
+            #
+            for op in self.__checkOpOrder:
+                if op not in operationList:
+                    continue
+                if op == "checkxml" and "checkNext" in operationList:
+                    # run in sequence with checkNext -
+                    continue
+                if op == "checkNext" and "checkxml" in operationList:
+                    tP.add((entryId, op), self.__runCheckOpSequence, ["checkNext", "checkxml"], entryId, modelFilePath, expFilePath)
                 else:
-                    duL.removeFromDownload(rptPath)
+                    tP.add((entryId, op), self.__runCheckOpSequence, [op], entryId, modelFilePath, expFilePath)
 
-            if "checkv4" in operationList:
-                chk = Check(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
-                chk.setDictionaryVersion(version="V4")
-                chk.run(entryId=entryId, inpPath=modelFilePath)
-                rptPath = chk.getReportPath()
-                hasDiags = chk.getReportSize() > 0
-                if hasDiags:
+        for (entryId, op), ok, resultL in tP.run():
+            if not ok:
+                self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() %s %s did not complete\n" % (entryId, op))
+                continue
+            for rptPath, copyFlag in resultL:
+                if rptPath is None:
+                    continue
+                if copyFlag:
                     duL.copyToDownload(rptPath)
                     aTagList.append(duL.getAnchorTag())
                 else:
                     duL.removeFromDownload(rptPath)
 
-            if "checkNext" in operationList:
-                self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() starting checkNext\n")
+        if self._verbose:
+            self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() task timings %r\n" % tP.getTimings())
+        self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() complete\n")
+
+        return aTagList
+
+    # Operation order for _makeCheckReports() - this is also the order of the returned anchor tags
+    __checkOpOrder = [
+        "cif2pdb",
+        "checkv5",
+        "checkv4",
+        "checkNext",
+        "checkxml",
+        "check-format",
+        "check-misc",
+        "check-geometry",
+        "check-special-position",
+        "check-emd-xml",
+        "check-em-map",
+        "check-sf",
+    ]
+
+    def __runCheckOpSequence(self, opList, entryId, modelFilePath, expFilePath):
+        """Run the input check operations in order - returns list of (report path, copy flag) -
+
+        copy flag True means the report should be copied to the download area, False that
+        any previous copy should be removed.
+        """
+        rL = []
+        for op in opList:
+            rL.extend(self.__runCheckOp(op, entryId, modelFilePath, expFilePath))
+        return rL
+
+    def __runCheckOp(self, op, entryId, modelFilePath, expFilePath):
+        """Run a single check operation for _makeCheckReports() -"""
+        if op == "cif2pdb":
+            chk = PdbFile(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+            ok = chk.runAlt(entryId=entryId, inpPath=modelFilePath)
+            if ok:
+                return [(chk.getPdbFilePath(), True)]
+            return []
 
-                chk = Check(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        if op in ["checkv5", "checkv4", "checkNext"]:
+            chk = Check(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+            if op == "checkv5":
+                chk.setDictionaryVersion(version="V5")
+                # Internal model file - check first block only
+                chk.setCheckFirstBlock(True)
+            elif op == "checkv4":
+                chk.setDictionaryVersion(version="V4")
+            else:
+                self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() starting checkNext\n")
                 # Public check - should have first block only
                 chk.setDictionaryVersion(version="archive_next")
-                chk.run(entryId=entryId, inpPath=modelFilePath)
-                rptPath = chk.getReportPath()
-                hasDiags = chk.getReportSize() > 0
-                if hasDiags:
-                    duL.copyToDownload(rptPath)
-                    aTagList.append(duL.getAnchorTag())
-                else:
-                    duL.removeFromDownload(rptPath)
+            chk.run(entryId=entryId, inpPath=modelFilePath)
+            return [(chk.getReportPath(), chk.getReportSize() > 0)]
 
-            if "checkxml" in operationList:
-                self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() starting checkxml\n")
+        if op == "checkxml":
+            self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() starting checkxml\n")
 
-                xchk = XmlCheck(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
-                pdbxPath = os.path.join(self._sessionPath, entryId + "_model-next_P1.cif")
-                if os.access(pdbxPath, os.R_OK):
-                    self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() starting checkxml using %s\n" % pdbxPath)
-                    xchk.run(entryId=entryId, inpPath=pdbxPath, publicCIFlag=True)
-                else:
-                    self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() starting checkxml using %s\n" % modelFilePath)
-                    xchk.run(entryId=entryId, inpPath=modelFilePath, publicCIFlag=False)
-                #
-                rptPath = xchk.getReportPath()
-                hasDiags = xchk.getReportSize() > 0
-                if hasDiags:
-                    duL.copyToDownload(rptPath)
-                    aTagList.append(duL.getAnchorTag())
-                else:
-                    duL.removeFromDownload(rptPath)
+            xchk = XmlCheck(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+            pdbxPath = os.path.join(self._sessionPath, entryId + "_model-next_P1.cif")
+            if os.access(pdbxPath, os.R_OK):
+                self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() starting checkxml using %s\n" % pdbxPath)
+                xchk.run(entryId=entryId, inpPath=pdbxPath, publicCIFlag=True)
+            else:
+                self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() starting checkxml using %s\n" % modelFilePath)
+                xchk.run(entryId=entryId, inpPath=modelFilePath, publicCIFlag=False)
+            #
+            return [(xchk.getReportPath(), xchk.getReportSize() > 0)]
 
-            if "check-format" in operationList:
+        if op in ["check-format", "check-misc", "check-geometry"]:
+            if op == "check-format":
                 chk = FormatCheck(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
-                chk.run(entryId=entryId, inpPath=modelFilePath)
-                hasDiags = chk.getReportSize() > 0
-                if hasDiags:
-                    rptPath = chk.getReportPath()
-                    duL.copyToDownload(rptPath)
-                    aTagList.append(duL.getAnchorTag())
-
-            if "check-misc" in operationList:
+            elif op == "check-misc":
                 chk = ExtraCheck(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
-                chk.run(entryId=entryId, inpPath=modelFilePath)
-                hasDiags = chk.getReportSize() > 0
-                if hasDiags:
-                    rptPath = chk.getReportPath()
-                    duL.copyToDownload(rptPath)
-                    aTagList.append(duL.getAnchorTag())
-
-            if "check-geometry" in operationList:
+            else:
                 chk = GeometryCheck(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
-                chk.run(entryId=entryId, inpPath=modelFilePath)
-                hasDiags = chk.getReportSize() > 0
-                if hasDiags:
-                    rptPath = chk.getReportPath()
-                    duL.copyToDownload(rptPath)
-                    aTagList.append(duL.getAnchorTag())
-
-            if "check-special-position" in operationList:
-                chk = SpecialPositionCalc(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+            chk.run(entryId=entryId, inpPath=modelFilePath)
+            if chk.getReportSize() > 0:
+                return [(chk.getReportPath(), True)]
+            return []
+
+        if op == "check-special-position":
+            chk = SpecialPositionCalc(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+            chk.run(entryId=entryId, modelInputFile=modelFilePath)
+            if chk.getReportSize() > 0:
+                return [(chk.getReportPath(), True)]
+            return []
+
+        if op in ["check-emd-xml", "check-em-map"]:
+            if op == "check-emd-xml":
+                chk = EmdXmlCheck(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+            else:
+                chk = EmMapCheck(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+            try:
                 chk.run(entryId=entryId, modelInputFile=modelFilePath)
-                hasDiags = chk.getReportSize() > 0
-                if hasDiags:
-                    rptPath = chk.getReportPath()
-                    duL.copyToDownload(rptPath)
-                    aTagList.append(duL.getAnchorTag())
-
-            if "check-emd-xml" in operationList:
-                try:
-                    chk = EmdXmlCheck(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
-                    chk.run(entryId=entryId, modelInputFile=modelFilePath)
-                except Exception as e:
-                    logger.error("Error running EmdXmlCheck %s", e)
-                hasDiags = chk.getReportSize() > 0
-                rptPath = chk.getReportPath()
-                if hasDiags:
-                    duL.copyToDownload(rptPath)
-                    aTagList.append(duL.getAnchorTag())
-                else:
-                    duL.removeFromDownload(rptPath)
-
-            if "check-em-map" in operationList:
-                try:
-                    chk = EmMapCheck(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
-                    chk.run(entryId=entryId, modelInputFile=modelFilePath)
-                except Exception as e:
-                    logger.error("Error running EmMapCheck %s", e)
-                hasDiags = chk.getReportSize() > 0
-                rptPath = chk.getReportPath()
-                if hasDiags:
-                    duL.copyToDownload(rptPath)
-                    aTagList.append(duL.getAnchorTag())
-                else:
-                    duL.removeFromDownload(rptPath)
-
-            if "check-sf" in operationList:
-                ok = duL.fetchId(entryId, contentType="structure-factors", formatType="pdbx", fileSource=fileSource, versionId=versionId)
-                expFilePath = duL.getDownloadPath()
-                chk = DccCalc(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
-                ok = chk.run(entryId=entryId, modelInputPath=modelFilePath, expInputPath=expFilePath)
-                if ok:
-                    rptPath = chk.getReportPath()
-                    duL.copyToDownload(rptPath)
-                    aTagList.append(duL.getAnchorTag())
+            except Exception as e:
+                logger.error("Error running %s %s", chk.__class__.__name__, e)
+            return [(chk.getReportPath(), chk.getReportSize() > 0)]
 
-        self._lfh.write("+CommonTasksWebAppWorker._makeCheckReports() complete\n")
+        if op == "check-sf":
+            chk = DccCalc(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+            ok = chk.run(entryId=entryId, modelInputPath=modelFilePath, expInputPath=expFilePath)
+            if ok:
+                return [(chk.getReportPath(), True)]
+            return []
 
-        return aTagList
+        return []
 
     def __getMessageTextWithMarkup(self, message):
         """Internal methods used by _makeCheckReports()"""
@@ -2788,7 +3005,9 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
                 "check-emd-xml",
                 "check-em-map",
             ]
-            aTagList = self._makeCheckReports([entryId], operationList=opList, fileSource=fileSource, useFileVersions=useFileVersions)
+            self._setProgress("running %d checks" % len(opList))
+            aTagList = self._makeCheckReports([entryId], operationList=opList, fileSource=fileSource, useFileVersions=useFileVersions, requireModel=True)
+            self._setProgress("rendering check reports")
             cTList = ["model", "em-map-info-report"]
             cTList.extend(sorted(opCtD.values()))
             if self._verbose:
@@ -2798,8 +3017,10 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
             rC.setStatus(statusMsg="Check reports completed")
         else:
             opList = [operation]
+            self._setProgress("running check %s" % operation)
             aTagList = self._makeCheckReports([entryId], operationList=opList, fileSource=fileSource, useFileVersions=useFileVersions)
             #
+            self._setProgress("rendering check report")
             cT = opCtD[operation]
             myD = self._renderCheckReports(entryId, fileSource="session-download", instance=None, contentTypeList=[cT], useModelFileVersion=useFileVersions)
 
@@ -3298,6 +3519,8 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
             self._lfh.write("+CommonTasksWebAppWorker._downloadResponderOp() starting\n")
         self._getSession(useContext=True)
         filePath = self._reqObj.getValue("file_path")
+        # The file may be deferred from the workflow import -
+        self._materializeImport(self._reqObj.getValue("entryid"), pathList=[filePath])
         return self.__makeDownloadResponse(filePath, attachmentFlag=True, compressFlag=False)
 
     def __makeDownloadResponse(self, filePath, attachmentFlag=True, compressFlag=False):
@@ -3329,20 +3552,31 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
         #
         myD = {}
         #
+        self._materializeImport(entryId, ["np-cc-maps"])
         mpd = MapDisplay(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
         htmlList = []
-        indexPath = os.path.join(self._sessionPath, "np-cc-maps", "np-cc-maps-index.cif")
-        if os.access(indexPath, os.R_OK):
-            mapIdx = mpd.readLocalMapIndex(indexPath)
-            htmlList.extend(mpd.renderLocalMapTable(rowDL=mapIdx, title="Table of local electron density maps for non-polymer chemical components"))
-            if self.__debug:
-                self._lfh.write("+CommonTasksWebAppWorker._mapDisplayOp() html list %r\n" % htmlList)
-                self._lfh.write("+CommonTasksWebAppWorker._mapDisplayOp() data object %r\n" % myD.items())
-
-        indexPath = os.path.join(self._sessionPath, "np-cc-omit-maps", "np-cc-omit-maps-index.cif")
-        if os.access(indexPath, os.R_OK):
-            mapIdx = mpd.readLocalMapIndex(indexPath)
-            htmlList.extend(mpd.renderLocalMapTable(rowDL=mapIdx, title="Table of local electron density omit maps for non-polymer chemical components", subdir="np-cc-omit-maps"))
+        # The regular and omit maps are calculated concurrently -  show each set as soon as it is available
+        progressD = NpCcMapCalc.readProgress(self._sessionPath)
+        for subdir, title in [
+            ("np-cc-maps", "Table of local electron density maps for non-polymer chemical components"),
+            ("np-cc-omit-maps", "Table of local electron density omit maps for non-polymer chemical components"),
+        ]:
+            indexPath = os.path.join(self._sessionPath, subdir, subdir + "-index.cif")
+            hasIndex = os.access(indexPath, os.R_OK)
+            state = progressD.get(subdir, {}).get("state")
+            note = None
+            if state == "running":
+                note = "Calculation in progress - " + ("the table shows the previous results." if hasIndex else "the maps will be listed when the calculation completes.")
+            elif state == "failed":
+                note = "The last calculation of these maps failed."
+            elif state == "done" and not hasIndex:
+                note = "There are no non-polymer chemical components with local maps."
+            #
+            if hasIndex:
+                mapIdx = mpd.readLocalMapIndex(indexPath)
+                htmlList.extend(mpd.renderLocalMapTable(rowDL=mapIdx, title=title, subdir=subdir, note=note))
+            elif note:
+                htmlList.extend(mpd.renderLocalMapNote(title, note))
             if self.__debug:
                 self._lfh.write("+CommonTasksWebAppWorker._mapDisplayOp() html list %r\n" % htmlList)
                 self._lfh.write("+CommonTasksWebAppWorker._mapDisplayOp() data object %r\n" % myD.items())
@@ -4108,3 +4342,14 @@ class CommonTasksWebAppWorker(WebAppWorkerBase):
             fileList.append([fileTimeTuple[0], fileTimeTuple[1]])
         #
         return fileList
+
+
+class _JobResponseContent(ResponseContent):
+    """Response replaying the stored response dictionary of an asynchronous job."""
+
+    def __init__(self, resultD, reqObj=None, verbose=False, log=sys.stderr):
+        super(_JobResponseContent, self).__init__(reqObj=reqObj, verbose=verbose, log=log)
+        self.__resultD = resultD
+
+    def get(self):
+        return self.__resultD
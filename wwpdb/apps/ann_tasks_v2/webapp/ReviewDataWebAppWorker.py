@@ -5,6 +5,9 @@
 # Updates:
 #   5-July-2104 jdw add download options
 #  29-Nov-2016  ep   add support for checkNext in _updateAndReportFileOps (V5RC checking)
+#  18-Oct-2026       write uploaded file reports to the session as they are rendered with row windows
+#  18-Oct-2026       check reports share the parse of the model file with the rendered model report
+#  18-Oct-2026       return the path of the written upload report rather than its content
 ##
 """
 Data review tool web request and response processing modules.
@@ -140,7 +143,6 @@ class ReviewDataWebAppWorker(CommonTasksWebAppWorker):
 
         #
         aTagList = []
-        htmlList = []
         hasDiags = False
 
         if not isFile or fileName is None or len(fileName) < 1:
@@ -152,10 +154,17 @@ class ReviewDataWebAppWorker(CommonTasksWebAppWorker):
             aTagList.append(du.getAnchorTag())
             downloadPath = du.getDownloadPath()
             layout = "multiaccordion"
-            htmlList.extend(pR.makeTabularReport(filePath=downloadPath, contentType=contentType, idCode=idCode, layout=layout))
-            if len(aTagList) > 0:
+            # Uploaded files may be large - the report is written to the session as it is rendered and
+            # only its session path is returned
+            reportDirPath = os.path.join(self._sessionPath, "report")
+            if not os.access(reportDirPath, os.F_OK):
+                os.makedirs(reportDirPath)
+            reportFileName = os.path.basename(downloadPath) + "-report.html"
+            reportPath = os.path.join(reportDirPath, reportFileName)
+            ok = pR.writeTabularReport(reportPath, filePath=downloadPath, contentType=contentType, idCode=idCode, layout=layout, rowLimit=self._getReportRowLimit())
+            if ok and len(aTagList) > 0:
                 rC.setHtmlLinkText('<span class="url-list">Download: %s</span>' % ",".join(aTagList))
-                rC.setHtmlList(htmlList)
+                rC.setHtmlContentPath(os.path.join(self._rltvSessionPath, "report", reportFileName))
                 rC.setStatus(statusMsg="Reports completed")
             else:
                 rC.setError(errMsg="Report preparation failed")
@@ -323,7 +332,7 @@ class ReviewDataWebAppWorker(CommonTasksWebAppWorker):
                 "check-emd-xml",
                 "check-em-map",
             ]
-            _aTagList = self._makeCheckReports([idCode], operationList=opList)  # noqa: F841
+            _aTagList = self._makeCheckReports([idCode], operationList=opList, requireModel=True)  # noqa: F841
         #
         #
         if self._verbose:
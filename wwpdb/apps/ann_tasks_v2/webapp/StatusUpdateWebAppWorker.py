@@ -17,6 +17,9 @@
 #  02-Feb-2018  ep    Return requested accession codes to end user
 #  23-May-2018  ep    Check status of generating XML header and provide feedback
 #  11-Jun-2018  ep    Return contents of XML header error file for display at UI
+#  18-Oct-2026  ep    add batched status code updates for a list of entries -- _statusCodeBatchUpdateOp()
+#  18-Oct-2026  ep    read the status items at launch through the request model context
+#  18-Oct-2026  ep    declare the status categories before the model file is read
 ##
 """
 Status update tasks tool  -
@@ -36,6 +39,7 @@ __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Creative Commons Attribution 3.0 Unported"
 __version__ = "V0.07"
 
+import json
 import os
 import sys
 import traceback
@@ -52,6 +56,7 @@ from wwpdb.apps.ann_tasks_v2.webapp.CommonTasksWebAppWorker import CommonTasksWe
 # from wwpdb.apps.ann_tasks_v2.report.PdbxReport import PdbxReport
 from wwpdb.apps.ann_tasks_v2.utils.SessionDownloadUtils import SessionDownloadUtils
 from wwpdb.apps.ann_tasks_v2.status.StatusUpdate import StatusUpdate
+from wwpdb.apps.ann_tasks_v2.status.StatusBatchUpdate import StatusBatchUpdate
 from wwpdb.utils.db.StatusHistoryUtils import StatusHistoryUtils
 from wwpdb.apps.ann_tasks_v2.utils.MergeXyz import MergeXyz
 from wwpdb.apps.ann_tasks_v2.em3d.EmHeaderUtils import EmHeaderUtils
@@ -106,6 +111,7 @@ class StatusUpdateWebAppWorker(CommonTasksWebAppWorker):
             # New service for updating
             "/service/status_update_tasks_v2/other_update": "_statusUpdateOtherOp",
             "/service/status_update_tasks_v2/status_code_update_v2": "_statusCodeUpdateV2Op",
+            "/service/status_update_tasks_v2/status_code_batch_update": "_statusCodeBatchUpdateOp",
         }
 
         self.addServices(self._appPathD)
@@ -187,7 +193,9 @@ class StatusUpdateWebAppWorker(CommonTasksWebAppWorker):
             fP = du.getDownloadPath()
 
             sU = StatusUpdate(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
-            sUD = sU.getV2(fP)
+            mC = self._getModelContext()
+            mC.require(fP, StatusUpdate.statusCategoryList)
+            sUD = sU.getV2(fP, modelContext=mC)
             pdbId = sUD["pdb_id"]
             emdbId = sUD["emdb_id"]
             annotatorId = sUD["annotatorInitials"]
@@ -1124,41 +1132,22 @@ class StatusUpdateWebAppWorker(CommonTasksWebAppWorker):
         if "EMDB" in reqAccTypes:
             hasEM = True
 
-        msg = "ok"
         # Test if any conditions are violated
         #
-
-        if hasPdb:
-            if (str(statusCode).upper() == "HPUB") and (str(orgAuthRelCode).upper() == "HOLD"):
-                # ((str(statusCode).upper() == 'HOLD') and (str(authStatusCode).upper() == 'HPUB')):
-                msg = "Processing status code and author release status are inconsistent"
-
-            if (str(orgStatusCode).upper() == "PROC") and (str(statusCode).upper() in ["HPUB", "HOLD"]):
-                msg = "Processing status code change from PROC to HPUB or HOLD prohibited"
-
-            if str(orgStatusCode).upper() == "REL":
-                if len(orgPostRelStatusCode) == 0:
-                    msg = "Processing status code change from REL prohibited"
-                else:
-                    # Web form does not set in this case
-                    statusCode = "REL"
-
-            if str(orgStatusCode).upper() == "OBS":
-                msg = "Processing status code change from OBS prohibited"
-
-        if hasEM and msg == "ok":
-            # For PostRel PDB - this will be empty
-            if statusD["em_current_status"] == "":
-                statusD["em_current_status"] = orgEmStatus
-
-            newEmStatus = statusD["em_current_status"]
-
-            if (str(orgEmStatus).upper() == "PROC") and (str(newEmStatus).upper() in ["HPUB", "HOLD"]):
-                msg = "EM processing status code change from PROC to HPUB or HOLD prohibited"
-
-            if (str(newEmStatus).upper() == "HPUB") and (str(orgEmAuthStatus).upper() == "HOLD"):
-                # ((str(statusCode).upper() == 'HOLD') and (str(authStatusCode).upper() == 'HPUB')):
-                msg = "Processing status code and author release status are inconsistent"
+        sU = StatusUpdate(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        msg, statusCode, newEmStatus = sU.checkTransition(
+            statusCode,
+            orgStatusCode,
+            orgAuthRelCode=orgAuthRelCode,
+            orgPostRelStatusCode=orgPostRelStatusCode,
+            emStatusCode=statusD["em_current_status"],
+            orgEmStatusCode=orgEmStatus,
+            orgEmAuthRelCode=orgEmAuthStatus,
+            hasPdb=hasPdb,
+            hasEM=hasEM,
+        )
+        if hasEM:
+            statusD["em_current_status"] = newEmStatus
 
         if self._verbose:
             self._lfh.write("+StatusUpdateWebAppWorker._statusCodeUpateOp() id %s check status message is: %s\n" % (idCode, msg))
@@ -1203,8 +1192,6 @@ class StatusUpdateWebAppWorker(CommonTasksWebAppWorker):
             if self._verbose:
                 self._lfh.write("+StatusUpdateWebAppWorker._statusCodeUpdateOp() model input path %s model archive output path %s\n" % (filePath, pdbxArchivePath))
 
-            sU = StatusUpdate(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
-
             ok1 = True
             if hasPdb:
                 ok1 = sU.wfLoad(
@@ -1353,6 +1340,42 @@ class StatusUpdateWebAppWorker(CommonTasksWebAppWorker):
 
         return rC
 
+    def _statusCodeBatchUpdateOp(self):
+        """Status code updates for a list of entries.
+
+        The request value 'status_batch' is a JSON list of {"idcode": ..., "status-code": ..., and optionally
+        "approval-type", "postrel-status-code", "em_new_status"}.  A missing approval-type is taken from the request.
+        Returns a report with the result for each entry (see StatusBatchUpdate).
+        """
+        self._getSession(useContext=True)
+        rC = ResponseContent(reqObj=self._reqObj, verbose=self._verbose, log=self._lfh)
+        rC.setReturnFormat("json")
+        try:
+            requestList = json.loads(self._reqObj.getValue("status_batch"))
+            if not isinstance(requestList, list) or not all(isinstance(reqD, dict) for reqD in requestList):
+                raise ValueError("status_batch is not a list of entry requests")
+        except ValueError:
+            rC.setError(errMsg="Status batch request cannot be read")
+            return rC
+        #
+        approvalType = self._reqObj.getValue("approval-type")
+        for reqD in requestList:
+            if not reqD.get("approval-type"):
+                reqD["approval-type"] = approvalType
+        annotatorInitials = self._reqObj.getValue("cur-annotator-initials")
+        if self._verbose:
+            self._lfh.write("+StatusUpdateWebAppWorker._statusCodeBatchUpdateOp() starting with %d entries\n" % len(requestList))
+        #
+        sbU = StatusBatchUpdate(self._reqObj, verbose=self._verbose, log=self._lfh)
+        resultList = sbU.run(requestList, annotatorInitials=annotatorInitials)
+        nUpdated = len([rD for rD in resultList if rD["status"] == "updated"])
+        rC.set("report", resultList)
+        if nUpdated == len(resultList):
+            rC.setStatus(statusMsg="Status updated for %d entries" % nUpdated)
+        else:
+            rC.setError(errMsg="Status updated for %d of %d entries" % (nUpdated, len(resultList)))
+        return rC
+
     #
 
     def __getFileTextWithMarkup(self, downloadPath):
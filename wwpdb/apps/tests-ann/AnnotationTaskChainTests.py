@@ -0,0 +1,154 @@
+##
+# File:    AnnotationTaskChainTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the annotation task chain - merging of the categories changed by each calculation and unknown calculation names.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+try:
+    from unittest.mock import patch
+except ImportError:  # pragma: no cover
+    from mock import patch
+
+from mmcif.api.DataCategory import DataCategory
+from mmcif.api.PdbxContainers import DataContainer
+from mmcif.io.IoAdapterPy import IoAdapterPy as IoAdapter
+
+from wwpdb.apps.ann_tasks_v2.utils import AnnotationTaskChain as ChainModule
+from wwpdb.utils.session.WebRequest import InputRequest
+
+
+def _category(name, attributeList, rowList):
+    return DataCategory(name, attributeList, rowList)
+
+
+class _Calculation(object):
+    """Edits the categories of the model file and publishes its own updated model file as the tools do."""
+
+    # name -> (categories added or replaced, categories removed) - pdbx_struct_conn_angle is not declared by the link calculation
+    editD = {
+        "link": (
+            [
+                _category("struct_conn", ["id", "conn_type_id"], [["covale1", "covale"]]),
+                _category("struct_conn_type", ["id"], [["covale"]]),
+                _category("pdbx_struct_conn_angle", ["id"], [["1"]]),
+            ],
+            [],
+        ),
+        "secstruct": ([_category("struct_conf", ["id", "conf_type_id"], [["HELX_P1", "HELX_P"]])], []),
+        "site": ([_category("struct_site", ["id", "details"], [["AC1", "binding site"]])], []),
+        "geometry": ([], ["pdbx_validate_close_contact"]),
+    }
+
+    def __init__(self, reqObj=None, verbose=False, log=sys.stderr):
+        self.__sessionPath = reqObj.getSessionObj().getPath()
+        self.__verbose = verbose
+        self.__lfh = log
+
+    def run(self, entryId, inpFile):
+        inpPath = os.path.join(self.__sessionPath, inpFile)
+        name = os.path.basename(inpFile)[len(entryId) + len("_model-") :].split("_P1")[0]
+        io = IoAdapter(raiseExceptions=True, verbose=False, log=self.__lfh)
+        cList = io.readFile(inpPath)
+        addL, removeL = self.editD[name]
+        for catObj in addL:
+            cList[0].remove(catObj.getName())
+            cList[0].append(catObj)
+        for catName in removeL:
+            cList[0].remove(catName)
+        io.writeFile(inpPath, cList)
+        io.writeFile(os.path.join(self.__sessionPath, entryId + "_model-updated_P1.cif"), cList)
+        return True
+
+    def getAnchorTagList(self, label=None, target="_blank", cssClass=""):  # pylint: disable=unused-argument
+        return []
+
+
+class AnnotationTaskChainTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__topPath = os.path.join(TESTOUTPUT, "annotation-task-chain")
+        if os.path.exists(self.__topPath):
+            shutil.rmtree(self.__topPath)
+        os.makedirs(self.__topPath)
+        self.__entryId = "D_1000000001"
+        self.__reqObj = InputRequest({}, verbose=True, log=self.__lfh)
+        self.__reqObj.setValue("TopSessionPath", self.__topPath)
+        self.__sessionPath = self.__reqObj.newSessionObj().getPath()
+        self.__modelFile = self.__entryId + "_model_P1.cif"
+        container = DataContainer(self.__entryId)
+        container.append(_category("atom_site", ["id", "type_symbol"], [["1", "C"], ["2", "N"]]))
+        container.append(_category("struct_conn", ["id", "conn_type_id"], [["disulf1", "disulf"]]))
+        container.append(_category("pdbx_validate_close_contact", ["id", "dist"], [["1", "2.1"]]))
+        IoAdapter(raiseExceptions=True).writeFile(os.path.join(self.__sessionPath, self.__modelFile), [container])
+        self.__patchL = [patch.object(ChainModule, name, _Calculation) for name in ["Link", "SecondaryStructure", "Site", "GeometryCalc"]]
+        for pt in self.__patchL:
+            pt.start()
+
+    def tearDown(self):
+        for pt in self.__patchL:
+            pt.stop()
+
+    def __read(self, fileName):
+        return IoAdapter(raiseExceptions=True).readFile(os.path.join(self.__sessionPath, fileName))[0]
+
+    def testMerge(self):
+        """Test the categories added, changed and removed by concurrent calculations are all kept -"""
+        chain = ChainModule.AnnotationTaskChain(reqObj=self.__reqObj, maxWorkers=2, verbose=True, log=self.__lfh)
+        ok, rL = chain.run(self.__entryId, self.__modelFile, taskNameList=["link", "secstruct", "site", "geometry"])
+        self.assertTrue(ok)
+        self.assertEqual([rD["name"] for rD in rL], ["link", "secstruct", "site", "geometry", "total"])
+        self.assertTrue(all(rD["ok"] for rD in rL))
+        #
+        container = self.__read(self.__modelFile)
+        self.assertEqual(container.getObj("atom_site").getRowCount(), 2)
+        self.assertEqual(container.getObj("struct_conn").getValue("id", 0), "covale1")
+        self.assertTrue(container.exists("struct_conn_type"))
+        # A category the calculation does not declare is merged as well
+        self.assertTrue(container.exists("pdbx_struct_conn_angle"))
+        self.assertTrue(container.exists("struct_conf"))
+        self.assertTrue(container.exists("struct_site"))
+        self.assertFalse(container.exists("pdbx_validate_close_contact"))
+        # The published updated model is the merged model
+        updated = self.__read(self.__entryId + "_model-updated_P1.cif")
+        self.assertEqual(sorted(updated.getObjNameList()), sorted(container.getObjNameList()))
+
+    def testUnknownName(self):
+        """Test nothing is run when a calculation name is unknown -"""
+        chain = ChainModule.AnnotationTaskChain(reqObj=self.__reqObj, verbose=True, log=self.__lfh)
+        self.assertEqual(chain.getUnknownTaskNameList(["link", "secstructure", "terminal-atoms"]), ["secstructure"])
+        self.assertEqual(chain.run(self.__entryId, self.__modelFile, taskNameList=["link", "secstructure"]), (False, []))
+        self.assertEqual(self.__read(self.__modelFile).getObj("struct_conn").getValue("id", 0), "disulf1")
+
+
+def suiteAnnotationTaskChainTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(AnnotationTaskChainTests("testMerge"))
+    suiteSelect.addTest(AnnotationTaskChainTests("testUnknownName"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteAnnotationTaskChainTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,136 @@
+##
+# File:    ArchiveFileIndexTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the directory listing index resolving versioned archive file paths.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.ann_tasks_v2.utils.ArchiveFileIndex import ArchiveFileIndex
+
+
+class LocalPathInfo(object):
+    """Archive file naming as in PathInfo for a local directory tree - explicit versions only."""
+
+    def __init__(self, topPath):
+        self.__topPath = topPath
+
+    def getFilePath(
+        self, dataSetId, wfInstanceId=None, contentType=None, formatType=None, fileSource="archive", versionId="latest", partNumber="1", mileStone=None
+    ):  # pylint: disable=unused-argument
+        ext = {"pdbx": "cif", "map": "map"}[formatType]
+        cType = contentType if mileStone is None else contentType + "-" + mileStone
+        basePath = os.path.join(self.__topPath, dataSetId, "%s_%s_P%s.%s" % (dataSetId, cType, partNumber, ext))
+        if versionId == "none":
+            return basePath
+        return basePath + ".V" + str(versionId)
+
+
+class ArchiveFileIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__topPath = os.path.join(TESTOUTPUT, "archive-file-index")
+        if os.path.exists(self.__topPath):
+            shutil.rmtree(self.__topPath)
+        self.__dirPath = os.path.join(self.__topPath, "D_1000000001")
+        os.makedirs(self.__dirPath)
+        for fN in [
+            "D_1000000001_model_P1.cif.V1",
+            "D_1000000001_model_P1.cif.V2",
+            "D_1000000001_model_P1.cif.V10",
+            "D_1000000001_model-upload_P1.cif.V1",
+            "D_1000000001_em-additional-volume_P1.map.V1",
+            "D_1000000001_em-additional-volume_P2.map.V1",
+            "D_1000000001_em-additional-volume_P2.map.V3",
+            "D_1000000001_em-additional-volume_P4.map.V1",
+            "D_1000000001_model_P1.cif.V3.bak",
+        ]:
+            self.__touch(fN)
+        self.__pI = LocalPathInfo(self.__topPath)
+
+    def __touch(self, fileName):
+        with open(os.path.join(self.__dirPath, fileName), "w") as ofh:
+            ofh.write("")
+
+    def __path(self, fileName):
+        return os.path.join(self.__dirPath, fileName)
+
+    def testVersions(self):
+        """Test latest, next and previous versions are resolved from one directory listing -"""
+        fI = ArchiveFileIndex(self.__pI, verbose=True, log=self.__lfh)
+        self.assertEqual(fI.getFilePath("D_1000000001", contentType="model", formatType="pdbx"), self.__path("D_1000000001_model_P1.cif.V10"))
+        self.assertEqual(fI.getFilePath("D_1000000001", contentType="model", formatType="pdbx", versionId="next"), self.__path("D_1000000001_model_P1.cif.V11"))
+        self.assertEqual(fI.getFilePath("D_1000000001", contentType="model", formatType="pdbx", versionId="previous"), self.__path("D_1000000001_model_P1.cif.V9"))
+        self.assertEqual(fI.getVersionList("D_1000000001", contentType="model", formatType="pdbx"), [1, 2, 10])
+        self.assertEqual(fI.getVersionList("D_1000000001", contentType="model", formatType="pdbx", mileStone="upload"), [1])
+        # Files which are not present follow the DataFileReference conventions
+        self.assertEqual(fI.getFilePath("D_1000000001", contentType="model", formatType="pdbx", partNumber="2"), self.__path("D_1000000001_model_P2.cif.V1"))
+        self.assertIsNone(fI.getFilePath("D_1000000001", contentType="model", formatType="pdbx", partNumber="2", versionId="previous"))
+        self.assertEqual(fI.getVersionList("D_1000000002", contentType="model", formatType="pdbx"), [])
+        # Explicit versions are passed to PathInfo
+        self.assertEqual(fI.getFilePath("D_1000000001", contentType="model", formatType="pdbx", versionId="2"), self.__path("D_1000000001_model_P1.cif.V2"))
+
+    def testPartitions(self):
+        """Test partition numbers and the latest files of contiguous partitions -"""
+        fI = ArchiveFileIndex(self.__pI, verbose=False, log=self.__lfh)
+        self.assertEqual(fI.getPartitionNumberList("D_1000000001", contentType="em-additional-volume", formatType="map"), [1, 2, 4])
+        self.assertEqual(
+            fI.getLatestPartitionFilePathList("D_1000000001", contentType="em-additional-volume", formatType="map"),
+            [self.__path("D_1000000001_em-additional-volume_P1.map.V1"), self.__path("D_1000000001_em-additional-volume_P2.map.V3")],
+        )
+        self.assertEqual(fI.getLatestPartitionFilePathList("D_1000000001", contentType="em-mask-volume", formatType="map"), [])
+
+    def testInvalidate(self):
+        """Test that files written after the listing are seen only after invalidation -"""
+        fI = ArchiveFileIndex(self.__pI, verbose=False, log=self.__lfh)
+        self.assertEqual(fI.getFilePath("D_1000000001", contentType="model", formatType="pdbx"), self.__path("D_1000000001_model_P1.cif.V10"))
+        self.__touch("D_1000000001_model_P1.cif.V11")
+        self.assertEqual(fI.getFilePath("D_1000000001", contentType="model", formatType="pdbx"), self.__path("D_1000000001_model_P1.cif.V10"))
+        fI.invalidate(self.__dirPath)
+        self.assertEqual(fI.getFilePath("D_1000000001", contentType="model", formatType="pdbx"), self.__path("D_1000000001_model_P1.cif.V11"))
+        self.__touch("D_1000000001_model_P1.cif.V12")
+        fI.invalidate()
+        self.assertEqual(fI.getVersionList("D_1000000001", contentType="model", formatType="pdbx"), [1, 2, 10, 11, 12])
+
+    def testRefresh(self):
+        """Test a file written after the listing is seen by a lookup with refresh -"""
+        fI = ArchiveFileIndex(self.__pI, verbose=False, log=self.__lfh)
+        self.assertEqual(fI.getFilePath("D_1000000001", contentType="model", formatType="pdbx"), self.__path("D_1000000001_model_P1.cif.V10"))
+        self.__touch("D_1000000001_model_P1.cif.V11")
+        self.assertEqual(fI.getFilePath("D_1000000001", contentType="model", formatType="pdbx", refresh=True), self.__path("D_1000000001_model_P1.cif.V11"))
+        self.__touch("D_1000000001_model_P1.cif.V12")
+        self.assertEqual(fI.getFilePath("D_1000000001", contentType="model", formatType="pdbx", versionId="next", refresh=True), self.__path("D_1000000001_model_P1.cif.V13"))
+
+
+def suiteArchiveFileIndexTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ArchiveFileIndexTests("testVersions"))
+    suiteSelect.addTest(ArchiveFileIndexTests("testPartitions"))
+    suiteSelect.addTest(ArchiveFileIndexTests("testInvalidate"))
+    suiteSelect.addTest(ArchiveFileIndexTests("testRefresh"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteArchiveFileIndexTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,122 @@
+##
+# File:    AsyncJobManagerTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for detached asynchronous jobs.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.ann_tasks_v2.utils.AsyncJobManager import AsyncJobManager, setJobProgress
+
+
+class AsyncJobManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        # A cancelled job of another test may still be writing its record - each test has its own directory
+        self.__workPath = os.path.join(TESTOUTPUT, "async-jobs", self._testMethodName)
+        if os.path.exists(self.__workPath):
+            shutil.rmtree(self.__workPath)
+        self.__sessionPath = os.path.join(self.__workPath, "session")
+        os.makedirs(self.__sessionPath)
+        self.__slotPath = os.path.join(self.__workPath, "slots")
+
+    def tearDown(self):
+        pass
+
+    def __waitFor(self, jM, jobId, statusList, timeout=30.0):
+        tEnd = time.time() + timeout
+        while time.time() < tEnd:
+            rD = jM.getStatus(jobId)
+            if rD["status"] in statusList:
+                return rD
+            time.sleep(0.1)
+        return jM.getStatus(jobId)
+
+    def testJobLifecycle(self):
+        """Test job completion, failure and cancellation of queued and running jobs"""
+        jM = AsyncJobManager(self.__sessionPath, slotPath=self.__slotPath, maxJobs=1, pollInterval=0.1, verbose=True, log=self.__lfh)
+        jobId = jM.submit(lambda: {"value": 42}, jobName="answer")
+        self.assertIsNotNone(jobId)
+        rD = self.__waitFor(jM, jobId, ["completed", "failed"])
+        self.assertEqual(rD["status"], "completed")
+        self.assertEqual(jM.getResult(jobId), {"value": 42})
+        self.assertFalse(jM.cancel(jobId))
+        #
+        failId = jM.submit(lambda: 1 / 0, jobName="fail")
+        rD = self.__waitFor(jM, failId, ["completed", "failed"])
+        self.assertEqual(rD["status"], "failed")
+        self.assertIsNone(jM.getResult(failId))
+        #
+        # With a single slot the second job stays queued behind the first
+        slowId = jM.submit(lambda: time.sleep(60), jobName="slow")
+        rD = self.__waitFor(jM, slowId, ["running"])
+        self.assertEqual(rD["status"], "running")
+        queuedId = jM.submit(lambda: {}, jobName="queued")
+        time.sleep(0.5)
+        self.assertEqual(jM.getStatus(queuedId)["status"], "queued")
+        self.assertTrue(jM.cancel(queuedId))
+        self.assertTrue(jM.cancel(slowId))
+        self.assertEqual(jM.getStatus(slowId)["status"], "cancelled")
+        self.assertEqual(jM.getStatus(queuedId)["status"], "cancelled")
+        #
+        self.assertEqual([rD["jobid"] for rD in jM.getJobList()], [jobId, failId, slowId, queuedId])
+        self.assertIsNone(jM.getStatus("J_unknown"))
+
+    def __reportingJob(self, stepPath):
+        for step in ["first step", "second step"]:
+            setJobProgress(step)
+            while not os.access(stepPath + "-" + step.split()[0], os.F_OK):
+                time.sleep(0.05)
+        return {"steps": 2}
+
+    def testJobProgress(self):
+        """Test progress reported by the operation run by a job"""
+        jM = AsyncJobManager(self.__sessionPath, slotPath=self.__slotPath, maxJobs=1, pollInterval=0.1, verbose=True, log=self.__lfh)
+        self.assertFalse(setJobProgress("not in a job"))
+        stepPath = os.path.join(self.__workPath, "step")
+        jobId = jM.submit(lambda: self.__reportingJob(stepPath), jobName="progress")
+        for step in ["first", "second"]:
+            tEnd = time.time() + 30.0
+            while jM.getStatus(jobId)["progress"] != step + " step" and time.time() < tEnd:
+                time.sleep(0.05)
+            self.assertEqual(jM.getStatus(jobId)["progress"], step + " step")
+            with open(stepPath + "-" + step, "w") as ofh:
+                ofh.write("")
+        rD = self.__waitFor(jM, jobId, ["completed", "failed"])
+        self.assertEqual((rD["status"], rD["progress"]), ("completed", "completed"))
+        self.assertEqual(jM.getResult(jobId), {"steps": 2})
+        # Progress is not recorded for jobs which are no longer active
+        self.assertFalse(jM.setProgress(jobId, "late"))
+
+
+def suiteAsyncJobManagerTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(AsyncJobManagerTests("testJobLifecycle"))
+    suiteSelect.addTest(AsyncJobManagerTests("testJobProgress"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteAsyncJobManagerTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,341 @@
+##
+# File:    AtomContactFinderTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#   18-Oct-2026  Symmetry contacts, contact classification and comparison with the annotation tool reports
+##
+"""
+Tests for the in process close contact and covalent bond calculation.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import time
+import unittest
+
+import numpy as np
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+try:
+    from unittest.mock import patch
+except ImportError:  # pragma: no cover
+    from mock import patch
+
+from mmcif.api.DataCategory import DataCategory
+from mmcif.api.PdbxContainers import DataContainer
+from mmcif.io.IoAdapterPy import IoAdapterPy
+
+from wwpdb.apps.ann_tasks_v2.utils import AtomContactFinder as AtomContactFinderModule
+from wwpdb.apps.ann_tasks_v2.utils import GetCloseContact as GetCloseContactModule
+from wwpdb.apps.ann_tasks_v2.utils.AtomContactFinder import AtomContactFinder, findAtomPairs, parseSymmetryOperator, sortSymmetryOperators
+from wwpdb.utils.session.WebRequest import InputRequest
+
+try:
+    import gemmi
+except ImportError:  # pragma: no cover
+    gemmi = None
+
+
+class _RcsbDpUtility(object):
+    """Records the tool operations run by GetCloseContact."""
+
+    opList = []
+
+    def __init__(self, tmpPath=".", siteId=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        pass
+
+    def imp(self, inpPath):
+        pass
+
+    def op(self, opName):
+        _RcsbDpUtility.opList.append(opName)
+
+    def expLog(self, dstPath=None, appendMode=True):  # pylint: disable=unused-argument
+        with open(dstPath, "w") as ofh:
+            ofh.write("Finished!\n")
+
+    def exp(self, dstPath):
+        with open(dstPath, "w") as ofh:
+            ofh.write('{"close_contact": []}')
+
+    def cleanup(self):
+        pass
+
+
+class AtomContactFinderTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__modelFilePath = os.path.join(HERE, "tests", "3rer.cif")
+
+    def tearDown(self):
+        pass
+
+    def testFindAtomPairs(self):
+        """Test the cell grid search returns the same pairs as the all pairs calculation -"""
+        rng = np.random.RandomState(7)
+        for nAtoms, boxSize in [(2, 1.0), (400, 12.0), (1500, 30.0)]:
+            xyz = rng.uniform(0.0, boxSize, (nAtoms, 3))
+            iA, jA, dA = findAtomPairs(xyz, 2.2)
+            dMat = np.sqrt(np.sum((xyz[:, None, :] - xyz[None, :, :]) ** 2, axis=2))
+            bI, bJ = np.nonzero(np.triu(dMat < 2.2, 1))
+            self.assertTrue(np.array_equal(iA, bI))
+            self.assertTrue(np.array_equal(jA, bJ))
+            self.assertTrue(np.allclose(dA, dMat[bI, bJ]))
+
+    def __writeModel(self, filePath, atomL, connL, cell=None, spaceGroup=None):
+        """Write a model file with atom_site rows (chain, comp, seq, atom, type, alt, x, y, z), struct_conn rows and optional cell"""
+        with open(filePath, "w") as ofh:
+            ofh.write("data_TEST\n#\n")
+            if cell:
+                for name, val in zip(("length_a", "length_b", "length_c", "angle_alpha", "angle_beta", "angle_gamma"), cell):
+                    ofh.write("_cell.%s %s\n" % (name, val))
+                ofh.write("#\n_symmetry.space_group_name_H-M '%s'\n#\n" % spaceGroup)
+            ofh.write("loop_\n_struct_conn.id\n_struct_conn.conn_type_id\n_struct_conn.pdbx_leaving_atom_flag\n")
+            ofh.write("_struct_conn.ptnr1_auth_asym_id\n_struct_conn.ptnr1_auth_comp_id\n_struct_conn.ptnr1_auth_seq_id\n_struct_conn.ptnr1_label_atom_id\n")
+            ofh.write("_struct_conn.ptnr2_auth_asym_id\n_struct_conn.ptnr2_auth_comp_id\n_struct_conn.ptnr2_auth_seq_id\n_struct_conn.ptnr2_label_atom_id\n")
+            ofh.write("_struct_conn.ptnr1_symmetry\n_struct_conn.ptnr2_symmetry\n_struct_conn.pdbx_dist_value\n")
+            for conn in connL:
+                ofh.write(conn + "\n")
+            ofh.write("#\nloop_\n")
+            for name in ("group_PDB", "id", "type_symbol", "label_atom_id", "label_alt_id", "label_comp_id", "label_asym_id", "label_seq_id",
+                         "pdbx_PDB_ins_code", "Cartn_x", "Cartn_y", "Cartn_z", "auth_seq_id", "auth_comp_id", "auth_asym_id", "pdbx_PDB_model_num"):
+                ofh.write("_atom_site.%s\n" % name)
+            for ii, (chain, comp, seq, atom, typ, alt, x, y, z) in enumerate(atomL, 1):
+                ofh.write("ATOM %d %s %s %s %s %s %s ? %.3f %.3f %.3f %s %s %s 1\n" % (ii, typ, atom, alt, comp, chain, seq if chain == "A" else ".", x, y, z, seq, comp, chain))
+            ofh.write("#\n")
+        #
+
+    def testModelContacts(self):
+        """Test close contact exclusions and covalent bond records on a small model -"""
+        filePath = os.path.join(TESTOUTPUT, "contact-model.cif")
+        atomL = [
+            # chain, comp, seq, atom, type, alt, x, y, z
+            ("A", "ALA", "1", "C", "C", ".", 0.0, 0.0, 0.0),
+            ("A", "ALA", "2", "N", "N", ".", 1.33, 0.0, 0.0),
+            ("A", "ALA", "2", "CB", "C", ".", 10.0, 0.0, 0.0),
+            ("B", "NAG", "1", "C1", "C", ".", 11.45, 0.0, 0.0),
+            ("B", "NAG", "1", "O1", "O", "A", 10.0, 5.0, 0.0),
+            ("B", "NAG", "1", "O1", "O", "B", 12.0, 3.5, 0.0),
+            ("C", "HOH", "1", "O", "O", "A", 10.0, 3.5, 0.0),
+            ("C", "HOH", "1", "H1", "H", "A", 10.0, 4.4, 0.0),
+        ]
+        self.__writeModel(filePath, atomL, ["covale1 covale one A ALA 2 CB B NAG 1 C1 1_555 1_555 ?"])
+        aF = AtomContactFinder(verbose=True, log=self.__lfh)
+        self.assertTrue(aF.read(filePath))
+        # The peptide link and the recorded covalent bond are excluded and the alternate conformers are not paired
+        ccL = aF.getCloseContacts()
+        self.assertEqual(ccL, [["B", "NAG", "1", "", "O1", "A", "C", "HOH", "1", "", "O", "A", "1.500", ""]])
+        self.assertEqual(len(aF.getCloseContacts(includeHydrogen=True)), 2)
+        self.assertEqual(len(aF.getCloseContacts(cutoff=1.0)), 0)
+        self.assertEqual(len(aF.getCloseContacts(cutoff=1.0, includeHydrogen=True)), 1)
+        cbL = aF.getCovalentBonds()
+        self.assertEqual(cbL, [["A", "ALA", "2", "", "CB", "", "1_555", "B", "NAG", "1", "", "C1", "", "1_555", "one", "1.450", "covale1"]])
+        #
+        aF = AtomContactFinder(verbose=True, log=self.__lfh)
+        self.assertTrue(aF.read(self.__modelFilePath))
+        # The metal coordination of this model is recorded in struct_conn
+        for row in aF.getCloseContacts():
+            self.assertNotIn("MG", (row[1], row[7]))
+            self.assertLess(float(row[12]), 2.2)
+
+    def testSymmetryContacts(self):
+        """Test contacts with symmetry related atoms, their classification and covalent bonds across symmetry -"""
+        filePath = os.path.join(TESTOUTPUT, "contact-symmetry-model.cif")
+        atomL = [
+            # chain, comp, seq, atom, type, alt, x, y, z
+            ("D", "ZN", "1", "ZN", "ZN", ".", 0.5, 5.0, 0.5),
+            ("E", "ASP", "1", "OD1", "O", ".", -0.5, -3.5, -0.5),
+            ("F", "NAG", "1", "C1", "C", ".", 5.5, 5.0, 5.5),
+            ("G", "ASN", "1", "ND2", "N", ".", -6.9, -5.0, -5.5),
+            ("H", "HOH", "1", "O", "O", ".", 2.5, 5.0, 0.5),
+            ("J", "SER", "1", "OG", "O", ".", 2.5, 8.5, 8.0),
+            ("K", "SER", "1", "OG", "O", ".", 2.5, 10.4, 8.0),
+        ]
+        connL = ["covale1 covale one F NAG 1 C1 G ASN 1 ND2 1_555 2_555 ?"]
+        self.__writeModel(filePath, atomL, connL, cell=(20.0, 20.0, 20.0, 90.0, 90.0, 90.0), spaceGroup="P 1 21 1")
+        aF = AtomContactFinder(verbose=True, log=self.__lfh)
+        self.assertTrue(aF.read(filePath))
+        # Metal to ligand at a bonding distance is a link candidate, metal to water and oxygen pairs beyond bonding distances are not
+        self.assertEqual(
+            aF.getCloseContacts(),
+            [["D", "ZN", "1", "", "ZN", "", "H", "HOH", "1", "", "O", "", "2.000", ""], ["J", "SER", "1", "", "OG", "", "K", "SER", "1", "", "OG", "", "1.900", ""]],
+        )
+        self.assertEqual(aF.getContactClass(("D", "ZN", "1", "", "ZN", "", "", "", "ZN"), ("E", "ASP", "1", "", "OD1", "", "", "", "O"), 2.0), "green")
+        self.assertEqual(aF.getContactClass(("J", "SER", "1", "", "OG", "", "", "", "O"), ("K", "SER", "1", "", "OG", "", "", "", "O"), 1.9), "")
+        self.assertEqual(aF.getContactClass(("F", "NAG", "1", "", "C1", "", "", "", "C"), ("G", "ASN", "1", "", "ND2", "", "", "", "N"), 1.8), "green")
+        if gemmi is None:
+            self.assertIsNone(aF.getSymmetryContacts())
+            return
+        #
+        # Each contact is listed once and the covalent bond recorded with its symmetry operator is excluded
+        self.assertEqual(aF.getSymmetryContacts(), [["D", "ZN", "1", "", "ZN", "", "1_555", "E", "ASP", "1", "", "OD1", "", "2_555", "1.500", "green"]])
+        self.assertEqual(aF.getCovalentBonds(), [["F", "NAG", "1", "", "C1", "", "1_555", "G", "ASN", "1", "", "ND2", "", "2_555", "one", "1.400", "covale1"]])
+        #
+        # Models without a crystal cell have no symmetry contacts
+        aF = AtomContactFinder(verbose=True, log=self.__lfh)
+        self.__writeModel(filePath, atomL, connL)
+        self.assertTrue(aF.read(filePath))
+        self.assertEqual(aF.getSymmetryOperators(), [])
+        self.assertEqual(aF.getSymmetryContacts(), [])
+        self.assertEqual(aF.getCovalentBonds()[0][15], "")
+
+    def testSymmetryOperatorOrder(self):
+        """Test space group operators are sorted into International Tables order -"""
+        opL = [parseSymmetryOperator(op) for op in ["x,y,z", "y,-x,z", "-x,-y,z", "-y,x,z", "y+1/2,-x+1/2,z+1/2", "x+1/2,y+1/2,z+1/2", "-y+1/2,x+1/2,z+1/2", "-x+1/2,-y+1/2,z+1/2"]]
+        rotL = [parseSymmetryOperator(op)[0] for op in ["x,y,z", "-x,-y,z", "-y,x,z", "y,-x,z"]]
+        sL = sortSymmetryOperators(opL)
+        for ii in range(8):
+            self.assertTrue(np.array_equal(sL[ii][0], rotL[ii % 4]))
+            self.assertTrue(np.allclose(sL[ii][1], [0.0, 0.0, 0.0] if ii < 4 else [0.5, 0.5, 0.5]))
+        #
+        rot, tran = parseSymmetryOperator("-y+1/2, x-y, z+2/3")
+        self.assertTrue(np.array_equal(rot, [[0, -1, 0], [1, -1, 0], [0, 0, 1]]))
+        self.assertTrue(np.allclose(tran, [0.5, 0.0, 2.0 / 3.0]))
+        self.assertIsNone(sortSymmetryOperators([parseSymmetryOperator("x,y,z"), parseSymmetryOperator("-x,-y,-z")]))
+        if gemmi is None:
+            return
+        #
+        for sgName, tripletL in [
+            ("P 43 21 2", ["x,y,z", "-x,-y,z+1/2", "-y+1/2,x+1/2,z+3/4", "y+1/2,-x+1/2,z+1/4", "-x+1/2,y+1/2,-z+3/4", "x+1/2,-y+1/2,-z+1/4", "y,x,-z", "-y,-x,-z+1/2"]),
+            ("H 3 2", ["x,y,z", "-y,x-y,z", "-x+y,-x,z", "y,x,-z", "x-y,-y,-z", "-x,-x+y,-z"]),
+            ("R 3 2:R", ["x,y,z", "z,x,y", "y,z,x", "-z,-y,-x", "-y,-x,-z", "-x,-z,-y"]),
+            ("P 21 3", ["x,y,z", "-x+1/2,-y,z+1/2", "-x,y+1/2,-z+1/2", "x+1/2,-y+1/2,-z", "z,x,y"]),
+            ("C 1 2 1", ["x,y,z", "-x,y,-z", "x+1/2,y+1/2,z", "-x+1/2,y+1/2,-z"]),
+        ]:
+            sg = gemmi.find_spacegroup_by_name(sgName)
+            sL = sortSymmetryOperators([(np.array(op.rot) / op.DEN, (np.array(op.tran) / op.DEN) % 1.0) for op in sg.operations()])
+            for (rot, tran), triplet in zip(sL, tripletL):
+                eRot, eTran = parseSymmetryOperator(triplet)
+                self.assertTrue(np.array_equal(rot, eRot), "%s %s" % (sgName, triplet))
+                self.assertTrue(np.allclose(tran, eTran % 1.0), "%s %s" % (sgName, triplet))
+            #
+        #
+
+    def __getReportRows(self, filePath, catName, symmetry):
+        io = IoAdapterPy(raiseExceptions=True)
+        cObj = io.readFile(filePath, selectList=[catName])[0].getObj(catName)
+        rowL = []
+        for ii in range(cObj.getRowCount()):
+            row = []
+            for num in ("1", "2"):
+                row.extend([cObj.getValue(name + "_" + num, ii) for name in ("auth_asym_id", "auth_comp_id", "auth_seq_id", "auth_atom_id")])
+                if symmetry:
+                    row.append(cObj.getValue("site_symmetry_" + num, ii))
+            row.append("%.2f" % float(cObj.getValue("dist", ii)))
+            rowL.append(row)
+        return sorted(rowL)
+
+    def __getContactRows(self, rowL, symmetry):
+        iL = [0, 1, 2, 4, 6, 7, 8, 9, 11, 13, 14] if symmetry else [0, 1, 2, 4, 6, 7, 8, 10, 12]
+        return sorted([[row[ii] for ii in iL[:-1]] + ["%.2f" % float(row[iL[-1]])] for row in rowL])
+
+    @unittest.skipIf(gemmi is None, "gemmi not installed")
+    def testToolReference(self):
+        """Test the contacts agree with the pdbx_validate_close_contact and pdbx_validate_symm_contact reports of the annotation tool -"""
+        for fileName, nSymm in [("3rer.cif", 0), ("4pdr.cif", 1)]:
+            filePath = os.path.join(HERE, "tests", fileName)
+            aF = AtomContactFinder(verbose=True, log=self.__lfh)
+            self.assertTrue(aF.read(filePath))
+            self.assertEqual(self.__getContactRows(aF.getCloseContacts(), False), self.__getReportRows(filePath, "pdbx_validate_close_contact", False))
+            symL = self.__getContactRows(aF.getSymmetryContacts(), True)
+            self.assertEqual(len(symL), nSymm)
+            if nSymm:
+                self.assertEqual(symL, self.__getReportRows(filePath, "pdbx_validate_symm_contact", True))
+            #
+        #
+
+    def testCloseContactEngine(self):
+        """Test the close contact service in process calculation and its fall back to the tool -"""
+        topPath = os.path.join(TESTOUTPUT, "close-contact-engine")
+        reqObj = InputRequest({}, verbose=True, log=self.__lfh)
+        reqObj.setValue("TopSessionPath", topPath)
+        sessionPath = reqObj.newSessionObj().getPath()
+        shutil.copyfile(os.path.join(HERE, "tests", "4pdr.cif"), os.path.join(sessionPath, "4pdr_model_P1.cif"))
+        _RcsbDpUtility.opList = []
+        with patch.object(GetCloseContactModule, "RcsbDpUtility", _RcsbDpUtility):
+            if gemmi is not None:
+                retD = GetCloseContactModule.GetCloseContact(reqObj=reqObj, verbose=True, log=self.__lfh).run("4pdr", "4pdr_model_P1.cif", engine="native")
+                self.assertEqual(retD["found"], "yes")
+                self.assertIn("B_GLY_67__N__B_HOH_317__O__1.992", retD["htmlcontent"])
+                self.assertIn("Contacts with symmetry related atoms", retD["htmlcontent"])
+                self.assertIn("3_555", retD["htmlcontent"])
+                self.assertEqual(_RcsbDpUtility.opList, [])
+            #
+            # Without the space group operators the tool is run
+            with patch.object(AtomContactFinderModule, "gemmi", None):
+                retD = GetCloseContactModule.GetCloseContact(reqObj=reqObj, verbose=True, log=self.__lfh).run("4pdr", "4pdr_model_P1.cif", engine="native")
+            self.assertEqual(retD["found"], "no")
+            self.assertEqual(_RcsbDpUtility.opList, ["annot-get-close-contact"])
+
+    def __makeLargeModel(self, filePath, nCopies):
+        """Write a model of nCopies translated copies of the test model with distinct chain ids"""
+        io = IoAdapterPy(raiseExceptions=True)
+        aObj = io.readFile(self.__modelFilePath, selectList=["atom_site"])[0].getObj("atom_site")
+        nameL = aObj.getAttributeList()
+        iX = nameL.index("Cartn_x")
+        iAsymL = [nameL.index("label_asym_id"), nameL.index("auth_asym_id")]
+        rowL = []
+        for iCopy in range(nCopies):
+            for row in aObj.getRowList():
+                newRow = list(row)
+                newRow[iX] = "%.3f" % (float(row[iX]) + 200.0 * iCopy)
+                for iAsym in iAsymL:
+                    newRow[iAsym] = row[iAsym] + str(iCopy)
+                rowL.append(newRow)
+        #
+        container = DataContainer("LARGE")
+        container.append(DataCategory("atom_site", nameL, rowL))
+        io.writeFile(filePath, [container])
+
+    def testContactBenchmark(self):
+        """Time the in process close contact search on a synthetic large model -"""
+        # Reference count from a single copy written the same way (without struct_conn)
+        filePath = os.path.join(TESTOUTPUT, "contact-large-model.cif")
+        self.__makeLargeModel(filePath, 1)
+        aF = AtomContactFinder(verbose=False, log=self.__lfh)
+        self.assertTrue(aF.read(filePath))
+        nCopyContacts = len(aF.getCloseContacts(cutoff=3.0))
+        #
+        nCopies = 30
+        self.__makeLargeModel(filePath, nCopies)
+        startTime = time.time()
+        aF = AtomContactFinder(verbose=False, log=self.__lfh)
+        self.assertTrue(aF.read(filePath))
+        ccL = aF.getCloseContacts(cutoff=3.0)
+        tD = aF.getTimings()
+        self.__lfh.write(
+            "Close contacts size %d bytes  %d contacts  read %.2f s  search %.2f s  total %.2f s\n"
+            % (os.path.getsize(filePath), len(ccL), tD["read"], tD["close_contact"], time.time() - startTime)
+        )
+        # Copies are far apart so every copy has the same contacts
+        self.assertEqual(len(ccL), nCopies * nCopyContacts)
+
+
+def suiteAtomContactFinderTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(AtomContactFinderTests("testFindAtomPairs"))
+    suiteSelect.addTest(AtomContactFinderTests("testModelContacts"))
+    suiteSelect.addTest(AtomContactFinderTests("testSymmetryContacts"))
+    suiteSelect.addTest(AtomContactFinderTests("testSymmetryOperatorOrder"))
+    suiteSelect.addTest(AtomContactFinderTests("testToolReference"))
+    suiteSelect.addTest(AtomContactFinderTests("testCloseContactEngine"))
+    suiteSelect.addTest(AtomContactFinderTests("testContactBenchmark"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteAtomContactFinderTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
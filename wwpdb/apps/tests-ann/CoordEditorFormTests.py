@@ -0,0 +1,142 @@
+##
+# File:    CoordEditorFormTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for reading chain objects from the coordinate editor entry JSON file by byte range.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import json
+import os
+import pickle
+import shutil
+import sys
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.ann_tasks_v2.editCoord.CoordEditorForm_v2 import CoordEditorForm
+from wwpdb.utils.session.WebRequest import InputRequest
+
+
+def _residue(name, seqNum, comment):
+    return {"Label": ["A", "A", name, str(seqNum), "?", "1", "1"], "comment": comment}
+
+
+class CoordEditorFormTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__topPath = os.path.join(TESTOUTPUT, "coord-editor")
+        if os.path.exists(self.__topPath):
+            shutil.rmtree(self.__topPath)
+        os.makedirs(self.__topPath)
+        self.__entryId = "D_1000000001"
+        self.__reqObj = InputRequest({}, verbose=True, log=self.__lfh)
+        self.__reqObj.setValue("TopSessionPath", self.__topPath)
+        self.__reqObj.setValue("entryid", self.__entryId)
+        sessionPath = self.__reqObj.newSessionObj().getPath()
+        self.__jsonPath = os.path.join(sessionPath, self.__entryId + "_Json")
+        os.makedirs(self.__jsonPath)
+        self.__entryJsonPath = os.path.join(self.__jsonPath, self.__entryId + ".json")
+
+    def __getEntryObj(self, info):
+        """Entry object with strings holding escaped quotes, braces, separators and multi-byte characters."""
+        return {
+            "info": info,
+            "1": {
+                "title": 'chain {"A"} , : } {',
+                "PDBChainID_A": {"entity_id": "1", "Polymer": [_residue("ALA", 1, 'quote " and \\\\ brace }'), _residue("GLY", 2, "Ångström {")]},
+                "count": [1, {"nested": "}"}],
+                "PDBChainID_B": {"Water": [_residue("HOH", 101, "}{,:")]},
+            },
+            "2": "not a molecule",
+            "3": {"PDBChainID_C": {"Nonpolymer": [_residue("ZN", 201, '\\"}')]}},
+        }
+
+    def __writeEntry(self, text, mtimeOffset=0):
+        with open(self.__entryJsonPath, "wb") as ofh:
+            ofh.write(text.encode("utf-8"))
+        tS = time.time() + mtimeOffset
+        os.utime(self.__entryJsonPath, (tS, tS))
+
+    def __getForm(self, identifier):
+        self.__reqObj.setValue("display_identifier", identifier)
+        return CoordEditorForm(reqObj=self.__reqObj, verbose=True, log=self.__lfh)
+
+    def __readChain(self, identifier):
+        # pylint: disable=protected-access
+        mol_idx, chainID = identifier.split("_")[1:]
+        return self.__getForm(identifier)._CoordEditorForm__readChainJSonObj(self.__entryJsonPath, mol_idx, chainID)
+
+    def testChainIndex(self):
+        """Test the chain byte ranges with quotes, braces and multi-byte characters inside strings -"""
+        entryObj = self.__getEntryObj("info")
+        self.__writeEntry(json.dumps(entryObj, ensure_ascii=False, indent=1))
+        self.assertEqual(self.__readChain("chain_1_A"), entryObj["1"]["PDBChainID_A"])
+        self.assertEqual(self.__readChain("chain_1_B"), entryObj["1"]["PDBChainID_B"])
+        self.assertEqual(self.__readChain("chain_3_C"), entryObj["3"]["PDBChainID_C"])
+        self.assertIsNone(self.__readChain("chain_1_C"))
+        self.assertIsNone(self.__readChain("chain_2_A"))
+        with open(os.path.join(self.__jsonPath, self.__entryId + "_chain_index.json"), "r") as ifh:
+            self.assertEqual(sorted(json.load(ifh)["chains"].keys()), ["1", "3"])
+        #
+        self.assertTrue(self.__getForm("chain_1_A").run())
+        with open(os.path.join(self.__jsonPath, "1_A.pickle"), "rb") as ifh:
+            chainObj = pickle.load(ifh)
+        self.assertEqual(chainObj["Polymer"]["Residue"], ["1_A_A_1__1", "1_A_A_2__1"])
+        self.assertEqual(chainObj["1_A_A_2__1"]["comment"], "Ångström {")
+
+    def testChangedFile(self):
+        """Test the index is rebuilt when entryId.json file is replaced by a file of the same size -"""
+        entryObj = self.__getEntryObj("x" * 40)
+        text1 = json.dumps(entryObj, ensure_ascii=False)
+        self.__writeEntry(text1)
+        self.assertEqual(self.__readChain("chain_1_B"), entryObj["1"]["PDBChainID_B"])
+        # Same byte size with the chain objects at other positions
+        entryObj = self.__getEntryObj("")
+        entryObj["tail"] = ""
+        text2 = json.dumps(entryObj, ensure_ascii=False)
+        entryObj["tail"] = "y" * (len(text1.encode("utf-8")) - len(text2.encode("utf-8")))
+        text2 = json.dumps(entryObj, ensure_ascii=False)
+        self.assertEqual(len(text1.encode("utf-8")), len(text2.encode("utf-8")))
+        self.__writeEntry(text2, mtimeOffset=10)
+        self.assertEqual(self.__readChain("chain_1_B"), entryObj["1"]["PDBChainID_B"])
+        self.assertEqual(self.__readChain("chain_1_A"), entryObj["1"]["PDBChainID_A"])
+        # An index which no longer matches the file content is rebuilt when it is read
+        with open(self.__entryJsonPath, "rb") as ifh:
+            text3 = ifh.read().decode("utf-8").replace('"info": ""', '"info": "", "pad": 0')
+        self.__writeEntry(text3)
+        st = os.stat(self.__entryJsonPath)
+        indexPath = os.path.join(self.__jsonPath, self.__entryId + "_chain_index.json")
+        with open(indexPath, "r") as ifh:
+            indexObj = json.load(ifh)
+        indexObj["stamp"] = [st.st_size, st.st_mtime_ns]
+        with open(indexPath, "w") as ofh:
+            json.dump(indexObj, ofh)
+        self.assertEqual(self.__readChain("chain_1_A"), entryObj["1"]["PDBChainID_A"])
+
+
+def suiteCoordEditorFormTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(CoordEditorFormTests("testChainIndex"))
+    suiteSelect.addTest(CoordEditorFormTests("testChangedFile"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteCoordEditorFormTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
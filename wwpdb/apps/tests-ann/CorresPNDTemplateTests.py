@@ -0,0 +1,204 @@
+##
+# File:    CorresPNDTemplateTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the correspondence template - the entry summary is reused until its input files or the program which makes it change.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+try:
+    from unittest.mock import patch
+except ImportError:  # pragma: no cover
+    from mock import patch
+
+from wwpdb.apps.ann_tasks_v2.correspnd import CorresPNDTemplate as CorresModule
+from wwpdb.utils.session.WebRequest import InputRequest
+
+_TOOLS_PATH = os.path.join(TESTOUTPUT, "corres-template", "annot-tools")
+
+_LETTER_TEMPLATE = """data_template
+loop_
+_letter_template.type
+_letter_template.text
+header 'Dear %(author)s, %(pdbid)s'
+major M
+major_release MR
+major_minor_addition MMA
+minor m
+release_hold H
+release_hpub HP
+release_rel R
+release_repl_rel RR
+release_unknown U
+pre_release_yes PY
+pre_release_no PN
+signature S
+encourage_xray EX
+#
+loop_
+_value_mapping.token
+_value_mapping.text
+title_missing 'Title is missing'
+#
+loop_
+_rcsb_question_category.question
+_rcsb_question_category.major_flag
+_rcsb_question_category.text
+Sequence n 'seq %(pdbid)s'
+#
+loop_
+_token_question_mapping.token
+_token_question_mapping.from_corres_info
+_token_question_mapping.question
+pdbid y .
+entryid y .
+emdbid y .
+title y .
+title_em y .
+author y .
+author_em y .
+status_em y .
+author_release_status_code y .
+author_release_sequence_code y .
+reported_completeness y .
+"""
+
+_CORRES_INFO = """data_corres
+_correspondence_information.pdbid 1ABC
+_correspondence_information.author 'Smith, J.'
+_correspondence_information.author_release_status_code HOLD
+_correspondence_information.author_release_sequence_code 'RELEASE NOW'
+#
+loop_
+_missing_value_items.name
+title_missing
+"""
+
+
+def _write(filePath, text):
+    with open(filePath, "w") as ofh:
+        ofh.write(text)
+
+
+class _RcsbDpUtility(object):
+    """Writes a fixed correspondence information file and counts the program runs."""
+
+    opList = []
+
+    def __init__(self, tmpPath=".", siteId=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        pass
+
+    def imp(self, inpPath):
+        pass
+
+    def op(self, opName):
+        _RcsbDpUtility.opList.append(opName)
+
+    def exp(self, outPath):
+        _write(outPath, _CORRES_INFO)
+
+    def expLog(self, logPath):
+        _write(logPath, "Finished!\n")
+
+    def cleanup(self):
+        pass
+
+
+class _ConfigInfoAppCommon(object):
+    def __init__(self, siteId=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        pass
+
+    def get_site_annot_tools_path(self):
+        return _TOOLS_PATH
+
+
+class CorresPNDTemplateTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__topPath = os.path.join(TESTOUTPUT, "corres-template")
+        if os.path.exists(self.__topPath):
+            shutil.rmtree(self.__topPath)
+        templatePath = os.path.join(self.__topPath, "templates")
+        os.makedirs(templatePath)
+        _write(os.path.join(templatePath, "correspondence_templt.cif"), _LETTER_TEMPLATE)
+        _write(os.path.join(templatePath, "correspondence_ligand_templt.html"), "ligand\n")
+        _write(os.path.join(templatePath, "correspondence_content_templt.html"), "%(rows)s\n")
+        os.makedirs(os.path.join(_TOOLS_PATH, "bin"))
+        self.__toolPath = os.path.join(_TOOLS_PATH, "bin", "GetCorresInfo")
+        _write(self.__toolPath, "version 1\n")
+        #
+        self.__entryId = "D_1000000001"
+        self.__reqObj = InputRequest({}, verbose=True, log=self.__lfh)
+        self.__reqObj.setValue("TopSessionPath", self.__topPath)
+        self.__reqObj.setValue("TemplatePath", self.__topPath)
+        self.__reqObj.setValue("entryid", self.__entryId)
+        self.__reqObj.setValue("entryfilename", self.__entryId + "_model_P1.cif")
+        self.__sessionPath = self.__reqObj.newSessionObj().getPath()
+        _write(os.path.join(self.__sessionPath, self.__entryId + "_model_P1.cif"), "data_model\n")
+        _RcsbDpUtility.opList = []
+        CorresModule.CorresPNDTemplate.clearCache()
+        self.__patchL = [patch.object(CorresModule, "RcsbDpUtility", _RcsbDpUtility), patch.object(CorresModule, "ConfigInfoAppCommon", _ConfigInfoAppCommon)]
+        for pt in self.__patchL:
+            pt.start()
+
+    def tearDown(self):
+        for pt in self.__patchL:
+            pt.stop()
+        CorresModule.CorresPNDTemplate.clearCache()
+
+    def __get(self):
+        return CorresModule.CorresPNDTemplate(reqObj=self.__reqObj, verbose=True, log=self.__lfh).get()
+
+    def testSummaryCache(self):
+        """Test the summary is reused for unchanged inputs and made again after the model file or the program changes -"""
+        text = self.__get()
+        with open(os.path.join(self.__sessionPath, self.__entryId + "_correspondence-to-depositor_P1.txt"), "r") as ifh:
+            self.assertIn("Dear Smith, J., 1ABC", ifh.read())
+        self.assertEqual(len(_RcsbDpUtility.opList), 1)
+        self.assertTrue(os.access(os.path.join(self.__sessionPath, "corres-info-summary_" + self.__entryId + "_model_P1.json"), os.R_OK))
+        # Cache hit
+        self.assertEqual(self.__get(), text)
+        self.assertEqual(len(_RcsbDpUtility.opList), 1)
+        # The model file changes
+        _write(os.path.join(self.__sessionPath, self.__entryId + "_model_P1.cif"), "data_model\n# changed\n")
+        self.assertEqual(self.__get(), text)
+        self.assertEqual(len(_RcsbDpUtility.opList), 2)
+        self.__get()
+        self.assertEqual(len(_RcsbDpUtility.opList), 2)
+        # The program is updated
+        _write(self.__toolPath, "version 2 - new checks\n")
+        self.assertEqual(self.__get(), text)
+        self.assertEqual(_RcsbDpUtility.opList, ["annot-get-corres-info"] * 3)
+        self.__get()
+        self.assertEqual(len(_RcsbDpUtility.opList), 3)
+
+
+def suiteCorresPNDTemplateTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(CorresPNDTemplateTests("testSummaryCache"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteCorresPNDTemplateTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
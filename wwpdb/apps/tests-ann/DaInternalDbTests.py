@@ -0,0 +1,236 @@
+##
+# File:    DaInternalDbTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the da_internal database_2 lookups - batched queries, the id cache, connection release and related entry updates.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sqlite3
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+try:
+    from unittest.mock import patch
+except ImportError:  # pragma: no cover
+    from mock import patch
+
+from mmcif.api.DataCategory import DataCategory
+from mmcif.api.PdbxContainers import DataContainer
+from mmcif.io.IoAdapterPy import IoAdapterPy as IoAdapter
+
+try:
+    from wwpdb.apps.ann_tasks_v2.related import DaInternalDb as DaInternalDbModule
+    from wwpdb.apps.ann_tasks_v2.related import UpdateRelated as UpdateRelatedModule
+except ImportError:  # database dependencies not installed
+    DaInternalDbModule = None
+    UpdateRelatedModule = None
+
+
+class _MyConnectionBase(object):
+    """Connections to an in-memory SQLite database_2 table."""
+
+    dbCon = None
+    openCount = 0
+    closeCount = 0
+    queryArgsL = []
+
+    def __init__(self, siteId=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        pass
+
+    def setResource(self, resourceName=None):
+        pass
+
+    def openConnection(self):
+        _MyConnectionBase.openCount += 1
+        return True
+
+    def closeConnection(self):
+        _MyConnectionBase.closeCount += 1
+        return True
+
+    def getCursor(self):
+        return _Cursor(_MyConnectionBase.dbCon.cursor())
+
+
+class _Cursor(object):
+    """Adapts the MySQLdb parameter style to SQLite."""
+
+    def __init__(self, curs):
+        self.__curs = curs
+
+    def execute(self, query, args):
+        _MyConnectionBase.queryArgsL.append(args)
+        return self.__curs.execute(query.replace("%s", "?"), args)
+
+    def fetchone(self):
+        return self.__curs.fetchone()
+
+    def close(self):
+        self.__curs.close()
+
+
+class _Clock(object):
+    now = 1000.0
+
+    @classmethod
+    def time(cls):
+        return cls.now
+
+
+@unittest.skipIf(DaInternalDbModule is None, "database dependencies not installed")
+class DaInternalDbTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        _MyConnectionBase.dbCon = sqlite3.connect(":memory:")
+        _MyConnectionBase.dbCon.execute("create table database_2 (Structure_id text, database_id text, database_code text)")
+        # Every third deposition has no assignments
+        self.__idList = ["D_%d" % (1000000000 + ii) for ii in range(1201)]
+        rowL = []
+        for ii, idCode in enumerate(self.__idList):
+            if ii % 3:
+                rowL.append((idCode, "PDB", "%dXYZ" % ii))
+                rowL.append((idCode, "EMDB", "EMD-%d" % ii))
+        _MyConnectionBase.dbCon.executemany("insert into database_2 values (?,?,?)", rowL)
+        _MyConnectionBase.openCount = 0
+        _MyConnectionBase.closeCount = 0
+        _MyConnectionBase.queryArgsL = []
+        _Clock.now = 1000.0
+        DaInternalDbModule.DaInternalDb.clearCache()
+        self.__patchL = [patch.object(DaInternalDbModule, "MyConnectionBase", _MyConnectionBase), patch.object(DaInternalDbModule, "time", _Clock)]
+        for pt in self.__patchL:
+            pt.start()
+
+    def tearDown(self):
+        for pt in self.__patchL:
+            pt.stop()
+        DaInternalDbModule.DaInternalDb.clearCache()
+        _MyConnectionBase.dbCon.close()
+
+    def testBatches(self):
+        """Test an id list longer than one query batch is resolved with one query per batch -"""
+        dai = DaInternalDbModule.DaInternalDb()
+        retD = dai.getDatabase2Many(self.__idList + self.__idList[:10])
+        dai.close()
+        self.assertEqual(len(retD), 1201)
+        self.assertEqual([len(args) for args in _MyConnectionBase.queryArgsL], [500, 500, 201])
+        self.assertEqual(retD["D_1000000001"], {"PDB": "1XYZ", "EMDB": "EMD-1"})
+        self.assertEqual(retD["D_1000001200"], {})
+        self.assertEqual(retD["D_1000001199"], {"PDB": "1199XYZ", "EMDB": "EMD-1199"})
+        self.assertEqual(_MyConnectionBase.openCount, 1)
+
+    def testCache(self):
+        """Test resolved ids are served from the cache until they expire and ids without assignments are not cached -"""
+        idList = self.__idList[:6]
+        dai = DaInternalDbModule.DaInternalDb(cacheTtl=600)
+        retD = dai.getDatabase2Many(idList)
+        self.assertEqual(_MyConnectionBase.queryArgsL, [tuple(idList)])
+        # A new instance uses the same cache
+        _MyConnectionBase.queryArgsL = []
+        _Clock.now += 600
+        dai = DaInternalDbModule.DaInternalDb(cacheTtl=600)
+        self.assertEqual(dai.getDatabase2Many(idList), retD)
+        self.assertEqual(_MyConnectionBase.queryArgsL, [("D_1000000000", "D_1000000003")])
+        self.assertEqual(dai.getDatabase2("D_1000000002"), {"PDB": "2XYZ", "EMDB": "EMD-2"})
+        self.assertEqual(len(_MyConnectionBase.queryArgsL), 1)
+        # Expired entries are read again
+        _MyConnectionBase.queryArgsL = []
+        _Clock.now += 1
+        self.assertEqual(dai.getDatabase2("D_1000000002"), {"PDB": "2XYZ", "EMDB": "EMD-2"})
+        self.assertEqual(_MyConnectionBase.queryArgsL, [("D_1000000002",)])
+        # A change is seen at once without the cache
+        _MyConnectionBase.queryArgsL = []
+        _MyConnectionBase.dbCon.execute("update database_2 set database_code = '2ABC' where Structure_id = 'D_1000000002' and database_id = 'PDB'")
+        self.assertEqual(dai.getDatabase2("D_1000000002")["PDB"], "2XYZ")
+        dai = DaInternalDbModule.DaInternalDb(cacheTtl=0)
+        self.assertEqual(dai.getDatabase2("D_1000000002")["PDB"], "2ABC")
+        self.assertEqual(len(_MyConnectionBase.queryArgsL), 1)
+
+    def testClose(self):
+        """Test the connection is opened on first use and returned by close() -"""
+        dai = DaInternalDbModule.DaInternalDb(cacheTtl=0)
+        self.assertEqual(_MyConnectionBase.openCount, 0)
+        dai.getDatabase2("D_1000000001")
+        dai.getDatabase2("D_1000000002")
+        self.assertEqual((_MyConnectionBase.openCount, _MyConnectionBase.closeCount), (1, 0))
+        dai.close()
+        self.assertEqual(_MyConnectionBase.closeCount, 1)
+        dai.close()
+        self.assertEqual(_MyConnectionBase.closeCount, 1)
+        # A further lookup opens a new connection
+        self.assertEqual(dai.getDatabase2("D_1000000001"), {"PDB": "1XYZ", "EMDB": "EMD-1"})
+        self.assertEqual(_MyConnectionBase.openCount, 2)
+        dai.close()
+        self.assertEqual(_MyConnectionBase.closeCount, 2)
+
+    def testUpdateRelated(self):
+        """Test deposition ids in pdbx_database_related are replaced and only that category is rewritten -"""
+        topPath = os.path.join(TESTOUTPUT, "da-internal-db")
+        if os.path.exists(topPath):
+            shutil.rmtree(topPath)
+        os.makedirs(topPath)
+        inpPath = os.path.join(topPath, "D_1000000005_model_P1.cif")
+        outPath = os.path.join(topPath, "D_1000000005_model-updated_P1.cif")
+        logPath = os.path.join(topPath, "related.log")
+        container = DataContainer("D_1000000005")
+        container.append(DataCategory("entry", ["id"], [["D_1000000005"]]))
+        container.append(
+            DataCategory(
+                "pdbx_database_related",
+                ["db_name", "db_id", "content_type"],
+                [["PDB", "D_1000000001", "unspecified"], ["EMDB", "D_1000000001", "associated EM volume"], ["BMRB", "D_1000000002", "unspecified"], ["PDB", "1ABC", "unspecified"]],
+            )
+        )
+        container.append(DataCategory("atom_site", ["id", "type_symbol"], [["1", "C"], ["2", "N"]]))
+        IoAdapter(raiseExceptions=True).writeFile(inpPath, [container])
+        #
+        uR = UpdateRelatedModule.UpdateRelated(verbose=True, log=self.__lfh)
+        self.assertTrue(uR.updateRelatedEntries(inpPath, outPath, logPath))
+        self.assertEqual(_MyConnectionBase.queryArgsL, [("D_1000000001", "D_1000000002")])
+        self.assertEqual(_MyConnectionBase.closeCount, 1)
+        outContainer = IoAdapter(raiseExceptions=True).readFile(outPath)[0]
+        self.assertEqual(outContainer.getObjNameList(), container.getObjNameList())
+        self.assertEqual(outContainer.getObj("pdbx_database_related").getAttributeValueList("db_id"), ["1XYZ", "EMD-1", "D_1000000002", "1ABC"])
+        self.assertEqual(outContainer.getObj("atom_site").getRowCount(), 2)
+        with open(logPath, "r") as ifh:
+            self.assertIn("database_2 info for D_1000000002 does not contain BMRB id", ifh.read())
+        #
+        # Nothing to update - no file is written
+        os.remove(outPath)
+        self.assertFalse(uR.updateRelatedEntries(inpPath.replace("_model_", "_model-missing_"), outPath, logPath))
+        container.getObj("pdbx_database_related").setValue("D_1000000000", "db_id", 0)
+        container.getObj("pdbx_database_related").setValue("D_1000000000", "db_id", 1)
+        IoAdapter(raiseExceptions=True).writeFile(inpPath, [container])
+        self.assertFalse(uR.updateRelatedEntries(inpPath, outPath, logPath))
+        self.assertFalse(os.access(outPath, os.F_OK))
+
+
+def suiteDaInternalDbTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(DaInternalDbTests("testBatches"))
+    suiteSelect.addTest(DaInternalDbTests("testCache"))
+    suiteSelect.addTest(DaInternalDbTests("testClose"))
+    suiteSelect.addTest(DaInternalDbTests("testUpdateRelated"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteDaInternalDbTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,130 @@
+##
+# File:    DetachStatusTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the status record and completion wait of detached operations.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import threading
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.ann_tasks_v2.utils.DetachStatus import DetachStatus
+
+
+class _SessionObj(object):
+    def __init__(self, sessionPath):
+        self.__sessionPath = sessionPath
+
+    def getPath(self):
+        return self.__sessionPath
+
+
+class _Request(object):
+    """Semaphore and session of a request as set by DetachUtils."""
+
+    def __init__(self, sessionPath, semaphore):
+        self.__sessionObj = _SessionObj(sessionPath)
+        self.__semaphore = semaphore
+
+    def getSemaphore(self):
+        return self.__semaphore
+
+    def getSessionObj(self):
+        return self.__sessionObj
+
+
+class DetachStatusTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__sessionPath = os.path.join(TESTOUTPUT, "detach-status")
+        if os.path.exists(self.__sessionPath):
+            shutil.rmtree(self.__sessionPath)
+        os.makedirs(self.__sessionPath)
+
+    def __post(self, semaphore, value="OK"):
+        with open(os.path.join(self.__sessionPath, semaphore), "w") as ofh:
+            ofh.write("%s\n" % value)
+
+    def testStage(self):
+        """Test stages reported by the detached operation and the initial stage recorded by the request -"""
+        self.assertIsNone(DetachStatus.fromRequest(_Request(self.__sessionPath, "")))
+        dS = DetachStatus.fromRequest(_Request(self.__sessionPath, "TMP_20261018000001"), verbose=True, log=self.__lfh)
+        self.assertEqual(dS.getStatus(), {"stage": "running", "elapsed": 0.0})
+        self.assertTrue(dS.setStage("generating coordinate data"))
+        time.sleep(0.1)
+        # The initial stage does not replace a stage already reported by the operation
+        self.assertTrue(dS.setStage("starting", replace=False))
+        self.assertTrue(dS.setStage("indexing chains"))
+        stD = DetachStatus(self.__sessionPath, "TMP_20261018000001").getStatus()
+        self.assertEqual(stD["stage"], "indexing chains")
+        self.assertGreaterEqual(stD["elapsed"], 0.1)
+        self.assertEqual(dS.getRetryAfter(), 1.0)
+
+    def testWait(self):
+        """Test the wait ends when the semaphore is posted and is limited by default -"""
+        dS = DetachStatus(self.__sessionPath, "TMP_20261018000002", verbose=True, log=self.__lfh)
+        self.assertEqual(dS.getWaitTime(30), 2.0)
+        self.assertEqual(dS.getWaitTime("30", maxWait="5"), 5.0)
+        self.assertEqual(dS.getWaitTime(30, maxWait=0), 0.0)
+        self.assertEqual(dS.getWaitTime("0.5"), 0.5)
+        self.assertEqual(dS.getWaitTime(None, maxWait=30), 0.0)
+        self.assertEqual(dS.getWaitTime("x"), 0.0)
+        #
+        startTime = time.time()
+        self.assertFalse(dS.waitFor(0.0))
+        self.assertFalse(dS.waitFor(0.3))
+        self.assertGreaterEqual(time.time() - startTime, 0.3)
+        tH = threading.Timer(0.2, self.__post, ["TMP_20261018000002"])
+        tH.start()
+        startTime = time.time()
+        self.assertTrue(dS.waitFor(10.0))
+        self.assertLess(time.time() - startTime, 2.0)
+        tH.join()
+        self.assertTrue(dS.isDone())
+
+    def testCleanup(self):
+        """Test status records are removed once the operation has completed -"""
+        for ii in range(3):
+            DetachStatus(self.__sessionPath, "TMP_2026101800001%d" % ii).setStage("running")
+        self.__post("TMP_20261018000010")
+        self.__post("TMP_20261018000011", "FAIL")
+        self.assertEqual(DetachStatus.removeCompleted(self.__sessionPath), 2)
+        self.assertEqual(sorted(fN for fN in os.listdir(self.__sessionPath) if fN.endswith(".status")), ["TMP_20261018000012.status"])
+        dS = DetachStatus(self.__sessionPath, "TMP_20261018000012")
+        dS.clear()
+        dS.clear()
+        self.assertEqual([fN for fN in os.listdir(self.__sessionPath) if fN.endswith(".status")], [])
+        self.assertEqual(DetachStatus.removeCompleted(os.path.join(self.__sessionPath, "missing")), 0)
+
+
+def suiteDetachStatusTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(DetachStatusTests("testStage"))
+    suiteSelect.addTest(DetachStatusTests("testWait"))
+    suiteSelect.addTest(DetachStatusTests("testCleanup"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteDetachStatusTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
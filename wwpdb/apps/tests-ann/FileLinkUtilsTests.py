@@ -0,0 +1,128 @@
+##
+# File:    FileLinkUtilsTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for placing files by hard link, symbolic link or copy.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.ann_tasks_v2.utils.FileLinkUtils import FileLinkUtils
+
+
+class FileLinkUtilsTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__topPath = os.path.join(TESTOUTPUT, "file-link-utils")
+        if os.path.exists(self.__topPath):
+            shutil.rmtree(self.__topPath)
+        self.__archivePath = os.path.join(self.__topPath, "archive", "D_1000000001")
+        self.__downloadPath = os.path.join(self.__topPath, "sessions", "downloads")
+        os.makedirs(self.__archivePath)
+        self.__srcPath = os.path.join(self.__archivePath, "D_1000000001_model_P1.cif.V1")
+        self.__dstPath = os.path.join(self.__downloadPath, "D_1000000001_model_P1.cif.V1")
+        self.__write(self.__srcPath, "data_source\n")
+
+    def __write(self, filePath, text):
+        with open(filePath, "w") as ofh:
+            ofh.write(text)
+
+    def __read(self, filePath):
+        with open(filePath, "r") as ifh:
+            return ifh.read()
+
+    def testHardlink(self):
+        """Test placing a file by hard link -"""
+        fL = FileLinkUtils(strategyList=["hardlink", "copy"], verbose=True, log=self.__lfh)
+        self.assertEqual(fL.place(self.__srcPath, self.__dstPath), "hardlink")
+        self.assertTrue(fL.isSameFile(self.__srcPath, self.__dstPath))
+        self.assertFalse(os.path.islink(self.__dstPath))
+        self.assertEqual(fL.place(self.__srcPath, self.__dstPath), "current")
+        self.assertEqual(fL.place(self.__srcPath, self.__srcPath), "same")
+        # A link is not current when the content must not be shared
+        self.assertFalse(fL.isCurrent(self.__srcPath, self.__dstPath, shareContent=False))
+        self.assertEqual(fL.place(self.__srcPath, self.__dstPath, shareContent=False), "copy")
+        self.assertFalse(fL.isSameFile(self.__srcPath, self.__dstPath))
+
+    def testSymlink(self):
+        """Test placing a file by symbolic link to the resolved source -"""
+        fL = FileLinkUtils(strategyList=["symlink", "copy"], verbose=True, log=self.__lfh)
+        self.assertEqual(fL.place(self.__srcPath, self.__dstPath), "symlink")
+        self.assertTrue(os.path.islink(self.__dstPath))
+        self.assertEqual(os.readlink(self.__dstPath), os.path.realpath(self.__srcPath))
+        self.assertEqual(self.__read(self.__dstPath), "data_source\n")
+        self.assertEqual(fL.place(self.__srcPath, self.__dstPath, shareContent=False), "copy")
+        self.assertFalse(os.path.islink(self.__dstPath))
+
+    def testCopyFallback(self):
+        """Test that unusable strategies fall back to a copy -"""
+        fL = FileLinkUtils(strategyList=["no-such-strategy", "hardlink", "symlink", "copy"], verbose=True, log=self.__lfh)
+        self.assertEqual(fL.place(self.__srcPath, self.__dstPath, shareContent=False), "copy")
+        self.assertTrue(fL.isCurrent(self.__srcPath, self.__dstPath, shareContent=False))
+        self.assertIsNone(FileLinkUtils(strategyList=["no-such-strategy"], log=self.__lfh).place(self.__srcPath, self.__dstPath, skipCurrent=False))
+        self.assertIsNone(fL.place(os.path.join(self.__archivePath, "missing.cif.V1"), self.__dstPath, shareContent=False))
+
+    def testWriteToCopy(self):
+        """Test that a write to the download copy does not change the source -"""
+        fL = FileLinkUtils(strategyList=["hardlink", "symlink", "copy"], verbose=False, log=self.__lfh)
+        # A previously linked download is replaced rather than written through
+        self.assertEqual(fL.place(self.__srcPath, self.__dstPath), "hardlink")
+        self.assertEqual(fL.place(self.__srcPath, self.__dstPath, shareContent=False), "copy")
+        self.__write(self.__dstPath, "data_changed\n")
+        self.assertEqual(self.__read(self.__srcPath), "data_source\n")
+        with open(self.__dstPath, "a") as ofh:
+            ofh.write("_exptl.method ?\n")
+        self.assertEqual(self.__read(self.__srcPath), "data_source\n")
+
+    def testIsUnderPath(self):
+        """Test source location checks resolve symbolic links -"""
+        fL = FileLinkUtils(log=self.__lfh)
+        sessionFilePath = os.path.join(self.__downloadPath, "D_1000000001_special-position-report_P1.txt.V1")
+        os.makedirs(self.__downloadPath)
+        self.__write(sessionFilePath, "report\n")
+        os.makedirs(self.__archivePath + "-other")
+        self.assertTrue(fL.isUnderPath(self.__srcPath, [None, self.__archivePath]))
+        self.assertFalse(fL.isUnderPath(sessionFilePath, [self.__archivePath]))
+        self.assertFalse(fL.isUnderPath(self.__archivePath, [self.__archivePath]))
+        self.assertFalse(fL.isUnderPath(os.path.join(self.__archivePath + "-other", "x.cif.V1"), [self.__archivePath]))
+        # A session path linking into the archive resolves into the archive and the reverse does not
+        linkPath = os.path.join(self.__downloadPath, "linked.cif.V1")
+        os.symlink(self.__srcPath, linkPath)
+        self.assertTrue(fL.isUnderPath(linkPath, [self.__archivePath]))
+        archiveLinkPath = os.path.join(self.__archivePath, "linked-report.txt.V1")
+        os.symlink(sessionFilePath, archiveLinkPath)
+        self.assertFalse(fL.isUnderPath(archiveLinkPath, [self.__archivePath]))
+
+
+def suiteFileLinkUtilsTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(FileLinkUtilsTests("testHardlink"))
+    suiteSelect.addTest(FileLinkUtilsTests("testSymlink"))
+    suiteSelect.addTest(FileLinkUtilsTests("testCopyFallback"))
+    suiteSelect.addTest(FileLinkUtilsTests("testWriteToCopy"))
+    suiteSelect.addTest(FileLinkUtilsTests("testIsUnderPath"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteFileLinkUtilsTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
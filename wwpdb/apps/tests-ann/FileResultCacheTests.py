@@ -0,0 +1,109 @@
+##
+# File:    FileResultCacheTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the content-addressed result file cache.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.ann_tasks_v2.utils.FileResultCache import FileResultCache
+
+
+class FileResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__workPath = os.path.join(TESTOUTPUT, "file-result-cache")
+        if os.path.exists(self.__workPath):
+            shutil.rmtree(self.__workPath)
+        os.makedirs(self.__workPath)
+        self.__cachePath = os.path.join(self.__workPath, "cache")
+        self.__inpPath = os.path.join(self.__workPath, "inp.cif")
+        with open(self.__inpPath, "w") as ofh:
+            ofh.write("data_test\n_entry.id TEST\n")
+
+    def tearDown(self):
+        pass
+
+    def __write(self, fileName, text):
+        filePath = os.path.join(self.__workPath, fileName)
+        with open(filePath, "w") as ofh:
+            ofh.write(text)
+        return filePath
+
+    def testStoreFetch(self):
+        """Test storing and restoring result files"""
+        fC = FileResultCache(self.__cachePath, verbose=True, log=self.__lfh)
+        stD0 = fC.getStats()
+        key = fC.makeKey([self.__inpPath], {"version": "V5"})
+        self.assertNotEqual(key, fC.makeKey([self.__inpPath], {"version": "V4"}))
+        self.assertIsNone(fC.fetch(key, {}))
+        #
+        rptPath = self.__write("report.txt", "report text")
+        self.assertTrue(fC.store(key, {"report": rptPath, "log": None}, metaD={"reportSize": 11}))
+        os.remove(rptPath)
+        stalePath = self.__write("log.txt", "stale")
+        metaD = fC.fetch(key, {"report": rptPath, "log": stalePath})
+        self.assertEqual(metaD["reportSize"], 11)
+        with open(rptPath, "r") as ifh:
+            self.assertEqual(ifh.read(), "report text")
+        # A role not stored with the entry must not leave an old file behind
+        self.assertFalse(os.path.exists(stalePath))
+        #
+        stD = fC.getStats()
+        self.assertEqual(stD["hits"] - stD0["hits"], 1)
+        self.assertEqual(stD["misses"] - stD0["misses"], 1)
+        #
+        with open(self.__inpPath, "a") as ofh:
+            ofh.write("_entry.details changed\n")
+        self.assertNotEqual(key, fC.makeKey([self.__inpPath], {"version": "V5"}))
+
+    def testEviction(self):
+        """Test least recently used entries are evicted to respect the size bound"""
+        fC = FileResultCache(self.__cachePath, maxSize=350, verbose=True, log=self.__lfh)
+        keyL = []
+        for ii in range(3):
+            filePath = self.__write("out-%d.txt" % ii, str(ii) * 100)
+            key = fC.makeKey([filePath])
+            keyL.append(key)
+            fC.store(key, {"out": filePath})
+            # Keep access times distinct
+            time.sleep(0.05)
+            if ii == 1:
+                # Touch the first entry so the second becomes the oldest
+                self.assertIsNotNone(fC.fetch(keyL[0], {"out": os.path.join(self.__workPath, "restored.txt")}))
+        self.assertIsNotNone(fC.fetch(keyL[0], {}))
+        self.assertIsNone(fC.fetch(keyL[1], {}))
+        self.assertIsNotNone(fC.fetch(keyL[2], {}))
+
+
+def suiteFileResultCacheTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(FileResultCacheTests("testStoreFetch"))
+    suiteSelect.addTest(FileResultCacheTests("testEviction"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteFileResultCacheTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,140 @@
+##
+# File:    ModelContextTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#   18-Oct-2026  Check and report readers serving one request parse the model file once
+##
+"""
+Tests for the request scoped model file context.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.utils.session.WebRequest import InputRequest
+
+from wwpdb.apps.ann_tasks_v2.check.EmMapCheck import EmMapCheckTask
+from wwpdb.apps.ann_tasks_v2.io.ModelContext import ModelContext
+from wwpdb.apps.ann_tasks_v2.report.PdbxReport import PdbxReport
+
+
+class ModelContextTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__modelFilePath = os.path.join(TESTOUTPUT, "model-context.cif")
+        shutil.copyfile(os.path.join(HERE, "tests", "3rer.cif"), self.__modelFilePath)
+
+    def tearDown(self):
+        pass
+
+    def testRequestContext(self):
+        """Test that the context is attached to the request object -"""
+        reqObj = InputRequest({})
+        mC = ModelContext.fromRequest(reqObj, verbose=True, log=self.__lfh)
+        self.assertIs(ModelContext.fromRequest(reqObj), mC)
+        self.assertIsNot(ModelContext.fromRequest(InputRequest({})), mC)
+
+    def testCategoryUnion(self):
+        """Test that declared and previously read categories are parsed together and reused -"""
+        mC = ModelContext(verbose=True, log=self.__lfh)
+        mC.require(self.__modelFilePath, ["pdbx_struct_assembly", "exptl"])
+        c0 = mC.getContainer(self.__modelFilePath, ["database_2"])
+        self.assertIsNotNone(c0.getObj("exptl"))
+        self.assertIsNotNone(c0.getObj("pdbx_struct_assembly"))
+        self.assertIsNone(c0.getObj("atom_site"))
+        self.assertEqual(mC.getStats()["parses"], 1)
+        for catList in (["exptl"], ["database_2", "pdbx_struct_assembly"]):
+            mC.getContainer(self.__modelFilePath, catList)
+        self.assertEqual(mC.getStats()["parses"], 1)
+        self.assertEqual(mC.getStats()["hits"], 2)
+        #
+        # A new category widens the parse -  a complete read satisfies all later requests
+        c0 = mC.getContainer(self.__modelFilePath, ["struct"])
+        self.assertIsNotNone(c0.getObj("database_2"))
+        mC.getContainer(self.__modelFilePath)
+        mC.getContainer(self.__modelFilePath, ["atom_site"])
+        sD = mC.getStats()
+        self.assertEqual(sD["parses"], 3)
+        self.assertEqual(sD["files"], {os.path.realpath(self.__modelFilePath): 3})
+        self.assertEqual(mC.getContainerList(os.path.join(TESTOUTPUT, "missing-model-context.cif")), [])
+
+    def testReadOnlyView(self):
+        """Test that category views do not expose modifying methods or internal rows -"""
+        mC = ModelContext(verbose=False, log=self.__lfh)
+        cObj = mC.getContainer(self.__modelFilePath, ["exptl"]).getObj("exptl")
+        self.assertTrue(cObj.getValue("method", 0))
+        self.assertRaises(AttributeError, getattr, cObj, "setValue")
+        self.assertRaises(AttributeError, getattr, cObj, "removeRow")
+        cObj.getRowList()[0][0] = "changed"
+        cObj.getRow(0)[0] = "changed"
+        self.assertNotEqual(mC.getContainer(self.__modelFilePath, ["exptl"]).getObj("exptl").getRow(0)[0], "changed")
+
+    def testChangedFile(self):
+        """Test that a file changed during the request is parsed again -"""
+        mC = ModelContext(verbose=False, log=self.__lfh)
+        self.assertTrue(mC.getContainer(self.__modelFilePath, ["exptl"]).getObj("exptl"))
+        time.sleep(0.01)
+        with open(self.__modelFilePath, "w") as ofh:
+            ofh.write("data_TEST\n_exptl.entry_id TEST\n_exptl.method 'SOLUTION NMR'\n")
+        self.assertEqual(mC.getContainer(self.__modelFilePath, ["exptl"]).getObj("exptl").getValue("method", 0), "SOLUTION NMR")
+        self.assertEqual(mC.getStats()["parses"], 2)
+
+    def __runRequest(self, requireModel):
+        """Readers of a check report request - the em_map check, the model report and the map display categories"""
+        reqObj = InputRequest({}, verbose=False, log=self.__lfh)
+        reqObj.setValue("TopSessionPath", TESTOUTPUT)
+        reqObj.setValue("TemplatePath", TESTOUTPUT)
+        reqObj.setValue("request_host", "localhost")
+        mC = ModelContext.fromRequest(reqObj, verbose=True, log=self.__lfh)
+        if requireModel:
+            mC.require(self.__modelFilePath)
+        #
+        checkTask = EmMapCheckTask(sessionPath=TESTOUTPUT, modelContext=mC, verbose=True, log=self.__lfh)
+        checkTask.run("3rer", self.__modelFilePath, os.path.join(TESTOUTPUT, "3rer_em-map-check-report_P1.txt.V1"))
+        pR = PdbxReport(reqObj, verbose=False, log=self.__lfh)
+        self.assertTrue(pR.makeTabularReport(filePath=self.__modelFilePath, contentType="model", idCode="3rer", layout="multiaccordion"))
+        pR.makeTabularReport(filePath=self.__modelFilePath, contentType="links-report", idCode="3rer", layout="multiaccordion")
+        self.assertTrue(mC.getContainer(self.__modelFilePath, ["em_map", "struct"]).getObj("struct"))
+        self.assertEqual(pR.getContainerCacheStats(), mC.getStats())
+        return mC.getStats()
+
+    def testRequestReaders(self):
+        """Test the check, report and display readers of a request share one parse of the model file -"""
+        sD = self.__runRequest(requireModel=True)
+        self.assertEqual(sD["files"], {os.path.realpath(self.__modelFilePath): 1})
+        self.assertEqual(sD["parses"], 1)
+        self.assertGreaterEqual(sD["hits"], 3)
+        # Without the declaration the complete report read parses the file again after the em_map check
+        sD = self.__runRequest(requireModel=False)
+        self.assertEqual(sD["parses"], 2)
+
+
+def suiteModelContextTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ModelContextTests("testRequestContext"))
+    suiteSelect.addTest(ModelContextTests("testCategoryUnion"))
+    suiteSelect.addTest(ModelContextTests("testReadOnlyView"))
+    suiteSelect.addTest(ModelContextTests("testChangedFile"))
+    suiteSelect.addTest(ModelContextTests("testRequestReaders"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteModelContextTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
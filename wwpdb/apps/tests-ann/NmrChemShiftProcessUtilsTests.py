@@ -0,0 +1,169 @@
+##
+# File:    NmrChemShiftProcessUtilsTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the chemical shift processing stages - order, skipping of unchanged steps and failed steps.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import json
+import os
+import shutil
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+try:
+    from unittest.mock import patch
+except ImportError:  # pragma: no cover
+    from mock import patch
+
+try:
+    from wwpdb.apps.ann_tasks_v2.nmr import NmrChemShiftProcessUtils as NmrModule
+except ImportError:  # NMR processing dependencies not installed
+    NmrModule = None
+
+
+def _write(filePath, text):
+    with open(filePath, "w") as ofh:
+        ofh.write(text)
+
+
+class _RcsbDpUtility(object):
+    """Records each operation and writes its output files."""
+
+    opList = []
+
+    def __init__(self, tmpPath=".", siteId=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        pass
+
+    def imp(self, inpPath):
+        pass
+
+    def addInput(self, name=None, value=None):
+        pass
+
+    def op(self, opName):
+        _RcsbDpUtility.opList.append(opName)
+
+    def expLog(self, logPath):
+        _write(logPath, "Finished!\n")
+
+    def exp(self, dstPath):
+        _write(dstPath, "data_%s\n" % _RcsbDpUtility.opList[-1].replace("-", "_"))
+        return True
+
+    def expList(self, dstPathList=None):
+        for dstPath in dstPathList:
+            self.exp(dstPath)
+        return True
+
+    def cleanup(self):
+        pass
+
+
+def _remediate(inpPath, outPath):
+    shutil.copyfile(inpPath, outPath)
+
+
+@unittest.skipIf(NmrModule is None, "NMR processing dependencies not installed")
+class NmrChemShiftProcessUtilsTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__workPath = os.path.join(TESTOUTPUT, "nmr-cs-process")
+        if os.path.exists(self.__workPath):
+            shutil.rmtree(self.__workPath)
+        os.makedirs(self.__workPath)
+        self.__modelPath = os.path.join(self.__workPath, "D_1000000001_model_P1.cif")
+        self.__csPath = os.path.join(self.__workPath, "D_1000000001_cs_P1.cif")
+        self.__reportPath = os.path.join(self.__workPath, "D_1000000001_cs-report_P1.json")
+        _write(self.__modelPath, "data_model\n")
+        _write(self.__csPath, "data_cs\n")
+        _RcsbDpUtility.opList = []
+        self.__patchL = [
+            patch.object(NmrModule, "RcsbDpUtility", _RcsbDpUtility),
+            patch.object(NmrModule, "remediate_cs_file", _remediate),
+            patch.object(NmrModule, "starToPdbx", _remediate),
+        ]
+        for pt in self.__patchL:
+            pt.start()
+
+    def tearDown(self):
+        for pt in self.__patchL:
+            pt.stop()
+
+    def __getUtils(self, modelPath):
+        csU = NmrModule.NmrChemShiftProcessUtils(verbose=True, log=self.__lfh)
+        csU.setWorkingDirPath(self.__workPath)
+        csU.setInputModelFileName(modelPath)
+        csU.setInputCsFileName(self.__csPath)
+        csU.setOutputModelFileName(os.path.join(self.__workPath, "D_1000000001_model-out_P1.cif"))
+        csU.setOutputCsFileName(os.path.join(self.__workPath, "D_1000000001_cs-out_P1.cif"))
+        csU.setOutputReportFileName(self.__reportPath)
+        csU.setOutputValidationFileList([os.path.join(self.__workPath, "D_1000000001_validation-data_P1.xml")])
+        return csU
+
+    def __getActions(self, csU):
+        return [(name, action) for name, action, _t in csU.getStageReport()]
+
+    def testStages(self):
+        """Test the processing steps run in order and unchanged steps are skipped on a later run -"""
+        csU = self.__getUtils(self.__modelPath)
+        csU.run()
+        self.assertEqual(_RcsbDpUtility.opList, ["annot-reorder-models", "annot-chem-shifts-update-with-check", "annot-wwpdb-validate-all"])
+        actionL = self.__getActions(csU)
+        self.assertEqual(actionL[:2], [("representative-model", "run"), ("cs-update", "run")])
+        self.assertEqual(sorted(actionL[2:]), [("misc-check", "run"), ("report", "run")])
+        self.assertTrue(os.access(self.__reportPath, os.R_OK))
+        #
+        csU = self.__getUtils(self.__modelPath)
+        csU.run()
+        self.assertEqual(len(_RcsbDpUtility.opList), 3)
+        self.assertEqual(
+            sorted(self.__getActions(csU)), [("cs-update", "skipped"), ("misc-check", "skipped"), ("report", "run"), ("representative-model", "skipped")]
+        )
+        # An updated model runs the steps again
+        _write(self.__modelPath, "data_model_updated\n")
+        csU = self.__getUtils(self.__modelPath)
+        csU.run()
+        self.assertEqual(len(_RcsbDpUtility.opList), 6)
+
+    def testFailedStep(self):
+        """Test a failed step is reported and the following steps and the report file are still produced -"""
+        csU = self.__getUtils(os.path.join(self.__workPath, "missing.cif"))
+        csU.run()
+        actionD = dict(self.__getActions(csU))
+        self.assertEqual(actionD["representative-model"], "failed")
+        self.assertEqual(actionD["cs-update"], "failed")
+        self.assertEqual(actionD["misc-check"], "failed")
+        self.assertEqual(actionD["report"], "run")
+        self.assertEqual(_RcsbDpUtility.opList, [])
+        with open(self.__reportPath, "r") as ifh:
+            rD = json.load(ifh)
+        self.assertIn("does not exist", rD["system_msg"])
+
+
+def suiteNmrChemShiftProcessUtilsTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(NmrChemShiftProcessUtilsTests("testStages"))
+    suiteSelect.addTest(NmrChemShiftProcessUtilsTests("testFailedStep"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteNmrChemShiftProcessUtilsTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,145 @@
+##
+# File:    NpCcMapCalcTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the local ligand map calculations - installed map directories, entries without ligands and progress states.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+try:
+    from unittest.mock import patch
+except ImportError:  # pragma: no cover
+    from mock import patch
+
+from wwpdb.apps.ann_tasks_v2.mapcalc import NpCcMapCalc as NpCcMapCalcModule
+from wwpdb.utils.session.WebRequest import InputRequest
+
+
+def _write(filePath, text):
+    with open(filePath, "w") as ofh:
+        ofh.write(text)
+
+
+class _RcsbDpUtility(object):
+    """Writes a map and an index file for each ligand in ligandList."""
+
+    ligandList = []
+    failOp = False
+
+    def __init__(self, tmpPath=".", siteId=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        self.__inputD = {}
+
+    def setDebugMode(self, flag=True):
+        pass
+
+    def imp(self, inpPath):
+        pass
+
+    def addInput(self, name=None, value=None):
+        self.__inputD[name] = value
+
+    def op(self, opName):  # pylint: disable=unused-argument
+        if _RcsbDpUtility.failOp:
+            raise RuntimeError("map calculation failed")
+        if not _RcsbDpUtility.ligandList:
+            return
+        os.makedirs(self.__inputD["output_data_path"])
+        for ligand in _RcsbDpUtility.ligandList:
+            _write(os.path.join(self.__inputD["output_data_path"], ligand + ".map"), ligand)
+        _write(self.__inputD["output_index_path"], "data_index\n")
+
+    def expLog(self, logPath):
+        _write(logPath, "Finished!\n")
+
+    def cleanup(self):
+        pass
+
+
+class NpCcMapCalcTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__topPath = os.path.join(TESTOUTPUT, "np-cc-map-calc")
+        if os.path.exists(self.__topPath):
+            shutil.rmtree(self.__topPath)
+        os.makedirs(self.__topPath)
+        self.__entryId = "D_1000000001"
+        self.__reqObj = InputRequest({}, verbose=True, log=self.__lfh)
+        self.__reqObj.setValue("TopSessionPath", self.__topPath)
+        self.__sessionPath = self.__reqObj.newSessionObj().getPath()
+        _write(os.path.join(self.__sessionPath, self.__entryId + "_model_P1.cif"), "data_model\n")
+        _write(os.path.join(self.__sessionPath, self.__entryId + "_sf_P1.cif"), "data_sf\n")
+        _RcsbDpUtility.ligandList = ["HEM_A_201"]
+        _RcsbDpUtility.failOp = False
+        self.__patch = patch.object(NpCcMapCalcModule, "RcsbDpUtility", _RcsbDpUtility)
+        self.__patch.start()
+
+    def tearDown(self):
+        self.__patch.stop()
+
+    def __run(self):
+        calc = NpCcMapCalcModule.NpCcMapCalc(reqObj=self.__reqObj, verbose=True, log=self.__lfh)
+        return calc.run(self.__entryId, doOmit=True)
+
+    def __getStates(self):
+        return {mapType: sD["state"] for mapType, sD in NpCcMapCalcModule.NpCcMapCalc.readProgress(self.__sessionPath).items()}
+
+    def __listDir(self, mapType):
+        return sorted(os.listdir(os.path.join(self.__sessionPath, mapType)))
+
+    def testMaps(self):
+        """Test the regular and omit maps are installed in the session -"""
+        self.assertTrue(self.__run())
+        self.assertEqual(self.__listDir("np-cc-maps"), ["HEM_A_201.map", "np-cc-maps-index.cif"])
+        self.assertEqual(self.__listDir("np-cc-omit-maps"), ["HEM_A_201.map", "np-cc-omit-maps-index.cif"])
+        self.assertEqual(self.__getStates(), {"np-cc-maps": "done", "np-cc-omit-maps": "done"})
+        self.assertTrue(os.access(os.path.join(self.__sessionPath, self.__entryId + "_map-npcc-calc.log"), os.R_OK))
+
+    def testNoLigands(self):
+        """Test an entry without ligands completes and replaces the previous maps with an empty directory -"""
+        self.assertTrue(self.__run())
+        _RcsbDpUtility.ligandList = []
+        self.assertTrue(self.__run())
+        self.assertEqual(self.__listDir("np-cc-maps"), [])
+        self.assertEqual(self.__listDir("np-cc-omit-maps"), [])
+        self.assertEqual(self.__getStates(), {"np-cc-maps": "done", "np-cc-omit-maps": "done"})
+
+    def testFailure(self):
+        """Test a failed calculation is recorded as failed and the previous maps are kept -"""
+        self.assertTrue(self.__run())
+        _RcsbDpUtility.failOp = True
+        self.assertFalse(self.__run())
+        self.assertEqual(self.__getStates(), {"np-cc-maps": "failed", "np-cc-omit-maps": "failed"})
+        self.assertEqual(self.__listDir("np-cc-maps"), ["HEM_A_201.map", "np-cc-maps-index.cif"])
+
+
+def suiteNpCcMapCalcTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(NpCcMapCalcTests("testMaps"))
+    suiteSelect.addTest(NpCcMapCalcTests("testNoLigands"))
+    suiteSelect.addTest(NpCcMapCalcTests("testFailure"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteNpCcMapCalcTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -19,14 +19,21 @@ __version__ = "V0.07"
 import sys
 import unittest
 import os.path
+import shutil
 
 if __package__ is None or __package__ == "":
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from commonsetup import HERE  # noqa:  F401 pylint: disable=import-error,unused-import
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
 else:
-    from .commonsetup import HERE  # noqa: F401 pylint: disable=relative-beyond-top-level
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from mmcif.api.DataCategory import DataCategory
+from mmcif.io.IoAdapterCore import IoAdapterCore
 
 from wwpdb.apps.ann_tasks_v2.io.PdbxIoUtils import ModelFileIo, PdbxFileIo
+from wwpdb.apps.ann_tasks_v2.io.PdbxContainerCache import CachingIoAdapter, PdbxContainerCache
+from wwpdb.apps.ann_tasks_v2.io.PdbxCategoryIo import PdbxCategoryIo
+from wwpdb.apps.ann_tasks_v2.report.styles.PdbxIo import PdbxReportIo, PdbxLinksReportIo
 
 TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
 
@@ -77,6 +84,52 @@ class PdbxIoUtilsTests(unittest.TestCase):
             polyEntityList = sdf.getEntityPolyList()
             self.assertNotEqual(polyEntityList, [])
 
+    def testSharedContainerCache(self):
+        """Test report readers share one parse through the container cache"""
+        for f in self.__examFileList:
+            fN = os.path.join(self.__pathExamples, f)
+            ioAdapter = CachingIoAdapter(cache=PdbxContainerCache(verbose=self.__verbose, log=self.__lfh))
+            for ioClass in [PdbxReportIo, PdbxLinksReportIo]:
+                cachedIo = ioClass(verbose=self.__verbose, log=self.__lfh, ioAdapter=ioAdapter)
+                self.assertTrue(cachedIo.setFilePath(fN))
+                plainIo = ioClass(verbose=self.__verbose, log=self.__lfh)
+                self.assertTrue(plainIo.setFilePath(fN))
+                self.assertEqual(cachedIo.getCurrentCategoryNameList(), plainIo.getCurrentCategoryNameList())
+                for catName in plainIo.getCurrentCategoryNameList():
+                    self.assertEqual(cachedIo.getCategory(catName), plainIo.getCategory(catName))
+            stD = ioAdapter.getCache().getStats()
+            self.assertEqual(stD["parses"], 1)
+            self.assertEqual(stD["hits"], 1)
+
+    def testCategorySelectiveIo(self):
+        """Test category selective reads and category splice write back"""
+        workPath = os.path.join(TESTOUTPUT, "category-io")
+        if os.path.exists(workPath):
+            shutil.rmtree(workPath)
+        os.makedirs(workPath)
+        for f in self.__examFileList:
+            fN = os.path.join(self.__pathExamples, f)
+            c0 = IoAdapterCore().readFile(fN, outDirPath=workPath)[0]
+            catIo = PdbxCategoryIo(verbose=self.__verbose, log=self.__lfh)
+            catList = ["cell", "pdbx_phasing_MR", "struct_ref_seq", "em_map"]
+            s0 = PdbxFileIo(verbose=self.__verbose, log=self.__lfh).getContainer(fN, selectList=catList)
+            self.assertEqual(sorted(s0.getObjNameList()), ["cell", "pdbx_phasing_MR", "struct_ref_seq"])
+            for catName in s0.getObjNameList():
+                self.assertEqual(s0.getObj(catName).get(), c0.getObj(catName).get())
+            #
+            s0.getObj("struct_ref_seq").setValue("CHANGED", "pdbx_db_accession", 0)
+            s0.remove("cell")
+            s0.append(DataCategory("em_map", ["id", "file"], [["1", "map one"], ["2", "map_two"]]))
+            outPath = os.path.join(workPath, "splice-" + f)
+            self.assertTrue(catIo.spliceCategories(fN, outPath, s0, catList))
+            u0 = IoAdapterCore().readFile(outPath, outDirPath=workPath)[0]
+            self.assertFalse(u0.exists("cell"))
+            self.assertEqual(u0.getObj("struct_ref_seq").getValue("pdbx_db_accession", 0), "CHANGED")
+            self.assertEqual(u0.getObj("em_map").getValue("file", 0), "map one")
+            for catName in c0.getObjNameList():
+                if catName not in ["cell", "struct_ref_seq"]:
+                    self.assertEqual(u0.getObj(catName).get(), c0.getObj(catName).get())
+
 
 if __name__ == "__main__":
     unittest.main()
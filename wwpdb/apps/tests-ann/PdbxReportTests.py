@@ -0,0 +1,92 @@
+##
+# File:    PdbxReportTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for tabular report rendering - row windows, incremental output and category pages.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.utils.session.WebRequest import InputRequest
+
+from wwpdb.apps.ann_tasks_v2.report.PdbxReport import PdbxReport
+
+
+class PdbxReportTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__modelFilePath = os.path.join(HERE, "tests", "3rer.cif")
+        self.__reqObj = InputRequest({}, verbose=False, log=self.__lfh)
+        self.__reqObj.setValue("TopSessionPath", TESTOUTPUT)
+        self.__reqObj.setValue("TemplatePath", TESTOUTPUT)
+        self.__reqObj.setValue("request_host", "localhost")
+
+    def testRowWindow(self):
+        """Test that large categories are rendered in a window of rows with a pager -"""
+        pR = PdbxReport(self.__reqObj, verbose=False, log=self.__lfh)
+        fullL = pR.makeTabularReport(filePath=self.__modelFilePath, contentType="model", idCode="3rer", layout="multiaccordion")
+        self.assertEqual(pR.getPdbIdCode(), "3RER")
+        self.assertFalse([line for line in fullL if "report-category-pager" in line])
+        #
+        pagedL = pR.makeTabularReport(filePath=self.__modelFilePath, contentType="model", idCode="3rer", layout="multiaccordion", rowLimit=5)
+        pagerL = [line for line in pagedL if "report-category-pager" in line]
+        self.assertEqual(len(pagerL), 1)
+        self.assertIn('data-category="struct_ref_seq" data-offset="5" data-limit="5" data-total="7"', pagerL[0])
+        self.assertLess(len(pagedL), len(fullL))
+        # the input file is parsed once for all reports from this request
+        self.assertEqual(pR.getContainerCacheStats()["parses"], 1)
+
+    def testWriteReport(self):
+        """Test that the report written as it is rendered matches the report returned as a list -"""
+        pR = PdbxReport(self.__reqObj, verbose=False, log=self.__lfh)
+        reportPath = os.path.join(TESTOUTPUT, "3rer-report.html")
+        self.assertTrue(pR.writeTabularReport(reportPath, filePath=self.__modelFilePath, contentType="links-report", idCode="3rer", layout="multiaccordion", rowLimit=5))
+        oL = pR.makeTabularReport(filePath=self.__modelFilePath, contentType="links-report", idCode="3rer", layout="multiaccordion", rowLimit=5)
+        with open(reportPath, "r") as ifh:
+            self.assertEqual(len(ifh.read().split("\n")), len(oL) + 1)
+        self.assertFalse(pR.writeTabularReport(reportPath, filePath=self.__modelFilePath, contentType="unknown-report"))
+
+    def testCategoryPage(self):
+        """Test serving further windows of rows of a paged category -"""
+        pR = PdbxReport(self.__reqObj, verbose=False, log=self.__lfh)
+        pR.makeTabularReport(filePath=self.__modelFilePath, contentType="model", idCode="3rer", layout="multiaccordion", rowLimit=5)
+        pD = pR.makeCategoryPage("3rer.cif", "model", "struct_ref_seq", offset=5, limit=5)
+        self.assertEqual((pD["offset"], pD["total"]), (7, 7))
+        self.assertEqual(len([line for line in pD["html"] if line == "<tr>"]), 2)
+        # each content type is read with its own report reader
+        pD = pR.makeCategoryPage("3rer.cif", "links-report", "struct_conn", offset=0, limit=2)
+        self.assertIsNotNone(pD)
+        self.assertEqual(pD["offset"], min(2, pD["total"]))
+        self.assertIsNone(pR.makeCategoryPage("3rer.cif", "model", "no_such_category"))
+        self.assertIsNone(pR.makeCategoryPage("../3rer.cif", "model", "struct_ref_seq"))
+
+
+def suitePdbxReportTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(PdbxReportTests("testRowWindow"))
+    suiteSelect.addTest(PdbxReportTests("testWriteReport"))
+    suiteSelect.addTest(PdbxReportTests("testCategoryPage"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suitePdbxReportTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
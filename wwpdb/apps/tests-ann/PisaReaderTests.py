@@ -5,6 +5,7 @@
 #
 # Update:
 #          5-July-2012 jdw add empty test case
+#         18-Oct-2026      add streaming reader, parsed result cache and benchmark tests
 ##
 """
 Test cases for the PISA XML parser.
@@ -21,6 +22,9 @@ import unittest
 import traceback
 import os
 import os.path
+import shutil
+import time
+import tracemalloc
 
 if __package__ is None or __package__ == "":
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -54,10 +58,87 @@ class PisaReaderTests(unittest.TestCase):
             traceback.print_exc(file=self.__lfh)
             self.fail()
 
+    def __readAll(self, filePath, **kwargs):
+        rC = PisaAssemblyReader(verbose=False, log=self.__lfh, **kwargs)
+        ok = rC.read(filePath)
+        return ok, rC.getSummaryDict(), rC.getAssemblySetDict(), rC.getAssemblyDict()
+
+    def testStreamingReader(self):
+        """Test the streaming reader returns the same content as the DOM reader -"""
+        for fileName in ["3rer_assembly-report_P1.xml", "pisa-assemblies.xml", "pisa-interfaces.xml"]:
+            filePath = os.path.join(HERE, "tests", fileName)
+            self.assertEqual(self.__readAll(filePath, streaming=False), self.__readAll(filePath, streaming=True))
+
+    def testParsedResultCache(self):
+        """Test reuse and invalidation of the parsed result cache -"""
+        filePath = os.path.join(TESTOUTPUT, "3rer_assembly-report_P1.xml")
+        shutil.copyfile(self.__pisaAssembliesFilePath, filePath)
+        rC = PisaAssemblyReader(verbose=False, log=self.__lfh, useCache=True)
+        cachePath = rC.getCachePath(filePath)
+        if os.access(cachePath, os.F_OK):
+            os.remove(cachePath)
+        rD = self.__readAll(filePath)
+        self.assertEqual(self.__readAll(filePath, useCache=True), rD)
+        self.assertTrue(os.access(cachePath, os.R_OK))
+        self.assertEqual(self.__readAll(filePath, useCache=True), rD)
+        # A changed report must not be satisfied from the cache
+        with open(filePath, "w") as ofh:
+            ofh.write("<pisa_results><name>changed</name></pisa_results>\n")
+        ok, gD, _sD, aD = self.__readAll(filePath, useCache=True)
+        self.assertTrue(ok)
+        self.assertEqual(gD["name"], "changed")
+        self.assertEqual(len(aD), 0)
+
+    def __makeLargeReport(self, filePath, nSets=10, nAssem=5, nMol=60):
+        """Write a synthetic PISA report by replicating the molecules of the test report."""
+        with open(self.__pisaAssembliesFilePath, "r") as ifh:
+            text = ifh.read()
+        molText = text[text.index("<molecule>") : text.index("</molecule>") + len("</molecule>")]
+        serialNo = 0
+        with open(filePath, "w") as ofh:
+            ofh.write("<pisa_results>\n<name>session-large</name>\n<status>Ok</status>\n<total_asm>%d</total_asm>\n" % nSets)
+            for iSet in range(1, nSets + 1):
+                ofh.write("<asm_set>\n<ser_no>%d</ser_no>\n<all_chains_at_identity>Yes</all_chains_at_identity>\n" % iSet)
+                for _ii in range(nAssem):
+                    serialNo += 1
+                    ofh.write("<assembly>\n<serial_no>%d</serial_no>\n<id>%d</id>\n<size>%d</size>\n" % (serialNo, serialNo, nMol))
+                    for _jj in range(nMol):
+                        ofh.write(molText)
+                        ofh.write("\n")
+                    ofh.write("</assembly>\n")
+                ofh.write("</asm_set>\n")
+            ofh.write("</pisa_results>\n")
+
+    def testReaderBenchmark(self):
+        """Compare time and peak memory of the DOM and streaming readers on a synthetic large report -"""
+        filePath = os.path.join(TESTOUTPUT, "pisa-large-assembly-report.xml")
+        self.__makeLargeReport(filePath)
+        resultD = {}
+        peakD = {}
+        for streaming in [False, True]:
+            tracemalloc.start()
+            startTime = time.time()
+            rD = self.__readAll(filePath, streaming=streaming)
+            elapsed = time.time() - startTime
+            _cur, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            resultD[streaming] = rD
+            peakD[streaming] = peak
+            self.__lfh.write(
+                "PISA reader %-9s size %d bytes  time %.2f s  peak memory %.1f MB\n"
+                % ("streaming" if streaming else "dom", os.path.getsize(filePath), elapsed, peak / 1048576.0)
+            )
+        self.assertEqual(resultD[False], resultD[True])
+        self.assertEqual(len(resultD[True][3]), 50)
+        self.assertLess(peakD[True], peakD[False])
+
 
 def suitePisaTests():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(PisaReaderTests("testPisaAssemblyReader"))
+    suiteSelect.addTest(PisaReaderTests("testStreamingReader"))
+    suiteSelect.addTest(PisaReaderTests("testParsedResultCache"))
+    suiteSelect.addTest(PisaReaderTests("testReaderBenchmark"))
     return suiteSelect
 
 
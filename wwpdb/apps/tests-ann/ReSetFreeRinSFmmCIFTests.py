@@ -0,0 +1,179 @@
+##
+# File:    ReSetFreeRinSFmmCIFTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the free R set reset - concurrent candidate sets give the result of trying the sets in order.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+try:
+    from unittest.mock import patch
+except ImportError:  # pragma: no cover
+    from mock import patch
+
+from wwpdb.apps.ann_tasks_v2.expIoUtils import ReSetFreeRinSFmmCIF as ReSetModule
+from wwpdb.utils.session.WebRequest import InputRequest
+
+_DCC_TEMPLATE = """data_dcc
+loop_
+_pdbx_density_corr.id
+_pdbx_density_corr.ls_d_res_high
+_pdbx_density_corr.ls_R_factor_R_work
+_pdbx_density_corr.ls_R_factor_R_free
+_pdbx_density_corr.correlation_coeff_Fo_to_Fc
+_pdbx_density_corr.details
+1 2.00 0.200 0.250 0.900 'PDB reported'
+2 2.00 0.210 0.260 0.890 'Best'
+3 2.00 0.200 %5.3f 0.880 'TLS'
+"""
+
+
+def _write(filePath, text):
+    with open(filePath, "w") as ofh:
+        ofh.write(text)
+
+
+class _RcsbDpUtility(object):
+    """Generates set N as 'data_sf_set_N' and validates it - TLS Rfree - R is above the acceptance limit for acceptSetList."""
+
+    acceptSetList = []
+    failSetList = []
+    # set -> seconds to wait before generating the set
+    delayD = {}
+
+    def __init__(self, tmpPath=".", siteId=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        self.__inputD = {}
+        self.__inpPath = None
+        self.__output = None
+        self.__log = ""
+
+    def imp(self, inpPath):
+        self.__inpPath = inpPath
+
+    def addInput(self, name=None, value=None):
+        self.__inputD[name] = value
+
+    def op(self, opName):
+        if opName == "annot-correct-freer-set":
+            setId = self.__inputD["set_num"]
+            time.sleep(_RcsbDpUtility.delayD.get(setId, 0))
+            if setId in _RcsbDpUtility.failSetList:
+                self.__log = "Error: no free R set %s\n" % setId
+            else:
+                self.__output = "data_sf_set_%s\n" % setId
+                self.__log = "Finished!\n"
+        elif opName == "annot-dcc-validation":
+            with open(self.__inpPath, "r") as ifh:
+                setId = ifh.read().strip().split("_")[-1]
+            self.__output = _DCC_TEMPLATE % (0.230 if setId in _RcsbDpUtility.acceptSetList else 0.210)
+
+    def exp(self, outPath):
+        if self.__output is not None:
+            _write(outPath, self.__output)
+
+    def expLog(self, logPath):
+        _write(logPath, self.__log)
+
+    def cleanup(self):
+        pass
+
+
+class ReSetFreeRinSFmmCIFTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__topPath = os.path.join(TESTOUTPUT, "reset-freer")
+        if os.path.exists(self.__topPath):
+            shutil.rmtree(self.__topPath)
+        os.makedirs(self.__topPath)
+        self.__entryId = "D_1000000001"
+        self.__reqObj = InputRequest({}, verbose=True, log=self.__lfh)
+        self.__reqObj.setValue("TopSessionPath", self.__topPath)
+        self.__reqObj.setValue("entryid", self.__entryId)
+        self.__reqObj.setValue("entryfilename", self.__entryId + "_model_P1.cif")
+        self.__reqObj.setValue("entryexpfilename", self.__entryId + "_sf_P1.cif")
+        self.__sessionPath = self.__reqObj.newSessionObj().getPath()
+        _write(os.path.join(self.__sessionPath, self.__entryId + "_model_P1.cif"), "data_model\n")
+        _write(os.path.join(self.__sessionPath, self.__entryId + "_sf_P1.cif"), "data_sf\n")
+        _RcsbDpUtility.acceptSetList = []
+        _RcsbDpUtility.failSetList = []
+        _RcsbDpUtility.delayD = {}
+        self.__patch = patch.object(ReSetModule, "RcsbDpUtility", _RcsbDpUtility)
+        self.__patch.start()
+
+    def tearDown(self):
+        self.__patch.stop()
+
+    def __run(self, maxWorkers):
+        calc = ReSetModule.ReSetFreeRinSFmmCIF(reqObj=self.__reqObj, verbose=True, log=self.__lfh)
+        return calc.run(maxWorkers=maxWorkers)
+
+    def __read(self, fileName):
+        with open(os.path.join(self.__sessionPath, fileName), "r") as ifh:
+            return ifh.read()
+
+    def __getSummaryD(self):
+        """set id -> status from the summary table of the log file"""
+        text = self.__read(self.__entryId + "-reset_freer.log")
+        lineL = text[text.index("Summary of tried free R sets:") :].split("\n")[3:]
+        return {line.split()[0]: line[line.rindex("  ") + 2 :] for line in lineL if line}
+
+    def testLowestAcceptedSet(self):
+        """Test the lowest accepted set is used when a higher set of the same group passes first -"""
+        _RcsbDpUtility.acceptSetList = ["2", "3"]
+        _RcsbDpUtility.delayD = {"2": 0.2}
+        self.assertTrue(self.__run(maxWorkers=4))
+        self.assertEqual(self.__read(self.__entryId + "_sf_P1.cif"), "data_sf_set_2\n#END OF REFLECTIONS\n")
+        self.assertEqual(self.__getSummaryD(), {"0": "rejected", "1": "rejected", "2": "accepted", "3": "passed, not used"})
+
+    def testGenerationFailure(self):
+        """Test the search stops at a set which cannot be generated even if a later set passes -"""
+        _RcsbDpUtility.failSetList = ["1"]
+        _RcsbDpUtility.acceptSetList = ["2"]
+        self.assertFalse(self.__run(maxWorkers=4))
+        self.assertEqual(self.__read(self.__entryId + "_sf_P1.cif"), "data_sf\n")
+        self.assertEqual(self.__getSummaryD(), {"0": "rejected", "1": "generation failed", "2": "passed, not used", "3": "rejected"})
+        self.assertIn("Error: no free R set 1", self.__read(self.__entryId + "-reset_freer.log"))
+
+    def testSummary(self):
+        """Test every tried set is in the summary in set order when no set is accepted -"""
+        self.assertFalse(self.__run(maxWorkers=8))
+        summaryD = self.__getSummaryD()
+        self.assertEqual(sorted(summaryD, key=int), [str(ii) for ii in range(20)])
+        self.assertEqual(set(summaryD.values()), {"rejected"})
+        # One line per set in numeric order
+        text = self.__read(self.__entryId + "-reset_freer.log")
+        self.assertLess(text.index("\n  9  "), text.index("\n 10  "))
+
+
+def suiteReSetFreeRinSFmmCIFTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ReSetFreeRinSFmmCIFTests("testLowestAcceptedSet"))
+    suiteSelect.addTest(ReSetFreeRinSFmmCIFTests("testGenerationFailure"))
+    suiteSelect.addTest(ReSetFreeRinSFmmCIFTests("testSummary"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteReSetFreeRinSFmmCIFTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,104 @@
+##
+# File:    SessionDownloadUtilsTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for session download file resolution - new archive versions written between lookups are returned.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+try:
+    from unittest.mock import patch
+except ImportError:  # pragma: no cover
+    from mock import patch
+
+from wwpdb.apps.ann_tasks_v2.utils import SessionDownloadUtils as SessionDownloadUtilsModule
+from wwpdb.utils.session.WebRequest import InputRequest
+
+_ARCHIVE_PATH = os.path.join(TESTOUTPUT, "session-download", "archive")
+
+
+class _PathInfo(object):
+    """Archive file naming as in PathInfo for a local directory tree."""
+
+    def __init__(self, siteId=None, sessionPath=".", verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        pass
+
+    def getFilePath(
+        self, dataSetId, wfInstanceId=None, contentType=None, formatType=None, fileSource="archive", versionId="latest", partNumber="1", mileStone=None
+    ):  # pylint: disable=unused-argument
+        basePath = os.path.join(self.getArchivePath(dataSetId), "%s_%s_P%s.cif" % (dataSetId, contentType, partNumber))
+        return basePath if versionId == "none" else basePath + ".V" + str(versionId)
+
+    def getArchivePath(self, dataSetId):
+        return os.path.join(_ARCHIVE_PATH, dataSetId)
+
+    def getInstanceTopPath(self, dataSetId):
+        return os.path.join(_ARCHIVE_PATH, "instances", dataSetId)
+
+
+class SessionDownloadUtilsTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__topPath = os.path.join(TESTOUTPUT, "session-download")
+        if os.path.exists(self.__topPath):
+            shutil.rmtree(self.__topPath)
+        self.__entryId = "D_1000000001"
+        self.__archivePath = os.path.join(_ARCHIVE_PATH, self.__entryId)
+        os.makedirs(self.__archivePath)
+        self.__write(self.__archivePath, self.__entryId + "_model_P1.cif.V1", "data_V1\n")
+        self.__reqObj = InputRequest({}, verbose=True, log=self.__lfh)
+        self.__reqObj.setValue("TopSessionPath", self.__topPath)
+        self.__reqObj.newSessionObj()
+        self.__patch = patch.object(SessionDownloadUtilsModule, "PathInfo", _PathInfo)
+        self.__patch.start()
+
+    def tearDown(self):
+        self.__patch.stop()
+
+    def __write(self, dirPath, fileName, text):
+        with open(os.path.join(dirPath, fileName), "w") as ofh:
+            ofh.write(text)
+
+    def testWriteAfterListing(self):
+        """Test a version written to the archive after a lookup is returned by the next lookup on the same instance -"""
+        du = SessionDownloadUtilsModule.SessionDownloadUtils(self.__reqObj, verbose=True, log=self.__lfh, linkStrategyList=["copy"])
+        self.assertTrue(du.fetchId(self.__entryId, "model", formatType="pdbx"))
+        nextPath = du.getFilePath(self.__entryId, contentType="model", formatType="pdbx", versionId="next")
+        self.assertEqual(os.path.basename(nextPath), self.__entryId + "_model_P1.cif.V2")
+        # As in the status update - the updated model is copied to the next version and the latest version is fetched
+        self.__write(self.__archivePath, os.path.basename(nextPath), "data_V2\n")
+        self.assertEqual(du.getFilePath(self.__entryId, contentType="model", formatType="pdbx"), nextPath)
+        self.assertTrue(du.fetchId(self.__entryId, "model", formatType="pdbx"))
+        with open(du.getDownloadPath(), "r") as ifh:
+            self.assertEqual(ifh.read(), "data_V2\n")
+
+
+def suiteSessionDownloadUtilsTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(SessionDownloadUtilsTests("testWriteAfterListing"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteSessionDownloadUtilsTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
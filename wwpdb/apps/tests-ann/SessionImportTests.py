@@ -0,0 +1,179 @@
+##
+# File:    SessionImportTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the import of workflow data files into a session - deferred files are copied only on first access.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+try:
+    from unittest.mock import patch
+except ImportError:  # pragma: no cover
+    from mock import patch
+
+from wwpdb.apps.ann_tasks_v2.utils import SessionImport as SessionImportModule
+from wwpdb.utils.session.WebRequest import InputRequest
+
+_ARCHIVE_PATH = os.path.join(TESTOUTPUT, "session-import", "archive")
+
+
+class _PathInfo(object):
+    """Archive and session file naming as in PathInfo for a local directory tree."""
+
+    _extD = {"pdbx": "cif", "map": "map", "xml": "xml", "txt": "txt", "pdf": "pdf", "svg": "svg", "csv": "csv", "json": "json"}
+
+    def __init__(self, siteId=None, sessionPath=".", verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        self.__sessionPath = sessionPath
+
+    def getFileName(self, dataSetId, contentType=None, formatType=None, versionId="latest", partNumber="1", mileStone=None):  # pylint: disable=unused-argument
+        fileName = "%s_%s_P%s.%s" % (dataSetId, contentType, partNumber, self._extD[formatType])
+        return fileName if versionId == "none" else fileName + ".V" + str(versionId)
+
+    def getFilePath(
+        self, dataSetId, wfInstanceId=None, contentType=None, formatType=None, fileSource="archive", versionId="latest", partNumber="1", mileStone=None
+    ):  # pylint: disable=unused-argument
+        return os.path.join(self.getArchivePath(dataSetId), self.getFileName(dataSetId, contentType, formatType, versionId, partNumber))
+
+    def getArchivePath(self, dataSetId):
+        return os.path.join(_ARCHIVE_PATH, dataSetId)
+
+
+class SessionImportTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__topPath = os.path.join(TESTOUTPUT, "session-import")
+        if os.path.exists(self.__topPath):
+            shutil.rmtree(self.__topPath)
+        self.__entryId = "D_1000000001"
+        self.__archivePath = os.path.join(_ARCHIVE_PATH, self.__entryId)
+        os.makedirs(os.path.join(self.__archivePath, "np-cc-maps"))
+        for fileName in [
+            "model_P1.cif.V1",
+            "model_P1.cif.V2",
+            "assembly-report_P1.xml.V1",
+            "map-2fofc_P1.map.V1",
+            "map-fofc_P1.map.V1",
+            "assembly-model-xyz_P1.cif.V1",
+            "assembly-model-xyz_P2.cif.V1",
+        ]:
+            self.__write(os.path.join(self.__archivePath, self.__entryId + "_" + fileName), fileName)
+        self.__write(os.path.join(self.__archivePath, "np-cc-maps", "np-cc-maps-index.cif"), "index")
+        #
+        self.__reqObj = InputRequest({}, verbose=True, log=self.__lfh)
+        self.__reqObj.setValue("TopSessionPath", self.__topPath)
+        self.__reqObj.setValue("WWPDB_SITE_ID", "WWPDB_DEPLOY")
+        self.__sessionPath = self.__reqObj.newSessionObj().getPath()
+        self.__patch = patch.object(SessionImportModule, "PathInfo", _PathInfo)
+        self.__patch.start()
+
+    def tearDown(self):
+        self.__patch.stop()
+
+    def __write(self, filePath, text):
+        with open(filePath, "w") as ofh:
+            ofh.write(text)
+
+    def __read(self, filePath):
+        with open(filePath, "r") as ifh:
+            return ifh.read()
+
+    def __sessionFilePath(self, fileName):
+        return os.path.join(self.__sessionPath, self.__entryId + "_" + fileName)
+
+    def __getImport(self):
+        return SessionImportModule.SessionImport(self.__reqObj, self.__entryId, verbose=True, log=self.__lfh)
+
+    def testDeferredImport(self):
+        """Test deferred files are copied only when they are requested -"""
+        self.assertTrue(self.__getImport().importFiles(fileSource="archive", getMaps=True))
+        self.assertEqual(self.__read(self.__sessionFilePath("model_P1.cif")), "model_P1.cif.V2")
+        self.assertEqual(self.__read(self.__sessionFilePath("assembly-report_P1.xml")), "assembly-report_P1.xml.V1")
+        deferredL = [
+            self.__sessionFilePath("map-2fofc_P1.map"),
+            self.__sessionFilePath("map-fofc_P1.map"),
+            self.__sessionFilePath("assembly-model-xyz_P1.cif"),
+            self.__sessionFilePath("assembly-model-xyz_P2.cif"),
+            os.path.join(self.__sessionPath, "np-cc-maps"),
+        ]
+        self.assertEqual(sorted(self.__getImport().getPendingList()), sorted(deferredL))
+        self.assertFalse(any(os.access(pth, os.F_OK) for pth in deferredL))
+        #
+        # A request for one file copies only that file
+        sI = self.__getImport()
+        self.assertEqual(sI.materialize(["maps"], pathList=[self.__sessionFilePath("map-2fofc_P1.map")]), [self.__sessionFilePath("map-2fofc_P1.map")])
+        self.assertEqual(self.__read(self.__sessionFilePath("map-2fofc_P1.map")), "map-2fofc_P1.map.V1")
+        self.assertFalse(os.access(self.__sessionFilePath("map-fofc_P1.map"), os.F_OK))
+        self.assertEqual(sI.materialize(["maps"], pathList=[self.__sessionFilePath("map-2fofc_P1.map")]), [])
+        # The path must belong to the requested group
+        self.assertEqual(sI.materialize(["maps"], pathList=[self.__sessionFilePath("assembly-model-xyz_P2.cif")]), [])
+        self.assertEqual(sI.materialize(["assembly-models"], pathList=[self.__sessionFilePath("assembly-model-xyz_P2.cif")]), [self.__sessionFilePath("assembly-model-xyz_P2.cif")])
+        self.assertFalse(os.access(self.__sessionFilePath("assembly-model-xyz_P1.cif"), os.F_OK))
+        self.assertEqual(sorted(sI.getPendingList()), sorted(deferredL[1:3] + deferredL[4:]))
+        self.assertEqual(sI.getPendingList(["assembly-models"]), [self.__sessionFilePath("assembly-model-xyz_P1.cif")])
+        #
+        # Directories are copied with their content
+        self.assertEqual(sI.materialize(["np-cc-maps"]), [os.path.join(self.__sessionPath, "np-cc-maps")])
+        self.assertEqual(self.__read(os.path.join(self.__sessionPath, "np-cc-maps", "np-cc-maps-index.cif")), "index")
+
+    def testReplacedFile(self):
+        """Test a deferred file written in the session after the import is not replaced and the pending list is removed when empty -"""
+        self.assertTrue(self.__getImport().importFiles(fileSource="archive", getMaps=True))
+        mapPath = self.__sessionFilePath("map-fofc_P1.map")
+        self.__write(mapPath, "recalculated")
+        tS = time.time() + 10
+        os.utime(mapPath, (tS, tS))
+        sI = self.__getImport()
+        self.assertEqual(sI.materialize(pathList=[mapPath]), [])
+        self.assertEqual(self.__read(mapPath), "recalculated")
+        self.assertNotIn(mapPath, sI.getPendingList())
+        #
+        self.assertEqual(len(sI.materialize()), 4)
+        self.assertEqual(sI.getPendingList(), [])
+        self.assertFalse(os.access(os.path.join(self.__sessionPath, self.__entryId + "_import-pending.json"), os.F_OK))
+        #
+        # Without deferral all files are copied at import
+        shutil.rmtree(self.__sessionPath)
+        os.makedirs(self.__sessionPath)
+        self.assertTrue(self.__getImport().importFiles(fileSource="archive", getMaps=True, defer=False))
+        self.assertEqual(self.__getImport().getPendingList(), [])
+        self.assertEqual(self.__read(self.__sessionFilePath("assembly-model-xyz_P1.cif")), "assembly-model-xyz_P1.cif.V1")
+
+    def testNoModel(self):
+        """Test the import fails without a model file -"""
+        os.remove(os.path.join(self.__archivePath, self.__entryId + "_model_P1.cif.V1"))
+        os.remove(os.path.join(self.__archivePath, self.__entryId + "_model_P1.cif.V2"))
+        self.assertFalse(self.__getImport().importFiles(fileSource="archive", getMaps=True))
+
+
+def suiteSessionImportTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(SessionImportTests("testDeferredImport"))
+    suiteSelect.addTest(SessionImportTests("testReplacedFile"))
+    suiteSelect.addTest(SessionImportTests("testNoModel"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteSessionImportTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
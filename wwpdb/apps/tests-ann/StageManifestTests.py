@@ -0,0 +1,243 @@
+##
+# File:    StageManifestTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for stage input fingerprints and the reuse of validation results.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+try:
+    from unittest.mock import patch
+except ImportError:  # pragma: no cover
+    from mock import patch
+
+from wwpdb.apps.ann_tasks_v2.utils.StageManifest import StageManifest
+from wwpdb.utils.session.WebRequest import InputRequest
+
+try:
+    from wwpdb.apps.ann_tasks_v2.validate import Validate as ValidateModule
+except ImportError:  # NMR remediation dependencies not installed
+    ValidateModule = None
+
+
+class _PathInfo(object):
+    """Session file naming of PathInfo for the files used by Validate.runAll()."""
+
+    def __init__(self, siteId=None, sessionPath=".", verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        self.__sessionPath = sessionPath
+
+    def getFileName(self, dataSetId, contentType=None, formatType=None, versionId="latest", partNumber="1"):  # pylint: disable=unused-argument
+        return "%s_%s_P%s.%s" % (dataSetId, contentType, partNumber, formatType)
+
+    def getEmVolumeFilePath(self, dataSetId, **kwargs):  # pylint: disable=unused-argument
+        return os.path.join(self.__sessionPath, "missing", dataSetId + "_em-volume_P1.map")
+
+    def getArchivePath(self, dataSetId):
+        return os.path.join(self.__sessionPath, "missing", dataSetId)
+
+
+class _ValidationWrapper(object):
+    """Records each validation run and writes its report files."""
+
+    opList = []
+
+    def __init__(self, tmpPath=".", siteId=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        self.__inputD = {}
+
+    def imp(self, inpPath):
+        self.__inputD["model"] = inpPath
+
+    def addInput(self, name=None, value=None):
+        self.__inputD[name] = value
+
+    def op(self, opName):
+        _ValidationWrapper.opList.append((opName, dict(self.__inputD)))
+
+    def expLog(self, logPath):
+        self.__write(logPath, "validation log\n")
+
+    def expList(self, dstPathList=None):
+        for filePath in dstPathList:
+            self.__write(filePath, "report %d\n" % len(_ValidationWrapper.opList))
+
+    def cleanup(self):
+        pass
+
+    def __write(self, filePath, text):
+        with open(filePath, "w") as ofh:
+            ofh.write(text)
+
+
+class _ConfigInfoAppValidation(object):
+    toolsPath = None
+
+    def __init__(self, siteId=None):
+        pass
+
+    def get_validation_tools_path(self):
+        return _ConfigInfoAppValidation.toolsPath
+
+
+class StageManifestTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__topPath = os.path.join(TESTOUTPUT, "stage-manifest")
+        if os.path.exists(self.__topPath):
+            shutil.rmtree(self.__topPath)
+        os.makedirs(self.__topPath)
+        self.__manifestPath = os.path.join(self.__topPath, "manifest.json")
+        self.__inpPath = os.path.join(self.__topPath, "input.cif")
+        self.__outPath = os.path.join(self.__topPath, "output.cif")
+        self.__write(self.__inpPath, "data_input\n")
+
+    def __write(self, filePath, text, mtimeOffset=0):
+        with open(filePath, "w") as ofh:
+            ofh.write(text)
+        if mtimeOffset:
+            tS = time.time() + mtimeOffset
+            os.utime(filePath, (tS, tS))
+
+    def testFingerprint(self):
+        """Test input fingerprints follow the file content -"""
+        sm = StageManifest(self.__manifestPath, verbose=True, log=self.__lfh)
+        fp = sm.fingerprint(self.__inpPath)
+        self.assertIsNotNone(fp)
+        self.assertEqual(sm.fingerprint(self.__inpPath), fp)
+        self.assertIsNone(sm.fingerprint(os.path.join(self.__topPath, "missing.cif")))
+        self.assertIsNone(sm.fingerprint(None))
+        # The same content written again has the same fingerprint
+        self.__write(self.__inpPath, "data_input\n", mtimeOffset=10)
+        self.assertEqual(sm.fingerprint(self.__inpPath), fp)
+        self.__write(self.__inpPath, "data_other\n", mtimeOffset=20)
+        self.assertNotEqual(sm.fingerprint(self.__inpPath), fp)
+
+    def testStages(self):
+        """Test a recorded stage is current until its inputs or outputs change -"""
+        sm = StageManifest(self.__manifestPath, verbose=True, log=self.__lfh)
+        inputD = {"model": sm.fingerprint(self.__inpPath), "mode": "annotate"}
+        self.assertFalse(sm.isCurrent("stage", inputD))
+        self.__write(self.__outPath, "data_output\n")
+        sm.record("stage", inputD, [self.__outPath, os.path.join(self.__topPath, "missing.cif")], metaD={"status": "ok"})
+        self.assertTrue(sm.isCurrent("stage", inputD))
+        self.assertFalse(sm.isCurrent("stage", {"model": inputD["model"], "mode": "server"}))
+        self.assertEqual(sm.getMeta("stage"), {"status": "ok"})
+        self.assertEqual(sm.getMeta("other"), {})
+        self.assertTrue(sm.save())
+        #
+        # The record is read back by a later run
+        sm = StageManifest(self.__manifestPath, verbose=True, log=self.__lfh)
+        self.assertTrue(sm.isCurrent("stage", inputD))
+        sm.report("stage", "reused")
+        self.assertEqual(sm.getReport(), [("stage", "reused")])
+        # A modified output is run again
+        self.__write(self.__outPath, "data_output_changed\n", mtimeOffset=10)
+        self.assertFalse(sm.isCurrent("stage", inputD))
+        sm.record("stage", inputD, [self.__outPath])
+        self.assertTrue(sm.isCurrent("stage", inputD))
+        sm.invalidate("stage")
+        self.assertFalse(sm.isCurrent("stage", inputD))
+        # A stage without outputs is never current
+        sm.record("empty", inputD, [])
+        self.assertFalse(sm.isCurrent("empty", inputD))
+
+    def testToolIdentity(self):
+        """Test a stage is run again when the program it ran changes -"""
+        toolPath = os.path.join(self.__topPath, "tools")
+        os.makedirs(toolPath)
+        self.__write(os.path.join(toolPath, "validator"), "version 1\n")
+        sm = StageManifest(self.__manifestPath, verbose=True, log=self.__lfh)
+        tD = sm.getToolIdentity(packageNameList=["wwpdb.utils.dp", "no.such.package"], pathList=[toolPath, os.path.join(self.__topPath, "missing")])
+        self.assertIsNotNone(tD["wwpdb.utils.dp"])
+        self.assertIsNone(tD["no.such.package"])
+        self.assertIsNone(tD[os.path.join(self.__topPath, "missing")])
+        self.assertEqual([rec[0] for rec in tD[toolPath]], ["validator"])
+        self.assertEqual(sm.getToolIdentity(), {})
+        #
+        self.__write(self.__outPath, "data_output\n")
+        sm.record("stage", {"model": sm.fingerprint(self.__inpPath), "tool": tD}, [self.__outPath])
+        sm.save()
+        sm = StageManifest(self.__manifestPath, verbose=True, log=self.__lfh)
+        tD = sm.getToolIdentity(packageNameList=["wwpdb.utils.dp", "no.such.package"], pathList=[toolPath, os.path.join(self.__topPath, "missing")])
+        self.assertTrue(sm.isCurrent("stage", {"model": sm.fingerprint(self.__inpPath), "tool": tD}))
+        self.__write(os.path.join(toolPath, "validator"), "version 2 update\n", mtimeOffset=10)
+        tD = sm.getToolIdentity(packageNameList=["wwpdb.utils.dp", "no.such.package"], pathList=[toolPath, os.path.join(self.__topPath, "missing")])
+        self.assertFalse(sm.isCurrent("stage", {"model": sm.fingerprint(self.__inpPath), "tool": tD}))
+        self.assertEqual(sm.getToolIdentity(pathList=[os.path.join(toolPath, "validator")])[os.path.join(toolPath, "validator")][0], len("version 2 update\n"))
+
+    def __runValidation(self, reqObj, entryId):
+        vw = ValidateModule.Validate(reqObj=reqObj, verbose=True, log=self.__lfh)
+        ok = vw.runAll(entryId)
+        return ok, vw.getStageReport()
+
+    @unittest.skipIf(ValidateModule is None, "Validate dependencies not installed")
+    def testValidationReuse(self):
+        """Test validation results are reused for unchanged inputs and programs and otherwise run again -"""
+        reqObj = InputRequest({}, verbose=True, log=self.__lfh)
+        reqObj.setValue("TopSessionPath", self.__topPath)
+        sObj = reqObj.newSessionObj()
+        sessionPath = sObj.getPath()
+        entryId = "D_1000000001"
+        self.__write(os.path.join(sessionPath, entryId + "_model_P1.pdbx"), "data_model\n")
+        toolPath = os.path.join(self.__topPath, "validation-tools")
+        os.makedirs(toolPath)
+        self.__write(os.path.join(toolPath, "validator"), "version 1\n")
+        _ConfigInfoAppValidation.toolsPath = toolPath
+        _ValidationWrapper.opList = []
+        #
+        with patch.object(ValidateModule, "PathInfo", _PathInfo), patch.object(ValidateModule, "ValidationWrapper", _ValidationWrapper), patch.object(
+            ValidateModule, "ConfigInfoAppValidation", _ConfigInfoAppValidation
+        ):
+            self.assertEqual(self.__runValidation(reqObj, entryId), (True, [("validation", "run")]))
+            self.assertEqual(len(_ValidationWrapper.opList), 1)
+            self.assertEqual(_ValidationWrapper.opList[0][0], "annot-wwpdb-validate-all-sf")
+            self.assertEqual(self.__runValidation(reqObj, entryId), (True, [("validation", "reused")]))
+            self.assertEqual(len(_ValidationWrapper.opList), 1)
+            #
+            # An updated validation program invalidates the previous results
+            self.__write(os.path.join(toolPath, "validator"), "version 2 update\n", mtimeOffset=10)
+            self.assertEqual(self.__runValidation(reqObj, entryId), (True, [("validation", "run")]))
+            self.assertEqual(len(_ValidationWrapper.opList), 2)
+            self.assertEqual(self.__runValidation(reqObj, entryId), (True, [("validation", "reused")]))
+            # ... as does a changed model file
+            self.__write(os.path.join(sessionPath, entryId + "_model_P1.pdbx"), "data_model_changed\n", mtimeOffset=20)
+            self.assertEqual(self.__runValidation(reqObj, entryId), (True, [("validation", "run")]))
+            self.assertEqual(len(_ValidationWrapper.opList), 3)
+            # ... and a modified result file
+            self.__write(os.path.join(sessionPath, entryId + "_validation-data_P1.xml"), "edited\n", mtimeOffset=30)
+            self.assertEqual(self.__runValidation(reqObj, entryId), (True, [("validation", "run")]))
+            self.assertEqual(len(_ValidationWrapper.opList), 4)
+
+
+def suiteStageManifestTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(StageManifestTests("testFingerprint"))
+    suiteSelect.addTest(StageManifestTests("testStages"))
+    suiteSelect.addTest(StageManifestTests("testToolIdentity"))
+    suiteSelect.addTest(StageManifestTests("testValidationReuse"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteStageManifestTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
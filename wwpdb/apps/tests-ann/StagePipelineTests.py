@@ -0,0 +1,170 @@
+##
+# File:    StagePipelineTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the stage pipeline - dependency order, concurrent stages, failures and skipping of current stages.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import threading
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.ann_tasks_v2.utils.StagePipeline import StagePipeline
+
+
+class StagePipelineTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__workPath = os.path.join(TESTOUTPUT, "stage-pipeline")
+        if os.path.exists(self.__workPath):
+            shutil.rmtree(self.__workPath)
+        os.makedirs(self.__workPath)
+        self.__manifestPath = os.path.join(self.__workPath, "stages.json")
+        self.__lock = threading.Lock()
+        self.__eventL = []
+
+    def __event(self, text):
+        with self.__lock:
+            self.__eventL.append(text)
+
+    def __stage(self, name, ok=True, delay=0.0, outPath=None, barrier=None):
+        def runStage():
+            self.__event("start " + name)
+            if barrier is not None:
+                barrier.wait()
+            time.sleep(delay)
+            if outPath:
+                with open(outPath, "w") as ofh:
+                    ofh.write("%s\n" % name)
+            self.__event("end " + name)
+            return ok, {"name": name}
+
+        return runStage
+
+    def __failingStage(self):
+        self.__event("start raise")
+        raise ValueError("failing stage")
+
+    def __index(self, text):
+        return self.__eventL.index(text)
+
+    def testOrder(self):
+        """Test stages start after the stages they depend on have finished -"""
+        sp = StagePipeline(verbose=True, log=self.__lfh)
+        sp.addStage("first", self.__stage("first", delay=0.2))
+        sp.addStage("second", self.__stage("second", delay=0.1), dependsOn=["first"])
+        sp.addStage("third", self.__stage("third"), dependsOn=["first", "second"])
+        sp.addStage("other", self.__stage("other"))
+        self.assertEqual(sp.run(), {"first": True, "second": True, "third": True, "other": True})
+        self.assertLess(self.__index("end first"), self.__index("start second"))
+        self.assertLess(self.__index("end second"), self.__index("start third"))
+        self.assertEqual([(name, action) for name, action, _t in sp.getReport()], [("first", "run"), ("other", "run"), ("second", "run"), ("third", "run")])
+        #
+        self.assertRaises(ValueError, sp.addStage, "first", self.__stage("first"))
+        self.assertRaises(ValueError, sp.addStage, "fourth", self.__stage("fourth"), dependsOn=["missing"])
+
+    def testConcurrent(self):
+        """Test stages which are ready together run concurrently on the task pool -"""
+        # Each stage waits at the barrier for the other, so they only complete if run at the same time
+        barrier = threading.Barrier(2, timeout=10.0)
+        sp = StagePipeline(maxWorkers=2, verbose=True, log=self.__lfh)
+        sp.addStage("setup", self.__stage("setup"))
+        sp.addStage("left", self.__stage("left", barrier=barrier), dependsOn=["setup"])
+        sp.addStage("right", self.__stage("right", barrier=barrier), dependsOn=["setup"])
+        sp.addStage("merge", self.__stage("merge"), dependsOn=["left", "right"])
+        self.assertEqual(sp.run(), {"setup": True, "left": True, "right": True, "merge": True})
+        self.assertLess(self.__index("start right"), self.__index("end left"))
+        self.assertLess(self.__index("start left"), self.__index("end right"))
+        self.assertLess(max(self.__index("end left"), self.__index("end right")), self.__index("start merge"))
+        self.assertEqual(sorted((name, action) for name, action, _t in sp.getReport()), [("left", "run"), ("merge", "run"), ("right", "run"), ("setup", "run")])
+
+    def testFailure(self):
+        """Test failed stages are reported, do not stop the stages which follow and are run again next time -"""
+        outPathD = {name: os.path.join(self.__workPath, name + ".txt") for name in ["first", "second"]}
+        for cycle in range(2):
+            self.__eventL = []
+            sp = StagePipeline(manifestPath=self.__manifestPath, maxWorkers=2, verbose=True, log=self.__lfh)
+            sp.addStage("first", self.__stage("first", outPath=outPathD["first"]), outputList=[outPathD["first"]])
+            sp.addStage("fails", self.__stage("fails", ok=False), outputList=[os.path.join(self.__workPath, "fails.txt")], dependsOn=["first"])
+            sp.addStage("raise", self.__failingStage, dependsOn=["first"])
+            sp.addStage("second", self.__stage("second", outPath=outPathD["second"]), outputList=[outPathD["second"]], dependsOn=["fails", "raise"])
+            statusD = sp.run()
+            self.assertEqual(statusD, {"first": True, "fails": False, "raise": False, "second": True})
+            actionD = {name: action for name, action, _t in sp.getReport()}
+            self.assertEqual(actionD["fails"], "failed")
+            self.assertEqual(actionD["raise"], "failed")
+            # Failed stages are run again - stages which succeeded are skipped on the second run
+            self.assertIn("start fails", self.__eventL)
+            self.assertIn("start raise", self.__eventL)
+            self.assertEqual(actionD["first"], "run" if cycle == 0 else "skipped")
+            self.assertEqual(actionD["second"], "run" if cycle == 0 else "skipped")
+        #
+        # A stage which fails after an earlier success is no longer current
+        sp = StagePipeline(manifestPath=self.__manifestPath, verbose=True, log=self.__lfh)
+        sp.addStage("first", self.__stage("first", ok=False, outPath=outPathD["first"]), outputList=[outPathD["first"]], paramD={"changed": True})
+        self.assertEqual(sp.run(), {"first": False})
+        sp = StagePipeline(manifestPath=self.__manifestPath, verbose=True, log=self.__lfh)
+        sp.addStage("first", self.__stage("first", outPath=outPathD["first"]), outputList=[outPathD["first"]])
+        sp.run()
+        self.assertEqual([action for _n, action, _t in sp.getReport()], ["run"])
+
+    def testSkip(self):
+        """Test stages are skipped while their inputs and outputs are unchanged and restore their results -"""
+        inpPath = os.path.join(self.__workPath, "input.cif")
+        outPath = os.path.join(self.__workPath, "output.cif")
+        with open(inpPath, "w") as ofh:
+            ofh.write("data_input\n")
+        restoreL = []
+
+        def run():
+            sp = StagePipeline(manifestPath=self.__manifestPath, verbose=True, log=self.__lfh)
+            sp.addStage("convert", self.__stage("convert", outPath=outPath), inputD={"model": inpPath}, outputList=[outPath], paramD={"mode": "annotate"}, restoreFunc=restoreL.append)
+            sp.addStage("report", self.__stage("report"), dependsOn=["convert"], cache=False)
+            self.assertEqual(sp.run(), {"convert": True, "report": True})
+            return [action for _n, action, _t in sp.getReport()]
+
+        self.assertEqual(run(), ["run", "run"])
+        self.assertEqual(restoreL, [])
+        self.assertEqual(run(), ["skipped", "run"])
+        self.assertEqual(restoreL, [{"name": "convert"}])
+        # Changed input content
+        with open(inpPath, "w") as ofh:
+            ofh.write("data_changed\n")
+        self.assertEqual(run(), ["run", "run"])
+        # Removed output
+        os.remove(outPath)
+        self.assertEqual(run(), ["run", "run"])
+        self.assertEqual(run(), ["skipped", "run"])
+
+
+def suiteStagePipelineTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(StagePipelineTests("testOrder"))
+    suiteSelect.addTest(StagePipelineTests("testConcurrent"))
+    suiteSelect.addTest(StagePipelineTests("testFailure"))
+    suiteSelect.addTest(StagePipelineTests("testSkip"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteStagePipelineTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,357 @@
+##
+# File:    StatusUpdateTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the batched status updates - locked reads, writes of the changed status columns only and roll back.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import copy
+import os
+import shutil
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+try:
+    from unittest.mock import patch
+except ImportError:  # pragma: no cover
+    from mock import patch
+
+from mmcif.api.DataCategory import DataCategory
+from mmcif.api.PdbxContainers import DataContainer
+from mmcif.io.IoAdapterPy import IoAdapterPy as IoAdapter
+
+from wwpdb.utils.session.WebRequest import InputRequest
+
+try:
+    from wwpdb.apps.ann_tasks_v2.status import StatusBatchUpdate as StatusBatchUpdateModule
+    from wwpdb.apps.ann_tasks_v2.status import StatusUpdate as StatusUpdateModule
+except ImportError:  # status database dependencies not installed
+    StatusBatchUpdateModule = None
+    StatusUpdateModule = None
+
+_ARCHIVE_PATH = os.path.join(TESTOUTPUT, "status-update", "archive")
+
+
+def _depositionRow(idCode, statusCode, emStatusCode=None):
+    return {
+        "dep_set_id": idCode,
+        "status_code": statusCode,
+        "post_rel_status": None,
+        "annotator_initials": "EP",
+        "initial_deposition_date": "2026-10-01",
+        "author_release_status_code": "HPUB",
+        "post_rel_recvd_coord": None,
+        "post_rel_recvd_coord_date": None,
+        "status_code_emdb": emStatusCode,
+        "dep_author_release_status_code_emdb": None,
+        "title_emdb": None,
+        "title": "It's a title",
+        "locking": "WFM",
+    }
+
+
+class _MyConnectionBase(object):
+    """Status database connections on an in-memory deposition table - a transaction works on a copy which replaces the table on commit."""
+
+    tableD = {}
+    executeL = []
+    failId = None
+
+    def __init__(self, siteId=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        self.__dbCon = None
+
+    def setResource(self, resourceName=None):
+        pass
+
+    def openConnection(self):
+        self.__dbCon = _Connection()
+        return True
+
+    def getConnection(self):
+        return self.__dbCon
+
+    def closeConnection(self):
+        self.__dbCon = None
+        return True
+
+
+class _Connection(object):
+    def __init__(self):
+        self.__tableD = copy.deepcopy(_MyConnectionBase.tableD)
+
+    def cursor(self):
+        return _Cursor(self.__tableD)
+
+    def commit(self):
+        _MyConnectionBase.tableD = self.__tableD
+
+    def rollback(self):
+        pass
+
+
+class _Cursor(object):
+    def __init__(self, tableD):
+        self.__tableD = tableD
+        self.__rowL = []
+
+    def execute(self, query, args):
+        _MyConnectionBase.executeL.append((query, args))
+        if query.startswith("SELECT "):
+            colL = query[len("SELECT ") : query.index(" FROM ")].split(",")
+            self.__rowL = [tuple(self.__tableD[idCode][col] for col in colL) for idCode in args if idCode in self.__tableD]
+        else:
+            if args[-1] == _MyConnectionBase.failId:
+                raise RuntimeError("update failed")
+            rd = self.__tableD[args[-1]]
+            for assign, val in zip(query[query.index(" SET ") + len(" SET ") : query.index(" WHERE ")].split(", "), args[:-1]):
+                rd[assign.split(" = ")[0]] = val
+
+    def fetchall(self):
+        return self.__rowL
+
+    def close(self):
+        pass
+
+
+class _SessionDownloadUtils(object):
+    """Copies the latest archive model file to the session."""
+
+    def __init__(self, reqObj, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        self.__sessionPath = reqObj.getSessionObj().getPath()
+        self.__downloadPath = None
+
+    def fetchId(self, idCode, contentType, formatType="pdbx"):  # pylint: disable=unused-argument
+        srcPath = os.path.join(_ARCHIVE_PATH, idCode, idCode + "_model_P1.cif.V1")
+        if not os.access(srcPath, os.R_OK):
+            return False
+        self.__downloadPath = os.path.join(self.__sessionPath, idCode + "_model_P1.cif")
+        shutil.copyfile(srcPath, self.__downloadPath)
+        return True
+
+    def getDownloadPath(self):
+        return self.__downloadPath
+
+
+class _PathInfo(object):
+    def __init__(self, siteId=None, sessionPath=".", verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        pass
+
+    def getModelPdbxFilePath(self, dataSetId, wfInstanceId=None, fileSource="archive", versionId="latest", mileStone=None):  # pylint: disable=unused-argument
+        return os.path.join(_ARCHIVE_PATH, dataSetId, dataSetId + "_model_P1.cif.V2")
+
+
+class _StatusHistoryUtils(object):
+    def __init__(self, reqObj=None, verbose=False, log=sys.stderr):  # pylint: disable=unused-argument
+        pass
+
+    def createHistory(self, entryIdList, overWrite=False, statusUpdateAuthWait=None):  # pylint: disable=unused-argument
+        return []
+
+    def updateEntryStatusHistory(self, entryIdList, statusCode, annotatorInitials, details=None, statusCodePrior=None):  # pylint: disable=unused-argument
+        return True
+
+    def loadEntryStatusHistory(self, entryIdList):  # pylint: disable=unused-argument
+        return True
+
+
+@unittest.skipIf(StatusUpdateModule is None, "status database dependencies not installed")
+class StatusUpdateTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__topPath = os.path.join(TESTOUTPUT, "status-update")
+        if os.path.exists(self.__topPath):
+            shutil.rmtree(self.__topPath)
+        os.makedirs(self.__topPath)
+        self.__reqObj = InputRequest({}, verbose=True, log=self.__lfh)
+        self.__reqObj.setValue("TopSessionPath", self.__topPath)
+        self.__reqObj.newSessionObj()
+        _MyConnectionBase.tableD = {
+            "D_1000000001": _depositionRow("D_1000000001", "PROC"),
+            "D_1000000002": _depositionRow("D_1000000002", "AUTH", emStatusCode="PROC"),
+        }
+        _MyConnectionBase.executeL = []
+        _MyConnectionBase.failId = None
+        self.__patch = patch.object(StatusUpdateModule, "MyConnectionBase", _MyConnectionBase)
+        self.__patch.start()
+
+    def tearDown(self):
+        self.__patch.stop()
+
+    def __getUpdateList(self):
+        return [("D_1000000001", {"statusCode": "AUTH", "initialDepositionDate": "2026-10-01", "postRelStatusCode": ""}, None), ("D_1000000002", None, {"statusCode": "AUTH"})]
+
+    def testLoadMany(self):
+        """Test the rows are locked and only the changed status columns are written -"""
+        sU = StatusUpdateModule.StatusUpdate(reqObj=self.__reqObj, verbose=True, log=self.__lfh)
+        self.assertTrue(sU.wfLoadMany(self.__getUpdateList()))
+        tableD = _MyConnectionBase.tableD
+        self.assertEqual(tableD["D_1000000001"]["status_code"], "AUTH")
+        self.assertEqual(tableD["D_1000000002"]["status_code_emdb"], "AUTH")
+        self.assertEqual(tableD["D_1000000002"]["status_code"], "AUTH")
+        # Columns owned by the workflow engine are neither read nor written and text is not quoted
+        self.assertEqual(tableD["D_1000000001"]["title"], "It's a title")
+        self.assertEqual(tableD["D_1000000001"]["locking"], "WFM")
+        #
+        queryL = [query for query, _args in _MyConnectionBase.executeL]
+        self.assertEqual(len(queryL), 3)
+        self.assertTrue(queryL[0].startswith("SELECT ") and queryL[0].endswith(" FOR UPDATE"))
+        self.assertEqual(_MyConnectionBase.executeL[1], ("UPDATE deposition SET status_code = %s WHERE dep_set_id = %s", ("AUTH", "D_1000000001")))
+        self.assertEqual(_MyConnectionBase.executeL[2], ("UPDATE deposition SET status_code_emdb = %s WHERE dep_set_id = %s", ("AUTH", "D_1000000002")))
+        #
+        # Nothing is written when no status column changes
+        _MyConnectionBase.executeL = []
+        self.assertTrue(sU.wfLoadMany([("D_1000000001", {"statusCode": "AUTH"}, None)]))
+        self.assertEqual(len(_MyConnectionBase.executeL), 1)
+
+    def testLoadManyFailure(self):
+        """Test nothing is changed when one of the updates fails -"""
+        sU = StatusUpdateModule.StatusUpdate(reqObj=self.__reqObj, verbose=True, log=self.__lfh)
+        _MyConnectionBase.failId = "D_1000000002"
+        self.assertFalse(sU.wfLoadMany(self.__getUpdateList()))
+        self.assertEqual(_MyConnectionBase.tableD["D_1000000001"]["status_code"], "PROC")
+        _MyConnectionBase.failId = None
+        self.assertFalse(sU.wfLoadMany([("D_1000000003", {"statusCode": "AUTH"}, None)]))
+        self.assertEqual(len(_MyConnectionBase.tableD), 2)
+
+    def testRollBackMany(self):
+        """Test roll back restores the changed status columns unless they have been changed again -"""
+        sU = StatusUpdateModule.StatusUpdate(reqObj=self.__reqObj, verbose=True, log=self.__lfh)
+        self.assertTrue(sU.wfLoadMany(self.__getUpdateList()))
+        # A later change by the workflow engine
+        _MyConnectionBase.tableD["D_1000000002"]["status_code_emdb"] = "HPUB"
+        _MyConnectionBase.tableD["D_1000000001"]["locking"] = "ANN"
+        _MyConnectionBase.executeL = []
+        self.assertTrue(sU.wfRollBackMany(["D_1000000001", "D_1000000002"]))
+        tableD = _MyConnectionBase.tableD
+        self.assertEqual(tableD["D_1000000001"]["status_code"], "PROC")
+        self.assertEqual(tableD["D_1000000001"]["locking"], "ANN")
+        self.assertEqual(tableD["D_1000000002"]["status_code_emdb"], "HPUB")
+        self.assertTrue(_MyConnectionBase.executeL[0][0].endswith(" FOR UPDATE"))
+        self.assertEqual(len(_MyConnectionBase.executeL), 2)
+        # The saved values are used once
+        _MyConnectionBase.executeL = []
+        self.assertTrue(sU.wfRollBackMany(["D_1000000001"]))
+        self.assertEqual(_MyConnectionBase.executeL, [])
+
+
+@unittest.skipIf(StatusBatchUpdateModule is None, "status database dependencies not installed")
+class StatusBatchUpdateTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__topPath = os.path.join(TESTOUTPUT, "status-update")
+        if os.path.exists(self.__topPath):
+            shutil.rmtree(self.__topPath)
+        self.__entryIdList = ["D_1000000001", "D_1000000002"]
+        for idCode, statusCode in zip(self.__entryIdList, ["PROC", "REL"]):
+            os.makedirs(os.path.join(_ARCHIVE_PATH, idCode))
+            self.__writeModel(idCode, statusCode)
+        self.__reqObj = InputRequest({}, verbose=True, log=self.__lfh)
+        self.__reqObj.setValue("TopSessionPath", self.__topPath)
+        self.__reqObj.newSessionObj()
+        _MyConnectionBase.tableD = {
+            "D_1000000001": _depositionRow("D_1000000001", "PROC"),
+            "D_1000000002": _depositionRow("D_1000000002", "REL"),
+        }
+        _MyConnectionBase.executeL = []
+        _MyConnectionBase.failId = None
+        self.__killL = []
+        self.__dbLoadL = []
+        self.__dbLoadOk = True
+        self.__patchL = [
+            patch.object(StatusUpdateModule, "MyConnectionBase", _MyConnectionBase),
+            patch.object(StatusUpdateModule.StatusUpdate, "dbLoadMany", self.__dbLoadMany),
+            patch.object(StatusBatchUpdateModule, "SessionDownloadUtils", _SessionDownloadUtils),
+            patch.object(StatusBatchUpdateModule, "PathInfo", _PathInfo),
+            patch.object(StatusBatchUpdateModule, "StatusHistoryUtils", _StatusHistoryUtils),
+            patch.object(StatusBatchUpdateModule, "killAllWF", self.__killAllWF),
+        ]
+        for pt in self.__patchL:
+            pt.start()
+
+    def tearDown(self):
+        for pt in self.__patchL:
+            pt.stop()
+
+    def __writeModel(self, idCode, statusCode):
+        container = DataContainer(idCode)
+        container.append(DataCategory("database_2", ["database_id", "database_code"], [["PDB", "9XYZ"]]))
+        container.append(
+            DataCategory(
+                "pdbx_database_status",
+                ["entry_id", "status_code", "author_release_status_code", "recvd_initial_deposition_date"],
+                [["9XYZ", statusCode, "HPUB", "2026-10-01"]],
+            )
+        )
+        container.append(DataCategory("pdbx_depui_entry_details", ["dep_dataset_id", "requested_accession_types"], [[idCode, "PDB"]]))
+        container.append(DataCategory("exptl", ["entry_id", "method"], [["9XYZ", "X-RAY DIFFRACTION"]]))
+        IoAdapter(raiseExceptions=True).writeFile(os.path.join(_ARCHIVE_PATH, idCode, idCode + "_model_P1.cif.V1"), [container])
+
+    def __dbLoadMany(self, pdbxFilePathList):
+        self.__dbLoadL.append(pdbxFilePathList)
+        return self.__dbLoadOk
+
+    def __killAllWF(self, idCode, caller):  # pylint: disable=unused-argument
+        self.__killL.append(idCode)
+        return "ok"
+
+    def __run(self):
+        sBU = StatusBatchUpdateModule.StatusBatchUpdate(self.__reqObj, maxWorkers=2, verbose=True, log=self.__lfh)
+        return sBU.run(
+            [{"idcode": "D_1000000001", "status-code": "AUTH"}, {"idcode": "d_1000000002", "status-code": "AUTH"}, {"idcode": "D_1000000001", "status-code": "AUTH"}],
+            annotatorInitials="EP",
+        )
+
+    def __readStatusCode(self, filePath):
+        return IoAdapter(raiseExceptions=True).readFile(filePath)[0].getObj("pdbx_database_status").getValue("status_code", 0)
+
+    def testRun(self):
+        """Test a permitted change is made, a prohibited or repeated one is rejected and nothing else is changed -"""
+        rL = self.__run()
+        self.assertEqual([(rD["idcode"], rD["status"]) for rD in rL], [("D_1000000001", "updated"), ("D_1000000002", "rejected"), ("D_1000000001", "rejected")])
+        self.assertEqual(rL[1]["msg"], "Processing status code change from REL prohibited")
+        self.assertEqual(_MyConnectionBase.tableD["D_1000000001"]["status_code"], "AUTH")
+        self.assertEqual(_MyConnectionBase.tableD["D_1000000002"]["status_code"], "REL")
+        self.assertEqual(self.__readStatusCode(_PathInfo().getModelPdbxFilePath("D_1000000001")), "AUTH")
+        self.assertFalse(os.access(_PathInfo().getModelPdbxFilePath("D_1000000002"), os.F_OK))
+        self.assertEqual(self.__killL, ["D_1000000001"])
+        self.assertEqual(len(self.__dbLoadL), 1)
+        self.assertEqual([os.path.basename(pth) for pth in self.__dbLoadL[0]], ["D_1000000001_model-status_P1.cif"])
+
+    def testDbLoadFailure(self):
+        """Test the workflow status is rolled back when the data file status load fails -"""
+        self.__dbLoadOk = False
+        rL = self.__run()
+        self.assertEqual(rL[0]["status"], "failed")
+        self.assertEqual(rL[0]["msg"], "Data file status update failed and workflow status rolled back.")
+        self.assertEqual(_MyConnectionBase.tableD["D_1000000001"]["status_code"], "PROC")
+
+
+def suiteStatusUpdateTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(StatusUpdateTests("testLoadMany"))
+    suiteSelect.addTest(StatusUpdateTests("testLoadManyFailure"))
+    suiteSelect.addTest(StatusUpdateTests("testRollBackMany"))
+    suiteSelect.addTest(StatusBatchUpdateTests("testRun"))
+    suiteSelect.addTest(StatusBatchUpdateTests("testDbLoadFailure"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteStatusUpdateTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
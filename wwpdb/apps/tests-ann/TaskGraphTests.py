@@ -0,0 +1,101 @@
+##
+# File:    TaskGraphTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for ordering and concurrent execution of tasks with declared reads and writes.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.ann_tasks_v2.utils.TaskGraph import TaskGraph
+
+
+class TaskGraphTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__lock = threading.Lock()
+        self.__eventL = []
+
+    def __task(self, name, delay):
+        with self.__lock:
+            self.__eventL.append(("start", name))
+        time.sleep(delay)
+        with self.__lock:
+            self.__eventL.append(("end", name))
+        return name
+
+    def __failingTask(self):
+        raise ValueError("failing task")
+
+    def testDependencies(self):
+        """Test that tasks wait for earlier tasks they conflict with -"""
+        tG = TaskGraph(maxWorkers=4, verbose=True, log=self.__lfh)
+        tG.add("model", self.__task, None, None, "model", 0.0)
+        tG.add("link", self.__task, ["atom_site"], ["struct_conn"], "link", 0.0)
+        tG.add("secstruct", self.__task, ["atom_site"], ["struct_conf"], "secstruct", 0.0)
+        tG.add("site", self.__task, ["atom_site", "struct_conn"], ["struct_site"], "site", 0.0)
+        tG.add("report", self.__task, [], [], "report", 0.0)
+        depD = tG.getDependencies()
+        self.assertEqual(depD, {"model": [], "link": ["model"], "secstruct": ["model"], "site": ["model", "link"], "report": []})
+
+    def testRun(self):
+        """Test concurrent execution, ordering, failures and the critical path -"""
+        tG = TaskGraph(maxWorkers=4, verbose=True, log=self.__lfh)
+        tG.add("model", self.__task, None, None, "model", 0.1)
+        tG.add("link", self.__task, ["atom_site"], ["struct_conn"], "link", 0.2)
+        tG.add("secstruct", self.__task, ["atom_site"], ["struct_conf"], "secstruct", 0.2)
+        tG.add("fail", self.__failingTask, ["atom_site"], ["struct_site"])
+        tG.add("site", self.__task, ["struct_conn", "struct_site"], ["struct_site_gen"], "site", 0.1)
+        progressL = []
+        startTime = time.time()
+        rL = tG.run(progressFunc=lambda name, ok, numberDone, numberOfTasks: progressL.append((name, ok, numberDone, numberOfTasks)))
+        elapsed = time.time() - startTime
+        self.assertEqual([rD["name"] for rD in rL], ["model", "link", "secstruct", "fail", "site"])
+        self.assertEqual([rD["ok"] for rD in rL], [True, True, True, False, True])
+        self.assertEqual(rL[1]["result"], "link")
+        # progress is reported once for each task as it finishes
+        self.assertEqual(sorted((t[0], t[1]) for t in progressL), sorted((rD["name"], rD["ok"]) for rD in rL))
+        self.assertEqual([t[2] for t in progressL], [1, 2, 3, 4, 5])
+        self.assertEqual(progressL[0][0], "model")
+        self.assertEqual(progressL[-1], ("site", True, 5, 5))
+        # link and secstruct overlap -  site starts after link and the failed task
+        self.assertLess(elapsed, 0.6)
+        self.assertLess(self.__eventL.index(("start", "secstruct")), self.__eventL.index(("end", "link")))
+        self.assertGreater(self.__eventL.index(("start", "site")), self.__eventL.index(("end", "link")))
+        self.assertGreaterEqual(rL[4]["start"], rL[1]["end"])
+        pathL, pathTime = TaskGraph.getCriticalPath(rL)
+        self.assertEqual(pathL, ["model", "link", "site"])
+        self.assertGreaterEqual(pathTime, 0.4)
+        self.assertEqual(TaskGraph(verbose=False).run(), [])
+
+
+def suiteTaskGraphTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(TaskGraphTests("testDependencies"))
+    suiteSelect.addTest(TaskGraphTests("testRun"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteTaskGraphTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,107 @@
+##
+# File:    TaskPoolTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the bounded task pool - result ordering, failures, timeouts and the concurrency limit.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.ann_tasks_v2.utils.TaskPool import TaskPool, getDefaultMaxWorkers
+
+
+class TaskPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__lock = threading.Lock()
+        self.__active = 0
+        self.__maxActive = 0
+
+    def __task(self, value, delay=0.0):
+        with self.__lock:
+            self.__active += 1
+            self.__maxActive = max(self.__maxActive, self.__active)
+        time.sleep(delay)
+        with self.__lock:
+            self.__active -= 1
+        return value
+
+    def __failingTask(self):
+        raise ValueError("failing task")
+
+    def testOrder(self):
+        """Test that results are returned in the order added whatever order the tasks finish in -"""
+        tP = TaskPool(maxWorkers=4, verbose=True, log=self.__lfh)
+        for ii, delay in enumerate([0.3, 0.0, 0.2, 0.1]):
+            tP.add("task%d" % ii, self.__task, ii, delay=delay)
+        self.assertEqual(tP.getTaskCount(), 4)
+        rL = tP.run()
+        self.assertEqual(rL, [("task0", True, 0), ("task1", True, 1), ("task2", True, 2), ("task3", True, 3)])
+        self.assertEqual(sorted(tP.getTimings().keys()), ["task0", "task1", "task2", "task3"])
+        self.assertEqual(tP.getTaskCount(), 0)
+        self.assertEqual(tP.run(), [])
+
+    def testFailure(self):
+        """Test that a failing task is reported without affecting the other tasks -"""
+        tP = TaskPool(maxWorkers=2, verbose=True, log=self.__lfh)
+        tP.add("first", self.__task, "a")
+        tP.add("fail", self.__failingTask)
+        tP.add("last", self.__task, "c")
+        self.assertEqual(tP.run(), [("first", True, "a"), ("fail", False, None), ("last", True, "c")])
+
+    def testTimeout(self):
+        """Test that a task exceeding the timeout is reported as failed -"""
+        tP = TaskPool(maxWorkers=2, timeout=0.2, log=self.__lfh)
+        tP.add("slow", self.__task, "slow", delay=1.0)
+        tP.add("fast", self.__task, "fast")
+        startTime = time.time()
+        rL = tP.run()
+        self.assertLess(time.time() - startTime, 0.9)
+        self.assertEqual(rL, [("slow", False, None), ("fast", True, "fast")])
+
+    def testConcurrencyLimit(self):
+        """Test that no more than maxWorkers tasks run at the same time -"""
+        tP = TaskPool(maxWorkers=2, log=self.__lfh)
+        for ii in range(6):
+            tP.add(ii, self.__task, ii, delay=0.1)
+        startTime = time.time()
+        rL = tP.run()
+        self.assertEqual([t[2] for t in rL], list(range(6)))
+        self.assertEqual(self.__maxActive, 2)
+        self.assertGreaterEqual(time.time() - startTime, 0.3)
+        self.assertGreaterEqual(getDefaultMaxWorkers(), 1)
+        self.assertLessEqual(getDefaultMaxWorkers(limit=1), 1)
+
+
+def suiteTaskPoolTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(TaskPoolTests("testOrder"))
+    suiteSelect.addTest(TaskPoolTests("testFailure"))
+    suiteSelect.addTest(TaskPoolTests("testTimeout"))
+    suiteSelect.addTest(TaskPoolTests("testConcurrencyLimit"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteTaskPoolTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
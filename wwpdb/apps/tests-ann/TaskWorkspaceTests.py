@@ -0,0 +1,115 @@
+##
+# File:    TaskWorkspaceTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the private task workspace - snapshots, result installation and the version history.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import shutil
+import sys
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.ann_tasks_v2.utils.TaskWorkspace import TaskWorkspace
+
+
+class TaskWorkspaceTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__sessionPath = os.path.join(TESTOUTPUT, "task-workspace-session")
+        if os.access(self.__sessionPath, os.F_OK):
+            shutil.rmtree(self.__sessionPath)
+        os.makedirs(self.__sessionPath)
+        self.__modelPath = os.path.join(self.__sessionPath, "D_000000_model_P1.cif")
+        self.__write(self.__modelPath, "version 0\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.__sessionPath, ignore_errors=True)
+
+    def __write(self, filePath, text):
+        with open(filePath, "w") as ofh:
+            ofh.write(text)
+
+    def __read(self, filePath):
+        with open(filePath, "r") as ifh:
+            return ifh.read()
+
+    def testCommitAndRestore(self):
+        """Test that results are installed in the session and replaced versions are kept -"""
+        for version in (1, 2):
+            with TaskWorkspace(self.__sessionPath, "D_000000", "task%d" % version, verbose=True, log=self.__lfh) as ws:
+                snapPath = ws.snapshot(self.__modelPath)
+                self.assertNotEqual(snapPath, self.__modelPath)
+                outPath = ws.getPath("D_000000_model-updated_P1.cif")
+                self.__write(outPath, self.__read(snapPath).replace(str(version - 1), str(version)))
+                self.assertEqual(ws.publish([outPath, ws.getPath("missing.log")]), [os.path.join(self.__sessionPath, "D_000000_model-updated_P1.cif")])
+                self.assertTrue(ws.commit(outPath, self.__modelPath))
+                workPath = ws.getPath()
+            self.assertFalse(os.access(workPath, os.F_OK))
+        self.assertEqual(self.__read(self.__modelPath), "version 2\n")
+        #
+        vL = TaskWorkspace.readVersionList(self.__sessionPath, self.__modelPath)
+        self.assertEqual([(vD["version"], vD["task"]) for vD in vL], [(1, "task1"), (2, "task2")])
+        self.assertEqual(self.__read(vL[0]["path"]), "version 0\n")
+        self.assertTrue(TaskWorkspace.restoreVersion(self.__sessionPath, self.__modelPath, 1, log=self.__lfh))
+        self.assertEqual(self.__read(self.__modelPath), "version 0\n")
+        self.assertEqual(len(TaskWorkspace.readVersionList(self.__sessionPath, self.__modelPath)), 3)
+        self.assertFalse(TaskWorkspace.restoreVersion(self.__sessionPath, self.__modelPath, 10, log=self.__lfh))
+
+    def testConflict(self):
+        """Test that a commit is refused if the target was replaced after the snapshot -"""
+        ws1 = TaskWorkspace(self.__sessionPath, "D_000000", "first", log=self.__lfh)
+        ws2 = TaskWorkspace(self.__sessionPath, "D_000000", "second", log=self.__lfh)
+        try:
+            self.assertNotEqual(ws1.getPath(), ws2.getPath())
+            ws1.snapshot(self.__modelPath)
+            ws2.snapshot(self.__modelPath)
+            self.__write(ws1.getPath("out.cif"), "first\n")
+            self.__write(ws2.getPath("out.cif"), "second\n")
+            self.assertTrue(ws1.commit(ws1.getPath("out.cif"), self.__modelPath))
+            self.assertFalse(ws2.commit(ws2.getPath("out.cif"), self.__modelPath))
+            self.assertEqual(self.__read(self.__modelPath), "first\n")
+            self.assertFalse(ws2.commit(ws2.getPath("none.cif"), self.__modelPath))
+        finally:
+            ws1.close()
+            ws2.close()
+
+    def testVersionLimit(self):
+        """Test that the version history is limited -"""
+        with TaskWorkspace(self.__sessionPath, "D_000000", "limit", maxVersions=3, log=self.__lfh) as ws:
+            for version in range(1, 6):
+                self.__write(ws.getPath("out.cif"), "version %d\n" % version)
+                self.assertTrue(ws.commit(ws.getPath("out.cif"), self.__modelPath))
+            vL = ws.getVersionList(self.__modelPath)
+        self.assertEqual([vD["version"] for vD in vL], [3, 4, 5])
+        self.assertEqual(len(os.listdir(os.path.join(self.__sessionPath, "task-history"))), 4)
+        self.assertEqual(self.__read(vL[-1]["path"]), "version 4\n")
+
+
+def suiteTaskWorkspaceTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(TaskWorkspaceTests("testCommitAndRestore"))
+    suiteSelect.addTest(TaskWorkspaceTests("testConflict"))
+    suiteSelect.addTest(TaskWorkspaceTests("testVersionLimit"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteTaskWorkspaceTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
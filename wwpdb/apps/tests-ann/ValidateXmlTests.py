@@ -0,0 +1,143 @@
+##
+# File:    ValidateXmlTests.py
+# Date:    18-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the validation XML report parser - DOM and streaming readers, summary cache and benchmark.
+
+"""
+__docformat__ = "restructuredtext en"
+__author__ = "Ezra Peisach"
+__email__ = "ezra.peisach@rcsb.org"
+__license__ = "Apache 2.0"
+__version__ = "V0.01"
+
+import os
+import sys
+import time
+import tracemalloc
+import unittest
+
+if __package__ is None or __package__ == "":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from commonsetup import HERE, TESTOUTPUT  # noqa:  F401 pylint: disable=import-error,unused-import
+else:
+    from .commonsetup import HERE, TESTOUTPUT  # noqa: F401 pylint: disable=relative-beyond-top-level
+
+from wwpdb.apps.ann_tasks_v2.correspnd.ValidateXml import ValidateXml
+
+
+class ValidateXmlTests(unittest.TestCase):
+    def setUp(self):
+        self.__lfh = sys.stdout
+        self.__outlierTypeList = ["torsion-outlier", "polymer-rsrz-outlier", "ligand-rsrz-outlier", "clash", "bond-outlier", "mog-angle-outlier",
+                                  "angle-outlier", "plane-outlier", "chiral-outlier", "r_free_diff", "r_work_diff"]
+
+    def tearDown(self):
+        pass
+
+    def __makeReport(self, filePath, nRes=200):
+        """Write a synthetic validation report with a chemical shift list and nRes residues carrying a mix of outliers."""
+        with open(filePath, "w") as ofh:
+            ofh.write('<?xml version="1.0" encoding="UTF-8"?>\n<wwPDB-validation-information>\n')
+            ofh.write('<Entry DCC_Rfree="0.30" PDB-Rfree="0.20" DCC_R="0.20" PDB-R="0.21" DataCompleteness="95.5"/>\n')
+            ofh.write('<chemical_shift_list total_number_of_shifts="100" number_of_mapped_shifts="90" number_of_errors_while_mapping="3">\n')
+            ofh.write('<unmapped_chemical_shift chain="A" resnum="3" rescode="ALA" atom="CB" value="1.0" diagnostic="Residue not found in structure."/>\n')
+            ofh.write('<unmapped_chemical_shift chain="A" resnum="4" rescode="GLY" atom="CA" value="2.0" error="0.1" diagnostic="Atom not found"/>\n')
+            ofh.write('<chemical_shift_outlier chain="B" resnum="5" rescode="SER" atom="N" value="120" prediction="110" zscore="5.5"/>\n')
+            ofh.write('<referencing_offset atom="C" number_of_measurements="10" precision="0.1" uncertainty="0.2" value="1.5"/>\n')
+            ofh.write("</chemical_shift_list>\n")
+            for ii in range(nRes):
+                attribs = 'model="1" ent="1" chain="%s" resname="ALA" resnum="%d" icode=" " altcode=" "' % ("ABCD"[ii % 4], ii)
+                if ii % 7 == 0:
+                    attribs += ' rama="OUTLIER" phi="-60.1" psi="120.5"'
+                if ii % 5 == 0:
+                    attribs += ' rsrz="%.2f"' % (ii % 9)
+                ofh.write("<ModelledSubgroup %s>\n" % attribs)
+                if ii % 3 == 0:
+                    ofh.write('<clash atom="%s" cid="%d" clashmag="0.5" dist="%.2f"/>\n' % (["CA", "HB", "N"][ii % 3 % 2], ii // 6, 1.6 + (ii % 10) / 10.0))
+                if ii % 13 == 0:
+                    ofh.write('<bond-outlier atom0="C" atom1="%s" mean="1.5" stdev="0.01" obs="1.7" z="12" link="no"/>\n' % ["N", "CB"][ii % 2])
+                    ofh.write('<mog-angle-outlier atoms="A,B,C" mean="1" mindiff="0.1" stdev="0.1" numobs="5" Zscore="%d" obsval="2"/>\n' % (ii % 20 - 5))
+                    ofh.write('<plane-outlier omega="1" improper="2" planeRMSD="0.2" type="mainchain"/>\n')
+                ofh.write("</ModelledSubgroup>\n")
+            ofh.write("</wwPDB-validation-information>\n")
+
+    def __readAll(self, filePath, **kwargs):
+        vX = ValidateXml(FileName=filePath, verbose=False, log=self.__lfh, **kwargs)
+        return (
+            [vX.getOutlier(outlierType) for outlierType in self.__outlierTypeList],
+            vX.getClashOutliers(),
+            vX.getCalculatedCompleteness(),
+            vX.getChemicalShiftStatistics(),
+            vX.getNotFoundInStructureCsList(),
+            vX.getNotFoundResidueInStructureCsList(),
+            vX.getCsOutliers(),
+            vX.getCsReferencingOffsetFlag(),
+        )
+
+    def testStreamingReader(self):
+        """Test the streaming reader returns the same content as the DOM reader -"""
+        filePath = os.path.join(TESTOUTPUT, "val-data-small.xml")
+        self.__makeReport(filePath)
+        rD = self.__readAll(filePath, streaming=False)
+        self.assertEqual(self.__readAll(filePath, streaming=True), rD)
+        self.assertEqual(len(rD[0][0]), 29)
+        self.assertEqual(len(rD[0][-2]), 1)
+        self.assertEqual(rD[3], (100, 90, 0, 3, 0, 1))
+        self.assertEqual(len(rD[5]), 1)
+
+    def testSummaryCache(self):
+        """Test reuse and invalidation of the parsed summary cache -"""
+        filePath = os.path.join(TESTOUTPUT, "val-data-cache.xml")
+        self.__makeReport(filePath)
+        cachePath = ValidateXml(FileName=filePath).getCachePath()
+        if os.access(cachePath, os.F_OK):
+            os.remove(cachePath)
+        rD = self.__readAll(filePath)
+        self.assertEqual(self.__readAll(filePath, useCache=True), rD)
+        self.assertTrue(os.access(cachePath, os.R_OK))
+        self.assertEqual(self.__readAll(filePath, useCache=True), rD)
+        # A changed report must not be satisfied from the cache
+        self.__makeReport(filePath, nRes=20)
+        rD = self.__readAll(filePath, useCache=True)
+        self.assertEqual(rD, self.__readAll(filePath))
+        self.assertEqual(len(rD[0][0]), 3)
+
+    def testReaderBenchmark(self):
+        """Compare time and peak memory of the DOM and streaming readers on a synthetic large report -"""
+        filePath = os.path.join(TESTOUTPUT, "val-data-large.xml")
+        self.__makeReport(filePath, nRes=10000)
+        resultD = {}
+        peakD = {}
+        for streaming in [False, True]:
+            tracemalloc.start()
+            startTime = time.time()
+            rD = self.__readAll(filePath, streaming=streaming)
+            elapsed = time.time() - startTime
+            _cur, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            resultD[streaming] = rD
+            peakD[streaming] = peak
+            self.__lfh.write(
+                "Validation XML reader %-9s size %d bytes  time %.2f s  peak memory %.1f MB\n"
+                % ("streaming" if streaming else "dom", os.path.getsize(filePath), elapsed, peak / 1048576.0)
+            )
+        self.assertEqual(resultD[False], resultD[True])
+        self.assertLess(peakD[True], peakD[False])
+
+
+def suiteValidateXmlTests():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ValidateXmlTests("testStreamingReader"))
+    suiteSelect.addTest(ValidateXmlTests("testSummaryCache"))
+    suiteSelect.addTest(ValidateXmlTests("testReaderBenchmark"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = suiteValidateXmlTests()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)